@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+"""
+Alerts for Cash Daily Workflow
+
+This module turns scan and portfolio results into notifications:
+1. Parses user-defined rules, as dicts or short phrases ("BTC drops 5% in 1h",
+   "allocation > 30%", "new negative sentiment on a held asset")
+2. Compiles threshold rules into sorted threshold lists indexed by metric, symbol, and operator,
+   so an update finds the rules it crosses by bisection instead of checking every rule
+3. Only looks at symbols whose values changed, and fires a rule when a value crosses into it
+   (not on every scan while it stays there)
+4. Sends alerts to local sinks: a JSONL file, stdout, or a webhook (the local API stub has one)
+
+Usage:
+    from alerts import AlertEngine
+    engine = AlertEngine(["BTC drops 5% in 1h", "allocation > 30%"], sinks=[StdoutSink()])
+    engine.process_scan(market_results)
+    engine.process_portfolio(portfolio_results)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import bisect
+import logging
+from pathlib import Path
+
+import requests
+
+logger = logging.getLogger("Cash.Alerts")
+
+OPERATORS = (">", ">=", "<", "<=")
+
+# Symbol keys that are not a single coin
+ANY_SYMBOL = "*"
+HELD_SYMBOL = "held"
+
+# Phrase windows -> top coin price change metrics
+WINDOW_METRICS = {"1h": "price_change_1h", "24h": "price_change_24h", "7d": "price_change_7d"}
+
+_MOVE_RULE = re.compile(r"^(?P<symbol>\S+) (?P<direction>drops|falls|rises|gains|jumps) (?P<value>[\d.]+)% in (?P<window>1h|24h|7d)$", re.IGNORECASE)
+_THRESHOLD_RULE = re.compile(r"^(?:(?P<symbol>\S+) )?(?P<metric>[a-z][a-z0-9_]*) (?P<op>>=|<=|>|<) (?P<value>-?[\d.]+)%?$", re.IGNORECASE)
+_EVENT_RULE = re.compile(r"^new (?P<event>[a-z _]+?)(?: on (?:an? )?(?P<symbol>held assets?|any assets?|\S+))?$", re.IGNORECASE)
+
+
+class Rule:
+    """A threshold rule (metric crosses a value) or an event rule (a new warning/opportunity type)"""
+
+    def __init__(self, name, metric=None, op=None, value=None, event=None, symbol=ANY_SYMBOL, message=None):
+        """
+        Initialize the rule
+
+        Args:
+            name (str): Rule name (shown in alerts)
+            metric (str): Metric for threshold rules (e.g., price_change_1h, allocation)
+            op (str): One of >, >=, <, <=
+            value (float): Threshold
+            event (str): Warning/opportunity/risk type for event rules (e.g., negative_sentiment)
+            symbol (str): Coin symbol, "*" for any, or "held" for assets in the portfolio
+            message (str): Custom alert text
+        """
+        if event is None and (metric is None or op not in OPERATORS or value is None):
+            raise ValueError(f"Rule {name!r} needs a metric, an operator ({', '.join(OPERATORS)}), and a value, or an event")
+        self.name = name
+        self.metric = metric
+        self.op = op
+        self.value = float(value) if value is not None else None
+        self.event = event
+        self.symbol = _symbol_key(symbol)
+        self.message = message
+
+    def to_dict(self):
+        """Serializable form"""
+        return {key: value for key, value in vars(self).items() if value is not None}
+
+
+def parse_rule(spec):
+    """
+    Build a rule from a dict or a phrase
+
+    Phrases:
+        "<SYMBOL> drops|rises <N>% in 1h|24h|7d"
+        "[<SYMBOL>|held|*] <metric> >|>=|<|<= <N>[%]"
+        "new <event type> [on <SYMBOL>|a held asset|any asset]"
+
+    Args:
+        spec (dict or str): Rule definition
+
+    Returns:
+        Rule: Parsed rule
+    """
+    if isinstance(spec, Rule):
+        return spec
+    if isinstance(spec, dict):
+        spec = dict(spec)
+        return Rule(spec.pop("name", None) or json.dumps(spec, sort_keys=True), **spec)
+
+    text = " ".join(str(spec).split())
+    match = _MOVE_RULE.match(text)
+    if match:
+        falling = match.group("direction").lower() in ("drops", "falls")
+        value = float(match.group("value"))
+        return Rule(text, metric=WINDOW_METRICS[match.group("window").lower()], op="<=" if falling else ">=",
+                    value=-value if falling else value, symbol=match.group("symbol"))
+
+    match = _EVENT_RULE.match(text)
+    if match:
+        return Rule(text, event=match.group("event").strip().lower().replace(" ", "_"), symbol=match.group("symbol") or ANY_SYMBOL)
+
+    match = _THRESHOLD_RULE.match(text)
+    if match:
+        return Rule(text, metric=match.group("metric").lower(), op=match.group("op"),
+                    value=float(match.group("value")), symbol=match.group("symbol") or ANY_SYMBOL)
+
+    raise ValueError(f"Could not parse alert rule: {text!r}")
+
+
+def _symbol_key(symbol):
+    """Normalize a rule's symbol to a coin symbol, "*", or "held\""""
+    symbol = (symbol or ANY_SYMBOL).strip()
+    lowered = symbol.lower()
+    if lowered in ("*", "any", "any asset", "any assets", "all"):
+        return ANY_SYMBOL
+    if lowered in ("held", "held asset", "held assets", "portfolio"):
+        return HELD_SYMBOL
+    return symbol.upper()
+
+
+class _ThresholdList:
+    """Rules sharing a metric, symbol key, and operator, sorted by threshold"""
+
+    def __init__(self, op):
+        self.op = op
+        self.thresholds = []
+        self.rules = []
+
+    def add(self, rule):
+        position = bisect.bisect_right(self.thresholds, rule.value)
+        self.thresholds.insert(position, rule.value)
+        self.rules.insert(position, rule)
+
+    def _boundary(self, value):
+        """Index splitting satisfied from unsatisfied rules at `value`"""
+        if self.op in (">", "<="):
+            return bisect.bisect_left(self.thresholds, value)
+        return bisect.bisect_right(self.thresholds, value)
+
+    def crossed(self, old, new):
+        """
+        Rules that hold at `new` but did not hold at `old`
+
+        For > and >= the satisfied rules are a prefix of the sorted thresholds, for < and <= a
+        suffix, so the newly satisfied ones are the slice between the two boundaries.
+        """
+        new_boundary = self._boundary(new)
+        if self.op in (">", ">="):
+            old_boundary = 0 if old is None else self._boundary(old)
+            return self.rules[old_boundary:new_boundary] if new_boundary > old_boundary else []
+        old_boundary = len(self.rules) if old is None else self._boundary(old)
+        return self.rules[new_boundary:old_boundary] if old_boundary > new_boundary else []
+
+
+class AlertEngine:
+    """Evaluates compiled rules against changed values and dispatches alerts"""
+
+    def __init__(self, rules=(), sinks=()):
+        """
+        Initialize the engine
+
+        Args:
+            rules (list): Rules as Rule objects, dicts, or phrases
+            sinks (list): Objects with a send(alerts) method
+        """
+        self.sinks = list(sinks)
+        self.rules = []
+        self.thresholds = {}   # metric -> symbol key -> [_ThresholdList per operator]
+        self.events = {}       # event type -> symbol key -> [rules]
+        self.values = {}       # symbol -> {metric: last value}
+        self.held = set()
+        self.seen_events = {}  # source -> event keys from the last update
+        self.stats = {"updates": 0, "values_changed": 0, "alerts": 0}
+        for rule in rules:
+            self.add_rule(rule)
+
+    def add_rule(self, spec):
+        """
+        Compile a rule into the index
+
+        Args:
+            spec (Rule, dict, or str): Rule definition
+
+        Returns:
+            Rule: The compiled rule
+        """
+        rule = parse_rule(spec)
+        self.rules.append(rule)
+        if rule.event is not None:
+            self.events.setdefault(rule.event, {}).setdefault(rule.symbol, []).append(rule)
+            return rule
+
+        by_op = self.thresholds.setdefault(rule.metric, {}).setdefault(rule.symbol, {})
+        if rule.op not in by_op:
+            by_op[rule.op] = _ThresholdList(rule.op)
+        by_op[rule.op].add(rule)
+        return rule
+
+    def update(self, facts, events=(), source="scan", held=None, timestamp=None):
+        """
+        Evaluate rules against new values and events
+
+        Args:
+            facts (dict): symbol -> {metric: value}
+            events (list): (event type, symbol, details dict) tuples
+            source (str): Update source; events repeated from this source's previous update are skipped
+            held (set): Symbols now held (unchanged if None)
+            timestamp (float): Update time (now if None)
+
+        Returns:
+            list: Alerts fired by this update
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        alerts = []
+        self.stats["updates"] += 1
+
+        newly_held = set()
+        if held is not None:
+            held = {symbol.upper() for symbol in held}
+            newly_held = held - self.held
+            self.held = held
+
+        for symbol, metrics in facts.items():
+            symbol = symbol.upper()
+            last_values = self.values.setdefault(symbol, {})
+            is_held = symbol in self.held
+            for metric, value in metrics.items():
+                if value is None:
+                    continue
+                old = last_values.get(metric)
+                recheck_held = symbol in newly_held
+                if old == value and not recheck_held:
+                    continue
+                last_values[metric] = value
+                self.stats["values_changed"] += 1
+
+                by_symbol = self.thresholds.get(metric)
+                if not by_symbol:
+                    continue
+                for key in (symbol, ANY_SYMBOL, HELD_SYMBOL):
+                    if key == HELD_SYMBOL and not is_held:
+                        continue
+                    lists = by_symbol.get(key)
+                    if not lists:
+                        continue
+                    # A symbol that just became held has not been checked against held rules yet
+                    previous = None if key == HELD_SYMBOL and recheck_held else old
+                    for threshold_list in lists.values():
+                        for rule in threshold_list.crossed(previous, value):
+                            alerts.append(self._alert(rule, symbol, source, timestamp, value=value, previous=old))
+
+        seen = set()
+        previously_seen = self.seen_events.get(source, set())
+        for event_type, symbol, details in events:
+            symbol = (symbol or "").upper()
+            event_key = f"{event_type}|{symbol}|{details.get('message', '')}"
+            seen.add(event_key)
+            if event_key in previously_seen:
+                continue
+            by_symbol = self.events.get(event_type)
+            if not by_symbol:
+                continue
+            for key in (symbol, ANY_SYMBOL, HELD_SYMBOL):
+                if key == HELD_SYMBOL and symbol not in self.held:
+                    continue
+                for rule in by_symbol.get(key, ()):
+                    alerts.append(self._alert(rule, symbol, source, timestamp, details=details))
+        self.seen_events[source] = seen
+
+        if alerts:
+            self.stats["alerts"] += len(alerts)
+            self._dispatch(alerts)
+        return alerts
+
+    def _alert(self, rule, symbol, source, timestamp, value=None, previous=None, details=None):
+        """Build an alert record"""
+        if rule.message:
+            message = rule.message.format(symbol=symbol, value=value, previous=previous)
+        elif rule.event is not None:
+            message = f"New {rule.event.replace('_', ' ')} on {symbol}: {(details or {}).get('message', '')}".rstrip(": ")
+        else:
+            message = f"{symbol} {rule.metric} {value:g} {rule.op} {rule.value:g}"
+        alert = {
+            "rule": rule.name,
+            "symbol": symbol,
+            "source": source,
+            "timestamp": timestamp,
+            "message": message
+        }
+        if rule.event is None:
+            alert.update({"metric": rule.metric, "value": value, "previous": previous, "threshold": rule.value})
+        return alert
+
+    def _dispatch(self, alerts):
+        """Send alerts to every sink (a failing sink doesn't stop the others)"""
+        for sink in self.sinks:
+            try:
+                sink.send(alerts)
+            except Exception as e:
+                logger.error(f"Error sending alerts to {type(sink).__name__}: {str(e)}", exc_info=True)
+
+    def process_scan(self, results, timestamp=None):
+        """
+        Evaluate a MarketScanner result
+
+        Args:
+            results (dict): Market scan results
+
+        Returns:
+            list: Alerts fired
+        """
+        return self.update(scan_facts(results), scan_events(results), source="scan", timestamp=timestamp)
+
+    def process_portfolio(self, results, timestamp=None):
+        """
+        Evaluate a PortfolioTracker result (also updates the set of held assets)
+
+        Args:
+            results (dict): Portfolio check results
+
+        Returns:
+            list: Alerts fired
+        """
+        facts = portfolio_facts(results)
+        held = {symbol for symbol, metrics in facts.items() if (metrics.get("value_usd") or 0) > 0}
+        return self.update(facts, portfolio_events(results), source="portfolio", held=held, timestamp=timestamp)
+
+    def state(self):
+        """Serializable evaluation state (last values, held assets, last events)"""
+        return {
+            "values": self.values,
+            "held": sorted(self.held),
+            "seen_events": {source: sorted(keys) for source, keys in self.seen_events.items()}
+        }
+
+    def save_state(self, path):
+        """Write the evaluation state so the next run only alerts on new crossings"""
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state(), f)
+        os.replace(tmp_path, path)
+
+    def load_state(self, path):
+        """Restore the evaluation state written by save_state (no-op if missing)"""
+        path = Path(path)
+        if not path.exists():
+            return
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.values = data.get("values", {})
+            self.held = set(data.get("held", []))
+            self.seen_events = {source: set(keys) for source, keys in data.get("seen_events", {}).items()}
+        except Exception as e:
+            logger.warning(f"Could not load alert state from {path}: {str(e)}")
+
+
+def scan_facts(results):
+    """
+    Per-symbol metrics from a market scan
+
+    Returns:
+        dict: symbol -> {price, price_change_1h, price_change_24h, price_change_7d, rank,
+            volume, sentiment, momentum}
+    """
+    facts = {}
+    for coin in results.get("top_coins", []):
+        symbol = (coin.get("symbol") or "").upper()
+        if not symbol:
+            continue
+        facts[symbol] = {
+            "price": coin.get("live_price") or coin.get("current_price"),
+            "price_change_1h": coin.get("price_change_percentage_1h"),
+            "price_change_24h": coin.get("price_change_percentage_24h"),
+            "price_change_7d": coin.get("price_change_percentage_7d"),
+            "rank": coin.get("market_cap_rank"),
+            "volume": coin.get("total_volume")
+        }
+    for symbol, sentiment in results.get("coin_sentiment", {}).items():
+        facts.setdefault(symbol.upper(), {})["sentiment"] = sentiment.get("score")
+    for trend in results.get("rising_coins", []):
+        facts.setdefault(trend["symbol"].upper(), {})["momentum"] = trend.get("momentum")
+    return facts
+
+
+def scan_events(results):
+    """(type, symbol, details) events from a scan's warnings and opportunities"""
+    events = []
+    for key in ("warnings", "opportunities"):
+        for entry in results.get(key, []):
+            if entry.get("type"):
+                events.append((entry["type"], entry.get("symbol") or entry.get("coin"), entry))
+    return events
+
+
+def portfolio_facts(results):
+    """
+    Per-asset metrics from a portfolio check
+
+    Returns:
+        dict: asset -> {allocation, value_usd, balance}
+    """
+    facts = {}
+    for holding in results.get("holdings", []):
+        asset = (holding.get("asset") or "").upper()
+        if not asset:
+            continue
+        metrics = facts.setdefault(asset, {"allocation": 0.0, "value_usd": 0.0, "balance": 0.0})
+        metrics["allocation"] += holding.get("allocation_percentage") or 0.0
+        metrics["value_usd"] += holding.get("value_usd") or 0.0
+        metrics["balance"] += holding.get("balance") or 0.0
+    return facts
+
+
+def portfolio_events(results):
+    """(type, asset, details) events from a portfolio check's risks and opportunities"""
+    events = []
+    for key in ("risks", "opportunities"):
+        for entry in results.get(key, []):
+            if entry.get("type"):
+                events.append((entry["type"], entry.get("asset") or entry.get("symbol"), entry))
+    return events
+
+
+class FileSink:
+    """Appends alerts to a JSONL file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    def send(self, alerts):
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        with open(self.path, 'a') as f:
+            for alert in alerts:
+                f.write(json.dumps(alert) + "\n")
+
+
+class StdoutSink:
+    """Prints one line per alert"""
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+
+    def send(self, alerts):
+        for alert in alerts:
+            self.stream.write(f"[ALERT] {alert['message']} ({alert['rule']})\n")
+        self.stream.flush()
+
+
+class WebhookSink:
+    """POSTs alerts as JSON to a webhook URL"""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, alerts):
+        response = requests.post(self.url, json={"alerts": alerts}, timeout=self.timeout)
+        response.raise_for_status()
+
+
+def build_sinks(specs, base_dir=None):
+    """
+    Create sinks from config entries
+
+    Args:
+        specs (list): {"type": "file", "path": ...}, {"type": "stdout"}, or {"type": "webhook", "url": ...}
+        base_dir (Path): Directory relative file paths are resolved against
+
+    Returns:
+        list: Sinks
+    """
+    sinks = []
+    for spec in specs or []:
+        sink_type = spec.get("type")
+        if sink_type == "file":
+            path = Path(spec.get("path", "logs/alerts.jsonl"))
+            sinks.append(FileSink(path if path.is_absolute() or base_dir is None else Path(base_dir) / path))
+        elif sink_type == "stdout":
+            sinks.append(StdoutSink())
+        elif sink_type == "webhook" and spec.get("url"):
+            sinks.append(WebhookSink(spec["url"], spec.get("timeout", 5)))
+        else:
+            logger.warning(f"Unknown alert sink: {spec}")
+    return sinks
+
+
+if __name__ == "__main__":
+    # If run directly, evaluate sample rules against two scans and a portfolio, posting to the local webhook stub
+    from api_stubs import LocalAPIStub
+
+    logging.basicConfig(level=logging.INFO)
+
+    with LocalAPIStub() as stub:
+        engine = AlertEngine(
+            ["BTC drops 5% in 1h", "ETH rises 10% in 24h", "allocation > 30%",
+             "new negative sentiment on a held asset", "* sentiment < -0.3"],
+            sinks=[StdoutSink(), WebhookSink(f"{stub.url}/webhook")]
+        )
+        engine.process_portfolio({"holdings": [
+            {"asset": "BTC", "value_usd": 7000, "allocation_percentage": 70.0},
+            {"asset": "ETH", "value_usd": 3000, "allocation_percentage": 30.0}
+        ]})
+        scan = {
+            "top_coins": [{"symbol": "btc", "current_price": 85000, "price_change_percentage_1h": -1.0},
+                          {"symbol": "eth", "current_price": 4500, "price_change_percentage_24h": 4.0}],
+            "warnings": []
+        }
+        engine.process_scan(scan)
+        scan["top_coins"][0]["price_change_percentage_1h"] = -6.2
+        scan["top_coins"][1]["price_change_percentage_24h"] = 12.5
+        scan["warnings"] = [{"type": "negative_sentiment", "coin": "BTC", "message": "Bear market incoming."}]
+        engine.process_scan(scan)
+        engine.process_scan(scan)   # nothing new: no alerts
+
+        print(json.dumps({"webhook_posts": len(stub.webhooks), "stats": engine.stats}, indent=4))
@@ -0,0 +1,536 @@
+#!/usr/bin/env python3
+"""
+Local API Stubs for Cash Daily Workflow
+
+This module runs a local HTTP server that stands in for the external APIs Cash uses:
+1. Binance-style endpoints with weight-based limits (X-MBX-USED-WEIGHT-1M)
+2. GitHub-style endpoints with request quotas (X-RateLimit-Remaining), including a paged
+   repository search that understands `topic:`, `stars:`, and `pushed:` qualifiers
+3. CoinGecko-style endpoints that answer conditional requests with 304
+4. Enforces the configured limits so throttling behaviour can be checked offline
+5. A webhook endpoint (POST /webhook) that records what alert sinks send
+
+Usage:
+    from api_stubs import LocalAPIStub
+    with LocalAPIStub(binance_limit=(40, 2)) as stub:
+        response = requests.get(f"{stub.url}/api/v3/ticker/price", params={"symbol": "BTCUSDT"})
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+logger = logging.getLogger("Cash.APIStubs")
+
+# Prices served by the Binance-style stub
+STUB_PRICES = {
+    "BTCUSDT": 85000.0,
+    "ETHUSDT": 4500.0,
+    "BNBUSDT": 750.0,
+    "SOLUSDT": 180.0,
+    "ADAUSDT": 1.2,
+    "DOTUSDT": 25.0
+}
+
+# Kline interval -> seconds for the Binance-style stub
+STUB_KLINE_INTERVALS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# Slow-changing documents served by the CoinGecko-style stub
+STUB_COINGECKO_DOCUMENTS = {
+    "/global": {
+        "data": {
+            "market_cap_change_percentage_24h_usd": 1.8,
+            "market_cap_percentage": {"btc": 54.1, "eth": 17.3},
+            "total_market_cap": {"usd": 2.9e12},
+            "total_volume": {"usd": 1.1e11}
+        }
+    },
+    "/search/trending": {
+        "coins": [
+            {"item": {"id": "solana", "name": "Solana", "symbol": "SOL", "market_cap_rank": 5, "price_btc": 0.0021, "score": 0}},
+            {"item": {"id": "pepe", "name": "Pepe", "symbol": "PEPE", "market_cap_rank": 30, "price_btc": 1.5e-10, "score": 1}},
+            {"item": {"id": "dogecoin", "name": "Dogecoin", "symbol": "DOGE", "market_cap_rank": 8, "price_btc": 2.1e-6, "score": 2}}
+        ]
+    }
+}
+
+# Repositories served by the GitHub-style /search/repositories stub
+STUB_GITHUB_REPOSITORIES = [
+    {
+        "full_name": "freqtrade/freqtrade",
+        "description": "Free, open source crypto trading bot",
+        "stargazers_count": 39000,
+        "forks_count": 7700,
+        "pushed_at": "2025-05-10T12:00:00Z",
+        "language": "Python",
+        "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "bitcoin", "altcoin"]
+    },
+    {
+        "full_name": "jesse-ai/jesse",
+        "description": "An advanced crypto trading bot written in Python",
+        "stargazers_count": 5200,
+        "forks_count": 950,
+        "pushed_at": "2025-05-09T18:30:00Z",
+        "language": "Python",
+        "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "backtesting"]
+    },
+    {
+        "full_name": "Drakkar-Software/OctoBot",
+        "description": "Cryptocurrency trading bot using technical analysis based strategies",
+        "stargazers_count": 2800,
+        "forks_count": 650,
+        "pushed_at": "2025-05-08T09:15:00Z",
+        "language": "Python",
+        "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "technical-analysis"]
+    },
+    {
+        "full_name": "hummingbot/hummingbot",
+        "description": "Hummingbot is open source software that helps you build trading bots that run on centralized and decentralized exchanges",
+        "stargazers_count": 6800,
+        "forks_count": 1900,
+        "pushed_at": "2025-05-10T15:45:00Z",
+        "language": "Python",
+        "topics": ["trading-bot", "market-making", "arbitrage", "cryptocurrency"]
+    },
+    {
+        "full_name": "DeviaVir/zenbot",
+        "description": "Zenbot is a command-line cryptocurrency trading bot using Node.js and MongoDB",
+        "stargazers_count": 8100,
+        "forks_count": 2200,
+        "pushed_at": "2025-05-07T22:10:00Z",
+        "language": "JavaScript",
+        "topics": ["trading-bot", "cryptocurrency", "bitcoin", "altcoin"]
+    },
+    {
+        "full_name": "askmike/gekko",
+        "description": "A bitcoin trading bot written in Node.js",
+        "stargazers_count": 9700,
+        "forks_count": 3100,
+        "pushed_at": "2025-05-05T14:20:00Z",
+        "language": "JavaScript",
+        "topics": ["trading-bot", "bitcoin", "cryptocurrency"]
+    },
+    {
+        "full_name": "kiridefi/DeFi_Trading_Bot",
+        "description": "Advanced DeFi trading bot with anti-bot bypass, P2P, and sniping capabilities",
+        "stargazers_count": 1200,
+        "forks_count": 350,
+        "pushed_at": "2025-05-09T20:30:00Z",
+        "language": "Python",
+        "topics": ["crypto-bot", "defi", "sniping-bot", "trading-bot"]
+    },
+    {
+        "full_name": "SherriMaxwell438/Crypto-Trading-Bot",
+        "description": "ML-driven crypto trading bot with beginner-friendly interface",
+        "stargazers_count": 850,
+        "forks_count": 210,
+        "pushed_at": "2025-05-08T11:45:00Z",
+        "language": "Python",
+        "topics": ["crypto-bot", "machine-learning", "trading-bot"]
+    },
+    {
+        "full_name": "botcrypto-io/awesome-crypto-trading-bots",
+        "description": "A curated list of awesome crypto trading bot frameworks, libraries, software and resources",
+        "stargazers_count": 3500,
+        "forks_count": 420,
+        "pushed_at": "2025-05-10T08:20:00Z",
+        "language": "Markdown",
+        "topics": ["awesome-list", "crypto-bot", "trading-bot", "cryptocurrency"]
+    }
+]
+
+# GitHub only returns the first 1000 results of a search
+GITHUB_SEARCH_MAX_RESULTS = 1000
+
+_QUALIFIER = re.compile(r"(\w+):(>=|<=|>|<)?(\S+)")
+
+
+class FixedWindowLimit:
+    """Fixed-window quota, the way Binance and GitHub count requests"""
+
+    def __init__(self, capacity, period):
+        """
+        Initialize the quota
+
+        Args:
+            capacity (int): Weight allowed per window
+            period (float): Window length in seconds
+        """
+        self.capacity = capacity
+        self.period = period
+        self.window = None
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def hit(self, weight=1):
+        """
+        Count a request against the current window
+
+        Args:
+            weight (int): Weight of the request
+
+        Returns:
+            tuple: (allowed, used weight, window reset as epoch seconds)
+        """
+        with self.lock:
+            now = time.time()
+            window = int(now // self.period)
+            if window != self.window:
+                self.window = window
+                self.used = 0
+
+            reset_at = (window + 1) * self.period
+            if self.used + weight > self.capacity:
+                return False, self.used, reset_at
+
+            self.used += weight
+            return True, self.used, reset_at
+
+
+class LocalAPIStub:
+    """Local HTTP server that imitates the external APIs used by Cash"""
+
+    def __init__(self, binance_limit=None, github_limit=None, coingecko_limit=None,
+                 coin_universe=10000, page_latency=0.0, github_topic_repos=0):
+        """
+        Initialize the stub
+
+        Args:
+            binance_limit (tuple): (weight, seconds) allowed on Binance-style endpoints
+            github_limit (tuple): (requests, seconds) allowed on GitHub-style endpoints
+            coingecko_limit (tuple): (requests, seconds) allowed on CoinGecko-style endpoints
+            coin_universe (int): Number of coins listed by /coins/markets
+            page_latency (float): Seconds to wait before answering each /coins/markets or
+                /search/repositories page
+            github_topic_repos (int): Synthetic repositories added to every searched topic
+        """
+        self.coin_universe = coin_universe
+        self.page_latency = page_latency
+        self.github_topic_repos = github_topic_repos
+        self.github_pushes = {}   # full name -> (pushed_at, stars) overrides set by push()
+        self.binance_limit = FixedWindowLimit(*binance_limit) if binance_limit else None
+        self.github_limit = FixedWindowLimit(*github_limit) if github_limit else None
+        self.coingecko_limit = FixedWindowLimit(*coingecko_limit) if coingecko_limit else None
+        self.rejections = {"binance": 0, "github": 0, "coingecko": 0}
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.webhooks = []
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+        self.url = None
+
+    def start(self):
+        """Start serving on a free local port"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub._dispatch(self)
+
+            def do_POST(self):
+                stub._receive(self)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        class Server(ThreadingHTTPServer):
+            # Room for many concurrent clients connecting at once (the default backlog is 5)
+            request_queue_size = 128
+
+        self.server = Server(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Local API stub listening on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop the server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _dispatch(self, handler):
+        """Route a request to the matching fake API"""
+        parsed = urlparse(handler.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+
+        with self.lock:
+            self.request_count += 1
+
+        if parsed.path.startswith("/api/v3/"):
+            status, headers, body = self._binance(parsed.path, query)
+        elif parsed.path in STUB_COINGECKO_DOCUMENTS or parsed.path.startswith("/coins/"):
+            status, headers, body = self._coingecko(parsed.path, query, handler.headers)
+        elif parsed.path.startswith("/search/") or parsed.path.startswith("/repos/"):
+            status, headers, body = self._github(parsed.path, query, handler.headers)
+        else:
+            status, headers, body = 404, {}, {"error": f"Unknown path {parsed.path}"}
+
+        payload = b"" if status == 304 else json.dumps(body).encode("utf-8")
+        if status == 304:
+            with self.lock:
+                self.not_modified_count += 1
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _receive(self, handler):
+        """Record a POST to /webhook"""
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        if urlparse(handler.path).path == "/webhook":
+            with self.lock:
+                self.request_count += 1
+                self.webhooks.append(json.loads(body or b"null"))
+            status, payload = 204, b""
+        else:
+            status, payload = 404, json.dumps({"error": f"Unknown path {handler.path}"}).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def _binance(self, path, query):
+        """Serve a Binance-style endpoint"""
+        headers = {}
+        if self.binance_limit:
+            allowed, used, reset_at = self.binance_limit.hit(2 if path.endswith(("/account", "/klines")) else 1)
+            headers["X-MBX-USED-WEIGHT-1M"] = str(used)
+            if not allowed:
+                with self.lock:
+                    self.rejections["binance"] += 1
+                headers["Retry-After"] = str(max(1, int(reset_at - time.time() + 0.999)))
+                return 429, headers, {"code": -1003, "msg": "Too many requests"}
+
+        if path == "/api/v3/ticker/price":
+            symbol = query.get("symbol")
+            if symbol:
+                return 200, headers, {"symbol": symbol, "price": str(STUB_PRICES.get(symbol, 0.0))}
+            return 200, headers, [{"symbol": s, "price": str(p)} for s, p in STUB_PRICES.items()]
+
+        if path == "/api/v3/klines":
+            return 200, headers, self._stub_klines(
+                query.get("symbol", "BTCUSDT"), query.get("interval", "1m"), min(int(query.get("limit", 500)), 1000)
+            )
+
+        return 404, headers, {"code": -1121, "msg": "Invalid endpoint"}
+
+    def _stub_klines(self, symbol, interval, limit):
+        """Build deterministic klines ending at the current period for a symbol"""
+        seconds = STUB_KLINE_INTERVALS.get(interval, 60)
+        end = int(time.time()) // seconds * seconds
+        base = STUB_PRICES.get(symbol, 1.0)
+        klines = []
+        for i in range(limit):
+            start = end - (limit - i) * seconds
+            open_price = base * (1 + 0.01 * ((i * 7) % 11 - 5) / 5)
+            close_price = base * (1 + 0.01 * (((i + 1) * 7) % 11 - 5) / 5)
+            klines.append([
+                start * 1000, f"{open_price:.8f}", f"{max(open_price, close_price) * 1.002:.8f}",
+                f"{min(open_price, close_price) * 0.998:.8f}", f"{close_price:.8f}", f"{100.0 + i % 17:.8f}",
+                (start + seconds) * 1000 - 1
+            ])
+        return klines
+
+    def _coingecko(self, path, query, request_headers):
+        """Serve a CoinGecko-style endpoint"""
+        headers = {}
+        if self.coingecko_limit:
+            allowed, _, reset_at = self.coingecko_limit.hit()
+            if not allowed:
+                with self.lock:
+                    self.rejections["coingecko"] += 1
+                headers["Retry-After"] = str(max(1, int(reset_at - time.time() + 0.999)))
+                return 429, headers, {"status": {"error_code": 429, "error_message": "Rate limit exceeded"}}
+
+        if path in STUB_COINGECKO_DOCUMENTS:
+            return self._conditional(STUB_COINGECKO_DOCUMENTS[path], request_headers, headers)
+
+        if path == "/coins/markets":
+            if self.page_latency:
+                time.sleep(self.page_latency)
+            per_page = min(int(query.get("per_page", 100)), 250)
+            page = max(1, int(query.get("page", 1)))
+            first = (page - 1) * per_page + 1
+            last = min(self.coin_universe, first + per_page - 1)
+            return 200, headers, [self._stub_market_row(rank) for rank in range(first, last + 1)]
+
+        return 404, headers, {"error": "Not Found"}
+
+    def _stub_market_row(self, rank):
+        """Build a deterministic /coins/markets row for the coin at a rank"""
+        price = round(50000.0 / rank, 8)
+        return {
+            "id": f"coin-{rank}",
+            "symbol": f"c{rank}",
+            "name": f"Coin {rank}",
+            "current_price": price,
+            "market_cap": round(1e12 / rank, 2),
+            "market_cap_rank": rank,
+            "total_volume": round(5e10 / rank, 2),
+            "price_change_percentage_24h": ((rank * 37) % 200 - 100) / 10.0,
+            "price_change_percentage_1h_in_currency": ((rank * 13) % 40 - 20) / 10.0,
+            "price_change_percentage_7d_in_currency": ((rank * 53) % 400 - 200) / 10.0
+        }
+
+    def _conditional(self, document, request_headers, headers):
+        """Answer with 304 when the client already holds the current ETag"""
+        etag = '"' + hashlib.sha1(json.dumps(document, sort_keys=True).encode("utf-8")).hexdigest()[:16] + '"'
+        headers["ETag"] = etag
+        if request_headers.get("If-None-Match") == etag:
+            return 304, headers, None
+        return 200, headers, document
+
+    def _github(self, path, query, request_headers):
+        """Serve a GitHub-style endpoint"""
+        headers = {}
+        if path.startswith("/repos/") or path == "/search/repositories":
+            # Conditional requests answered with 304 are not counted against the quota
+            if path == "/search/repositories":
+                status, body = self._search_repositories(query)
+            else:
+                status, body = 200, self._stub_repository(path[len("/repos/"):])
+            if status == 200:
+                status, headers, body = self._conditional(body, request_headers, headers)
+                if status == 304:
+                    return status, headers, body
+
+        if self.github_limit:
+            allowed, used, reset_at = self.github_limit.hit()
+            headers["X-RateLimit-Limit"] = str(self.github_limit.capacity)
+            headers["X-RateLimit-Remaining"] = str(max(0, self.github_limit.capacity - used))
+            headers["X-RateLimit-Reset"] = str(int(reset_at + 0.999))
+            if not allowed:
+                with self.lock:
+                    self.rejections["github"] += 1
+                headers["X-RateLimit-Remaining"] = "0"
+                return 403, headers, {"message": "API rate limit exceeded"}
+
+        if path.startswith("/repos/") or path == "/search/repositories":
+            return status, headers, body
+
+        return 404, headers, {"message": "Not Found"}
+
+    def push(self, full_name, stars=None):
+        """
+        Mark a stub repository as pushed now, optionally changing its star count
+
+        Args:
+            full_name (str): Repository full name
+            stars (int): New star count (unchanged if None)
+        """
+        with self.lock:
+            self.github_pushes[full_name] = (time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), stars)
+
+    def _search_repositories(self, query):
+        """Answer a repository search filtered by `topic:`, `stars:`, and `pushed:` qualifiers, sorted by stars"""
+        if self.page_latency:
+            time.sleep(self.page_latency)
+
+        topics = []
+        min_stars, max_stars = 0, float("inf")
+        pushed = []
+        for key, op, value in _QUALIFIER.findall(query.get("q", "")):
+            if key == "topic":
+                topics.append(value.lower())
+            elif key == "stars" and value.isdigit():
+                if op in (">=", ">"):
+                    min_stars = int(value) + (op == ">")
+                elif op in ("<=", "<"):
+                    max_stars = int(value) - (op == "<")
+                else:
+                    min_stars = max_stars = int(value)
+            elif key == "pushed":
+                pushed.append((op or ">=", value))
+
+        repos = list(STUB_GITHUB_REPOSITORIES)
+        for topic in topics:
+            repos.extend(self._stub_topic_repositories(topic))
+        with self.lock:
+            pushes = dict(self.github_pushes)
+        for position, repo in enumerate(repos):
+            if repo["full_name"] in pushes:
+                pushed_at, stars = pushes[repo["full_name"]]
+                repos[position] = {**repo, "pushed_at": pushed_at,
+                                   "stargazers_count": repo["stargazers_count"] if stars is None else stars}
+        repos = [
+            repo for repo in repos
+            if all(topic in repo["topics"] for topic in topics) and min_stars <= repo["stargazers_count"] <= max_stars
+            and all(self._compare(repo["pushed_at"][:len(value)], op, value) for op, value in pushed)
+        ]
+        repos.sort(key=lambda repo: -repo["stargazers_count"])
+
+        per_page = min(int(query.get("per_page", 30)), 100)
+        page = max(1, int(query.get("page", 1)))
+        first = (page - 1) * per_page
+        if first >= GITHUB_SEARCH_MAX_RESULTS:
+            return 422, {"message": "Only the first 1000 search results are available"}
+
+        items = [
+            {**repo, "html_url": f"https://github.com/{repo['full_name']}"}
+            for repo in repos[first:min(first + per_page, GITHUB_SEARCH_MAX_RESULTS)]
+        ]
+        return 200, {"total_count": len(repos), "incomplete_results": False, "items": items}
+
+    def _compare(self, left, op, right):
+        """Apply a search qualifier's comparison operator"""
+        return {">=": left >= right, ">": left > right, "<=": left <= right, "<": left < right}.get(op, left == right)
+
+    def _stub_topic_repositories(self, topic):
+        """Build deterministic extra repositories for a topic"""
+        return [
+            {
+                "full_name": f"{topic}-dev{i}/{topic}-{i}",
+                "description": f"Stub {topic} repository {i}",
+                "stargazers_count": 20000 // (i + 1),
+                "forks_count": 4000 // (i + 1),
+                "pushed_at": "2025-05-01T00:00:00Z",
+                "language": ["Python", "JavaScript", "Go", "Rust"][i % 4],
+                "topics": [topic]
+            }
+            for i in range(self.github_topic_repos)
+        ]
+
+    def _stub_repository(self, full_name):
+        """Build a deterministic repository document"""
+        return {
+            "full_name": full_name,
+            "html_url": f"https://github.com/{full_name}",
+            "description": f"Stub repository {full_name}",
+            "stargazers_count": 1000,
+            "forks_count": 100,
+            "language": "Python",
+            "pushed_at": "2025-05-10T12:00:00Z"
+        }
+
+
+if __name__ == "__main__":
+    # If run directly, serve the stub until interrupted
+    logging.basicConfig(level=logging.INFO)
+
+    with LocalAPIStub(binance_limit=(6000, 60), github_limit=(30, 60)) as stub:
+        print(f"Stub running at {stub.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
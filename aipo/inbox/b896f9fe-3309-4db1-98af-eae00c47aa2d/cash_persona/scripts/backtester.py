@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Backtester for Cash Daily Workflow
+
+This module checks playbook rules against history:
+1. Replays stored market scans (results/market_scan_*.json) as timed opportunity/warning events
+2. Applies the playbook's rules: enter on high-confidence opportunities, trim positions that
+   breach the portfolio concentration limit, exit on warnings or after a holding period
+3. Simulates fills with fees and slippage and reports returns, drawdown, and trades
+4. Runs the event loop only where the portfolio changes; marking to market and scanning for
+   concentration breaches between events is vectorized over (symbols, time) slices
+5. Offers a fully vectorized path for signal matrices (e.g. indicator rules) over years of bars
+
+Usage:
+    python backtester.py --history prices.npz --scans results
+    python backtester.py                       # synthetic demo
+
+    from backtester import Backtester, PriceHistory, load_scan_events
+    report = Backtester().run(PriceHistory.load("prices.npz"), load_scan_events("results"))
+"""
+
+import sys
+import json
+import heapq
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from market_scanner import trending_sources
+from scan_diff import ScanStore
+
+logger = logging.getLogger("Cash.Backtester")
+
+# Strategy rules (mirroring PlaybookGenerator and PortfolioTracker) and execution costs
+DEFAULT_STRATEGY = {
+    "initial_cash": 10000.0,
+    "confidence_threshold": 0.7,   # opportunities above this become entries
+    "min_sources": 2,              # sources a trending coin needs to count as an opportunity
+    "concentration_limit": 20.0,   # % of equity; larger positions are trimmed
+    "position_size": 10.0,         # % of equity per entry, and the trim target
+    "holding_bars": 1440,          # bars before a position is closed (0 = hold)
+    "exit_on_warning": True,       # close positions named in a warning
+    "fee_bps": 10.0,
+    "slippage_bps": 5.0,
+    "min_trade_usd": 10.0
+}
+
+# Event kinds, in the order they are applied within a bar
+EXIT, WARNING, REBALANCE, ENTRY = range(4)
+EVENT_NAMES = {EXIT: "holding_period", WARNING: "warning", REBALANCE: "rebalance", ENTRY: "entry"}
+
+
+class PriceHistory:
+    """Close prices for many symbols on a shared, regular time grid"""
+
+    def __init__(self, symbols, times, close, bar_seconds=None):
+        """
+        Initialize the history
+
+        Args:
+            symbols (list): Exchange symbols, one per row of `close`
+            times (np.ndarray): Bar start times in epoch seconds (ascending)
+            close (np.ndarray): (symbols, time) closes; may be a read-only memmap
+            bar_seconds (int): Bar length (inferred from `times` if None)
+        """
+        self.symbols = list(symbols)
+        self.times = np.asarray(times, dtype=float)
+        self.close = close
+        self.bar_seconds = bar_seconds or (float(np.median(np.diff(self.times[:1000]))) if len(self.times) > 1 else 60.0)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def from_aggregator(cls, aggregator, timeframe="1m"):
+        """Build a history from the closed bars of a BarAggregator"""
+        ring = aggregator.rings[aggregator.timeframes.index(timeframe)]
+        close = forward_fill(np.array(aggregator.matrix(timeframe, ring.capacity, "close")))
+        return cls(aggregator.symbol_list(), np.array(aggregator.times(timeframe, ring.capacity)), close, ring.seconds)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load a history saved with `save` (an .npz with symbols, times, close)
+
+        Args:
+            path (str or Path): .npz file, or a directory with symbols.json, times.npy, close.npy
+            mmap (bool): Memory-map close.npy from a directory instead of reading it
+
+        Returns:
+            PriceHistory: Loaded history
+        """
+        path = Path(path)
+        if path.is_dir():
+            with open(path / "symbols.json", 'r') as f:
+                symbols = json.load(f)
+            return cls(symbols, np.load(path / "times.npy"), np.load(path / "close.npy", mmap_mode="r" if mmap else None))
+        with np.load(path, allow_pickle=False) as saved:
+            return cls([str(symbol) for symbol in saved["symbols"]], saved["times"], saved["close"])
+
+    def save(self, path):
+        """Save to a directory (close.npy can then be memory-mapped) or an .npz file"""
+        path = Path(path)
+        if path.suffix == ".npz":
+            np.savez(path, symbols=np.array(self.symbols), times=self.times, close=self.close)
+            return
+        path.mkdir(exist_ok=True, parents=True)
+        with open(path / "symbols.json", 'w') as f:
+            json.dump(self.symbols, f)
+        np.save(path / "times.npy", self.times)
+        np.save(path / "close.npy", np.asarray(self.close))
+
+    def bar_at(self, timestamp):
+        """Index of the first bar starting at or after `timestamp` (len(times) if none)"""
+        return int(np.searchsorted(self.times, timestamp, side="left"))
+
+
+class Backtester:
+    """Replays scan events and price history through the playbook's trading rules"""
+
+    def __init__(self, strategy=None, chunk_bars=65536):
+        """
+        Initialize the backtester
+
+        Args:
+            strategy (dict): Strategy rules and costs (merged with DEFAULT_STRATEGY)
+            chunk_bars (int): Bars per vectorized block (bounds memory use)
+        """
+        self.strategy = dict(DEFAULT_STRATEGY, **(strategy or {}))
+        self.chunk_bars = chunk_bars
+
+    def run(self, history, events):
+        """
+        Run the event-driven backtest
+
+        Args:
+            history (PriceHistory): Forward-filled close prices
+            events (list): Scan events from `load_scan_events`
+
+        Returns:
+            dict: Report with returns, drawdown, trades, and the equity curve summary
+        """
+        s = self.strategy
+        close = history.close
+        n_symbols, n_bars = close.shape
+        queue = self._queue_events(history, events)
+
+        cash = float(s["initial_cash"])
+        units = np.zeros(n_symbols)
+        equity = np.empty(n_bars)
+        trades = []
+        fees = 0.0
+        bar = 0
+
+        while bar < n_bars:
+            next_bar = queue[0][0] if queue else n_bars
+
+            # Mark to market until the next event, stopping early at a concentration breach
+            held = np.flatnonzero(units)
+            end = next_bar
+            for start in range(bar, next_bar, self.chunk_bars):
+                stop = min(start + self.chunk_bars, next_bar)
+                values = units[held, None] * close[held, start:stop] if len(held) else np.zeros((0, stop - start))
+                curve = cash + values.sum(axis=0)
+                equity[start:stop] = curve
+                if len(held) and s["concentration_limit"]:
+                    breached = values.max(axis=0) > curve * s["concentration_limit"] / 100.0
+                    if breached.any():
+                        end = start + int(np.argmax(breached))
+                        heapq.heappush(queue, (end, REBALANCE, -1, 0.0))
+                        break
+            if end >= n_bars:
+                break
+
+            # Apply every event due at this bar (exits first, entries last)
+            bar = end
+            prices = close[:, bar]
+            while queue and queue[0][0] == bar:
+                _, kind, symbol, confidence = heapq.heappop(queue)
+                total = cash + float(units @ np.nan_to_num(prices))
+                orders = self._orders(kind, symbol, confidence, units, prices, total)
+                for order_symbol, delta_units in orders:
+                    cash, cost = self._fill(cash, units, order_symbol, delta_units, prices[order_symbol])
+                    fees += cost
+                    trades.append({
+                        "time": _iso(history.times[bar]),
+                        "symbol": history.symbols[order_symbol],
+                        "side": "buy" if delta_units > 0 else "sell",
+                        "units": round(abs(delta_units), 8),
+                        "price": float(prices[order_symbol]),
+                        "fee": round(cost, 4),
+                        "reason": EVENT_NAMES[kind]
+                    })
+                    if kind == ENTRY and s["holding_bars"]:
+                        heapq.heappush(queue, (bar + int(s["holding_bars"]), EXIT, order_symbol, 0.0))
+            equity[bar] = cash + float(units @ np.nan_to_num(prices))
+            bar += 1
+
+        report = summarize(equity, history.bar_seconds, s["initial_cash"])
+        report.update({
+            "trades": len(trades),
+            "fees_paid": round(fees, 2),
+            "events": len(events),
+            "trade_log": trades[-50:]
+        })
+        return report
+
+    def run_signals(self, history, entries, exits=None):
+        """
+        Vectorized backtest for signal matrices
+
+        Each entry signal holds an equal-weight position (`position_size`) for `holding_bars`
+        bars or until an exit signal; gross exposure is capped at 100%. Processed in blocks of
+        `chunk_bars`, so years of minute bars fit in memory.
+
+        Args:
+            history (PriceHistory): Forward-filled close prices
+            entries (np.ndarray): (symbols, time) boolean entry signals
+            exits (np.ndarray): (symbols, time) boolean exit signals (optional)
+
+        Returns:
+            dict: Report with returns, drawdown, and turnover
+        """
+        s = self.strategy
+        close = history.close
+        n_symbols, n_bars = close.shape
+        hold = int(s["holding_bars"]) or n_bars
+        cost_rate = (s["fee_bps"] + s["slippage_bps"]) / 10000.0
+        weight = s["position_size"] / 100.0
+
+        equity = np.empty(n_bars)
+        level = float(s["initial_cash"])
+        previous_weights = np.zeros(n_symbols)
+        previous_close = np.asarray(close[:, 0], dtype=float)
+        # Latest entry and exit bar per symbol, carried across blocks
+        carried_entry = np.full(n_symbols, -hold - 1, dtype=np.int64)
+        carried_exit = np.full(n_symbols, -hold - 1, dtype=np.int64)
+        turnover = 0.0
+
+        for start in range(0, n_bars, self.chunk_bars):
+            stop = min(start + self.chunk_bars, n_bars)
+            block = np.asarray(close[:, start:stop], dtype=float)
+            entry_block = np.asarray(entries[:, start:stop], dtype=bool)
+
+            # Most recent entry (and exit) at each bar, by carrying signal indices forward
+            steps = np.arange(start, stop)
+            last_entry = np.where(entry_block, steps, carried_entry[:, None])
+            np.maximum.accumulate(last_entry, axis=1, out=last_entry)
+            held = (steps - last_entry) < hold
+            if exits is not None:
+                last_exit = np.where(np.asarray(exits[:, start:stop], dtype=bool), steps, carried_exit[:, None])
+                np.maximum.accumulate(last_exit, axis=1, out=last_exit)
+                held &= last_exit < last_entry
+                carried_exit = last_exit[:, -1]
+            held &= np.isfinite(block)
+
+            weights = held * weight
+            weights = weights / np.maximum(weights.sum(axis=0), 1.0)
+
+            # Returns use the weights held over the previous bar
+            lagged = np.hstack([previous_weights[:, None], weights[:, :-1]])
+            prior = np.hstack([previous_close[:, None], block[:, :-1]])
+            with np.errstate(invalid="ignore", divide="ignore"):
+                returns = np.nan_to_num(block / prior - 1.0)
+            trade = np.abs(weights - lagged).sum(axis=0)
+            turnover += float(trade.sum())
+            growth = 1.0 + (lagged * returns).sum(axis=0) - trade * cost_rate
+            curve = level * np.cumprod(growth)
+            equity[start:stop] = curve
+
+            level = float(curve[-1])
+            previous_weights = weights[:, -1]
+            previous_close = np.where(np.isfinite(block[:, -1]), block[:, -1], previous_close)
+            carried_entry = last_entry[:, -1]
+
+        report = summarize(equity, history.bar_seconds, s["initial_cash"])
+        report["turnover"] = round(turnover, 2)
+        return report
+
+    def _queue_events(self, history, events):
+        """Turn scan events into a heap of (bar, kind, symbol row, confidence)"""
+        s = self.strategy
+        queue = []
+        skipped = 0
+        for event in events:
+            row = history.index.get(event["symbol"])
+            bar = history.bar_at(event["timestamp"])
+            if row is None or bar >= len(history.times):
+                skipped += 1
+                continue
+            if event["kind"] == "trending" and event["sources"] < s["min_sources"]:
+                continue
+            if event["kind"] in ("opportunity", "trending") and event.get("confidence", 0) > s["confidence_threshold"]:
+                queue.append((bar, ENTRY, row, event.get("confidence", 0)))
+            elif event["kind"] == "warning" and s["exit_on_warning"]:
+                queue.append((bar, WARNING, row, 0.0))
+        if skipped:
+            logger.info(f"Skipped {skipped} events for symbols or times outside the price history")
+        heapq.heapify(queue)
+        return queue
+
+    def _orders(self, kind, symbol, confidence, units, prices, total):
+        """Work out (symbol row, unit change) orders for an event"""
+        s = self.strategy
+        if kind in (EXIT, WARNING):
+            return [(symbol, -units[symbol])] if units[symbol] > 0 else []
+
+        if kind == REBALANCE:
+            values = units * np.nan_to_num(prices)
+            limit = total * s["concentration_limit"] / 100.0
+            target = total * min(s["position_size"], 0.9 * s["concentration_limit"]) / 100.0
+            return [
+                (row, -(values[row] - target) / prices[row])
+                for row in np.flatnonzero(values > limit)
+            ]
+
+        # Entry: open a position_size slice if not already holding
+        if units[symbol] > 0 or not np.isfinite(prices[symbol]) or prices[symbol] <= 0:
+            return []
+        cash = total - float(units @ np.nan_to_num(prices))
+        notional = min(total * s["position_size"] / 100.0, cash / (1 + (s["fee_bps"] + s["slippage_bps"]) / 10000.0))
+        if notional < s["min_trade_usd"]:
+            return []
+        return [(symbol, notional / prices[symbol])]
+
+    def _fill(self, cash, units, symbol, delta_units, price):
+        """Execute an order with slippage and fees, returning (cash, fee)"""
+        s = self.strategy
+        slip = s["slippage_bps"] / 10000.0
+        fill_price = price * (1 + slip) if delta_units > 0 else price * (1 - slip)
+        notional = abs(delta_units) * fill_price
+        fee = notional * s["fee_bps"] / 10000.0
+        units[symbol] += delta_units
+        if abs(units[symbol]) < 1e-12:
+            units[symbol] = 0.0
+        cash += -notional - fee if delta_units > 0 else notional - fee
+        return cash, fee
+
+
+def load_scan_events(results_dir):
+    """
+    Read stored market scans into timed events
+
+    Trending coins are re-scored from the scan's sources (rather than taking the stored
+    trending_coin opportunities) so `min_sources` can be varied in a backtest.
+
+    Args:
+        results_dir (str or Path): Directory holding market scans (keyframes and deltas)
+
+    Returns:
+        list: {"timestamp", "kind", "symbol", "type", "confidence"} dicts (trending events
+        also carry "sources"), oldest first
+    """
+    events = []
+    for path, scan in ScanStore(results_dir).iter_scans():
+        try:
+            timestamp = datetime.fromisoformat(scan["timestamp"]).timestamp()
+        except Exception as e:
+            logger.warning(f"Skipping unreadable scan {path}: {str(e)}")
+            continue
+        for coin in scan.get("trending_coins", []):
+            if not coin.get("symbol"):
+                continue
+            sources = len(trending_sources(scan, coin))
+            events.append({
+                "timestamp": timestamp,
+                "kind": "trending",
+                "symbol": f"{coin['symbol'].upper()}USDT",
+                "type": "trending_coin",
+                "sources": sources,
+                "confidence": sources / 4.0
+            })
+        for kind, key in (("opportunity", "opportunities"), ("warning", "warnings")):
+            for item in scan.get(key, []):
+                symbol = item.get("symbol") or item.get("coin")
+                if not symbol or item.get("type") == "trending_coin":
+                    continue
+                events.append({
+                    "timestamp": timestamp,
+                    "kind": kind,
+                    "symbol": f"{symbol.upper()}USDT",
+                    "type": item.get("type"),
+                    "confidence": item.get("confidence", 0)
+                })
+    events.sort(key=lambda event: event["timestamp"])
+    return events
+
+
+def forward_fill(close):
+    """Carry the last known price forward through NaN gaps (per row, vectorized)"""
+    valid = np.isfinite(close)
+    index = np.where(valid, np.arange(close.shape[1]), 0)
+    np.maximum.accumulate(index, axis=1, out=index)
+    filled = close[np.arange(close.shape[0])[:, None], index]
+    return np.where(valid | (np.cumsum(valid, axis=1) > 0), filled, np.nan)
+
+
+def summarize(equity, bar_seconds, initial_cash):
+    """
+    Summarize an equity curve
+
+    Args:
+        equity (np.ndarray): Equity per bar
+        bar_seconds (float): Bar length in seconds
+        initial_cash (float): Starting equity
+
+    Returns:
+        dict: Return, drawdown, and risk statistics
+    """
+    peak = np.maximum.accumulate(np.maximum(equity, initial_cash))
+    drawdown = equity / peak - 1.0
+    returns = np.diff(equity, prepend=initial_cash) / np.concatenate([[initial_cash], equity[:-1]])
+    bars_per_year = 365 * 86400 / bar_seconds
+    years = len(equity) / bars_per_year
+    final = float(equity[-1])
+    std = float(returns.std())
+    return {
+        "bars": len(equity),
+        "final_equity": round(final, 2),
+        "total_return_pct": round((final / initial_cash - 1) * 100, 3),
+        "annualized_return_pct": round(((final / initial_cash) ** (1 / years) - 1) * 100, 3) if years > 0 and final > 0 else None,
+        "max_drawdown_pct": round(float(drawdown.min()) * 100, 3),
+        "sharpe": round(float(returns.mean()) / std * np.sqrt(bars_per_year), 3) if std > 0 else None
+    }
+
+
+def synthetic_history(n_symbols=50, n_bars=43200, bar_seconds=60, start_time=1_700_000_000, seed=5, dtype=np.float64):
+    """Random-walk price history for demos and benchmarks"""
+    rng = np.random.default_rng(seed)
+    close = np.empty((n_symbols, n_bars), dtype=dtype)
+    level = np.log(10.0 + rng.random(n_symbols) * 100.0)
+    for start in range(0, n_bars, 65536):
+        stop = min(start + 65536, n_bars)
+        steps = rng.normal(0.0, 0.001, (n_symbols, stop - start))
+        block = level[:, None] + np.cumsum(steps, axis=1)
+        close[:, start:stop] = np.exp(block)
+        level = block[:, -1]
+    times = start_time + np.arange(n_bars) * bar_seconds
+    return PriceHistory([f"C{i}USDT" for i in range(n_symbols)], times, close, bar_seconds)
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(float(timestamp)).isoformat()
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Cash Backtester")
+    parser.add_argument("--history", help="Price history (.npz or directory from PriceHistory.save)")
+    parser.add_argument("--scans", default=str(Path(__file__).parent / "results"), help="Directory of stored market scans")
+    parser.add_argument("--strategy", help="JSON object overriding DEFAULT_STRATEGY")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    backtester = Backtester(json.loads(args.strategy) if args.strategy else None)
+
+    if args.history:
+        history = PriceHistory.load(args.history)
+        events = load_scan_events(args.scans)
+    else:
+        # Synthetic demo: a month of minute bars and a scan every six hours
+        history = synthetic_history()
+        rng = np.random.default_rng(9)
+        events = [
+            {
+                "timestamp": float(history.times[bar]),
+                "kind": "opportunity" if rng.random() < 0.7 else "warning",
+                "symbol": history.symbols[int(rng.integers(len(history.symbols)))],
+                "confidence": float(rng.random())
+            }
+            for bar in range(0, len(history.times), 360)
+            for _ in range(3)
+        ]
+
+    report = backtester.run(history, events)
+    report["trade_log"] = report["trade_log"][-5:]
+    print(json.dumps(report, indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,801 @@
+#!/usr/bin/env python3
+"""
+Cash Benchmarks
+
+This script measures the performance of Cash's workflow components against local stubs:
+1. Top-coins fetch: sequential vs concurrent pagination of /coins/markets
+2. Indicators: full recompute vs incremental update for the whole coin universe
+3. Backtest: event-driven and vectorized runs over a year of minute bars
+4. Sentiment: posts scored per minute, in-process and across a process pool
+5. Tickers: characters tagged per second and incremental rebuild time for a large coin universe
+6. Dedup: feed items deduplicated per second against a windowed near-duplicate index
+7. Alerts: per-update latency with 10k compiled rules, for one symbol and for a full scan
+8. Bot search: sequential vs concurrent paged GitHub topic searches against the local stub
+9. Bot catalog: a full hunt that fills the repository catalog vs the next, incremental hunt
+10. Repo scan: static analysis throughput over tarball fixtures, and a re-run served from the cache
+11. Vuln match: repositories' declared dependencies matched per second against the advisory index
+12. Top-K: full sort vs streaming heap selection of top picks from a large catalog, one key and three
+13. Scoring: per-repository Python scoring vs the vectorized scoring model, and what-if rescoring
+14. Startup: `python -X importtime` cost of importing cash_daily vs every workflow module, and
+    `cash_daily.py --help` wall time
+15. Logging: time worker threads spend in logger calls with a synchronous file handler vs the
+    queue-based pipeline, and sampled DEBUG volume
+16. Checkpoints: a full run whose last stage fails vs resuming it, and the cost of checkpointing a
+    market-scan-sized stage output
+
+Usage:
+    python benchmarks.py [--only top_coins|indicators|backtest|sentiment|tickers|dedup|alerts|bot_search|bot_catalog|repo_scan|vuln_match|top_k|scoring|startup|logging|checkpoints]
+"""
+
+import sys
+import json
+import time
+import argparse
+import logging
+
+# Setup logging
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("Cash.Benchmarks")
+
+def bench_top_coins(top_coins=5000, page_latency=0.2, workers=8):
+    """Benchmark paginated top-coins fetch against the local paging stub"""
+    from api_stubs import LocalAPIStub
+    from market_scanner import MarketScanner
+    from rate_limiter import RequestScheduler
+
+    results = {"top_coins": top_coins, "page_latency": page_latency}
+
+    with LocalAPIStub(coin_universe=top_coins, page_latency=page_latency) as stub:
+        for label, page_workers in [("sequential", 1), ("concurrent", workers)]:
+            scheduler = RequestScheduler({"coingecko": {"capacity": 500, "period": 60}})
+            scanner = MarketScanner(
+                {"top_coins": top_coins, "page_workers": page_workers, "coingecko_api_url": stub.url},
+                {},
+                scheduler=scheduler
+            )
+
+            start_time = time.perf_counter()
+            coins = scanner._fetch_top_coins(top_coins)
+            elapsed = time.perf_counter() - start_time
+
+            ranks = [coin["market_cap_rank"] for coin in coins]
+            results[label] = {
+                "workers": page_workers,
+                "seconds": round(elapsed, 3),
+                "coins": len(coins),
+                "ordered": ranks == sorted(ranks)
+            }
+
+    results["speedup"] = round(results["sequential"]["seconds"] / results["concurrent"]["seconds"], 2)
+    return results
+
+def bench_indicators(coins=2500, minutes=300, seed=11):
+    """Benchmark indicator updates per closed minute bar: full recompute vs incremental"""
+    import numpy as np
+    from ohlcv import BarAggregator
+    from indicators import IndicatorEngine
+
+    rng = np.random.default_rng(seed)
+    symbols = [f"C{i}USDT" for i in range(coins)]
+    prices = 10.0 + rng.random(coins) * 100.0
+    aggregator = BarAggregator({"1m": (60, 240)}, max_symbols=coins)
+    incremental = IndicatorEngine()
+
+    start = 1_700_000_000
+    incremental_seconds = []
+    for minute in range(minutes):
+        prices *= 1.0 + rng.normal(0, 0.002, coins)
+        aggregator.add_ticks(symbols, prices, rng.gamma(2.0, 50.0, coins), start + minute * 60)
+        start_time = time.perf_counter()
+        incremental.update(aggregator, "1m")
+        incremental_seconds.append(time.perf_counter() - start_time)
+
+    full_seconds = []
+    for _ in range(5):
+        start_time = time.perf_counter()
+        IndicatorEngine().update(aggregator, "1m")
+        full_seconds.append(time.perf_counter() - start_time)
+
+    steady = sorted(incremental_seconds[minutes // 2:])
+    full = sorted(full_seconds)[len(full_seconds) // 2]
+    return {
+        "coins": coins,
+        "minutes": minutes,
+        "full_recompute_ms": round(full * 1000, 3),
+        "incremental_ms": round(steady[len(steady) // 2] * 1000, 3),
+        "speedup": round(full / steady[len(steady) // 2], 1)
+    }
+
+def bench_backtest(symbols=200, days=365, scans_per_day=4, seed=5):
+    """Benchmark the backtester on synthetic minute bars (float32 to bound memory)"""
+    import numpy as np
+    from backtester import Backtester, synthetic_history
+
+    start_time = time.perf_counter()
+    history = synthetic_history(symbols, days * 1440, dtype=np.float32, seed=seed)
+    generate_seconds = time.perf_counter() - start_time
+
+    rng = np.random.default_rng(seed)
+    step = 1440 // scans_per_day
+    events = [
+        {
+            "timestamp": float(history.times[bar]),
+            "kind": "opportunity" if rng.random() < 0.7 else "warning",
+            "symbol": history.symbols[int(rng.integers(symbols))],
+            "confidence": float(rng.random())
+        }
+        for bar in range(0, len(history.times), step)
+        for _ in range(5)
+    ]
+    backtester = Backtester()
+
+    start_time = time.perf_counter()
+    event_report = backtester.run(history, events)
+    event_seconds = time.perf_counter() - start_time
+
+    entries = np.zeros(history.close.shape, dtype=bool)
+    entries[:, ::step] = rng.random((symbols, len(range(0, len(history.times), step)))) < 0.05
+    start_time = time.perf_counter()
+    signal_report = backtester.run_signals(history, entries)
+    signal_seconds = time.perf_counter() - start_time
+
+    return {
+        "symbols": symbols,
+        "bars": len(history.times),
+        "generate_seconds": round(generate_seconds, 2),
+        "event_driven": {"seconds": round(event_seconds, 2), "events": len(events), "trades": event_report["trades"],
+                         "total_return_pct": event_report["total_return_pct"]},
+        "vectorized": {"seconds": round(signal_seconds, 2), "total_return_pct": signal_report["total_return_pct"]}
+    }
+
+def bench_sentiment(posts=100000, seed=3):
+    """Benchmark sentiment scoring throughput on synthetic posts"""
+    import random
+    from sentiment import SentimentScorer, LEXICON
+
+    rng = random.Random(seed)
+    vocabulary = list(LEXICON) + ["the", "a", "is", "not", "very", "btc", "eth", "$sol", "🚀", "market"] * 20
+    texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 40))) for _ in range(posts)]
+
+    results = {"posts": posts}
+    for label, scorer in [("single_process", SentimentScorer(workers=1)), ("process_pool", SentimentScorer())]:
+        start_time = time.perf_counter()
+        scorer.score_many(texts)
+        elapsed = time.perf_counter() - start_time
+        results[label] = {
+            "workers": scorer.workers,
+            "seconds": round(elapsed, 3),
+            "posts_per_minute": int(posts / elapsed * 60)
+        }
+    return results
+
+def bench_tickers(coins=10000, posts=50000, seed=13):
+    """Benchmark ticker extraction throughput and incremental rebuilds"""
+    import random
+    from ticker_extractor import TickerExtractor
+
+    rng = random.Random(seed)
+    universe = [{"symbol": f"c{i}x", "name": f"Coin {i} Protocol"} for i in range(coins)]
+    universe[:4] = [{"symbol": "btc", "name": "Bitcoin"}, {"symbol": "eth", "name": "Ethereum"},
+                    {"symbol": "sol", "name": "Solana"}, {"symbol": "one", "name": "Harmony"}]
+    vocabulary = ["the", "market", "is", "up", "today", "and", "we", "are", "bullish", "on", "fees",
+                  "bitcoin", "$SOL", "eth", "one", "$ONE", "c42x", "coin", "protocol", "news", "🚀"]
+    texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 60))) for _ in range(posts)]
+    characters = sum(len(text) for text in texts)
+
+    start_time = time.perf_counter()
+    extractor = TickerExtractor(universe)
+    extractor.extract("")
+    build = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    mentions = sum(len(symbols) for symbols in extractor.extract_many(texts))
+    elapsed = time.perf_counter() - start_time
+
+    # A typical scan-to-scan change: a few coins drop out of the universe and a few join
+    start_time = time.perf_counter()
+    change = extractor.update(universe[:-20] + [{"symbol": f"n{i}x", "name": f"New {i}"} for i in range(20)])
+    extractor.extract("")
+    rebuild = time.perf_counter() - start_time
+
+    return {
+        "patterns": extractor.stats["patterns"],
+        "characters": characters,
+        "mentions": mentions,
+        "build_ms": round(build * 1000, 1),
+        "chars_per_second": int(characters / elapsed),
+        "incremental_update": change,
+        "rebuild_ms": round(rebuild * 1000, 1)
+    }
+
+def bench_dedup(items=200000, stories=40000, batch_size=5000, seed=17):
+    """Benchmark streaming near-duplicate detection on reposted synthetic stories"""
+    import random
+    from dedup import DedupIndex
+
+    rng = random.Random(seed)
+    vocabulary = ["bitcoin", "ethereum", "solana", "etf", "approved", "sec", "bank", "adds", "market",
+                  "rally", "crash", "whales", "buying", "selling", "regulation", "exchange", "upgrade",
+                  "network", "fees", "record", "high", "low", "today", "breaking", "analyst", "says"]
+    texts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(10, 30))) for _ in range(stories)]
+    stream = []
+    for i in range(items):
+        text = rng.choice(texts)
+        if rng.random() < 0.3:
+            text = rng.choice(["BREAKING: ", "RT ", ""]) + text + rng.choice([" 🚀", " via @news", " https://t.co/x"])
+        stream.append({"title": text, "source": rng.choice(["reddit", "twitter", "news"]), "url": f"https://example.com/{i}"})
+
+    index = DedupIndex(window_seconds=3600, max_items=50000)
+    start_time = time.perf_counter()
+    kept = 0
+    for offset in range(0, items, batch_size):
+        kept += len(index.dedup(stream[offset:offset + batch_size], timestamp=offset / 50.0))
+    elapsed = time.perf_counter() - start_time
+
+    return {
+        "items": items,
+        "kept": kept,
+        "stats": index.stats,
+        "indexed": len(index),
+        "items_per_second": int(items / elapsed)
+    }
+
+def bench_alerts(rules=10000, coins=2500, updates=2000, seed=19):
+    """Benchmark alert evaluation latency against a large rule set"""
+    import random
+    from alerts import AlertEngine
+
+    rng = random.Random(seed)
+    symbols = [f"C{i}" for i in range(coins)]
+    metrics = ["price_change_1h", "price_change_24h", "price", "volume", "sentiment"]
+    specs = []
+    for i in range(rules):
+        symbol = rng.choice(symbols) if i % 100 else rng.choice(["*", "held"])
+        specs.append({"name": f"rule-{i}", "symbol": symbol, "metric": rng.choice(metrics),
+                      "op": rng.choice([">", ">=", "<", "<="]), "value": rng.uniform(-20, 20)})
+    specs += [{"name": f"event-{i}", "event": "negative_sentiment", "symbol": rng.choice(symbols)} for i in range(100)]
+
+    start_time = time.perf_counter()
+    engine = AlertEngine(specs)
+    compile_ms = (time.perf_counter() - start_time) * 1000
+
+    # Values drift in small steps between updates, the way prices and percentages move
+    values = {symbol: {metric: rng.uniform(-20, 20) for metric in metrics} for symbol in symbols}
+
+    def step(symbol):
+        for metric in metrics:
+            values[symbol][metric] += rng.gauss(0, 0.5)
+        return dict(values[symbol])
+
+    engine.update({symbol: dict(values[symbol]) for symbol in symbols}, held=set(symbols[:20]))
+
+    # Single-symbol updates, as a price tick would produce
+    latencies = []
+    for _ in range(updates):
+        symbol = rng.choice(symbols)
+        facts = {symbol: step(symbol)}
+        start_time = time.perf_counter()
+        engine.update(facts, source="tick")
+        latencies.append(time.perf_counter() - start_time)
+    latencies.sort()
+
+    # Whole scans: every value of every coin changes
+    scans = [{symbol: step(symbol) for symbol in symbols} for _ in range(5)]
+    start_time = time.perf_counter()
+    for facts in scans:
+        engine.update(facts)
+    scan_ms = (time.perf_counter() - start_time) * 1000 / len(scans)
+
+    return {
+        "rules": len(engine.rules),
+        "compile_ms": round(compile_ms, 1),
+        "symbol_update_p50_ms": round(latencies[len(latencies) // 2] * 1000, 4),
+        "symbol_update_p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 4),
+        "full_scan_update_ms": round(scan_ms, 2),
+        "values_per_scan": coins * len(metrics),
+        "alerts": engine.stats["alerts"]
+    }
+
+def bench_bot_search(topics=24, repos_per_topic=250, page_latency=0.1, workers=24):
+    """Benchmark GitHub topic searches: one topic at a time vs all topics concurrently"""
+    from api_stubs import LocalAPIStub
+    from bot_hunter import BotHunter
+    from rate_limiter import RequestScheduler
+
+    results = {"topics": topics, "repos_per_topic": repos_per_topic, "page_latency": page_latency}
+
+    with LocalAPIStub(github_topic_repos=repos_per_topic, page_latency=page_latency) as stub:
+        for label, search_workers in [("sequential", 1), ("concurrent", workers)]:
+            hunter = BotHunter(
+                {
+                    "github_topics": [f"bench-topic-{i}" for i in range(topics)],
+                    "min_stars": 100,
+                    "max_pages": 3,
+                    "search_workers": search_workers,
+                    "github_api_url": stub.url
+                },
+                scheduler=RequestScheduler({"github_search": {"capacity": 1000, "period": 60}})
+            )
+
+            start_time = time.perf_counter()
+            hunter._search_github()
+            elapsed = time.perf_counter() - start_time
+
+            results[label] = {
+                "workers": search_workers,
+                "seconds": round(elapsed, 3),
+                "pages": sum(search["pages"] for search in hunter.results["searches"].values()),
+                "repositories": len(hunter.results["repositories"])
+            }
+
+    results["speedup"] = round(results["sequential"]["seconds"] / results["concurrent"]["seconds"], 2)
+    return results
+
+def bench_bot_catalog(topics=24, repos_per_topic=1000, pushed=50, page_latency=0.05):
+    """Benchmark an incremental bot hunt against a catalog of tens of thousands of repositories"""
+    import tempfile
+    from pathlib import Path
+    from api_stubs import LocalAPIStub
+    from bot_hunter import BotHunter
+    from repo_catalog import RepoCatalog
+    from rate_limiter import RequestScheduler
+
+    results = {"topics": topics, "repos_per_topic": repos_per_topic, "pushed_between_hunts": pushed}
+    config_topics = [f"bench-topic-{i}" for i in range(topics)]
+
+    with tempfile.TemporaryDirectory() as catalog_dir, \
+            LocalAPIStub(github_topic_repos=repos_per_topic, page_latency=page_latency) as stub:
+        catalog_path = Path(catalog_dir) / "repo_catalog.json"
+        for label in ["full", "incremental"]:
+            if label == "incremental":
+                for i in range(pushed):
+                    topic = config_topics[i % topics]
+                    stub.push(f"{topic}-dev{i}/{topic}-{i}", stars=30000 + i)
+
+            requests_before = stub.request_count
+            start_time = time.perf_counter()
+            catalog = RepoCatalog.load(catalog_path)
+            hunter = BotHunter(
+                {"github_topics": config_topics, "min_stars": 10, "max_pages": 10, "github_api_url": stub.url},
+                scheduler=RequestScheduler({"github_search": {"capacity": 1000, "period": 60}}),
+                catalog=catalog
+            )
+            hunt = hunter.hunt()
+            catalog.save(catalog_path)
+            elapsed = time.perf_counter() - start_time
+
+            results[label] = {
+                "seconds": round(elapsed, 3),
+                "requests": stub.request_count - requests_before,
+                "fetched": hunt["catalog"]["fetched"],
+                "analyzed": hunt["catalog"]["analyzed"],
+                "catalog": len(catalog)
+            }
+
+    results["speedup"] = round(results["full"]["seconds"] / results["incremental"]["seconds"], 2)
+    return results
+
+def bench_repo_scan(repos=60, files_per_repo=150, workers=None, seed=23):
+    """Benchmark the static analysis pipeline over synthetic repository fixtures"""
+    import random
+    import tempfile
+    from pathlib import Path
+    from repo_scanner import RepoScanner, write_fixture
+
+    rng = random.Random(seed)
+    words = ["price", "order", "symbol", "balance", "exchange", "signal", "position", "strategy", "risk", "fee"]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        fixtures_dir = Path(work_dir) / "fixtures"
+        names = [f"bench-owner-{i}/bot-{i}" for i in range(repos)]
+        for i, name in enumerate(names):
+            files = {
+                f"src/module_{j}.py": "\n".join(
+                    f"def {rng.choice(words)}_{k}(x):\n    return x * {rng.random():.4f}  # {' '.join(rng.choices(words, k=8))}"
+                    for k in range(40)
+                )
+                for j in range(files_per_repo)
+            }
+            files["requirements.txt"] = "\n".join(rng.sample(words, 5))
+            if i % 5 == 0:
+                files["tests/test_bot.py"] = "def test_bot():\n    assert True\n"
+            if i % 7 == 0:
+                files["src/config.py"] = "API_KEY = '" + "x" * 32 + "'\nexec(base64.b64decode('aGk='))\n"
+            write_fixture(fixtures_dir, name, files)
+
+        scanner = RepoScanner(Path(work_dir) / "scratch", cache_path=Path(work_dir) / "scans.json",
+                              fixtures_dir=fixtures_dir, clone=False, workers=workers)
+        repositories = [{"name": name} for name in names]
+
+        start_time = time.perf_counter()
+        scans = scanner.scan_many(repositories)
+        first_seconds = time.perf_counter() - start_time
+        scanned_bytes = sum(scan.get("bytes", 0) for scan in scans.values())
+
+        start_time = time.perf_counter()
+        scanner.scan_many(repositories)
+        cached_seconds = time.perf_counter() - start_time
+
+    return {
+        "repos": repos,
+        "files": repos * files_per_repo,
+        "workers": scanner.workers,
+        "scan_seconds": round(first_seconds, 3),
+        "repos_per_second": round(repos / first_seconds, 1),
+        "mb_per_second": round(scanned_bytes / first_seconds / 1e6, 2),
+        "flagged": sum(1 for scan in scans.values() if scan.get("security_score", 100) < 60),
+        "cached_rerun_seconds": round(cached_seconds, 3),
+        "cached_stats": scanner.stats
+    }
+
+def bench_vuln_match(repos=5000, deps_per_repo=30, packages=3000, advisories_per_package=4, seed=29):
+    """Benchmark matching repositories' dependencies against a large advisory index"""
+    import random
+    from pathlib import Path
+    from vuln_matcher import AdvisoryIndex
+
+    rng = random.Random(seed)
+
+    def version():
+        return f"{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 30)}"
+
+    # The bundled database plus synthetic advisories for a few thousand packages
+    with open(Path(__file__).parent / "advisories.json", 'r') as f:
+        advisories = json.load(f)["advisories"]
+    names = [(rng.choice(["npm", "PyPI"]), f"bench-pkg-{i}") for i in range(packages)]
+    for ecosystem, name in names:
+        for j in range(advisories_per_package):
+            introduced = version()
+            advisories.append({
+                "id": f"BENCH-{name}-{j}",
+                "ecosystem": ecosystem,
+                "package": name,
+                "severity": rng.choice(["low", "moderate", "high", "critical"]),
+                "ranges": [{"introduced": introduced, "fixed": f"{int(introduced.split('.')[0]) + 1}.0.0"}]
+            })
+
+    start_time = time.perf_counter()
+    index = AdvisoryIndex(advisories)
+    index_seconds = time.perf_counter() - start_time
+
+    # Half the declarations name an indexed package; the rest are unknown to the database
+    specs = {"npm": ["{}", "^{}", "~{}", ">={}"], "PyPI": ["=={}", ">={}", "~={}", ">={},<9.0"]}
+    manifests = []
+    for _ in range(repos):
+        dependencies = []
+        for _ in range(deps_per_repo):
+            ecosystem, name = rng.choice(names) if rng.random() < 0.5 else ("PyPI", f"unlisted-{rng.randint(0, 10**6)}")
+            dependencies.append({"ecosystem": ecosystem, "name": name, "spec": rng.choice(specs[ecosystem]).format(version()),
+                                 "source": "package.json" if ecosystem == "npm" else "requirements.txt"})
+        manifests.append(dependencies)
+
+    start_time = time.perf_counter()
+    findings = [index.match_dependencies(dependencies) for dependencies in manifests]
+    match_seconds = time.perf_counter() - start_time
+
+    return {
+        "advisories": index.count,
+        "repos": repos,
+        "dependencies": repos * deps_per_repo,
+        "index_seconds": round(index_seconds, 3),
+        "match_seconds": round(match_seconds, 3),
+        "repos_per_second": round(repos / match_seconds, 1),
+        "findings": sum(len(found) for found in findings),
+        "repos_flagged": sum(1 for found in findings if found)
+    }
+
+def bench_top_k(repos=200000, k=10, seed=31):
+    """Benchmark streaming top-k selection against sorting a whole catalog"""
+    import random
+    from repo_catalog import RepoCatalog
+    from topk import top_k, rank_many
+
+    rng = random.Random(seed)
+    catalog = RepoCatalog()
+    for i in range(repos):
+        catalog.repos[f"bench-owner-{i}/bot-{i}"] = {
+            "name": f"bench-owner-{i}/bot-{i}",
+            "stars": rng.randint(100, 50000),
+            "forks": rng.randint(0, 5000),
+            "matched_topics": ["trading-bot"],
+            "scores": {"overall": round(rng.uniform(0, 100), 1)}
+        }
+    overall = lambda repo: repo["scores"]["overall"]
+    stars = lambda repo: repo["stars"]
+    forks = lambda repo: repo["forks"]
+
+    start_time = time.perf_counter()
+    sorted_picks = sorted(list(catalog.repositories(["trading-bot"], 100)), key=overall, reverse=True)[:k]
+    sort_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    picks = top_k(catalog.repositories(["trading-bot"], 100), k, key=overall)
+    top_k_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    entries = list(catalog.repositories(["trading-bot"], 100))
+    sorted_rankings = {name: sorted(entries, key=key, reverse=True)[:k] for name, key in
+                       [("overall", overall), ("stars", stars), ("forks", forks)]}
+    sort_three_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    rankings = rank_many(catalog.repositories(["trading-bot"], 100),
+                         {"overall": (k, overall), "stars": (k, stars), "forks": (k, forks)})
+    rank_many_seconds = time.perf_counter() - start_time
+
+    return {
+        "repos": repos,
+        "k": k,
+        "sort_seconds": round(sort_seconds, 3),
+        "top_k_seconds": round(top_k_seconds, 3),
+        "sort_three_keys_seconds": round(sort_three_seconds, 3),
+        "rank_many_seconds": round(rank_many_seconds, 3),
+        "same_results": picks == sorted_picks and rankings == sorted_rankings
+    }
+
+def bench_scoring(repos=100000, what_ifs=10, seed=37):
+    """Benchmark the vectorized scoring model over a large catalog"""
+    import random
+    from scoring_model import ScoringModel
+
+    rng = random.Random(seed)
+    now = time.time()
+    repositories = [{
+        "name": f"bench-owner-{i}/bot-{i}",
+        "stars": int(rng.paretovariate(1.2) * 100),
+        "forks": rng.randint(0, 2000),
+        "last_updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - rng.uniform(0, 720) * 86400))
+    } for i in range(repos)]
+
+    # The per-repository arithmetic the bot hunter used before the scoring model
+    start_time = time.perf_counter()
+    for repo in repositories:
+        activity = min(100, repo.get("stars", 0) / 100)
+        quality = min(100, (repo.get("stars", 0) / 100) * 0.7 + (repo.get("forks", 0) / 50) * 0.3)
+        repo["scores"] = {"activity": activity, "security": 80, "quality": quality,
+                          "overall": (activity + 80 + quality) / 3}
+    loop_seconds = time.perf_counter() - start_time
+
+    model = ScoringModel()
+    start_time = time.perf_counter()
+    model.apply(repositories, now=now)
+    apply_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    features = model.features(repositories, now=now)
+    features_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for i in range(what_ifs):
+        model.with_changes({"activity.recency.scale": 7 + i * 7, "overall.security": 1 + i / 10}).score(features)
+    what_if_seconds = (time.perf_counter() - start_time) / what_ifs
+
+    return {
+        "repos": repos,
+        "python_loop_seconds": round(loop_seconds, 3),
+        "model_apply_seconds": round(apply_seconds, 3),
+        "features_seconds": round(features_seconds, 3),
+        "what_if_rescore_seconds": round(what_if_seconds, 4)
+    }
+
+def import_times(statement, runs=3):
+    """
+    Cumulative import time per module for a statement, from `python -X importtime`
+
+    Each run is a fresh interpreter; the fastest run is kept for each module.
+
+    Args:
+        statement (str): Python statement, e.g. "import cash_daily"
+        runs (int): Interpreter runs
+
+    Returns:
+        dict: Module name -> cumulative import time in milliseconds
+    """
+    import subprocess
+    from pathlib import Path
+
+    best = {}
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", statement],
+            cwd=Path(__file__).parent, capture_output=True, text=True, check=True
+        )
+        for line in completed.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            try:
+                milliseconds = int(cumulative) / 1000.0
+            except ValueError:
+                continue   # the header line
+            name = name.strip()
+            best[name] = min(best.get(name, milliseconds), milliseconds)
+    return best
+
+def bench_startup(runs=5):
+    """Benchmark cash_daily startup against importing every workflow module up front"""
+    import subprocess
+    from pathlib import Path
+
+    lazy = import_times("import cash_daily", runs)
+    eager = import_times("import market_scanner, portfolio_tracker, bot_hunter, playbook_generator, money_logger", runs)
+
+    help_seconds = []
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, str(Path(__file__).parent / "cash_daily.py"), "--help"],
+                       capture_output=True, check=True)
+        help_seconds.append(time.perf_counter() - start_time)
+
+    return {
+        "cash_daily_import_ms": round(lazy.get("cash_daily", 0), 1),
+        "workflow_modules_import_ms": round(sum(eager.get(name, 0) for name in
+                                                ["market_scanner", "portfolio_tracker", "bot_hunter",
+                                                 "playbook_generator", "money_logger"]), 1),
+        "heavy_modules_on_import": sorted(name for name in ["requests", "numpy"] if name in lazy),
+        "help_seconds": round(min(help_seconds), 3)
+    }
+
+def bench_logging(threads=8, records_per_thread=5000, debug_per_record=4):
+    """Benchmark logging from worker threads: synchronous file handler vs the log pipeline"""
+    import tempfile
+    import concurrent.futures
+    from pathlib import Path
+    from log_pipeline import setup_logging, stage
+
+    bench_logger = logging.getLogger("Cash.Bench")
+    root = logging.getLogger()
+
+    def work(index):
+        start_time = time.perf_counter()
+        for i in range(records_per_thread):
+            bench_logger.info("Worker %d record %d", index, i)
+            for j in range(debug_per_record):
+                bench_logger.debug("Worker %d record %d detail %d", index, i, j)
+        return time.perf_counter() - start_time
+
+    def run():
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+            return sum(pool.map(work, range(threads)))
+
+    saved_handlers, saved_level = root.handlers[:], root.level
+    for handler in saved_handlers:
+        root.removeHandler(handler)
+    try:
+        with tempfile.TemporaryDirectory() as log_dir:
+            # What basicConfig gave every module: a plain FileHandler on the calling thread
+            file_handler = logging.FileHandler(Path(log_dir) / "sync.log")
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+            root.addHandler(file_handler)
+            root.setLevel(logging.DEBUG)
+            sync_seconds = run()
+            root.removeHandler(file_handler)
+            file_handler.close()
+
+            pipeline = setup_logging({"level": "DEBUG", "console": False, "debug_sample_every": 10}, log_dir)
+            with stage("bench"):
+                pipeline_seconds = run()
+            start_time = time.perf_counter()
+            pipeline.stop()
+            drain_seconds = time.perf_counter() - start_time
+            with open(Path(log_dir) / "cash_daily.jsonl", 'r') as f:
+                written = sum(1 for _ in f)
+    finally:
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    records = threads * records_per_thread * (1 + debug_per_record)
+    return {
+        "records": records,
+        "sync_us_per_record": round(sync_seconds / records * 1e6, 2),
+        "pipeline_us_per_record": round(pipeline_seconds / records * 1e6, 2),
+        "pipeline_drain_seconds": round(drain_seconds, 3),
+        "pipeline_records_written": written
+    }
+
+def bench_checkpoints(coins=5000, stage_seconds=1.0):
+    """Benchmark a failed run and its resume, with sleeps standing in for API-bound stages"""
+    import random
+    import tempfile
+    from checkpoints import CheckpointStore
+
+    rng = random.Random(5)
+    market_data = {"top_coins": [{
+        "id": f"coin-{i}",
+        "symbol": f"C{i}",
+        "price": rng.uniform(0.01, 60000),
+        "market_cap": rng.uniform(1e5, 1e12),
+        "change_24h": rng.uniform(-30, 30)
+    } for i in range(coins)]}
+    bot_data = {"top_picks": [{"name": f"owner-{i}/bot-{i}", "stars": rng.randint(100, 20000)} for i in range(200)]}
+    failing = {"playbook": True}
+
+    def fetch(value):
+        def run():
+            time.sleep(stage_seconds)
+            return value
+        return run
+
+    def playbook():
+        if failing["playbook"]:
+            raise RuntimeError("playbook failed")
+        return "# Playbook"
+
+    def workflow(run):
+        market = run.stage("market_scan", [run.run_id], fetch(market_data))
+        bots = run.stage("bot_hunt", [run.run_id], fetch(bot_data))
+        return run.stage("playbook", [market, bots], playbook)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CheckpointStore(root)
+        start_time = time.perf_counter()
+        try:
+            workflow(store.start_run("bench"))
+        except RuntimeError:
+            pass
+        failed_seconds = time.perf_counter() - start_time
+
+        failing["playbook"] = False
+        start_time = time.perf_counter()
+        workflow(store.load_run("bench"))
+        resume_seconds = time.perf_counter() - start_time
+
+        # A fresh store, so the output is actually written rather than found by its digest
+        fresh = CheckpointStore(f"{root}/fresh")
+        start_time = time.perf_counter()
+        digest = fresh.put(market_data)
+        put_seconds = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        fresh.get(digest)
+        get_seconds = time.perf_counter() - start_time
+        size_kb = (fresh.objects_dir / f"{digest}.json").stat().st_size / 1024
+
+    return {
+        "failed_run_seconds": round(failed_seconds, 3),
+        "resume_seconds": round(resume_seconds, 3),
+        "market_checkpoint_kb": round(size_kb, 1),
+        "checkpoint_write_ms": round(put_seconds * 1000, 2),
+        "checkpoint_verified_read_ms": round(get_seconds * 1000, 2)
+    }
+
+BENCHMARKS = {
+    "top_coins": bench_top_coins,
+    "indicators": bench_indicators,
+    "backtest": bench_backtest,
+    "sentiment": bench_sentiment,
+    "tickers": bench_tickers,
+    "dedup": bench_dedup,
+    "alerts": bench_alerts,
+    "bot_search": bench_bot_search,
+    "bot_catalog": bench_bot_catalog,
+    "repo_scan": bench_repo_scan,
+    "vuln_match": bench_vuln_match,
+    "top_k": bench_top_k,
+    "scoring": bench_scoring,
+    "startup": bench_startup,
+    "logging": bench_logging,
+    "checkpoints": bench_checkpoints
+}
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Cash Benchmarks")
+    parser.add_argument("--only", choices=sorted(BENCHMARKS), help="Run a single benchmark")
+    args = parser.parse_args()
+
+    names = [args.only] if args.only else list(BENCHMARKS)
+    report = {}
+    for name in names:
+        print(f"Running benchmark: {name}")
+        report[name] = BENCHMARKS[name]()
+
+    print(json.dumps(report, indent=4))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,9 +3,17 @@
 Bot Hunter for Cash Daily Workflow
 
 This module hunts for new trading bots, scripts, and automation tools:
-1. Searches GitHub for trending crypto trading repositories
-2. Analyzes repositories for quality, activity, and security
-3. Identifies potential tools for integration
+1. Searches GitHub for trending crypto trading repositories, one concurrent paged query per topic
+2. Merges repositories found under several topics into one entry listing the matched topics
+3. Analyzes each unique repository for quality, activity, and security with a configurable,
+   vectorized scoring model
+4. With a repository catalog, searches only for repositories pushed since the last hunt and
+   re-scores only the ones that changed
+5. Runs local static checks over the strongest candidates and folds the findings into their
+   security and quality scores
+6. Matches the candidates' declared dependencies against a local advisory database, and
+   flags descriptions advertising scam or abuse features
+7. Identifies potential tools for integration
 
 Usage:
     from bot_hunter import BotHunter
@@ -15,25 +23,56 @@ Usage:
 
 import os
 import json
+import math
 import time
 import logging
 import requests
 from datetime import datetime, timedelta
 from pathlib import Path
+import concurrent.futures
+
+from rate_limiter import get_scheduler, PRIORITY_BOTS
+from repo_scanner import describe_findings
+from scoring_model import ScoringModel
+from topk import top_k
+from vuln_matcher import security_penalty
 
 logger = logging.getLogger("Cash.BotHunter")
 
+# GitHub search returns at most 100 repositories per page and 1000 per query
+GITHUB_SEARCH_PAGE_SIZE = 100
+GITHUB_SEARCH_MAX_RESULTS = 1000
+
+# Description phrases advertising features that abuse other users or hide a scam
+DESCRIPTION_RED_FLAGS = (
+    "anti-bot bypass", "bypass anti-bot", "drainer", "honeypot",
+    "guaranteed profit", "risk-free profit", "private key generator"
+)
+# Security score penalty per red flag, and the most all red flags may cost
+RED_FLAG_PENALTY = 25
+MAX_RED_FLAG_PENALTY = 50
+
 class BotHunter:
     """Hunts for new trading bots, scripts, and automation tools"""
     
-    def __init__(self, config):
+    def __init__(self, config, scheduler=None, catalog=None, repo_scanner=None, advisories=None):
         """
         Initialize the bot hunter
         
         Args:
             config (dict): Configuration for the bot hunter
+            scheduler (RequestScheduler): Scheduler that paces API requests (shared one if None)
+            catalog (RepoCatalog): Repositories kept from earlier hunts (every hunt is a full one if None)
+            repo_scanner (RepoScanner): Static analysis of candidate repositories (skipped if None)
+            advisories (AdvisoryIndex): Known vulnerable packages matched against scanned
+                repositories' dependencies (skipped if None)
         """
         self.config = config
+        self.scheduler = scheduler or get_scheduler()
+        self.catalog = catalog
+        self.repo_scanner = repo_scanner
+        self.advisories = advisories
+        self.scoring = ScoringModel(config.get("scoring"))
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "repositories": [],
@@ -42,8 +81,8 @@ class BotHunter:
         }
         
         # GitHub API settings
-        self.github_api_url = "https://api.github.com"
-        self.github_headers = {}
+        self.github_api_url = config.get("github_api_url", "https://api.github.com").rstrip("/")
+        self.github_headers = {"Accept": "application/vnd.github+json"}
         if "github_token" in config:
             self.github_headers["Authorization"] = f"token {config['github_token']}"
     
@@ -59,8 +98,19 @@ class BotHunter:
         # Search GitHub for trading bots
         self._search_github()
         
-        # Analyze repositories
-        self._analyze_repositories()
+        # Analyze new and changed repositories
+        if self.catalog is not None:
+            repositories = self._update_catalog()
+        else:
+            repositories = self.results["repositories"]
+        self._analyze_repositories(repositories)
+        if self.catalog is not None:
+            for repo in repositories:
+                self.catalog.record_analysis(repo)
+        
+        # Statically analyze the strongest candidates
+        if self.repo_scanner is not None:
+            self._static_analysis()
         
         # Select top picks
         self._select_top_picks()
@@ -69,504 +119,336 @@ class BotHunter:
         return self.results
     
     def _search_github(self):
-        """Search GitHub for trading bots and scripts"""
-        logger.info("Searching GitHub for trading bots and scripts")
+        """
+        Search GitHub for trading bots and scripts, one query per topic
+        
+        Topics are searched concurrently (paced by the scheduler's github_search quota).
+        The star filter is part of each query, and once a topic's first page reports the
+        result count, its remaining pages (up to `max_pages`) are requested in parallel.
+        Repositories are added to the results as each page arrives. A repository returned
+        for several topics is kept once (keyed by full name) with the topics merged.
         
-        # Get search topics from config
+        With a catalog, topics searched before get a `pushed:>=` qualifier so only
+        repositories updated since the last search are returned (a full search runs
+        every `catalog.full_refresh_days`).
+        """
         topics = self.config.get("github_topics", ["crypto-trading-bot", "trading-bot", "crypto-bot"])
         min_stars = self.config.get("min_stars", 100)
+        max_pages = max(1, self.config.get("max_pages", 3))
+        per_page = max(1, min(self.config.get("per_page", 100), GITHUB_SEARCH_PAGE_SIZE))
+        workers = max(1, min(len(topics), self.config.get("search_workers", 16)))
+        full_refresh_days = self.config.get("catalog", {}).get("full_refresh_days", 7)
+        self.results["searches"] = {}
+        index = {}   # lowercased full name -> repository entry
+        if not topics:
+            return
+        
+        started = time.time()
+        qualifiers = {
+            topic: self.catalog.search_qualifier(topic, min_stars, started, full_refresh_days) if self.catalog is not None else None
+            for topic in topics
+        }
+        failed = set()
         
-        # Search for each topic
-        for topic in topics:
-            try:
-                logger.info(f"Searching for topic: {topic}")
-                
-                # This is a placeholder - in a real implementation, we would use the GitHub API
-                # For now, use simulated data
-                
-                # Simulated repositories for each topic
-                if topic == "crypto-trading-bot":
-                    self._add_simulated_repos_crypto_trading_bot()
-                elif topic == "trading-bot":
-                    self._add_simulated_repos_trading_bot()
-                elif topic == "crypto-bot":
-                    self._add_simulated_repos_crypto_bot()
-            
-            except Exception as e:
-                logger.error(f"Error searching GitHub for topic {topic}: {str(e)}", exc_info=True)
-    
-    def _add_simulated_repos_crypto_trading_bot(self):
-        """Add simulated repositories for the 'crypto-trading-bot' topic"""
-        self.results["repositories"].extend([
-            {
-                "name": "freqtrade/freqtrade",
-                "description": "Free, open source crypto trading bot",
-                "url": "https://github.com/freqtrade/freqtrade",
-                "stars": 39000,
-                "forks": 7700,
-                "last_updated": "2025-05-10T12:00:00Z",
-                "language": "Python",
-                "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "bitcoin", "altcoin"],
-                "source": "github"
-            },
-            {
-                "name": "jesse-ai/jesse",
-                "description": "An advanced crypto trading bot written in Python",
-                "url": "https://github.com/jesse-ai/jesse",
-                "stars": 5200,
-                "forks": 950,
-                "last_updated": "2025-05-09T18:30:00Z",
-                "language": "Python",
-                "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "backtesting"],
-                "source": "github"
-            },
-            {
-                "name": "Drakkar-Software/OctoBot",
-                "description": "Cryptocurrency trading bot using technical analysis based strategies",
-                "url": "https://github.com/Drakkar-Software/OctoBot",
-                "stars": 2800,
-                "forks": 650,
-                "last_updated": "2025-05-08T09:15:00Z",
-                "language": "Python",
-                "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "technical-analysis"],
-                "source": "github"
-            }
-        ])
-    
-    def _add_simulated_repos_trading_bot(self):
-        """Add simulated repositories for the 'trading-bot' topic"""
-        self.results["repositories"].extend([
-            {
-                "name": "hummingbot/hummingbot",
-                "description": "Hummingbot is open source software that helps you build trading bots that run on centralized and decentralized exchanges",
-                "url": "https://github.com/hummingbot/hummingbot",
-                "stars": 6800,
-                "forks": 1900,
-                "last_updated": "2025-05-10T15:45:00Z",
-                "language": "Python",
-                "topics": ["trading-bot", "market-making", "arbitrage", "cryptocurrency"],
-                "source": "github"
-            },
-            {
-                "name": "DeviaVir/zenbot",
-                "description": "Zenbot is a command-line cryptocurrency trading bot using Node.js and MongoDB",
-                "url": "https://github.com/DeviaVir/zenbot",
-                "stars": 8100,
-                "forks": 2200,
-                "last_updated": "2025-05-07T22:10:00Z",
-                "language": "JavaScript",
-                "topics": ["trading-bot", "cryptocurrency", "bitcoin", "altcoin"],
-                "source": "github"
-            },
-            {
-                "name": "askmike/gekko",
-                "description": "A bitcoin trading bot written in Node.js",
-                "url": "https://github.com/askmike/gekko",
-                "stars": 9700,
-                "forks": 3100,
-                "last_updated": "2025-05-05T14:20:00Z",
-                "language": "JavaScript",
-                "topics": ["trading-bot", "bitcoin", "cryptocurrency"],
-                "source": "github"
-            }
-        ])
-    
-    def _add_simulated_repos_crypto_bot(self):
-        """Add simulated repositories for the 'crypto-bot' topic"""
-        self.results["repositories"].extend([
-            {
-                "name": "kiridefi/DeFi_Trading_Bot",
-                "description": "Advanced DeFi trading bot with anti-bot bypass, P2P, and sniping capabilities",
-                "url": "https://github.com/kiridefi/DeFi_Trading_Bot",
-                "stars": 1200,
-                "forks": 350,
-                "last_updated": "2025-05-09T20:30:00Z",
-                "language": "Python",
-                "topics": ["crypto-bot", "defi", "sniping-bot", "trading-bot"],
-                "source": "github"
-            },
-            {
-                "name": "SherriMaxwell438/Crypto-Trading-Bot",
-                "description": "ML-driven crypto trading bot with beginner-friendly interface",
-                "url": "https://github.com/SherriMaxwell438/Crypto-Trading-Bot",
-                "stars": 850,
-                "forks": 210,
-                "last_updated": "2025-05-08T11:45:00Z",
-                "language": "Python",
-                "topics": ["crypto-bot", "machine-learning", "trading-bot"],
-                "source": "github"
-            },
-            {
-                "name": "botcrypto-io/awesome-crypto-trading-bots",
-                "description": "A curated list of awesome crypto trading bot frameworks, libraries, software and resources",
-                "url": "https://github.com/botcrypto-io/awesome-crypto-trading-bots",
-                "stars": 3500,
-                "forks": 420,
-                "last_updated": "2025-05-10T08:20:00Z",
-                "language": "Markdown",
-                "topics": ["awesome-list", "crypto-bot", "trading-bot", "cryptocurrency"],
-                "source": "github"
-            }
-        ])
-    
-    def _analyze_repositories(self):
-        """Analyze repositories for quality, activity, and security"""
-        logger.info("Analyzing repositories")
+        logger.info(f"Searching GitHub for {len(topics)} topics ({workers} workers, up to {max_pages} pages each)")
         
-        for repo in self.results["repositories"]:
-            try:
-                # Calculate activity score (0-100)
-                # This is a placeholder - in a real implementation, we would analyze commit history, issues, etc.
-                activity_score = min(100, repo.get("stars", 0) / 100)
-                
-                # Calculate security score (0-100)
-                # This is a placeholder - in a real implementation, we would analyze code, dependencies, etc.
-                security_score = 80  # Default score
-                
-                # Calculate quality score (0-100)
-                # This is a placeholder - in a real implementation, we would analyze code quality, tests, etc.
-                quality_score = min(100, (repo.get("stars", 0) / 100) * 0.7 + (repo.get("forks", 0) / 50) * 0.3)
-                
-                # Add scores to repository
-                repo["scores"] = {
-                    "activity": activity_score,
-                    "security": security_score,
-                    "quality": quality_score,
-                    "overall": (activity_score + security_score + quality_score) / 3
-                }
-                
-                # Check for security concerns
-                if security_score < 60:
-                    self.results["security_concerns"].append({
-                        "repository": repo.get("name"),
-                        "score": security_score,
-                        "message": "Low security score - review code carefully before using"
-                    })
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(self._search_page, topic, min_stars, 1, per_page, qualifiers[topic]): (topic, 1)
+                for topic in topics
+            }
             
-            except Exception as e:
-                logger.error(f"Error analyzing repository {repo.get('name')}: {str(e)}", exc_info=True)
+            while pending:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    topic, page = pending.pop(future)
+                    search = self.results["searches"].setdefault(topic, {
+                        "qualifier": qualifiers[topic], "total_count": 0, "pages": 0, "repositories": 0, "new": 0
+                    })
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.error(f"Error searching GitHub for topic {topic} (page {page}): {str(e)}", exc_info=True)
+                        failed.add(topic)
+                        continue
+                    
+                    search["pages"] += 1
+                    for item in data.get("items", []):
+                        if item.get("stargazers_count", 0) < min_stars or not item.get("full_name"):
+                            continue
+                        search["repositories"] += 1
+                        if self._merge_repository(index, item, topic):
+                            search["new"] += 1
+                    
+                    # The first page tells how many results there are; fetch the rest at once
+                    if page == 1:
+                        search["total_count"] = data.get("total_count", 0)
+                        available = min(search["total_count"], GITHUB_SEARCH_MAX_RESULTS)
+                        pages = min(max_pages, math.ceil(available / per_page))
+                        for next_page in range(2, pages + 1):
+                            pending[executor.submit(self._search_page, topic, min_stars, next_page, per_page, qualifiers[topic])] = (topic, next_page)
+        
+        # A topic that failed is searched from the same point next time
+        if self.catalog is not None:
+            for topic in topics:
+                if topic not in failed:
+                    self.catalog.record_search(topic, min_stars, started, full=qualifiers[topic] is None)
     
-    def _select_top_picks(self):
-        """Select top picks based on scores and criteria"""
-        logger.info("Selecting top picks")
-        
-        # Sort repositories by overall score
-        sorted_repos = sorted(
-            self.results["repositories"],
-            key=lambda x: x.get("scores", {}).get("overall", 0),
-            reverse=True
-        )
+    def _update_catalog(self):
+        """
+        Merge this hunt's repositories into the catalog
         
-        # Select top 3 repositories
-        top_repos = sorted_repos[:3]
+        Every analyzed entry is re-scored from its stored metadata first, so push recency
+        and scoring model changes reach repositories no search returned. Repositories
+        unchanged since they were last analyzed take those scores.
         
-        # Add to top picks with recommendations
-        for repo in top_repos:
-            self.results["top_picks"].append({
-                "repository": repo.get("name"),
-                "url": repo.get("url"),
-                "overall_score": repo.get("scores", {}).get("overall", 0),
-                "recommendation": self._generate_recommendation(repo)
-            })
+        Returns:
+            list: Repositories that are new or changed and need analysis
+        """
+        now = time.time()
+        changed = []
+        unchanged = []
+        for repo in self.results["repositories"]:
+            entry, is_changed = self.catalog.upsert(repo, now)
+            if is_changed:
+                changed.append(repo)
+            else:
+                unchanged.append((repo, entry))
+        
+        entries = list(self.catalog.repositories())
+        self.scoring.apply(entries, [self._red_flag_penalty(entry) for entry in entries], now)
+        for repo, entry in unchanged:
+            repo["scores"] = entry["scores"]
+        
+        pruned = self.catalog.prune(self.config.get("catalog", {}).get("max_age_days", 30), now)
+        self.results["catalog"] = {
+            "repositories": len(self.catalog),
+            "fetched": len(self.results["repositories"]),
+            "analyzed": len(changed),
+            "pruned": pruned
+        }
+        logger.info(f"Repository catalog: {len(self.catalog)} repositories, {len(changed)} new or changed")
+        return changed
     
-    def _generate_recommendation(self, repo):
+    def _merge_repository(self, index, item, topic):
         """
-        Generate a recommendation for a repository
+        Add a search result to the results, or merge it into the entry already found
         
         Args:
-            repo (dict): Repository data
+            index (dict): Lowercased full name -> repository entry
+            item (dict): GitHub search result
+            topic (str): Topic whose search returned the result
         
         Returns:
-            str: Recommendation
+            bool: True if the repository was new
         """
-        name = repo.get("name", "").split("/")[-1]
-        language = repo.get("language", "Unknown")
-        stars = repo.get("stars", 0)
-        
-        if language == "Python":
-            return f"Consider using {name} for its Python-based approach, making it easy to customize and integrate with our existing tools. With {stars} stars, it has a strong community and active development."
-        elif language == "JavaScript":
-            return f"Consider using {name} for its JavaScript-based approach, which could integrate well with web-based dashboards. With {stars} stars, it has a solid community backing."
-        else:
-            return f"Consider exploring {name} further to evaluate its potential for our trading strategy. With {stars} stars, it's worth investigating."
-
-
-if __name__ == "__main__":
-    # If run directly, perform a test hunt
-    logging.basicConfig(level=logging.INFO)
-    
-    # Test configuration
-    config = {
-        "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
-        "min_stars": 100
-    }
-    
-    # Run test hunt
-    hunter = BotHunter(config)
-    results = hunter.hunt()
-    
-    # Print results
-    print(json.dumps(results, indent=4))#!/usr/bin/env python3
-"""
-Bot Hunter for Cash Daily Workflow
-
-This module hunts for new trading bots, scripts, and automation tools:
-1. Searches GitHub for trending crypto trading repositories
-2. Analyzes repositories for quality, activity, and security
-3. Identifies potential tools for integration
-
-Usage:
-    from bot_hunter import BotHunter
-    hunter = BotHunter(config)
-    results = hunter.hunt()
-"""
-
-import os
-import json
-import time
-import logging
-import requests
-from datetime import datetime, timedelta
-from pathlib import Path
-
-logger = logging.getLogger("Cash.BotHunter")
-
-class BotHunter:
-    """Hunts for new trading bots, scripts, and automation tools"""
+        key = item["full_name"].lower()
+        repo = index.get(key)
+        if repo is None:
+            repo = index[key] = self._parse_repository(item)
+            repo["matched_topics"] = [topic]
+            self.results["repositories"].append(repo)
+            return True
+        
+        if topic not in repo["matched_topics"]:
+            repo["matched_topics"].append(topic)
+        for extra in item.get("topics", []):
+            if extra not in repo["topics"]:
+                repo["topics"].append(extra)
+        return False
     
-    def __init__(self, config):
+    def _search_page(self, topic, min_stars, page, per_page, qualifier=None):
         """
-        Initialize the bot hunter
+        Fetch one page of GitHub's repository search for a topic
         
         Args:
-            config (dict): Configuration for the bot hunter
+            topic (str): GitHub topic
+            min_stars (int): Minimum stars (sent as a `stars:>=` qualifier)
+            page (int): Page number (1-based)
+            per_page (int): Repositories per page
+            qualifier (str): Extra search qualifier (e.g., `pushed:>=2025-05-01`)
+        
+        Returns:
+            dict: Search response (total_count, items)
         """
-        self.config = config
-        self.results = {
-            "timestamp": datetime.now().isoformat(),
-            "repositories": [],
-            "top_picks": [],
-            "security_concerns": []
+        query = f"topic:{topic} stars:>={min_stars}"
+        if qualifier:
+            query += f" {qualifier}"
+        response = self.scheduler.get(
+            "github_search",
+            f"{self.github_api_url}/search/repositories",
+            priority=PRIORITY_BOTS,
+            use_cache=True,
+            headers=self.github_headers,
+            params={
+                "q": query,
+                "sort": "stars",
+                "order": "desc",
+                "per_page": per_page,
+                "page": page
+            }
+        )
+        if response.status_code != 200:
+            raise Exception(f"GitHub API error (HTTP {response.status_code}): {response.text[:200]}")
+        return response.json()
+    
+    def _parse_repository(self, item):
+        """Convert a GitHub search result into a repository entry"""
+        return {
+            "name": item.get("full_name"),
+            "description": item.get("description"),
+            "url": item.get("html_url"),
+            "stars": item.get("stargazers_count", 0),
+            "forks": item.get("forks_count", 0),
+            "last_updated": item.get("pushed_at"),
+            "language": item.get("language"),
+            "topics": list(item.get("topics", [])),
+            "size_kb": item.get("size"),
+            "source": "github"
         }
-        
-        # GitHub API settings
-        self.github_api_url = "https://api.github.com"
-        self.github_headers = {}
-        if "github_token" in config:
-            self.github_headers["Authorization"] = f"token {config['github_token']}"
     
-    def hunt(self):
+    def _analyze_repositories(self, repositories=None):
         """
-        Hunt for new trading bots and scripts
+        Analyze repositories for quality, activity, and security
         
-        Returns:
-            dict: Hunt results
+        Args:
+            repositories (list): Repositories to analyze (all found by this hunt if None)
         """
-        logger.info("Starting bot hunt")
-        
-        # Search GitHub for trading bots
-        self._search_github()
-        
-        # Analyze repositories
-        self._analyze_repositories()
-        
-        # Select top picks
-        self._select_top_picks()
-        
-        logger.info(f"Bot hunt complete. Found {len(self.results['repositories'])} repositories, {len(self.results['top_picks'])} top picks")
-        return self.results
+        repositories = self.results["repositories"] if repositories is None else repositories
+        logger.info(f"Analyzing {len(repositories)} repositories")
+        
+        # Changed repositories need a new static analysis
+        for repo in repositories:
+            repo.pop("static_analysis", None)
+        
+        # Score every repository in one pass of the scoring model. Code and dependencies are
+        # checked by static analysis; until then, security judges the description.
+        try:
+            self.scoring.apply(repositories, [self._red_flag_penalty(repo) for repo in repositories])
+        except Exception as e:
+            logger.error(f"Error scoring {len(repositories)} repositories: {str(e)}", exc_info=True)
+            return
+        
+        # Check for security concerns
+        for repo in repositories:
+            security_score = repo["scores"]["security"]
+            if security_score < 60:
+                red_flags = self._red_flags(repo)
+                # A low bot_hunt.scoring.security_base puts repositories here without red flags
+                if red_flags:
+                    cause = f"Description advertises {', '.join(red_flags)}"
+                else:
+                    cause = f"Security score {security_score} below 60"
+                self.results["security_concerns"].append({
+                    "repository": repo.get("name"),
+                    "score": security_score,
+                    "message": f"{cause} - review code carefully before using",
+                    "red_flags": red_flags
+                })
     
-    def _search_github(self):
-        """Search GitHub for trading bots and scripts"""
-        logger.info("Searching GitHub for trading bots and scripts")
-        
-        # Get search topics from config
-        topics = self.config.get("github_topics", ["crypto-trading-bot", "trading-bot", "crypto-bot"])
-        min_stars = self.config.get("min_stars", 100)
-        
-        # Search for each topic
-        for topic in topics:
-            try:
-                logger.info(f"Searching for topic: {topic}")
-                
-                # This is a placeholder - in a real implementation, we would use the GitHub API
-                # For now, use simulated data
-                
-                # Simulated repositories for each topic
-                if topic == "crypto-trading-bot":
-                    self._add_simulated_repos_crypto_trading_bot()
-                elif topic == "trading-bot":
-                    self._add_simulated_repos_trading_bot()
-                elif topic == "crypto-bot":
-                    self._add_simulated_repos_crypto_bot()
-            
-            except Exception as e:
-                logger.error(f"Error searching GitHub for topic {topic}: {str(e)}", exc_info=True)
+    def _red_flags(self, repo):
+        """Red-flag phrases in a repository's description"""
+        description = (repo.get("description") or "").lower()
+        return [flag for flag in DESCRIPTION_RED_FLAGS if flag in description]
     
-    def _add_simulated_repos_crypto_trading_bot(self):
-        """Add simulated repositories for the 'crypto-trading-bot' topic"""
-        self.results["repositories"].extend([
-            {
-                "name": "freqtrade/freqtrade",
-                "description": "Free, open source crypto trading bot",
-                "url": "https://github.com/freqtrade/freqtrade",
-                "stars": 39000,
-                "forks": 7700,
-                "last_updated": "2025-05-10T12:00:00Z",
-                "language": "Python",
-                "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "bitcoin", "altcoin"],
-                "source": "github"
-            },
-            {
-                "name": "jesse-ai/jesse",
-                "description": "An advanced crypto trading bot written in Python",
-                "url": "https://github.com/jesse-ai/jesse",
-                "stars": 5200,
-                "forks": 950,
-                "last_updated": "2025-05-09T18:30:00Z",
-                "language": "Python",
-                "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "backtesting"],
-                "source": "github"
-            },
-            {
-                "name": "Drakkar-Software/OctoBot",
-                "description": "Cryptocurrency trading bot using technical analysis based strategies",
-                "url": "https://github.com/Drakkar-Software/OctoBot",
-                "stars": 2800,
-                "forks": 650,
-                "last_updated": "2025-05-08T09:15:00Z",
-                "language": "Python",
-                "topics": ["crypto-trading-bot", "trading-bot", "cryptocurrency", "technical-analysis"],
-                "source": "github"
-            }
-        ])
+    def _red_flag_penalty(self, repo):
+        """Security points a repository's description red flags cost"""
+        return min(MAX_RED_FLAG_PENALTY, RED_FLAG_PENALTY * len(self._red_flags(repo)))
     
-    def _add_simulated_repos_trading_bot(self):
-        """Add simulated repositories for the 'trading-bot' topic"""
-        self.results["repositories"].extend([
-            {
-                "name": "hummingbot/hummingbot",
-                "description": "Hummingbot is open source software that helps you build trading bots that run on centralized and decentralized exchanges",
-                "url": "https://github.com/hummingbot/hummingbot",
-                "stars": 6800,
-                "forks": 1900,
-                "last_updated": "2025-05-10T15:45:00Z",
-                "language": "Python",
-                "topics": ["trading-bot", "market-making", "arbitrage", "cryptocurrency"],
-                "source": "github"
-            },
-            {
-                "name": "DeviaVir/zenbot",
-                "description": "Zenbot is a command-line cryptocurrency trading bot using Node.js and MongoDB",
-                "url": "https://github.com/DeviaVir/zenbot",
-                "stars": 8100,
-                "forks": 2200,
-                "last_updated": "2025-05-07T22:10:00Z",
-                "language": "JavaScript",
-                "topics": ["trading-bot", "cryptocurrency", "bitcoin", "altcoin"],
-                "source": "github"
-            },
-            {
-                "name": "askmike/gekko",
-                "description": "A bitcoin trading bot written in Node.js",
-                "url": "https://github.com/askmike/gekko",
-                "stars": 9700,
-                "forks": 3100,
-                "last_updated": "2025-05-05T14:20:00Z",
-                "language": "JavaScript",
-                "topics": ["trading-bot", "bitcoin", "cryptocurrency"],
-                "source": "github"
-            }
-        ])
+    def _candidates(self):
+        """Every analyzed repository in the catalog, or this hunt's finds (an iterable)"""
+        if self.catalog is not None:
+            return self.catalog.repositories(
+                self.config.get("github_topics", ["crypto-trading-bot", "trading-bot", "crypto-bot"]),
+                self.config.get("min_stars", 100)
+            )
+        return self.results["repositories"]
     
-    def _add_simulated_repos_crypto_bot(self):
-        """Add simulated repositories for the 'crypto-bot' topic"""
-        self.results["repositories"].extend([
-            {
-                "name": "kiridefi/DeFi_Trading_Bot",
-                "description": "Advanced DeFi trading bot with anti-bot bypass, P2P, and sniping capabilities",
-                "url": "https://github.com/kiridefi/DeFi_Trading_Bot",
-                "stars": 1200,
-                "forks": 350,
-                "last_updated": "2025-05-09T20:30:00Z",
-                "language": "Python",
-                "topics": ["crypto-bot", "defi", "sniping-bot", "trading-bot"],
-                "source": "github"
-            },
-            {
-                "name": "SherriMaxwell438/Crypto-Trading-Bot",
-                "description": "ML-driven crypto trading bot with beginner-friendly interface",
-                "url": "https://github.com/SherriMaxwell438/Crypto-Trading-Bot",
-                "stars": 850,
-                "forks": 210,
-                "last_updated": "2025-05-08T11:45:00Z",
-                "language": "Python",
-                "topics": ["crypto-bot", "machine-learning", "trading-bot"],
-                "source": "github"
-            },
-            {
-                "name": "botcrypto-io/awesome-crypto-trading-bots",
-                "description": "A curated list of awesome crypto trading bot frameworks, libraries, software and resources",
-                "url": "https://github.com/botcrypto-io/awesome-crypto-trading-bots",
-                "stars": 3500,
-                "forks": 420,
-                "last_updated": "2025-05-10T08:20:00Z",
-                "language": "Markdown",
-                "topics": ["awesome-list", "crypto-bot", "trading-bot", "cryptocurrency"],
-                "source": "github"
-            }
-        ])
+    def _static_analysis(self):
+        """Scan the highest-scoring candidates locally and fold the findings into their scores"""
+        max_repos = self.config.get("static_analysis", {}).get("max_repos", 10)
+        candidates = top_k(self._candidates(), max_repos, key=lambda x: x.get("scores", {}).get("overall", 0))
+        logger.info(f"Running static analysis on {len(candidates)} candidate repositories")
+        
+        scans = self.repo_scanner.scan_many(candidates)
+        fetched = {repo["name"].lower(): repo for repo in self.results["repositories"]}
+        for repo in candidates:
+            key = repo["name"].lower()
+            scan = scans.get(key, {})
+            if "security_score" not in scan:
+                continue
+            
+            self._apply_scan(repo, scan)
+            # Catalog entries are separate copies of this hunt's finds
+            if key in fetched and fetched[key] is not repo:
+                fetched[key]["scores"] = dict(repo["scores"])
+                fetched[key]["static_analysis"] = repo["static_analysis"]
+        
+        self.results["static_analysis"] = dict(self.repo_scanner.stats)
     
-    def _analyze_repositories(self):
-        """Analyze repositories for quality, activity, and security"""
-        logger.info("Analyzing repositories")
+    def _apply_scan(self, repo, scan):
+        """
+        Replace a repository's description-based security score with its static analysis results
         
-        for repo in self.results["repositories"]:
-            try:
-                # Calculate activity score (0-100)
-                # This is a placeholder - in a real implementation, we would analyze commit history, issues, etc.
-                activity_score = min(100, repo.get("stars", 0) / 100)
-                
-                # Calculate security score (0-100)
-                # This is a placeholder - in a real implementation, we would analyze code, dependencies, etc.
-                security_score = 80  # Default score
-                
-                # Calculate quality score (0-100)
-                # This is a placeholder - in a real implementation, we would analyze code quality, tests, etc.
-                quality_score = min(100, (repo.get("stars", 0) / 100) * 0.7 + (repo.get("forks", 0) / 50) * 0.3)
-                
-                # Add scores to repository
-                repo["scores"] = {
-                    "activity": activity_score,
-                    "security": security_score,
-                    "quality": quality_score,
-                    "overall": (activity_score + security_score + quality_score) / 3
-                }
-                
-                # Check for security concerns
-                if security_score < 60:
-                    self.results["security_concerns"].append({
-                        "repository": repo.get("name"),
-                        "score": security_score,
-                        "message": "Low security score - review code carefully before using"
-                    })
-            
-            except Exception as e:
-                logger.error(f"Error analyzing repository {repo.get('name')}: {str(e)}", exc_info=True)
+        Known-vulnerable or malicious dependencies and description red flags are taken off
+        the scan's security score.
+        
+        Args:
+            repo (dict): Analyzed repository
+            scan (dict): RepoScanner result
+        """
+        vulnerabilities = []
+        if self.advisories is not None:
+            vulnerabilities = self.advisories.match_dependencies(scan.get("manifest_dependencies", []))
+        red_flags = self._red_flags(repo)
+        
+        repo["static_analysis"] = {
+            "security_score": max(0, scan["security_score"] - security_penalty(vulnerabilities)
+                                  - self._red_flag_penalty(repo)),
+            "quality_score": scan["quality_score"],
+            "counts": scan.get("counts", {}),
+            "has_tests": scan.get("has_tests", False),
+            "dependencies": scan.get("dependencies", 0),
+            "findings": scan.get("findings", [])[:5],
+            "vulnerabilities": vulnerabilities,
+            "timed_out": scan.get("timed_out", False),
+            "content_hash": scan.get("content_hash")
+        }
+        # The scoring model takes security from the scan and averages the quality scores
+        self.scoring.apply([repo])
+        scores = repo["scores"]
+        
+        if scores["security"] < 60:
+            problems = []
+            if describe_findings(scan.get("counts", {})):
+                problems.append(f"static analysis found {describe_findings(scan.get('counts', {}))}")
+            if vulnerabilities:
+                advisory_ids = sorted({finding["id"] for finding in vulnerabilities})
+                problems.append(f"dependencies match {', '.join(advisory_ids)}")
+            if red_flags:
+                problems.append(f"description advertises {', '.join(red_flags)}")
+            if not problems:
+                problems.append(f"security score {scores['security']} below 60")
+            # Replaces the description-only concern from the metadata analysis
+            self.results["security_concerns"] = [
+                concern for concern in self.results["security_concerns"]
+                if concern.get("repository") != repo.get("name")
+            ]
+            self.results["security_concerns"].append({
+                "repository": repo.get("name"),
+                "score": scores["security"],
+                "message": f"{'; '.join(problems)[:1].upper()}{'; '.join(problems)[1:]} - review code carefully before using",
+                "findings": scan.get("findings", [])[:5],
+                "vulnerabilities": vulnerabilities,
+                "red_flags": red_flags
+            })
     
     def _select_top_picks(self):
         """Select top picks based on scores and criteria"""
         logger.info("Selecting top picks")
         
-        # Sort repositories by overall score
-        sorted_repos = sorted(
-            self.results["repositories"],
-            key=lambda x: x.get("scores", {}).get("overall", 0),
-            reverse=True
-        )
-        
-        # Select top 3 repositories
-        top_repos = sorted_repos[:3]
+        # Select the top 3 repositories by overall score
+        top_repos = top_k(self._candidates(), 3, key=lambda x: x.get("scores", {}).get("overall", 0))
         
         # Add to top picks with recommendations
         for repo in top_repos:
@@ -574,6 +456,7 @@ class BotHunter:
                 "repository": repo.get("name"),
                 "url": repo.get("url"),
                 "overall_score": repo.get("scores", {}).get("overall", 0),
+                "matched_topics": repo.get("matched_topics", []),
                 "recommendation": self._generate_recommendation(repo)
             })
     
@@ -600,18 +483,22 @@ class BotHunter:
 
 
 if __name__ == "__main__":
-    # If run directly, perform a test hunt
-    logging.basicConfig(level=logging.INFO)
+    # If run directly, perform a test hunt against the local GitHub stub
+    from api_stubs import LocalAPIStub
     
-    # Test configuration
-    config = {
-        "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
-        "min_stars": 100
-    }
+    logging.basicConfig(level=logging.INFO)
     
-    # Run test hunt
-    hunter = BotHunter(config)
-    results = hunter.hunt()
+    with LocalAPIStub(github_limit=(30, 60)) as stub:
+        # Test configuration
+        config = {
+            "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
+            "min_stars": 100,
+            "github_api_url": stub.url
+        }
+        
+        # Run test hunt
+        hunter = BotHunter(config)
+        results = hunter.hunt()
     
     # Print results
-    print(json.dumps(results, indent=4))
\ No newline at end of file
+    print(json.dumps(results, indent=4))
@@ -10,13 +10,21 @@ This script runs Cash's daily workflow:
 5. Log money moves and lessons
 
 Usage:
-    python cash_daily.py [--full] [--market-only] [--portfolio-only] [--bots-only]
+    python cash_daily.py [--full] [--market-only] [--portfolio-only] [--bots-only] [--resume RUN_ID]
 
 Options:
     --full          Run the complete workflow (default)
     --market-only   Only run the market scan
     --portfolio-only Only check the portfolio
     --bots-only     Only hunt for new bots/scripts
+    --resume RUN_ID Rerun only the stages of an earlier run that failed or never ran
+
+Workflow modules (and with them requests, NumPy, and the rest) are imported only when their
+stage runs, and logging is set up after the arguments are parsed, so single-stage runs from
+cron or the daemon start quickly. Logging goes through the queue-based pipeline in
+log_pipeline.py: JSON lines in logs/cash_daily.jsonl, tagged with the run id and stage.
+Each stage's output is checkpointed under the run id (checkpoints.py), so a run that fails
+part-way can be finished with --resume instead of repeating every API call.
 """
 
 import os
@@ -28,28 +36,30 @@ import logging
 from datetime import datetime
 from pathlib import Path
 
-# Import workflow modules
-from market_scanner import MarketScanner
-from portfolio_tracker import PortfolioTracker
-from bot_hunter import BotHunter
-from playbook_generator import PlaybookGenerator
-from money_logger import MoneyLogger
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"cash_daily_{datetime.now().strftime('%Y%m%d')}.log"),
-        logging.StreamHandler()
-    ]
-)
+# Workflow modules are imported inside the functions that use them
+
 logger = logging.getLogger("Cash")
 
 # Constants
 CONFIG_PATH = Path(__file__).parent / "config.json"
 RESULTS_DIR = Path(__file__).parent / "results"
 LOGS_DIR = Path(__file__).parent / "logs"
+CACHE_DIR = Path(__file__).parent / "cache" / "http"
+BARS_PATH = Path(__file__).parent / "cache" / "ohlcv_bars.npz"
+TREND_STATE_PATH = Path(__file__).parent / "cache" / "trend_state.json"
+ALERT_STATE_PATH = Path(__file__).parent / "cache" / "alert_state.json"
+REPO_CATALOG_PATH = Path(__file__).parent / "cache" / "repo_catalog.json"
+REPO_SCANS_PATH = Path(__file__).parent / "cache" / "repo_scans.json"
+REPO_SCRATCH_DIR = Path(__file__).parent / "cache" / "repo_scratch"
+CHECKPOINT_DIR = Path(__file__).parent / "cache" / "checkpoints"
+
+# Options a resumed run takes from the run it resumes
+RUN_OPTIONS = ("full", "market_only", "portfolio_only", "bots_only")
+
+def setup_logging(config, run_id=None):
+    """Start the queue-based logging pipeline (console, and JSON lines under logs/)"""
+    from log_pipeline import setup_logging as start_pipeline
+    return start_pipeline(config.get("logging"), LOGS_DIR, run_id=run_id)
 
 def ensure_dirs():
     """Ensure all required directories exist"""
@@ -72,16 +82,119 @@ def load_config():
             },
             "portfolio": {
                 "track_wallets": [],
-                "manual_holdings": {}
+                "manual_holdings": {},
+                "concentration_limit": 20
             },
             "market_scan": {
                 "top_coins": 100,
                 "trending_threshold": 5,
-                "sources": ["coingecko", "reddit", "twitter"]
+                "min_sources": 2,
+                "source_timeout": 60,
+                "dedup": {
+                    "enabled": True,
+                    "window_hours": 24
+                },
+                "storage": {
+                    "deltas": True,
+                    "keyframe_every": 24
+                },
+                "trend": {
+                    "enabled": True,
+                    "fast_half_life_hours": 6,
+                    "slow_half_life_hours": 72,
+                    "rising_threshold": 2.0,
+                    "min_mentions": 3
+                },
+                "sources": ["coingecko", "reddit", "twitter", "news"],
+                "sentiment": {
+                    "positive_threshold": 0.3,
+                    "negative_threshold": -0.05,
+                    "min_mentions": 2
+                },
+                "indicators": {
+                    "enabled": True,
+                    "timeframe": "1m"
+                }
             },
             "bot_hunt": {
                 "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
-                "min_stars": 100
+                "min_stars": 100,
+                "max_pages": 3,
+                "per_page": 100,
+                "search_workers": 16,
+                "catalog": {
+                    "enabled": True,
+                    "full_refresh_days": 7,
+                    "max_age_days": 30
+                },
+                "static_analysis": {
+                    "enabled": True,
+                    "max_repos": 10,
+                    "clone": True,
+                    "fixtures_dir": None,
+                    "workers": None,
+                    "timeout": 120,
+                    "max_mb": 200
+                },
+                "advisories": {
+                    "enabled": True,
+                    "path": "advisories.json"
+                },
+                "scoring": {
+                    "activity": {
+                        "stars": {"transform": "log", "scale": 20000, "weight": 0.5},
+                        "recency": {"feature": "age_days", "transform": "decay", "scale": 30, "weight": 0.5}
+                    },
+                    "quality": {
+                        "stars": {"transform": "log", "scale": 20000, "weight": 0.6},
+                        "fork_ratio": {"transform": "linear", "scale": 0.2, "weight": 0.4}
+                    },
+                    "security_base": 80,
+                    "overall": {"activity": 1.0, "security": 1.0, "quality": 1.0}
+                }
+            },
+            "http_cache": {
+                "enabled": True,
+                "max_mb": 50
+            },
+            "checkpoints": {
+                "enabled": True,
+                "max_age_days": 7
+            },
+            "logging": {
+                "level": "INFO",
+                "file": "cash_daily.jsonl",
+                "console": True,
+                "rotation": {
+                    "when": "midnight",
+                    "max_mb": None,
+                    "backups": 14
+                },
+                "debug_sample_every": 10
+            },
+            "price_stream": {
+                "enabled": False,
+                "url": "wss://stream.binance.com:9443",
+                "symbols": [],
+                "warmup_seconds": 5
+            },
+            "ohlcv": {
+                "enabled": True
+            },
+            "playbook": {
+                "confidence_threshold": 0.7
+            },
+            "alerts": {
+                "enabled": True,
+                "rules": [
+                    "BTC drops 5% in 1h",
+                    "allocation > 30%",
+                    "new negative sentiment on a held asset"
+                ],
+                "sinks": [
+                    {"type": "file", "path": "logs/alerts.jsonl"},
+                    {"type": "stdout"}
+                ]
             }
         }
         with open(CONFIG_PATH, 'w') as f:
@@ -91,25 +204,125 @@ def load_config():
     with open(CONFIG_PATH, 'r') as f:
         return json.load(f)
 
-def run_market_scan(config):
+def load_bars(config):
+    """Load the OHLCV bars kept from previous runs (new bars if none), or None if disabled"""
+    if not config.get("ohlcv", {}).get("enabled", True):
+        return None
+    
+    from ohlcv import BarAggregator
+    if BARS_PATH.exists():
+        try:
+            return BarAggregator.load(BARS_PATH)
+        except Exception as e:
+            logger.warning(f"Could not load OHLCV bars from {BARS_PATH}: {str(e)}")
+    return BarAggregator()
+
+def save_bars(bars):
+    """Save the OHLCV bars for the next run"""
+    BARS_PATH.parent.mkdir(exist_ok=True, parents=True)
+    bars.save(BARS_PATH)
+    logger.info(f"OHLCV bars for {len(bars.symbols)} symbols saved to {BARS_PATH}")
+
+def load_trend_state(config):
+    """Load the mention counts kept from previous scans, or None if disabled"""
+    trend_config = config.get("market_scan", {}).get("trend", {})
+    if not trend_config.get("enabled", True):
+        return None
+    
+    from trend_state import TrendState
+    return TrendState.load(
+        TREND_STATE_PATH,
+        fast_half_life_hours=trend_config.get("fast_half_life_hours", 6),
+        slow_half_life_hours=trend_config.get("slow_half_life_hours", 72)
+    )
+
+def save_trend_state(trend_state):
+    """Save the mention counts for the next scan"""
+    trend_state.save(TREND_STATE_PATH)
+    logger.info(f"Trend state for {len(trend_state.symbols)} symbols saved to {TREND_STATE_PATH}")
+
+def load_alert_engine(config):
+    """Compile the configured alert rules, restoring the last run's state, or None if disabled"""
+    alert_config = config.get("alerts", {})
+    if not alert_config.get("enabled", True) or not alert_config.get("rules"):
+        return None
+    
+    from alerts import AlertEngine, build_sinks
+    engine = AlertEngine(alert_config["rules"], build_sinks(alert_config.get("sinks"), Path(__file__).parent))
+    engine.load_state(ALERT_STATE_PATH)
+    logger.info(f"Loaded {len(engine.rules)} alert rules")
+    return engine
+
+def evaluate_alerts(engine, market_data=None, portfolio_data=None):
+    """Run new scan and portfolio results through the alert rules"""
+    if engine is None:
+        return
+    
+    try:
+        alerts = []
+        if portfolio_data:
+            alerts += engine.process_portfolio(portfolio_data)
+        if market_data:
+            alerts += engine.process_scan(market_data)
+        if alerts:
+            logger.info(f"Fired {len(alerts)} alerts")
+    except Exception as e:
+        logger.error(f"Error evaluating alerts: {str(e)}", exc_info=True)
+
+def start_price_stream(config, bars=None):
+    """Start the live price stream if enabled, returning (book, stream)"""
+    stream_config = config.get("price_stream", {})
+    if not stream_config.get("enabled"):
+        return None, None
+    
+    logger.info("Starting live price stream...")
+    from price_stream import PriceBook, PriceStream, BINANCE_STREAM_URL
+    book = PriceBook(bars)
+    stream = PriceStream(
+        book,
+        symbols=stream_config.get("symbols") or None,
+        url=stream_config.get("url", BINANCE_STREAM_URL)
+    )
+    stream.start()
+    if not stream.wait_for_prices(timeout=stream_config.get("warmup_seconds", 5)):
+        logger.warning("Price stream delivered no prices during warmup; falling back to API prices")
+    return book, stream
+
+def run_market_scan(config, price_book=None, bars=None):
     """Run the market scanner module"""
     logger.info("Starting market scan...")
-    scanner = MarketScanner(config["market_scan"], config["api_keys"])
+    from market_scanner import MarketScanner
+    from scan_diff import ScanStore
+    trend_state = load_trend_state(config)
+    scanner = MarketScanner(
+        config["market_scan"], config["api_keys"], price_book=price_book, bars=bars, trend_state=trend_state
+    )
     results = scanner.scan()
-    
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = RESULTS_DIR / f"market_scan_{timestamp}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=4)
+    if trend_state is not None:
+        save_trend_state(trend_state)
+    
+    # Save results as a full keyframe or a delta against the latest one
+    storage_config = config["market_scan"].get("storage", {})
+    store = ScanStore(
+        RESULTS_DIR,
+        keyframe_every=storage_config.get("keyframe_every", 24),
+        deltas=storage_config.get("deltas", True)
+    )
+    output_file, changes = store.save(
+        results,
+        price_move_pct=storage_config.get("price_move_pct", 5.0),
+        rank_move=storage_config.get("rank_move", 10)
+    )
+    results["changes"] = changes
     
     logger.info(f"Market scan complete. Results saved to {output_file}")
     return results
 
-def check_portfolio(config):
+def check_portfolio(config, price_book=None):
     """Check portfolio status using the portfolio tracker"""
     logger.info("Checking portfolio...")
-    tracker = PortfolioTracker(config["portfolio"], config["api_keys"])
+    from portfolio_tracker import PortfolioTracker
+    tracker = PortfolioTracker(config["portfolio"], config["api_keys"], price_book=price_book)
     results = tracker.check()
     
     # Save results
@@ -121,11 +334,45 @@ def check_portfolio(config):
     logger.info(f"Portfolio check complete. Results saved to {output_file}")
     return results
 
+def load_repo_scanner(config):
+    """Set up static analysis of candidate repositories, or None if disabled"""
+    scan_config = config["bot_hunt"].get("static_analysis", {})
+    if not scan_config.get("enabled", True):
+        return None
+    
+    from repo_scanner import RepoScanner
+    fixtures_dir = scan_config.get("fixtures_dir")
+    return RepoScanner(
+        REPO_SCRATCH_DIR,
+        cache_path=REPO_SCANS_PATH,
+        fixtures_dir=Path(__file__).parent / fixtures_dir if fixtures_dir else None,
+        clone=scan_config.get("clone", True),
+        workers=scan_config.get("workers"),
+        timeout=scan_config.get("timeout", 120),
+        max_mb=scan_config.get("max_mb", 200)
+    )
+
+def load_advisories(config):
+    """Load the local advisory database, or None if disabled"""
+    advisory_config = config["bot_hunt"].get("advisories", {})
+    if not advisory_config.get("enabled", True):
+        return None
+    from vuln_matcher import AdvisoryIndex
+    return AdvisoryIndex.load(Path(__file__).parent / advisory_config.get("path", "advisories.json"))
+
 def hunt_bots(config):
     """Hunt for new trading bots and scripts"""
     logger.info("Hunting for new trading bots and scripts...")
-    hunter = BotHunter(config["bot_hunt"])
+    from bot_hunter import BotHunter
+    from repo_catalog import RepoCatalog
+    catalog_config = config["bot_hunt"].get("catalog", {})
+    catalog = RepoCatalog.load(REPO_CATALOG_PATH) if catalog_config.get("enabled", True) else None
+    hunter = BotHunter(config["bot_hunt"], catalog=catalog, repo_scanner=load_repo_scanner(config),
+                       advisories=load_advisories(config))
     results = hunter.hunt()
+    if catalog is not None:
+        catalog.save(REPO_CATALOG_PATH)
+        logger.info(f"Repository catalog with {len(catalog)} repositories saved to {REPO_CATALOG_PATH}")
     
     # Save results
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -136,10 +383,11 @@ def hunt_bots(config):
     logger.info(f"Bot hunt complete. Results saved to {output_file}")
     return results
 
-def generate_playbook(market_data, portfolio_data, bot_data):
+def generate_playbook(market_data, portfolio_data, bot_data, config=None):
     """Generate an actionable playbook based on collected data"""
     logger.info("Generating actionable playbook...")
-    generator = PlaybookGenerator(market_data, portfolio_data, bot_data)
+    from playbook_generator import PlaybookGenerator
+    generator = PlaybookGenerator(market_data, portfolio_data, bot_data, config)
     playbook = generator.generate()
     
     # Save playbook
@@ -154,10 +402,61 @@ def generate_playbook(market_data, portfolio_data, bot_data):
 def log_money_moves(market_data, portfolio_data, playbook):
     """Log money moves, wins, losses, and lessons"""
     logger.info("Logging money moves...")
+    from money_logger import MoneyLogger
     money_logger = MoneyLogger(LOGS_DIR)
     money_logger.log(market_data, portfolio_data, playbook)
     logger.info("Money moves logged")
 
+def load_run(config, args, run_id):
+    """
+    Start this run's checkpoints, or load the run being resumed
+
+    Returns None when checkpoints are disabled. A resumed run takes its options (--full,
+    --market-only, ...) from the original run.
+    """
+    checkpoint_config = config.get("checkpoints", {})
+    if not checkpoint_config.get("enabled", True):
+        if args.resume:
+            raise ValueError("--resume needs checkpoints.enabled in config.json")
+        return None
+    
+    from checkpoints import CheckpointStore
+    store = CheckpointStore(CHECKPOINT_DIR)
+    if args.resume:
+        run = store.load_run(args.resume)
+        if run is None:
+            raise ValueError(f"No checkpoints found for run {args.resume}")
+        for option in RUN_OPTIONS:
+            setattr(args, option, bool(run.args.get(option)))
+        pending = [name for name, entry in run.stages.items() if entry.get("status") != "done"]
+        logger.info(f"Resuming run {run.run_id}" + (f" (failed stages: {', '.join(pending)})" if pending else ""))
+        return run
+    
+    removed = store.prune(checkpoint_config.get("max_age_days", 7))
+    if removed["runs"] or removed["objects"]:
+        logger.info(f"Pruned {removed['runs']} old runs and {removed['objects']} checkpoint objects")
+    return store.start_run(run_id, {option: getattr(args, option) for option in RUN_OPTIONS})
+
+def run_stage(run, name, inputs, func):
+    """
+    Run a workflow stage under its log tag, through the run's checkpoints if they are on
+
+    Args:
+        run (checkpoints.Run): The run's checkpoints, or None
+        name (str): Stage name
+        inputs (list): What the stage output depends on; stages that fetch live data include
+            the run id, so only stages derived from them are reused across runs
+        func (callable): Runs the stage
+    
+    Returns:
+        The stage output (from its checkpoint when it has a valid one)
+    """
+    from log_pipeline import stage
+    with stage(name):
+        if run is None:
+            return func()
+        return run.stage(name, inputs, func)
+
 def main():
     """Main function to run the Cash daily workflow"""
     parser = argparse.ArgumentParser(description="Cash Daily Workflow")
@@ -165,220 +464,18 @@ def main():
     parser.add_argument("--market-only", action="store_true", help="Only run the market scan")
     parser.add_argument("--portfolio-only", action="store_true", help="Only check the portfolio")
     parser.add_argument("--bots-only", action="store_true", help="Only hunt for new bots/scripts")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                        help="Resume an earlier run, rerunning only its failed or missing stages")
     args = parser.parse_args()
     
-    # Default to full workflow if no specific option is selected
-    if not (args.market_only or args.portfolio_only or args.bots_only):
-        args.full = True
-    
-    # Ensure directories exist
-    ensure_dirs()
-    
     # Load configuration
     config = load_config()
     
-    # Initialize results
-    market_data = None
-    portfolio_data = None
-    bot_data = None
-    
-    # Run selected workflow components
-    if args.full or args.market_only:
-        market_data = run_market_scan(config)
-    
-    if args.full or args.portfolio_only:
-        portfolio_data = check_portfolio(config)
-    
-    if args.full or args.bots_only:
-        bot_data = hunt_bots(config)
-    
-    # Generate playbook if we have at least some data
-    if args.full and (market_data or portfolio_data or bot_data):
-        playbook = generate_playbook(market_data, portfolio_data, bot_data)
-        log_money_moves(market_data, portfolio_data, playbook)
-    
-    logger.info("Cash daily workflow completed successfully")
-
-if __name__ == "__main__":
-    start_time = time.time()
+    # Log through the queue so worker threads never wait on log I/O; a resumed run
+    # logs under its original run id
+    pipeline = setup_logging(config, run_id=args.resume)
     logger.info("Starting Cash daily workflow")
     
-    try:
-        main()
-    except Exception as e:
-        logger.error(f"Error in Cash daily workflow: {str(e)}", exc_info=True)
-        sys.exit(1)
-    
-    elapsed_time = time.time() - start_time
-    logger.info(f"Cash daily workflow completed in {elapsed_time:.2f} seconds")#!/usr/bin/env python3
-"""
-Cash Daily Workflow - Main Orchestrator
-
-This script runs Cash's daily workflow:
-1. Market scan for latest crypto trends and opportunities
-2. Portfolio check (when API keys are provided)
-3. Bot/script hunt for new trading tools
-4. Generate actionable playbook
-5. Log money moves and lessons
-
-Usage:
-    python cash_daily.py [--full] [--market-only] [--portfolio-only] [--bots-only]
-
-Options:
-    --full          Run the complete workflow (default)
-    --market-only   Only run the market scan
-    --portfolio-only Only check the portfolio
-    --bots-only     Only hunt for new bots/scripts
-"""
-
-import os
-import sys
-import json
-import time
-import argparse
-import logging
-from datetime import datetime
-from pathlib import Path
-
-# Import workflow modules
-from market_scanner import MarketScanner
-from portfolio_tracker import PortfolioTracker
-from bot_hunter import BotHunter
-from playbook_generator import PlaybookGenerator
-from money_logger import MoneyLogger
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"cash_daily_{datetime.now().strftime('%Y%m%d')}.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("Cash")
-
-# Constants
-CONFIG_PATH = Path(__file__).parent / "config.json"
-RESULTS_DIR = Path(__file__).parent / "results"
-LOGS_DIR = Path(__file__).parent / "logs"
-
-def ensure_dirs():
-    """Ensure all required directories exist"""
-    for dir_path in [RESULTS_DIR, LOGS_DIR]:
-        dir_path.mkdir(exist_ok=True, parents=True)
-    logger.info("Directory structure verified")
-
-def load_config():
-    """Load configuration from config.json"""
-    if not CONFIG_PATH.exists():
-        logger.warning(f"Config file not found at {CONFIG_PATH}. Creating default config.")
-        default_config = {
-            "api_keys": {
-                "binance": {
-                    "api_key": "",
-                    "api_secret": ""
-                },
-                "coinmarketcap": "",
-                "coingecko": ""
-            },
-            "portfolio": {
-                "track_wallets": [],
-                "manual_holdings": {}
-            },
-            "market_scan": {
-                "top_coins": 100,
-                "trending_threshold": 5,
-                "sources": ["coingecko", "reddit", "twitter"]
-            },
-            "bot_hunt": {
-                "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
-                "min_stars": 100
-            }
-        }
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(default_config, f, indent=4)
-        return default_config
-    
-    with open(CONFIG_PATH, 'r') as f:
-        return json.load(f)
-
-def run_market_scan(config):
-    """Run the market scanner module"""
-    logger.info("Starting market scan...")
-    scanner = MarketScanner(config["market_scan"], config["api_keys"])
-    results = scanner.scan()
-    
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = RESULTS_DIR / f"market_scan_{timestamp}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=4)
-    
-    logger.info(f"Market scan complete. Results saved to {output_file}")
-    return results
-
-def check_portfolio(config):
-    """Check portfolio status using the portfolio tracker"""
-    logger.info("Checking portfolio...")
-    tracker = PortfolioTracker(config["portfolio"], config["api_keys"])
-    results = tracker.check()
-    
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = RESULTS_DIR / f"portfolio_{timestamp}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=4)
-    
-    logger.info(f"Portfolio check complete. Results saved to {output_file}")
-    return results
-
-def hunt_bots(config):
-    """Hunt for new trading bots and scripts"""
-    logger.info("Hunting for new trading bots and scripts...")
-    hunter = BotHunter(config["bot_hunt"])
-    results = hunter.hunt()
-    
-    # Save results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = RESULTS_DIR / f"bot_hunt_{timestamp}.json"
-    with open(output_file, 'w') as f:
-        json.dump(results, f, indent=4)
-    
-    logger.info(f"Bot hunt complete. Results saved to {output_file}")
-    return results
-
-def generate_playbook(market_data, portfolio_data, bot_data):
-    """Generate an actionable playbook based on collected data"""
-    logger.info("Generating actionable playbook...")
-    generator = PlaybookGenerator(market_data, portfolio_data, bot_data)
-    playbook = generator.generate()
-    
-    # Save playbook
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = RESULTS_DIR / f"playbook_{timestamp}.md"
-    with open(output_file, 'w') as f:
-        f.write(playbook)
-    
-    logger.info(f"Playbook generated. Saved to {output_file}")
-    return playbook
-
-def log_money_moves(market_data, portfolio_data, playbook):
-    """Log money moves, wins, losses, and lessons"""
-    logger.info("Logging money moves...")
-    money_logger = MoneyLogger(LOGS_DIR)
-    money_logger.log(market_data, portfolio_data, playbook)
-    logger.info("Money moves logged")
-
-def main():
-    """Main function to run the Cash daily workflow"""
-    parser = argparse.ArgumentParser(description="Cash Daily Workflow")
-    parser.add_argument("--full", action="store_true", help="Run the complete workflow")
-    parser.add_argument("--market-only", action="store_true", help="Only run the market scan")
-    parser.add_argument("--portfolio-only", action="store_true", help="Only check the portfolio")
-    parser.add_argument("--bots-only", action="store_true", help="Only hunt for new bots/scripts")
-    args = parser.parse_args()
-    
     # Default to full workflow if no specific option is selected
     if not (args.market_only or args.portfolio_only or args.bots_only):
         args.full = True
@@ -386,34 +483,84 @@ def main():
     # Ensure directories exist
     ensure_dirs()
     
-    # Load configuration
-    config = load_config()
+    # Checkpoint each stage's output under the run id
+    run = load_run(config, args, pipeline.run_id)
+    try:
+        run_workflow(config, args, run)
+    except Exception:
+        if run is not None:
+            logger.error(f"Run {run.run_id} stopped; finish it with: python cash_daily.py --resume {run.run_id}")
+        raise
+
+def run_workflow(config, args, run=None):
+    """Run the stages selected by the command line options"""
+    # Pace all API calls through one rate-limited scheduler with an on-disk response cache
+    from rate_limiter import configure_scheduler
+    from response_cache import ResponseCache
+    cache_config = config.get("http_cache", {})
+    cache = None
+    if cache_config.get("enabled", True):
+        cache = ResponseCache(CACHE_DIR, max_bytes=int(cache_config.get("max_mb", 50) * 1024 * 1024))
+    configure_scheduler(config.get("rate_limits"), cache=cache)
     
     # Initialize results
     market_data = None
     portfolio_data = None
     bot_data = None
     
-    # Run selected workflow components
-    if args.full or args.market_only:
-        market_data = run_market_scan(config)
+    # Start the live price stream (if enabled) so lookups skip the price APIs;
+    # stream ticks and the market scan snapshot both feed the rolling OHLCV bars,
+    # which the market scan's indicators are computed from. A resumed run whose market
+    # scan and portfolio check are already checkpointed skips the stream
+    price_book, price_stream, bars = None, None, None
+    needs_prices = [
+        name for name, selected in (("market_scan", args.full or args.market_only),
+                                    ("portfolio", args.full or args.portfolio_only))
+        if selected and not (run and run.done(name))
+    ]
+    if needs_prices:
+        bars = load_bars(config)
+        price_book, price_stream = start_price_stream(config, bars)
+    
+    # Alert rules are evaluated against every scan and portfolio snapshot
+    alert_engine = load_alert_engine(config)
     
-    if args.full or args.portfolio_only:
-        portfolio_data = check_portfolio(config)
+    # Run selected workflow components
+    try:
+        if args.full or args.market_only:
+            market_data = run_stage(run, "market_scan", [run and run.run_id, config["market_scan"]],
+                                    lambda: run_market_scan(config, price_book, bars))
+        
+        if args.full or args.portfolio_only:
+            portfolio_data = run_stage(run, "portfolio", [run and run.run_id, config["portfolio"]],
+                                       lambda: check_portfolio(config, price_book))
+        
+        run_stage(run, "alerts", [market_data, portfolio_data, config.get("alerts")],
+                  lambda: evaluate_alerts(alert_engine, market_data, portfolio_data))
+    finally:
+        if price_stream:
+            price_stream.stop()
+        if bars is not None:
+            save_bars(bars)
+        if alert_engine is not None:
+            alert_engine.save_state(ALERT_STATE_PATH)
     
     if args.full or args.bots_only:
-        bot_data = hunt_bots(config)
+        bot_data = run_stage(run, "bot_hunt", [run and run.run_id, config["bot_hunt"]],
+                             lambda: hunt_bots(config))
     
-    # Generate playbook if we have at least some data
+    # Generate playbook if we have at least some data. Both stages depend only on the
+    # data above, so identical inputs reuse an earlier run's output
     if args.full and (market_data or portfolio_data or bot_data):
-        playbook = generate_playbook(market_data, portfolio_data, bot_data)
-        log_money_moves(market_data, portfolio_data, playbook)
+        playbook = run_stage(run, "playbook", [market_data, portfolio_data, bot_data, config.get("playbook")],
+                             lambda: generate_playbook(market_data, portfolio_data, bot_data, config.get("playbook")))
+        run_stage(run, "money_log", [market_data, portfolio_data, playbook],
+                  lambda: log_money_moves(market_data, portfolio_data, playbook))
     
     logger.info("Cash daily workflow completed successfully")
 
 if __name__ == "__main__":
     start_time = time.time()
-    logger.info("Starting Cash daily workflow")
     
     try:
         main()
@@ -422,4 +569,4 @@ if __name__ == "__main__":
         sys.exit(1)
     
     elapsed_time = time.time() - start_time
-    logger.info(f"Cash daily workflow completed in {elapsed_time:.2f} seconds")
\ No newline at end of file
+    logger.info(f"Cash daily workflow completed in {elapsed_time:.2f} seconds")
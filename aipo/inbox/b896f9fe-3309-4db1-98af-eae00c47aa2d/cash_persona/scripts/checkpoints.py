@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Run Checkpoints for Cash Daily Workflow
+
+This module lets an interrupted daily run pick up where it stopped:
+1. Stores each stage's output as a content-addressed JSON object (named by its SHA-256), and
+   records per run id which stages finished, with which inputs and output
+2. Skips a stage on resume when its checkpoint is valid: it finished with the same inputs and
+   its stored output still matches its hash; failed or missing stages run again
+3. Keys stages by a hash of their inputs, so a stage run on identical inputs in any earlier run
+   (e.g. the playbook for the same scan, portfolio, and bot hunt) is reused instead of re-run
+4. Prunes old runs and the outputs no remaining run refers to
+
+Usage:
+    from checkpoints import CheckpointStore
+    store = CheckpointStore("cache/checkpoints")
+    run = store.start_run("a1b2c3", {"full": True})      # or store.load_run("a1b2c3")
+    market_data = run.stage("market_scan", [run.run_id, config["market_scan"]], scan)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger("Cash.Checkpoints")
+
+# Marks a missing or corrupt stored output (None is a valid stage output)
+_MISSING = object()
+
+
+def _canonical(value):
+    """Stable JSON bytes for a value (sorted keys)"""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _write_atomic(path, data):
+    """Write bytes to a file via a temporary file and rename"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class CheckpointStore:
+    """Content-addressed stage outputs plus per-run stage manifests"""
+
+    def __init__(self, root):
+        """
+        Initialize the store
+
+        Args:
+            root (str): Checkpoint directory (objects/, keys/, and runs/ live under it)
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.keys_dir = self.root / "keys"
+        self.runs_dir = self.root / "runs"
+
+    @staticmethod
+    def key(stage, inputs):
+        """
+        Content key of a stage run
+
+        Args:
+            stage (str): Stage name
+            inputs (list): JSON-serializable inputs the output depends on
+
+        Returns:
+            str: SHA-256 hex digest
+        """
+        return hashlib.sha256(_canonical([stage, inputs])).hexdigest()
+
+    def put(self, value):
+        """
+        Store a stage output
+
+        Args:
+            value: JSON-serializable output
+
+        Returns:
+            str: Digest the output is stored under
+        """
+        data = _canonical(value)
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.objects_dir / f"{digest}.json"
+        if not path.exists():
+            _write_atomic(path, data)
+        return digest
+
+    def get(self, digest):
+        """
+        A stored output, verified against its digest
+
+        Args:
+            digest (str): Digest from put()
+
+        Returns:
+            The output, or _MISSING if it is gone or does not match its digest
+        """
+        path = self.objects_dir / f"{digest}.json"
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return _MISSING
+        if hashlib.sha256(data).hexdigest() != digest:
+            logger.warning(f"Checkpoint object {digest[:12]} is corrupt; ignoring it")
+            return _MISSING
+        return json.loads(data)
+
+    def lookup(self, key):
+        """Digest of the output a stage key produced in any run (None if unknown)"""
+        try:
+            return (self.keys_dir / key).read_text().strip() or None
+        except OSError:
+            return None
+
+    def remember(self, key, digest):
+        """Record that a stage key produced an output"""
+        _write_atomic(self.keys_dir / key, digest.encode("ascii"))
+
+    def start_run(self, run_id, args=None):
+        """
+        Begin a new run
+
+        Args:
+            run_id (str): Run id (the log pipeline's)
+            args (dict): Options the run was started with, restored on resume
+
+        Returns:
+            Run: The new run
+        """
+        run = Run(self, run_id, args or {})
+        run.save()
+        return run
+
+    def load_run(self, run_id):
+        """
+        Load an earlier run to resume it
+
+        Args:
+            run_id (str): Run id
+
+        Returns:
+            Run: The run, or None if it has no checkpoints
+        """
+        path = self.runs_dir / f"{run_id}.json"
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"No usable checkpoints for run {run_id}: {str(e)}")
+            return None
+        return Run(self, run_id, data.get("args", {}), data.get("stages", {}), data.get("created"))
+
+    def prune(self, max_age_days=7, now=None):
+        """
+        Drop runs older than `max_age_days`, then the outputs and keys no run refers to
+
+        Outputs younger than `max_age_days` are kept for cross-run reuse even when no run
+        refers to them.
+
+        Returns:
+            dict: Number of runs and objects removed
+        """
+        now = time.time() if now is None else now
+        cutoff = now - max_age_days * 86400
+        removed = {"runs": 0, "objects": 0}
+        referenced = set()
+        for path in self.runs_dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed["runs"] += 1
+                    continue
+                with open(path, 'r') as f:
+                    stages = json.load(f).get("stages", {})
+                referenced.update(entry["output"] for entry in stages.values() if entry.get("output"))
+            except (OSError, ValueError):
+                continue
+
+        for path in self.objects_dir.glob("*.json"):
+            try:
+                if path.stem not in referenced and path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed["objects"] += 1
+            except OSError:
+                continue
+        for path in self.keys_dir.glob("*"):
+            digest = self.lookup(path.name)
+            if not digest or not (self.objects_dir / f"{digest}.json").exists():
+                path.unlink(missing_ok=True)
+        return removed
+
+
+class Run:
+    """One workflow run's stage checkpoints"""
+
+    def __init__(self, store, run_id, args, stages=None, created=None):
+        """
+        Initialize the run (use CheckpointStore.start_run or load_run)
+
+        Args:
+            store (CheckpointStore): Store holding the outputs
+            run_id (str): Run id
+            args (dict): Options the run was started with
+            stages (dict): Stage name -> {status, key, output, finished_at, error}
+            created (float): When the run started
+        """
+        self.store = store
+        self.run_id = run_id
+        self.args = args
+        self.stages = stages or {}
+        self.created = created or time.time()
+
+    def save(self):
+        """Write the run's manifest (atomically)"""
+        _write_atomic(self.store.runs_dir / f"{self.run_id}.json", json.dumps({
+            "run_id": self.run_id,
+            "created": self.created,
+            "args": self.args,
+            "stages": self.stages
+        }, indent=4).encode("utf-8"))
+
+    def done(self, stage):
+        """Whether a stage finished in this run and its output is still stored"""
+        entry = self.stages.get(stage)
+        return bool(entry and entry.get("status") == "done"
+                    and (self.store.objects_dir / f"{entry['output']}.json").exists())
+
+    def stage(self, name, inputs, func):
+        """
+        Run a stage, or return its checkpointed output
+
+        Args:
+            name (str): Stage name
+            inputs (list): Everything the output depends on (JSON-serializable). Include the
+                run id for stages that fetch live data, so only derived stages are shared
+                across runs.
+            func (callable): Runs the stage and returns its JSON-serializable output
+
+        Returns:
+            The stage output
+        """
+        key = self.store.key(name, inputs)
+        entry = self.stages.get(name)
+        if entry and entry.get("status") == "done" and entry.get("key") == key:
+            value = self.store.get(entry["output"])
+            if value is not _MISSING:
+                logger.info(f"Skipping stage {name}: checkpointed in run {self.run_id}")
+                return value
+
+        digest = self.store.lookup(key)
+        if digest:
+            value = self.store.get(digest)
+            if value is not _MISSING:
+                logger.info(f"Reusing stage {name}: same inputs as an earlier run")
+                self._record(name, key, digest, reused=True)
+                return value
+
+        try:
+            value = func()
+        except Exception as e:
+            self.stages[name] = {"status": "failed", "key": key, "error": str(e), "finished_at": time.time()}
+            self.save()
+            raise
+
+        digest = self.store.put(value)
+        self.store.remember(key, digest)
+        self._record(name, key, digest)
+        return value
+
+    def _record(self, name, key, digest, reused=False):
+        """Mark a stage done"""
+        self.stages[name] = {"status": "done", "key": key, "output": digest, "finished_at": time.time()}
+        if reused:
+            self.stages[name]["reused"] = True
+        self.save()
+
+
+if __name__ == "__main__":
+    # If run directly, crash a run in its last stage, resume it, then show a second run
+    # reusing the derived stage
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    calls = []
+
+    def slow_stage(name, value, seconds=0.2, fail=False):
+        def run():
+            calls.append(name)
+            time.sleep(seconds)
+            if fail:
+                raise RuntimeError(f"{name} crashed")
+            return value
+        return run
+
+    with tempfile.TemporaryDirectory() as root:
+        store = CheckpointStore(root)
+        config = {"market_scan": {"top_coins": 100}, "bot_hunt": {"min_stars": 100}}
+
+        def workflow(run, fail_playbook=False):
+            market = run.stage("market_scan", [run.run_id, config["market_scan"]], slow_stage("market_scan", {"btc": 1}))
+            bots = run.stage("bot_hunt", [run.run_id, config["bot_hunt"]], slow_stage("bot_hunt", ["freqtrade"]))
+            return run.stage("playbook", [market, bots], slow_stage("playbook", "# Playbook", 0.01, fail_playbook))
+
+        report = {}
+        run = store.start_run("run-1", {"full": True})
+        try:
+            workflow(run, fail_playbook=True)
+        except RuntimeError as e:
+            report["first_attempt"] = {"error": str(e), "calls": list(calls)}
+
+        calls.clear()
+        start_time = time.perf_counter()
+        workflow(store.load_run("run-1"))
+        report["resume"] = {"calls": list(calls), "seconds": round(time.perf_counter() - start_time, 3)}
+
+        calls.clear()
+        workflow(store.start_run("run-2"))
+        report["next_run"] = {"calls": list(calls), "playbook": store.load_run("run-2").stages["playbook"]}
+        print(json.dumps(report, indent=4))
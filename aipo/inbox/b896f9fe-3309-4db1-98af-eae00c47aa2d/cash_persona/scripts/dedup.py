@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Near-Duplicate Detection for Cash Daily Workflow
+
+This module collapses the same story or post arriving through several feeds:
+1. Computes 64-bit SimHash signatures over word and word-pair features, a whole batch at a time
+   with NumPy
+2. Finds near-duplicates with an LSH index: the signature is split into bands, and items sharing
+   a band are compared by Hamming distance (any pair within `max_distance` bits shares a band)
+3. Keeps memory bounded with a time window and an item cap; old signatures are evicted in
+   arrival order
+4. Marks duplicates within a batch (`duplicate_of`) and repeats of items seen in earlier batches
+   (`seen_before`), and records on each kept item which other sources carried it
+
+Usage:
+    from dedup import DedupIndex
+    index = DedupIndex(window_seconds=86400)
+    unique = index.dedup(items)
+"""
+
+import re
+import time
+import hashlib
+import logging
+from collections import deque
+
+import numpy as np
+
+logger = logging.getLogger("Cash.Dedup")
+
+# Item fields that hold the text, in order
+TEXT_KEYS = ("title", "tweet", "summary", "text", "body")
+
+_WORD = re.compile(r"[a-z0-9$]+")
+_URL = re.compile(r"https?://\S+")
+
+# Feature hashes are reused across items; the cache is cleared when it grows past this size
+_HASH_CACHE_SIZE = 1000000
+_hash_cache = {}
+
+# Set bits in an int (int.bit_count is Python 3.10+)
+_popcount = getattr(int, "bit_count", None) or (lambda value: bin(value).count("1"))
+
+
+def item_text(item, text_keys=TEXT_KEYS):
+    """Join an item's text fields"""
+    return " ".join(str(item[key]) for key in text_keys if item.get(key))
+
+
+def features(text):
+    """
+    Word and adjacent word-pair features of a text (lowercased, URLs removed)
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        list: Feature strings
+    """
+    words = _WORD.findall(_URL.sub(" ", text.lower()))
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def _feature_hash(feature):
+    """Stable 64-bit hash of a feature (the same across processes, unlike hash())"""
+    value = _hash_cache.get(feature)
+    if value is None:
+        if len(_hash_cache) >= _HASH_CACHE_SIZE:
+            _hash_cache.clear()
+        value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+        _hash_cache[feature] = value
+    return value
+
+
+def simhash_many(texts):
+    """
+    SimHash signatures for a batch of texts
+
+    Every feature hash is unpacked to 64 bits, and each bit of a signature is set where
+    most of the text's features have it set. The bit counting for the whole batch is done
+    in one NumPy pass.
+
+    Args:
+        texts (list): Texts
+
+    Returns:
+        list: 64-bit signatures as ints (None for texts without features, e.g. emoji only)
+    """
+    hashes = []
+    counts = np.zeros(len(texts), dtype=np.int64)
+    for position, text in enumerate(texts):
+        text_features = features(text)
+        counts[position] = len(text_features)
+        hashes.extend(_feature_hash(feature) for feature in text_features)
+
+    if not hashes:
+        return [None] * len(texts)
+
+    bits = np.unpackbits(np.array(hashes, dtype="<u8").view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    nonempty = counts > 0
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))[nonempty]
+    ones = np.add.reduceat(bits, offsets, axis=0, dtype=np.int32)
+
+    majority = (2 * ones > counts[nonempty, None]).astype(np.uint8)
+    packed = np.packbits(majority, axis=1, bitorder="little").view("<u8").ravel()
+
+    signatures = iter(packed.tolist())
+    return [next(signatures) if has_features else None for has_features in nonempty.tolist()]
+
+
+def simhash(text):
+    """SimHash signature of one text (None if it has no features)"""
+    return simhash_many([text])[0]
+
+
+class DedupIndex:
+    """Time-windowed LSH index of SimHash signatures"""
+
+    def __init__(self, window_seconds=86400, max_items=100000, max_distance=3):
+        """
+        Initialize the index
+
+        Args:
+            window_seconds (float): How long a signature stays in the index
+            max_items (int): Maximum signatures kept (oldest evicted first)
+            max_distance (int): Largest Hamming distance counted as a near-duplicate
+        """
+        self.window_seconds = window_seconds
+        self.max_items = max_items
+        self.max_distance = max_distance
+        # max_distance + 1 bands guarantee any pair within max_distance bits shares a band
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self.band_mask = (1 << self.band_bits) - 1
+        self.buckets = [{} for _ in range(self.bands)]
+        self.entries = deque()   # entries in arrival order
+        self.next_id = 0
+        self.stats = {"added": 0, "duplicates": 0, "seen_before": 0, "evicted": 0}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _band_keys(self, signature):
+        """The signature's key in each band"""
+        return [(signature >> (band * self.band_bits)) & self.band_mask for band in range(self.bands)]
+
+    def find(self, signature):
+        """
+        Find an indexed near-duplicate of a signature
+
+        Args:
+            signature (int): SimHash signature
+
+        Returns:
+            dict: Closest matching entry (None if there is none)
+        """
+        best = None
+        best_distance = self.max_distance + 1
+        for band, key in enumerate(self._band_keys(signature)):
+            for entry in self.buckets[band].get(key, ()):
+                distance = _popcount(entry["signature"] ^ signature)
+                if distance < best_distance:
+                    best, best_distance = entry, distance
+                    if distance == 0:
+                        return best
+        return best
+
+    def add(self, signature, key, timestamp=None):
+        """
+        Index a signature
+
+        Args:
+            signature (int): SimHash signature
+            key: Identifier stored with the entry (e.g., the item's URL)
+            timestamp (float): Arrival time (now if None)
+
+        Returns:
+            dict: The new entry
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        entry = {"id": self.next_id, "signature": signature, "key": key, "timestamp": timestamp}
+        self.next_id += 1
+        for band, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band].setdefault(band_key, []).append(entry)
+        self.entries.append(entry)
+        self.stats["added"] += 1
+        if len(self.entries) > self.max_items:
+            self._evict_oldest()
+        return entry
+
+    def _evict_oldest(self):
+        """Remove the oldest signature from the index"""
+        entry = self.entries.popleft()
+        for band, band_key in enumerate(self._band_keys(entry["signature"])):
+            bucket = self.buckets[band][band_key]
+            bucket.remove(entry)
+            if not bucket:
+                del self.buckets[band][band_key]
+        self.stats["evicted"] += 1
+
+    def expire(self, now=None):
+        """
+        Evict signatures older than the window, and the oldest ones over the item cap
+
+        Args:
+            now (float): Current time (now if None)
+
+        Returns:
+            int: Number of signatures evicted
+        """
+        now = time.time() if now is None else now
+        cutoff = now - self.window_seconds
+        evicted = 0
+        while self.entries and (self.entries[0]["timestamp"] < cutoff or len(self.entries) > self.max_items):
+            self._evict_oldest()
+            evicted += 1
+        return evicted
+
+    def dedup(self, items, timestamp=None, text_keys=TEXT_KEYS):
+        """
+        Collapse near-duplicate items
+
+        Within the batch, every item after the first of its kind gets `duplicate_of` (the first
+        item's URL) and is left out of the returned list; the first gets `duplicate_sources`.
+        Items matching an earlier batch are kept but marked `seen_before`, and are not indexed
+        again, so a story stays in the index for one window from when it was first seen.
+
+        Args:
+            items (list): Feed items
+            timestamp (float): Batch time (now if None)
+            text_keys (tuple): Item fields holding the text
+
+        Returns:
+            list: Items that are not duplicates within the batch
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self.expire(timestamp)
+
+        firsts = {}   # entry id -> first item of its kind in this batch
+        unique = []
+        texts = [item_text(item, text_keys) for item in items]
+        for item, text, signature in zip(items, texts, simhash_many(texts)):
+            # Items with no words to compare (no text, or emoji only) are kept and not indexed
+            if signature is None:
+                unique.append(item)
+                continue
+
+            match = self.find(signature)
+            if match is None:
+                match = self.add(signature, item.get("url") or text[:80], timestamp)
+            elif match["id"] in firsts:
+                first = firsts[match["id"]]
+                item["duplicate_of"] = first.get("url") or match["key"]
+                sources = first.setdefault("duplicate_sources", [])
+                if item.get("source") != first.get("source") and item.get("source") not in sources:
+                    sources.append(item.get("source"))
+                self.stats["duplicates"] += 1
+                continue
+            else:
+                item["seen_before"] = True
+                self.stats["seen_before"] += 1
+
+            firsts[match["id"]] = item
+            unique.append(item)
+
+        return unique
+
+    def memory_items(self):
+        """Number of signatures held (bounded by max_items)"""
+        return len(self.entries)
+
+
+if __name__ == "__main__":
+    # If run directly, dedup a synthetic stream with reposted stories and time it
+    import json
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = random.Random(7)
+    vocabulary = ["bitcoin", "ethereum", "etf", "approved", "sec", "bank", "adds", "balance", "sheet",
+                  "market", "rally", "crash", "whales", "buying", "selling", "regulation", "exchange",
+                  "solana", "upgrade", "network", "fees", "record", "high", "low", "today", "breaking"]
+    stories = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 20))) for _ in range(20000)]
+
+    items = []
+    for i in range(100000):
+        story = rng.choice(stories)
+        if rng.random() < 0.3:
+            story = story + " " + rng.choice(["via @cryptonews", "| Bloomberg", "🚀", "read more"])
+        items.append({"title": story, "source": rng.choice(["reddit", "twitter", "cnbc", "bloomberg"]), "url": f"u{i}"})
+
+    index = DedupIndex(window_seconds=3600, max_items=50000)
+    start_time = time.perf_counter()
+    unique = []
+    for batch_start in range(0, len(items), 5000):
+        unique.extend(index.dedup(items[batch_start:batch_start + 5000], timestamp=batch_start / 100.0))
+    elapsed = time.perf_counter() - start_time
+
+    print(json.dumps({
+        "items": len(items),
+        "kept": len(unique),
+        "stats": index.stats,
+        "indexed": index.memory_items(),
+        "items_per_second": int(len(items) / elapsed)
+    }, indent=4))
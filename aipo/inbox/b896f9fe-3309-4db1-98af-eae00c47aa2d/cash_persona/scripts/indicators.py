@@ -0,0 +1,513 @@
+#!/usr/bin/env python3
+"""
+Technical Indicators for Cash Daily Workflow
+
+This module computes price and volume indicators for the whole coin universe at once:
+1. SMA/EMA, RSI, MACD, Bollinger bands, ATR, and volume z-scores over coin x time matrices
+2. An incremental engine that updates every indicator from each new bar in O(coins),
+   without recomputing full windows
+3. Opportunity and warning signals for MarketScanner (oversold/overbought, MACD crosses,
+   band breaks, volume spikes, high volatility)
+
+Matrices are NumPy arrays shaped (coins, time), oldest bar first, as returned by
+BarAggregator.matrix. NaN marks bars with no data.
+
+Usage:
+    from indicators import IndicatorEngine
+    engine = IndicatorEngine()
+    engine.update(aggregator, "1m")
+    opportunities, warnings = engine.signals()
+"""
+
+import logging
+
+import numpy as np
+
+from ohlcv import HIGH, LOW, CLOSE, VOLUME
+
+logger = logging.getLogger("Cash.Indicators")
+
+# Indicator periods
+DEFAULT_PARAMS = {
+    "rsi_period": 14,
+    "macd_fast": 12,
+    "macd_slow": 26,
+    "macd_signal": 9,
+    "bollinger_window": 20,
+    "bollinger_width": 2.0,
+    "atr_period": 14,
+    "volume_window": 20,
+    "resync_every": 1440
+}
+
+# Signal thresholds
+DEFAULT_THRESHOLDS = {
+    "rsi_oversold": 30.0,
+    "rsi_overbought": 70.0,
+    "volume_zscore": 3.0,
+    "atr_percent": 5.0
+}
+
+
+def ema(x, span=None, alpha=None):
+    """
+    Exponential moving average along the time axis
+
+    Args:
+        x (np.ndarray): (coins, time) matrix
+        span (int): EMA span (alpha = 2 / (span + 1))
+        alpha (float): Smoothing factor, overrides span (1 / period gives Wilder smoothing)
+
+    Returns:
+        np.ndarray: (coins, time) matrix
+    """
+    alpha = alpha if alpha is not None else 2.0 / (span + 1)
+    out = np.empty_like(x, dtype=float)
+    previous = np.full(x.shape[0], np.nan)
+    for t in range(x.shape[1]):
+        previous = _ema_step(previous, x[:, t], alpha)
+        out[:, t] = previous
+    return out
+
+
+def sma(x, window):
+    """Simple moving average along the time axis (NaN until `window` values are seen)"""
+    return rolling_mean_std(x, window)[0]
+
+
+def rolling_mean_std(x, window):
+    """
+    Rolling mean and population standard deviation along the time axis
+
+    Args:
+        x (np.ndarray): (coins, time) matrix
+        window (int): Window length
+
+    Returns:
+        tuple: (mean, std) matrices, NaN where the window holds fewer than `window` values
+    """
+    finite = np.isfinite(x)
+    values = np.where(finite, x, 0.0)
+    zeros = np.zeros((x.shape[0], 1))
+    total = np.cumsum(np.hstack([zeros, values]), axis=1)
+    squares = np.cumsum(np.hstack([zeros, values * values]), axis=1)
+    counts = np.cumsum(np.hstack([zeros, finite]), axis=1)
+
+    mean = np.full(x.shape, np.nan)
+    std = np.full(x.shape, np.nan)
+    if x.shape[1] >= window:
+        count = counts[:, window:] - counts[:, :-window]
+        window_mean, window_std = _mean_std(
+            total[:, window:] - total[:, :-window], squares[:, window:] - squares[:, :-window], count, window
+        )
+        mean[:, window - 1:] = window_mean
+        std[:, window - 1:] = window_std
+    return mean, std
+
+
+def rsi(close, period=14):
+    """
+    Relative strength index with Wilder smoothing
+
+    Args:
+        close (np.ndarray): (coins, time) closes
+        period (int): RSI period
+
+    Returns:
+        np.ndarray: (coins, time) RSI in 0-100 (NaN for the first bar)
+    """
+    delta = np.diff(close, axis=1, prepend=np.nan)
+    average_gain = ema(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), alpha=1.0 / period)
+    average_loss = ema(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), alpha=1.0 / period)
+    return _rsi_from_averages(average_gain, average_loss)
+
+
+def macd(close, fast=12, slow=26, signal=9):
+    """
+    Moving average convergence/divergence
+
+    Returns:
+        tuple: (macd, signal, histogram) matrices
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def bollinger(close, window=20, width=2.0):
+    """
+    Bollinger bands
+
+    Returns:
+        tuple: (lower, middle, upper) matrices
+    """
+    middle, std = rolling_mean_std(close, window)
+    return middle - width * std, middle, middle + width * std
+
+
+def atr(high, low, close, period=14):
+    """Average true range with Wilder smoothing"""
+    previous_close = np.hstack([np.full((close.shape[0], 1), np.nan), close[:, :-1]])
+    return ema(_true_range(high, low, previous_close), alpha=1.0 / period)
+
+
+def volume_zscore(volume, window=20):
+    """
+    Z-score of each bar's volume against the `window` bars before it
+
+    Returns:
+        np.ndarray: (coins, time) z-scores
+    """
+    mean, std = rolling_mean_std(volume, window)
+    previous_mean = np.hstack([np.full((volume.shape[0], 1), np.nan), mean[:, :-1]])
+    previous_std = np.hstack([np.full((volume.shape[0], 1), np.nan), std[:, :-1]])
+    return _zscore(volume, previous_mean, previous_std)
+
+
+def compute_all(high, low, close, volume, params=None):
+    """
+    Compute every indicator over full coin x time matrices
+
+    Args:
+        high, low, close, volume (np.ndarray): (coins, time) matrices
+        params (dict): Indicator periods (DEFAULT_PARAMS if None)
+
+    Returns:
+        dict: Indicator name -> (coins, time) matrix
+    """
+    p = dict(DEFAULT_PARAMS, **(params or {}))
+    macd_line, macd_signal, macd_histogram = macd(close, p["macd_fast"], p["macd_slow"], p["macd_signal"])
+    lower, middle, upper = bollinger(close, p["bollinger_window"], p["bollinger_width"])
+    return {
+        "close": close,
+        "sma": middle,
+        "ema_fast": ema(close, p["macd_fast"]),
+        "ema_slow": ema(close, p["macd_slow"]),
+        "rsi": rsi(close, p["rsi_period"]),
+        "macd": macd_line,
+        "macd_signal": macd_signal,
+        "macd_histogram": macd_histogram,
+        "bollinger_lower": lower,
+        "bollinger_upper": upper,
+        "atr": atr(high, low, close, p["atr_period"]),
+        "volume_zscore": volume_zscore(volume, p["volume_window"])
+    }
+
+
+class IndicatorEngine:
+    """Keeps indicators for every symbol of a BarAggregator up to date, one bar at a time"""
+
+    def __init__(self, params=None, thresholds=None):
+        """
+        Initialize the engine
+
+        Args:
+            params (dict): Indicator periods (merged with DEFAULT_PARAMS)
+            thresholds (dict): Signal thresholds (merged with DEFAULT_THRESHOLDS)
+        """
+        self.params = dict(DEFAULT_PARAMS, **(params or {}))
+        self.thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+        self.symbols = []
+        self.timeframe = None
+        self.bar_count = 0
+        self.steps_since_sync = 0
+        self.state = None
+        self.values = {}
+        self.previous_values = {}
+
+    @property
+    def history_needed(self):
+        """Bars of history needed for a full recompute"""
+        p = self.params
+        return max(p["macd_slow"] + p["macd_signal"], p["rsi_period"], p["atr_period"],
+                   p["bollinger_window"], p["volume_window"]) * 4
+
+    def update(self, aggregator, timeframe="1m"):
+        """
+        Fold the bars closed since the last update into the indicators
+
+        Recomputes from the aggregator's history on first use, when symbols are added, when
+        too many bars were missed, and every `resync_every` steps (to shed rounding drift).
+
+        Args:
+            aggregator (BarAggregator): Bar source
+            timeframe (str): Timeframe to evaluate
+
+        Returns:
+            int: Number of new bars processed
+        """
+        with aggregator.lock:
+            ring = aggregator.rings[aggregator.timeframes.index(timeframe)]
+            new_bars = ring.count - self.bar_count
+            symbols = aggregator.symbol_list()
+            window = max(self.params["bollinger_window"], self.params["volume_window"])
+
+            if ring.count == 0 or (new_bars <= 0 and symbols == self.symbols and timeframe == self.timeframe):
+                return 0
+
+            needs_sync = (
+                self.state is None
+                or timeframe != self.timeframe
+                or symbols != self.symbols
+                or new_bars + window + 1 > ring.capacity
+                or self.steps_since_sync + new_bars >= self.params["resync_every"]
+            )
+            bars = ring.last(self.history_needed if needs_sync else new_bars + window + 1)[:, :len(symbols), :]
+
+            if needs_sync:
+                self._warm_up(bars)
+            else:
+                for offset in range(new_bars, 0, -1):
+                    end = bars.shape[2] - offset + 1
+                    self._step(bars[:, :, :end])
+
+            self.symbols = symbols
+            self.timeframe = timeframe
+            self.bar_count = ring.count
+            return max(new_bars, 0)
+
+    def latest(self, name):
+        """Get the latest value of an indicator for every symbol (aligned with `symbols`)"""
+        return self.values.get(name)
+
+    def signals(self, names=None):
+        """
+        Turn the latest indicator values into MarketScanner opportunities and warnings
+
+        Args:
+            names (dict): Exchange symbol -> display name (optional)
+
+        Returns:
+            tuple: (opportunities, warnings) lists
+        """
+        if not self.values:
+            return [], []
+
+        names = names or {}
+        t = self.thresholds
+        v = self.values
+        previous_histogram = self.previous_values.get("macd_histogram", np.full(len(self.symbols), np.nan))
+        previous_close = self.previous_values.get("close", np.full(len(self.symbols), np.nan))
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            atr_percent = v["atr"] / v["close"] * 100
+            rules = [
+                ("opportunity", "rsi_oversold", v["rsi"] < t["rsi_oversold"], v["rsi"],
+                 lambda value: (t["rsi_oversold"] - value) / t["rsi_oversold"] + 0.5,
+                 "RSI {value:.1f} is below {threshold:.0f}", t["rsi_oversold"]),
+                ("warning", "rsi_overbought", v["rsi"] > t["rsi_overbought"], v["rsi"], None,
+                 "RSI {value:.1f} is above {threshold:.0f}", t["rsi_overbought"]),
+                ("opportunity", "macd_bullish_cross", (previous_histogram <= 0) & (v["macd_histogram"] > 0),
+                 v["macd"], lambda value: 0.6, "MACD crossed above its signal line", None),
+                ("warning", "macd_bearish_cross", (previous_histogram >= 0) & (v["macd_histogram"] < 0),
+                 v["macd"], None, "MACD crossed below its signal line", None),
+                ("opportunity", "bollinger_lower_break", v["close"] < v["bollinger_lower"], v["close"],
+                 lambda value: 0.55, "Price {value:.6g} closed below the lower Bollinger band", None),
+                ("warning", "bollinger_upper_break", v["close"] > v["bollinger_upper"], v["close"], None,
+                 "Price {value:.6g} closed above the upper Bollinger band", None),
+                ("opportunity", "volume_spike",
+                 (v["volume_zscore"] > t["volume_zscore"]) & (v["close"] > previous_close), v["volume_zscore"],
+                 lambda value: min(1.0, value / (2 * t["volume_zscore"]) + 0.25),
+                 "Volume z-score {value:.1f} on a rising bar", None),
+                ("warning", "volume_dump",
+                 (v["volume_zscore"] > t["volume_zscore"]) & (v["close"] < previous_close), v["volume_zscore"], None,
+                 "Volume z-score {value:.1f} on a falling bar", None),
+                ("warning", "high_volatility", atr_percent > t["atr_percent"], atr_percent, None,
+                 "ATR is {value:.1f}% of price (threshold {threshold:.0f}%)", t["atr_percent"])
+            ]
+
+        opportunities, warnings = [], []
+        for kind, signal_type, mask, values, confidence, message, threshold in rules:
+            for row in np.flatnonzero(np.nan_to_num(mask, nan=0).astype(bool)):
+                symbol = self.symbols[row]
+                value = float(values[row])
+                entry = {
+                    "type": signal_type,
+                    "coin": names.get(symbol, symbol),
+                    "symbol": _base_asset(symbol),
+                    "source": "indicators",
+                    "timeframe": self.timeframe,
+                    "value": round(value, 6),
+                    "message": message.format(value=value, threshold=threshold or 0)
+                }
+                if kind == "opportunity":
+                    entry["confidence"] = round(min(1.0, max(0.0, confidence(value))), 2)
+                    opportunities.append(entry)
+                else:
+                    warnings.append(entry)
+        return opportunities, warnings
+
+    def _warm_up(self, bars):
+        """Recompute all indicators over the full history and seed the incremental state"""
+        high, low, close, volume = bars[HIGH], bars[LOW], bars[CLOSE], bars[VOLUME]
+        p = self.params
+        full = compute_all(high, low, close, volume, p)
+
+        delta = np.diff(close, axis=1, prepend=np.nan)
+        alpha = 1.0 / p["rsi_period"]
+        self.state = {
+            "ema_fast": full["ema_fast"][:, -1].copy(),
+            "ema_slow": full["ema_slow"][:, -1].copy(),
+            "macd_signal": full["macd_signal"][:, -1].copy(),
+            "average_gain": ema(np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), alpha=alpha)[:, -1],
+            "average_loss": ema(np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), alpha=alpha)[:, -1],
+            "atr": full["atr"][:, -1].copy(),
+            "close": _window_sums(close, p["bollinger_window"]),
+            "volume": _window_sums(volume, p["volume_window"])
+        }
+        self.previous_values = {name: values[:, -2].copy() for name, values in full.items()} if close.shape[1] > 1 else {}
+        self.values = {name: values[:, -1].copy() for name, values in full.items()}
+        self.steps_since_sync = 0
+
+    def _step(self, bars):
+        """Fold the newest bar of `bars` (fields, coins, time) into the incremental state"""
+        p = self.params
+        s = self.state
+        high, low, close, volume = bars[HIGH, :, -1], bars[LOW, :, -1], bars[CLOSE, :, -1], bars[VOLUME, :, -1]
+        previous_close = bars[CLOSE, :, -2] if bars.shape[2] > 1 else np.full_like(close, np.nan)
+
+        s["ema_fast"] = _ema_step(s["ema_fast"], close, 2.0 / (p["macd_fast"] + 1))
+        s["ema_slow"] = _ema_step(s["ema_slow"], close, 2.0 / (p["macd_slow"] + 1))
+        macd_line = s["ema_fast"] - s["ema_slow"]
+        s["macd_signal"] = _ema_step(s["macd_signal"], macd_line, 2.0 / (p["macd_signal"] + 1))
+
+        delta = close - previous_close
+        s["average_gain"] = _ema_step(s["average_gain"], np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0)), 1.0 / p["rsi_period"])
+        s["average_loss"] = _ema_step(s["average_loss"], np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0)), 1.0 / p["rsi_period"])
+        s["atr"] = _ema_step(s["atr"], _true_range(high, low, previous_close), 1.0 / p["atr_period"])
+
+        # Volume z-score compares against the window before this bar, so score first, then slide
+        volume_mean, volume_std = _mean_std(*s["volume"], p["volume_window"])
+        zscore = _zscore(volume, volume_mean, volume_std)
+        _slide(s["close"], close, _leaving(bars[CLOSE], p["bollinger_window"]))
+        _slide(s["volume"], volume, _leaving(bars[VOLUME], p["volume_window"]))
+        middle, std = _mean_std(*s["close"], p["bollinger_window"])
+
+        self.previous_values = self.values
+        self.values = {
+            "close": close.copy(),
+            "sma": middle,
+            "ema_fast": s["ema_fast"],
+            "ema_slow": s["ema_slow"],
+            "rsi": _rsi_from_averages(s["average_gain"], s["average_loss"]),
+            "macd": macd_line,
+            "macd_signal": s["macd_signal"],
+            "macd_histogram": macd_line - s["macd_signal"],
+            "bollinger_lower": middle - p["bollinger_width"] * std,
+            "bollinger_upper": middle + p["bollinger_width"] * std,
+            "atr": s["atr"],
+            "volume_zscore": zscore
+        }
+        self.steps_since_sync += 1
+
+
+def _ema_step(previous, value, alpha):
+    """Advance an EMA by one bar (seeds from the first value, holds through NaN)"""
+    return np.where(
+        np.isnan(previous), value,
+        np.where(np.isnan(value), previous, previous + alpha * (value - previous))
+    )
+
+
+def _true_range(high, low, previous_close):
+    """True range; the bar's own range when there is no previous close"""
+    gap = np.fmax(np.abs(high - previous_close), np.abs(low - previous_close))
+    return np.fmax(high - low, gap)
+
+
+def _rsi_from_averages(average_gain, average_loss):
+    """RSI from smoothed gains and losses (50 for flat prices)"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        value = 100.0 - 100.0 / (1.0 + average_gain / average_loss)
+    value = np.where(average_loss == 0, np.where(average_gain > 0, 100.0, 50.0), value)
+    return np.where(np.isnan(average_gain) | np.isnan(average_loss), np.nan, value)
+
+
+def _mean_std(total, squares, count, window):
+    """Mean and population std from window sums (NaN unless the window is full)"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count
+        variance = np.maximum(squares / count - mean * mean, 0.0)
+    full = count >= window
+    return np.where(full, mean, np.nan), np.where(full, np.sqrt(variance), np.nan)
+
+
+def _zscore(value, mean, std):
+    """Z-score that is 0 when the window has no spread"""
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (value - mean) / std
+    return np.where(std == 0, 0.0, z)
+
+
+def _window_sums(x, window):
+    """[sum, sum of squares, count] of the finite values in the last `window` bars"""
+    tail = x[:, -window:]
+    finite = np.isfinite(tail)
+    values = np.where(finite, tail, 0.0)
+    return [values.sum(axis=1), (values * values).sum(axis=1), finite.sum(axis=1).astype(float)]
+
+
+def _leaving(history, window):
+    """Value dropping out of a `window`-bar window when the newest bar enters"""
+    if history.shape[1] <= window:
+        return np.full(history.shape[0], np.nan)
+    return history[:, -window - 1]
+
+
+def _slide(sums, entering, leaving):
+    """Slide window sums by one bar in place"""
+    for value, sign in ((entering, 1.0), (leaving, -1.0)):
+        finite = np.isfinite(value)
+        value = np.where(finite, value, 0.0)
+        sums[0] = sums[0] + sign * value
+        sums[1] = sums[1] + sign * value * value
+        sums[2] = sums[2] + sign * finite
+
+
+def _base_asset(symbol):
+    """Strip the quote asset from an exchange symbol (BTCUSDT -> BTC)"""
+    return symbol[:-4] if symbol.endswith("USDT") else symbol
+
+
+if __name__ == "__main__":
+    # If run directly, compare incremental updates against a full recompute
+    import json
+    import time
+    from ohlcv import BarAggregator
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = np.random.default_rng(11)
+    symbols = [f"C{i}USDT" for i in range(2500)]
+    prices = 10.0 + rng.random(len(symbols)) * 100.0
+    aggregator = BarAggregator({"1m": (60, 240), "1h": (3600, 24)}, max_symbols=len(symbols))
+    engine = IndicatorEngine()
+
+    start = 1_700_000_000 - (1_700_000_000 % 3600)
+    step_seconds = []
+    for minute in range(400):
+        prices *= 1.0 + rng.normal(0, 0.002, len(symbols))
+        aggregator.add_ticks(symbols, prices, rng.gamma(2.0, 50.0, len(symbols)), start + minute * 60 + 30)
+        started = time.perf_counter()
+        engine.update(aggregator, "1m")
+        step_seconds.append(time.perf_counter() - started)
+
+    full_engine = IndicatorEngine()
+    started = time.perf_counter()
+    full_engine.update(aggregator, "1m")
+    full_seconds = time.perf_counter() - started
+
+    drift = {
+        name: float(np.nanmax(np.abs(engine.values[name] - full_engine.values[name])))
+        for name in ("sma", "rsi", "macd", "atr", "bollinger_upper", "volume_zscore")
+    }
+    opportunities, warnings = engine.signals()
+    print(json.dumps({
+        "symbols": len(symbols),
+        "incremental_ms": round(float(np.median(step_seconds[200:])) * 1000, 3),
+        "full_recompute_ms": round(full_seconds * 1000, 3),
+        "max_difference": drift,
+        "opportunities": len(opportunities),
+        "warnings": len(warnings),
+        "sample": opportunities[:2] + warnings[:2]
+    }, indent=4))
@@ -11,11 +11,11 @@ fi
 
 # Install required packages
 echo "Installing required Python packages..."
-pip3 install requests || {
+pip3 install requests numpy || {
     echo "Failed to install packages with pip3. Trying with python3 -m pip..."
-    python3 -m pip install requests || {
+    python3 -m pip install requests numpy || {
         echo "Failed to install packages. Please install them manually:"
-        echo "pip install requests"
+        echo "pip install requests numpy"
         exit 1
     }
 }
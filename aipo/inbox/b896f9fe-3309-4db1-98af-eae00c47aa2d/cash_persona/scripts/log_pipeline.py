@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Logging Pipeline for Cash Daily Workflow
+
+This module takes log writes off the threads that produce them:
+1. Installs a QueueHandler on the root logger, so every Cash module's `logger.info` only puts a
+   record on an in-memory queue; a QueueListener thread does the formatting and file I/O
+2. Writes structured JSON lines (time, level, logger, message, run id, stage, thread, and any
+   exception) to a rotating log file, by size or by time, and plain text to the console
+3. Tags every record with the run id and the workflow stage running when it was logged
+4. Samples high-volume DEBUG records, keeping one in every N per logger
+
+Usage:
+    from log_pipeline import setup_logging, stage
+    pipeline = setup_logging(config.get("logging"), "logs")
+    with stage("market_scan"):
+        ...
+    pipeline.stop()
+"""
+
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger("Cash.LogPipeline")
+
+DEFAULT_LOGGING = {
+    "level": "INFO",
+    "file": "cash_daily.jsonl",
+    "console": True,
+    "rotation": {
+        "when": "midnight",   # time-based; set max_mb instead to rotate by size
+        "max_mb": None,
+        "backups": 14
+    },
+    "debug_sample_every": 10
+}
+
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Run id and current stage, shared by every thread of the process
+_context = {"run_id": None, "stage": None}
+_context_lock = threading.Lock()
+
+
+@contextmanager
+def stage(name):
+    """
+    Tag records logged inside the block with a workflow stage
+
+    Stages run one after another, so the stage is process-wide: worker threads a stage
+    starts log under it too.
+
+    Args:
+        name (str): Stage name, e.g. "market_scan"
+    """
+    with _context_lock:
+        previous, _context["stage"] = _context["stage"], name
+    try:
+        yield
+    finally:
+        with _context_lock:
+            _context["stage"] = previous
+
+
+class ContextFilter(logging.Filter):
+    """Adds the run id and current stage to each record"""
+
+    def filter(self, record):
+        record.run_id = _context["run_id"]
+        record.stage = _context["stage"]
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """Keeps one in every `every` DEBUG records per logger; other levels always pass"""
+
+    def __init__(self, every=10):
+        super().__init__()
+        self.every = max(1, int(every or 1))
+        self.counts = {}
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG or self.every == 1:
+            return True
+        # Racing threads may miscount by one now and then; a sample does not need a lock
+        count = self.counts.get(record.name, 0)
+        self.counts[record.name] = count + 1
+        return count % self.every == 0
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", None),
+            "stage": getattr(record, "stage", None),
+            "thread": record.threadName
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queues records as they are, rendering only tracebacks up front"""
+
+    def prepare(self, record):
+        # The stock prepare() copies and formats every record on the logging thread, and
+        # folds the traceback into the message. Only records with a traceback are copied
+        # here (to render it while the frames exist); formatting is the listener's job.
+        if record.exc_info:
+            record = logging.makeLogRecord(record.__dict__)
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogPipeline:
+    """Queue-based logging: the root logger's handler enqueues, a listener thread writes"""
+
+    def __init__(self, handlers, level=logging.INFO, debug_sample_every=10, run_id=None):
+        """
+        Initialize the pipeline (call start() to install it)
+
+        Args:
+            handlers (list): Handlers the listener thread writes to
+            level (int): Root logger level
+            debug_sample_every (int): Keep one in this many DEBUG records per logger
+            run_id (str): Id tagged on every record (a new one if None)
+        """
+        self.queue = queue.SimpleQueue()
+        self.handlers = handlers
+        self.level = level
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self.queue_handler = _QueueHandler(self.queue)
+        self.queue_handler.addFilter(DebugSampler(debug_sample_every))
+        self.queue_handler.addFilter(ContextFilter())
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._previous = None
+
+    def start(self):
+        """Route the root logger through the queue and start the writer thread"""
+        root = logging.getLogger()
+        self._previous = (root.handlers[:], root.level)
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(self.level)
+        _context["run_id"] = self.run_id
+        self.listener.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        """Write out every queued record, then restore the root logger's old handlers"""
+        if self._previous is None:
+            return
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        self.listener.stop()   # drains the queue first
+        for handler in self.handlers:
+            handler.close()
+        handlers, level = self._previous
+        for handler in handlers:
+            root.addHandler(handler)
+        root.setLevel(level)
+        self._previous = None
+        atexit.unregister(self.stop)
+
+
+def _file_handler(path, rotation):
+    """Rotating JSON-lines file handler, by size when max_mb is set and by time otherwise"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if rotation.get("max_mb"):
+        return logging.handlers.RotatingFileHandler(
+            path, maxBytes=int(rotation["max_mb"] * 1024 * 1024), backupCount=rotation.get("backups", 14),
+            encoding="utf-8", delay=True
+        )
+    return logging.handlers.TimedRotatingFileHandler(
+        path, when=rotation.get("when", "midnight"), backupCount=rotation.get("backups", 14),
+        encoding="utf-8", delay=True
+    )
+
+
+def setup_logging(config=None, log_dir="logs", run_id=None):
+    """
+    Install the logging pipeline for this process
+
+    Args:
+        config (dict): Overrides of DEFAULT_LOGGING (the `logging` config)
+        log_dir (str): Directory of the JSON log file
+        run_id (str): Id tagged on every record (a new one if None)
+
+    Returns:
+        LogPipeline: The started pipeline (stop() flushes it; it also stops at exit)
+    """
+    settings = {**DEFAULT_LOGGING, **(config or {})}
+    rotation = {**DEFAULT_LOGGING["rotation"], **(settings.get("rotation") or {})}
+
+    handlers = []
+    if settings.get("file"):
+        file_handler = _file_handler(Path(log_dir) / settings["file"], rotation)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if settings.get("console", True):
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    level = logging.getLevelName(str(settings.get("level", "INFO")).upper())
+    pipeline = LogPipeline(
+        handlers,
+        level=level if isinstance(level, int) else logging.INFO,
+        debug_sample_every=settings.get("debug_sample_every", 10),
+        run_id=run_id
+    )
+    return pipeline.start()
+
+
+if __name__ == "__main__":
+    # If run directly, log from worker threads through the pipeline and show the JSON lines
+    import tempfile
+    import concurrent.futures
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        pipeline = setup_logging({"level": "DEBUG", "console": False, "debug_sample_every": 100}, log_dir)
+        worker_logger = logging.getLogger("Cash.Demo")
+
+        def work(index):
+            for i in range(1000):
+                worker_logger.debug(f"Worker {index} step {i}")
+            worker_logger.info(f"Worker {index} done")
+
+        start_time = time.perf_counter()
+        with stage("demo_scan"):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(work, range(4)))
+            try:
+                raise ValueError("example failure")
+            except ValueError:
+                worker_logger.error("Stage failed", exc_info=True)
+        logging_seconds = time.perf_counter() - start_time
+        pipeline.stop()
+
+        lines = (Path(log_dir) / "cash_daily.jsonl").read_text().splitlines()
+        print(json.dumps({
+            "records_logged": 4 * 1001 + 1,
+            "records_written": len(lines),
+            "logging_seconds": round(logging_seconds, 3),
+            "first": json.loads(lines[0]),
+            "last": json.loads(lines[-1])
+        }, indent=4))
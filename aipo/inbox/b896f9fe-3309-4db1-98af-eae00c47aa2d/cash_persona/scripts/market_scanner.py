@@ -7,6 +7,13 @@ This module scans various sources for crypto market trends, opportunities, and i
 2. Reddit for trending discussions and sentiment
 3. Twitter for trending tweets and sentiment
 4. News sources for major announcements
+5. Technical indicators over rolling OHLCV bars for the top coins
+6. Lexicon-based sentiment scoring of social and news text, aggregated per coin
+7. Ticker extraction that tags raw-text items with the coins they mention
+8. Near-duplicate collapsing, so a story carried by several feeds counts once
+9. Time-decayed mention counts across scans, ranking rising coins by momentum
+
+Sources come from the plugin registry in sources.py and are enabled by `sources` in the config.
 
 Usage:
     from market_scanner import MarketScanner
@@ -16,28 +23,93 @@ Usage:
 
 import os
 import json
+import math
 import time
 import logging
-import requests
 from datetime import datetime
 from pathlib import Path
 import concurrent.futures
 
+from rate_limiter import get_scheduler, PRIORITY_MARKET
+from indicators import IndicatorEngine
+from sentiment import SentimentScorer
+from ticker_extractor import TickerExtractor
+from dedup import DedupIndex
+from trend_state import TrendState, scan_mentions
+from sources import DEFAULT_SOURCES, DEFAULT_FEEDS, enabled_sources, run_sources
+
 logger = logging.getLogger("Cash.MarketScanner")
 
+# Maximum page size of CoinGecko's /coins/markets
+COINGECKO_PAGE_SIZE = 250
+
+def trending_sources(results, coin):
+    """
+    List the sources a trending coin shows up in
+    
+    Args:
+        results (dict): Market scan results
+        coin (dict): Trending coin entry
+    
+    Returns:
+        list: Source names (one per mention)
+    """
+    symbol = (coin.get("symbol") or "").upper()
+    sources = []
+    if coin.get("source") == "coingecko":
+        sources.append("coingecko")
+    
+    # Check social and news feeds (Reddit, Twitter, news, and any plugin sources)
+    for feed in results.get("feeds", DEFAULT_FEEDS):
+        for item in results.get(feed, []):
+            if "duplicate_of" in item:
+                continue
+            if symbol in item.get("trending_coins", []):
+                sources.append(item.get("source"))
+    
+    return sources
+
 class MarketScanner:
     """Scans various sources for crypto market trends and opportunities"""
     
-    def __init__(self, config, api_keys):
+    def __init__(self, config, api_keys, scheduler=None, price_book=None, bars=None, indicator_engine=None,
+                 ticker_extractor=None, dedup_index=None, trend_state=None):
         """
         Initialize the market scanner
         
         Args:
             config (dict): Configuration for the market scanner
             api_keys (dict): API keys for various services
+            scheduler (RequestScheduler): Rate-limited request scheduler (shared scheduler if None)
+            price_book (PriceBook): Live price book fed by a price stream (optional)
+            bars (BarAggregator): Rolling OHLCV bars the scan snapshot is added to (optional)
+            indicator_engine (IndicatorEngine): Engine to reuse across scans (new one if None)
+            ticker_extractor (TickerExtractor): Extractor to reuse across scans (new one if None)
+            dedup_index (DedupIndex): Near-duplicate index to reuse across scans (new one if None)
+            trend_state (TrendState): Mention counts carried over from earlier scans (new one if None)
         """
         self.config = config
         self.api_keys = api_keys
+        self.scheduler = scheduler or get_scheduler()
+        self.price_book = price_book
+        self.bars = bars
+        indicator_config = config.get("indicators", {})
+        self.indicator_engine = indicator_engine or IndicatorEngine(
+            indicator_config.get("params"), indicator_config.get("thresholds")
+        )
+        self.sentiment_scorer = SentimentScorer(workers=config.get("sentiment", {}).get("workers"))
+        self.ticker_extractor = ticker_extractor or TickerExtractor()
+        dedup_config = config.get("dedup", {})
+        self.dedup_index = dedup_index or DedupIndex(
+            window_seconds=dedup_config.get("window_hours", 24) * 3600,
+            max_items=dedup_config.get("max_items", 100000),
+            max_distance=dedup_config.get("max_distance", 3)
+        )
+        trend_config = config.get("trend", {})
+        self.trend_state = trend_state or TrendState(
+            trend_config.get("fast_half_life_hours", 6), trend_config.get("slow_half_life_hours", 72)
+        )
+        self.coingecko_api_url = config.get("coingecko_api_url", "https://api.coingecko.com/api/v3")
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "trending_coins": [],
@@ -56,21 +128,18 @@ class MarketScanner:
         """
         logger.info("Starting market scan")
         
-        # Run scans in parallel
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(self._scan_coingecko),
-                executor.submit(self._scan_reddit),
-                executor.submit(self._scan_twitter),
-                executor.submit(self._scan_news)
-            ]
-            
-            # Wait for all scans to complete
-            for future in concurrent.futures.as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    logger.error(f"Error in market scan: {str(e)}", exc_info=True)
+        # Run the enabled sources in parallel
+        sources = enabled_sources(self.config.get("sources", DEFAULT_SOURCES))
+        self.results["feeds"] = [source.result_key for source in sources if source.feed]
+        self.results["source_status"] = run_sources(
+            sources, self, workers=self.config.get("source_workers"), timeout=self.config.get("source_timeout")
+        )
+        
+        # Overlay live prices from the price stream, if one is running
+        self._apply_live_prices()
+        
+        # Add this snapshot to the rolling bars and bring the indicators up to date
+        self._update_indicators()
         
         # Process results to find opportunities and warnings
         self._process_results()
@@ -79,17 +148,29 @@ class MarketScanner:
         return self.results
     
     def _scan_coingecko(self):
-        """Scan CoinGecko for price data and trending coins"""
+        """
+        Scan CoinGecko for price data and trending coins
+        
+        The results are built in a dict of their own and merged by run_sources only if the
+        scan finishes within the source timeout, so an overrunning scan never touches
+        self.results while the rest of the scan reads it.
+        
+        Returns:
+            dict: trending_coins, market_sentiment, top_coins, and warnings to merge
+        """
         logger.info("Scanning CoinGecko")
+        results = {"trending_coins": [], "market_sentiment": {}, "warnings": []}
         
         try:
             # Get trending coins
-            response = requests.get("https://api.coingecko.com/api/v3/search/trending")
+            response = self.scheduler.get(
+                "coingecko", f"{self.coingecko_api_url}/search/trending", priority=PRIORITY_MARKET, use_cache=True
+            )
             if response.status_code == 200:
                 data = response.json()
                 for coin in data.get("coins", []):
                     item = coin.get("item", {})
-                    self.results["trending_coins"].append({
+                    results["trending_coins"].append({
                         "id": item.get("id"),
                         "name": item.get("name"),
                         "symbol": item.get("symbol"),
@@ -100,10 +181,12 @@ class MarketScanner:
                     })
             
             # Get global market data
-            response = requests.get("https://api.coingecko.com/api/v3/global")
+            response = self.scheduler.get(
+                "coingecko", f"{self.coingecko_api_url}/global", priority=PRIORITY_MARKET, use_cache=True
+            )
             if response.status_code == 200:
                 data = response.json().get("data", {})
-                self.results["market_sentiment"]["global"] = {
+                results["market_sentiment"]["global"] = {
                     "market_cap_change_percentage_24h_usd": data.get("market_cap_change_percentage_24h_usd"),
                     "market_cap_percentage": data.get("market_cap_percentage"),
                     "total_market_cap": data.get("total_market_cap", {}).get("usd"),
@@ -112,549 +195,291 @@ class MarketScanner:
                 }
             
             # Get top coins by market cap
-            top_n = self.config.get("top_coins", 100)
-            response = requests.get(
-                f"https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page={top_n}&page=1"
-            )
-            if response.status_code == 200:
-                self.results["top_coins"] = []
-                for coin in response.json():
-                    self.results["top_coins"].append({
-                        "id": coin.get("id"),
-                        "symbol": coin.get("symbol"),
-                        "name": coin.get("name"),
-                        "current_price": coin.get("current_price"),
-                        "market_cap": coin.get("market_cap"),
-                        "market_cap_rank": coin.get("market_cap_rank"),
-                        "price_change_percentage_24h": coin.get("price_change_percentage_24h"),
-                        "price_change_percentage_7d": coin.get("price_change_percentage_7d"),
-                        "source": "coingecko"
-                    })
+            results["top_coins"] = self._fetch_top_coins(self.config.get("top_coins", 100), results["warnings"])
         
         except Exception as e:
             logger.error(f"Error scanning CoinGecko: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
+            results["warnings"].append({
                 "source": "coingecko",
                 "message": f"Failed to scan CoinGecko: {str(e)}"
             })
-    
-    def _scan_reddit(self):
-        """Scan Reddit for trending discussions and sentiment"""
-        logger.info("Scanning Reddit")
-        
-        # This is a placeholder - in a real implementation, we would use PRAW (Python Reddit API Wrapper)
-        # or scrape Reddit for trending discussions
-        
-        try:
-            # Simulate Reddit data for now
-            self.results["reddit_trends"] = [
-                {
-                    "subreddit": "r/CryptoCurrency",
-                    "title": "Daily Discussion - May 11, 2025",
-                    "sentiment": "neutral",
-                    "trending_coins": ["BTC", "ETH", "SOL"],
-                    "url": "https://reddit.com/r/CryptoCurrency/comments/daily",
-                    "source": "reddit"
-                },
-                {
-                    "subreddit": "r/Bitcoin",
-                    "title": "Bitcoin breaks $100k!",
-                    "sentiment": "positive",
-                    "trending_coins": ["BTC"],
-                    "url": "https://reddit.com/r/Bitcoin/comments/btc100k",
-                    "source": "reddit"
-                },
-                {
-                    "subreddit": "r/SatoshiStreetBets",
-                    "title": "What's your moonshot for this week?",
-                    "sentiment": "bullish",
-                    "trending_coins": ["PEPE", "DOGE", "SHIB"],
-                    "url": "https://reddit.com/r/SatoshiStreetBets/comments/moonshot",
-                    "source": "reddit"
-                }
-            ]
-        
-        except Exception as e:
-            logger.error(f"Error scanning Reddit: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
-                "source": "reddit",
-                "message": f"Failed to scan Reddit: {str(e)}"
-            })
-    
-    def _scan_twitter(self):
-        """Scan Twitter for trending tweets and sentiment"""
-        logger.info("Scanning Twitter")
-        
-        # This is a placeholder - in a real implementation, we would use the Twitter API
-        # or scrape Twitter for trending tweets
         
-        try:
-            # Simulate Twitter data for now
-            self.results["twitter_trends"] = [
-                {
-                    "username": "elonmusk",
-                    "tweet": "Dogecoin to the moon! 🚀",
-                    "sentiment": "positive",
-                    "trending_coins": ["DOGE"],
-                    "url": "https://twitter.com/elonmusk/status/doge",
-                    "source": "twitter"
-                },
-                {
-                    "username": "VitalikButerin",
-                    "tweet": "Excited about the latest Ethereum upgrade. Scaling solutions are coming.",
-                    "sentiment": "positive",
-                    "trending_coins": ["ETH"],
-                    "url": "https://twitter.com/VitalikButerin/status/eth",
-                    "source": "twitter"
-                },
-                {
-                    "username": "CryptoWhale",
-                    "tweet": "Bear market incoming. Protect your assets.",
-                    "sentiment": "negative",
-                    "trending_coins": ["BTC", "ETH"],
-                    "url": "https://twitter.com/CryptoWhale/status/bear",
-                    "source": "twitter"
-                }
-            ]
-        
-        except Exception as e:
-            logger.error(f"Error scanning Twitter: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
-                "source": "twitter",
-                "message": f"Failed to scan Twitter: {str(e)}"
-            })
+        return results
     
-    def _scan_news(self):
-        """Scan news sources for major announcements"""
-        logger.info("Scanning news sources")
-        
-        # This is a placeholder - in a real implementation, we would use a news API
-        # or scrape news sources for major announcements
-        
-        try:
-            # Simulate news data for now
-            self.results["news"] = [
-                {
-                    "title": "SEC Approves Spot Ethereum ETF",
-                    "summary": "The SEC has approved the first spot Ethereum ETF, opening the door for institutional investment.",
-                    "sentiment": "positive",
-                    "trending_coins": ["ETH"],
-                    "url": "https://example.com/news/eth-etf",
-                    "source": "bloomberg"
-                },
-                {
-                    "title": "Major Bank Adds Bitcoin to Balance Sheet",
-                    "summary": "A major US bank has added Bitcoin to its balance sheet, following the trend of institutional adoption.",
-                    "sentiment": "positive",
-                    "trending_coins": ["BTC"],
-                    "url": "https://example.com/news/bank-btc",
-                    "source": "cnbc"
-                },
-                {
-                    "title": "New Regulations Coming for Crypto Exchanges",
-                    "summary": "Regulators are planning new rules for crypto exchanges, focusing on consumer protection.",
-                    "sentiment": "neutral",
-                    "trending_coins": ["BNB", "CRO"],
-                    "url": "https://example.com/news/regulations",
-                    "source": "coindesk"
-                }
-            ]
-        
-        except Exception as e:
-            logger.error(f"Error scanning news: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
-                "source": "news",
-                "message": f"Failed to scan news: {str(e)}"
-            })
-    
-    def _process_results(self):
-        """Process results to find opportunities and warnings"""
-        logger.info("Processing market scan results")
-        
-        # Find opportunities based on trending coins and positive sentiment
-        for coin in self.results.get("trending_coins", []):
-            # Check if coin is trending across multiple sources
-            sources = []
-            if coin.get("source") == "coingecko":
-                sources.append("coingecko")
-            
-            # Check Reddit trends
-            for reddit_trend in self.results.get("reddit_trends", []):
-                if coin.get("symbol", "").upper() in reddit_trend.get("trending_coins", []):
-                    sources.append("reddit")
-            
-            # Check Twitter trends
-            for twitter_trend in self.results.get("twitter_trends", []):
-                if coin.get("symbol", "").upper() in twitter_trend.get("trending_coins", []):
-                    sources.append("twitter")
-            
-            # Check news
-            for news_item in self.results.get("news", []):
-                if coin.get("symbol", "").upper() in news_item.get("trending_coins", []):
-                    sources.append(news_item.get("source"))
-            
-            # If coin is trending across multiple sources, add it as an opportunity
-            if len(sources) >= 2:
-                self.results["opportunities"].append({
-                    "type": "trending_coin",
-                    "coin": coin.get("name"),
-                    "symbol": coin.get("symbol"),
-                    "sources": sources,
-                    "confidence": len(sources) / 4.0  # Normalize to 0-1 range (4 possible sources)
-                })
-        
-        # Find warnings based on negative sentiment
-        # (This is a placeholder - in a real implementation, we would use more sophisticated analysis)
-        for twitter_trend in self.results.get("twitter_trends", []):
-            if twitter_trend.get("sentiment") == "negative":
-                for coin in twitter_trend.get("trending_coins", []):
-                    self.results["warnings"].append({
-                        "type": "negative_sentiment",
-                        "coin": coin,
-                        "source": "twitter",
-                        "message": twitter_trend.get("tweet")
-                    })
-        
-        logger.info(f"Found {len(self.results['opportunities'])} opportunities and {len(self.results['warnings'])} warnings")
-
-
-if __name__ == "__main__":
-    # If run directly, perform a test scan
-    logging.basicConfig(level=logging.INFO)
-    
-    # Test configuration
-    config = {
-        "top_coins": 10,
-        "trending_threshold": 5,
-        "sources": ["coingecko", "reddit", "twitter"]
-    }
-    
-    api_keys = {
-        "coingecko": "",
-        "coinmarketcap": ""
-    }
-    
-    # Run test scan
-    scanner = MarketScanner(config, api_keys)
-    results = scanner.scan()
-    
-    # Print results
-    print(json.dumps(results, indent=4))#!/usr/bin/env python3
-"""
-Market Scanner for Cash Daily Workflow
-
-This module scans various sources for crypto market trends, opportunities, and insights:
-1. CoinGecko/CoinMarketCap for price data and trending coins
-2. Reddit for trending discussions and sentiment
-3. Twitter for trending tweets and sentiment
-4. News sources for major announcements
-
-Usage:
-    from market_scanner import MarketScanner
-    scanner = MarketScanner(config, api_keys)
-    results = scanner.scan()
-"""
-
-import os
-import json
-import time
-import logging
-import requests
-from datetime import datetime
-from pathlib import Path
-import concurrent.futures
-
-logger = logging.getLogger("Cash.MarketScanner")
-
-class MarketScanner:
-    """Scans various sources for crypto market trends and opportunities"""
-    
-    def __init__(self, config, api_keys):
+    def _fetch_top_coins(self, top_n, warnings=None):
         """
-        Initialize the market scanner
+        Fetch the top coins by market cap, one CoinGecko page per request
+        
+        Pages are fetched concurrently (paced by the scheduler) and their rows are
+        collected as each page arrives, then ordered by market cap rank.
         
         Args:
-            config (dict): Configuration for the market scanner
-            api_keys (dict): API keys for various services
-        """
-        self.config = config
-        self.api_keys = api_keys
-        self.results = {
-            "timestamp": datetime.now().isoformat(),
-            "trending_coins": [],
-            "market_sentiment": {},
-            "opportunities": [],
-            "warnings": [],
-            "news": []
-        }
-    
-    def scan(self):
-        """
-        Run the market scan
+            top_n (int): Number of coins to fetch
+            warnings (list): Receives a warning for each page that fails
         
         Returns:
-            dict: Scan results
+            list: Up to top_n coins, by market cap rank
         """
-        logger.info("Starting market scan")
-        
-        # Run scans in parallel
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(self._scan_coingecko),
-                executor.submit(self._scan_reddit),
-                executor.submit(self._scan_twitter),
-                executor.submit(self._scan_news)
-            ]
+        per_page = min(top_n, COINGECKO_PAGE_SIZE)
+        pages = math.ceil(top_n / per_page) if per_page > 0 else 0
+        workers = max(1, min(pages, self.config.get("page_workers", 8)))
+        warnings = warnings if warnings is not None else []
+        top_coins = []
+        
+        logger.info(f"Fetching top {top_n} coins in {pages} pages ({workers} workers)")
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._fetch_markets_page, page, per_page): page
+                for page in range(1, pages + 1)
+            }
             
-            # Wait for all scans to complete
             for future in concurrent.futures.as_completed(futures):
+                page = futures[future]
                 try:
-                    future.result()
+                    coins = future.result()
                 except Exception as e:
-                    logger.error(f"Error in market scan: {str(e)}", exc_info=True)
+                    logger.error(f"Error fetching CoinGecko markets page {page}: {str(e)}", exc_info=True)
+                    warnings.append({
+                        "source": "coingecko",
+                        "message": f"Failed to fetch top coins page {page}: {str(e)}"
+                    })
+                    continue
+                
+                top_coins.extend(self._parse_market_row(coin) for coin in coins)
+        
+        # Pages arrive out of order; restore market cap order and trim to top_n
+        top_coins.sort(key=lambda coin: coin.get("market_cap_rank") or float("inf"))
+        del top_coins[top_n:]
+        return top_coins
+    
+    def _fetch_markets_page(self, page, per_page):
+        """
+        Fetch one page of CoinGecko's /coins/markets
         
-        # Process results to find opportunities and warnings
-        self._process_results()
+        Args:
+            page (int): Page number (1-based)
+            per_page (int): Coins per page
         
-        logger.info("Market scan completed")
-        return self.results
+        Returns:
+            list: Raw coin rows
+        """
+        response = self.scheduler.get(
+            "coingecko",
+            f"{self.coingecko_api_url}/coins/markets",
+            priority=PRIORITY_MARKET,
+            params={
+                "vs_currency": "usd",
+                "order": "market_cap_desc",
+                "per_page": per_page,
+                "page": page,
+                "price_change_percentage": "1h,24h,7d"
+            }
+        )
+        if response.status_code != 200:
+            raise Exception(f"CoinGecko API error (HTTP {response.status_code}): {response.text[:200]}")
+        return response.json()
     
-    def _scan_coingecko(self):
-        """Scan CoinGecko for price data and trending coins"""
-        logger.info("Scanning CoinGecko")
+    def _parse_market_row(self, coin):
+        """Convert a /coins/markets row into a top coin entry"""
+        return {
+            "id": coin.get("id"),
+            "symbol": coin.get("symbol"),
+            "name": coin.get("name"),
+            "current_price": coin.get("current_price"),
+            "market_cap": coin.get("market_cap"),
+            "market_cap_rank": coin.get("market_cap_rank"),
+            "total_volume": coin.get("total_volume"),
+            "price_change_percentage_1h": coin.get("price_change_percentage_1h_in_currency"),
+            "price_change_percentage_24h": coin.get("price_change_percentage_24h"),
+            "price_change_percentage_7d": coin.get("price_change_percentage_7d_in_currency", coin.get("price_change_percentage_7d")),
+            "source": "coingecko"
+        }
+    
+    def _apply_live_prices(self):
+        """Add the latest streamed price to each top coin (no API calls)"""
+        if self.price_book is None:
+            return
+        
+        max_age = self.config.get("price_max_age", 300)
+        for coin in self.results.get("top_coins", []):
+            price = self.price_book.get_price(f"{(coin.get('symbol') or '').upper()}USDT", max_age=max_age)
+            if price is not None:
+                coin["live_price"] = price
+    
+    def _update_indicators(self):
+        """Fold the scan into the OHLCV bars and update indicators for every symbol"""
+        indicator_config = self.config.get("indicators", {})
+        if self.bars is None or not indicator_config.get("enabled", True):
+            return
         
         try:
-            # Get trending coins
-            response = requests.get("https://api.coingecko.com/api/v3/search/trending")
-            if response.status_code == 200:
-                data = response.json()
-                for coin in data.get("coins", []):
-                    item = coin.get("item", {})
-                    self.results["trending_coins"].append({
-                        "id": item.get("id"),
-                        "name": item.get("name"),
-                        "symbol": item.get("symbol"),
-                        "market_cap_rank": item.get("market_cap_rank"),
-                        "price_btc": item.get("price_btc"),
-                        "score": item.get("score"),
-                        "source": "coingecko"
-                    })
-            
-            # Get global market data
-            response = requests.get("https://api.coingecko.com/api/v3/global")
-            if response.status_code == 200:
-                data = response.json().get("data", {})
-                self.results["market_sentiment"]["global"] = {
-                    "market_cap_change_percentage_24h_usd": data.get("market_cap_change_percentage_24h_usd"),
-                    "market_cap_percentage": data.get("market_cap_percentage"),
-                    "total_market_cap": data.get("total_market_cap", {}).get("usd"),
-                    "total_volume": data.get("total_volume", {}).get("usd"),
-                    "source": "coingecko"
-                }
-            
-            # Get top coins by market cap
-            top_n = self.config.get("top_coins", 100)
-            response = requests.get(
-                f"https://api.coingecko.com/api/v3/coins/markets?vs_currency=usd&order=market_cap_desc&per_page={top_n}&page=1"
-            )
-            if response.status_code == 200:
-                self.results["top_coins"] = []
-                for coin in response.json():
-                    self.results["top_coins"].append({
-                        "id": coin.get("id"),
-                        "symbol": coin.get("symbol"),
-                        "name": coin.get("name"),
-                        "current_price": coin.get("current_price"),
-                        "market_cap": coin.get("market_cap"),
-                        "market_cap_rank": coin.get("market_cap_rank"),
-                        "price_change_percentage_24h": coin.get("price_change_percentage_24h"),
-                        "price_change_percentage_7d": coin.get("price_change_percentage_7d"),
-                        "source": "coingecko"
-                    })
-        
+            self.bars.add_scan(self.results)
+            timeframe = indicator_config.get("timeframe", "1m")
+            new_bars = self.indicator_engine.update(self.bars, timeframe)
+            self.results["indicators"] = {
+                "timeframe": timeframe,
+                "symbols": len(self.indicator_engine.symbols),
+                "new_bars": new_bars
+            }
         except Exception as e:
-            logger.error(f"Error scanning CoinGecko: {str(e)}", exc_info=True)
+            logger.error(f"Error updating indicators: {str(e)}", exc_info=True)
             self.results["warnings"].append({
-                "source": "coingecko",
-                "message": f"Failed to scan CoinGecko: {str(e)}"
+                "source": "indicators",
+                "message": f"Failed to update indicators: {str(e)}"
             })
     
-    def _scan_reddit(self):
-        """Scan Reddit for trending discussions and sentiment"""
-        logger.info("Scanning Reddit")
+    def _add_indicator_signals(self):
+        """Add indicator-based opportunities and warnings for the top coins"""
+        if "indicators" not in self.results:
+            return
+        
+        names = {
+            f"{(coin.get('symbol') or '').upper()}USDT": coin.get("name")
+            for coin in self.results.get("top_coins", [])
+        }
+        opportunities, warnings = self.indicator_engine.signals(names)
+        if names:
+            opportunities = [entry for entry in opportunities if f"{entry['symbol']}USDT" in names]
+            warnings = [entry for entry in warnings if f"{entry['symbol']}USDT" in names]
         
-        # This is a placeholder - in a real implementation, we would use PRAW (Python Reddit API Wrapper)
-        # or scrape Reddit for trending discussions
+        self.results["opportunities"].extend(opportunities)
+        self.results["warnings"].extend(warnings)
+    
+    def _dedup_items(self, items):
+        """Drop near-duplicate feed items (duplicates stay in their feeds, marked duplicate_of)"""
+        if not self.config.get("dedup", {}).get("enabled", True):
+            return items
         
         try:
-            # Simulate Reddit data for now
-            self.results["reddit_trends"] = [
-                {
-                    "subreddit": "r/CryptoCurrency",
-                    "title": "Daily Discussion - May 11, 2025",
-                    "sentiment": "neutral",
-                    "trending_coins": ["BTC", "ETH", "SOL"],
-                    "url": "https://reddit.com/r/CryptoCurrency/comments/daily",
-                    "source": "reddit"
-                },
-                {
-                    "subreddit": "r/Bitcoin",
-                    "title": "Bitcoin breaks $100k!",
-                    "sentiment": "positive",
-                    "trending_coins": ["BTC"],
-                    "url": "https://reddit.com/r/Bitcoin/comments/btc100k",
-                    "source": "reddit"
-                },
-                {
-                    "subreddit": "r/SatoshiStreetBets",
-                    "title": "What's your moonshot for this week?",
-                    "sentiment": "bullish",
-                    "trending_coins": ["PEPE", "DOGE", "SHIB"],
-                    "url": "https://reddit.com/r/SatoshiStreetBets/comments/moonshot",
-                    "source": "reddit"
-                }
-            ]
+            unique = self.dedup_index.dedup(items)
+            if len(unique) < len(items):
+                logger.info(f"Collapsed {len(items) - len(unique)} near-duplicate items")
+            return unique
         
         except Exception as e:
-            logger.error(f"Error scanning Reddit: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
-                "source": "reddit",
-                "message": f"Failed to scan Reddit: {str(e)}"
-            })
+            logger.error(f"Error deduplicating items: {str(e)}", exc_info=True)
+            return items
     
-    def _scan_twitter(self):
-        """Scan Twitter for trending tweets and sentiment"""
-        logger.info("Scanning Twitter")
+    def _update_trend_state(self, items):
+        """
+        Add this scan's mentions to the trend state and list the rising coins
         
-        # This is a placeholder - in a real implementation, we would use the Twitter API
-        # or scrape Twitter for trending tweets
+        Returns:
+            dict: Momentum per tracked symbol mentioned in this scan
+        """
+        trend_config = self.config.get("trend", {})
+        if not trend_config.get("enabled", True):
+            return {}
         
         try:
-            # Simulate Twitter data for now
-            self.results["twitter_trends"] = [
-                {
-                    "username": "elonmusk",
-                    "tweet": "Dogecoin to the moon! 🚀",
-                    "sentiment": "positive",
-                    "trending_coins": ["DOGE"],
-                    "url": "https://twitter.com/elonmusk/status/doge",
-                    "source": "twitter"
-                },
-                {
-                    "username": "VitalikButerin",
-                    "tweet": "Excited about the latest Ethereum upgrade. Scaling solutions are coming.",
-                    "sentiment": "positive",
-                    "trending_coins": ["ETH"],
-                    "url": "https://twitter.com/VitalikButerin/status/eth",
-                    "source": "twitter"
-                },
-                {
-                    "username": "CryptoWhale",
-                    "tweet": "Bear market incoming. Protect your assets.",
-                    "sentiment": "negative",
-                    "trending_coins": ["BTC", "ETH"],
-                    "url": "https://twitter.com/CryptoWhale/status/bear",
-                    "source": "twitter"
-                }
-            ]
+            now = time.time()
+            mentions = scan_mentions(self.results, items)
+            self.trend_state.update(mentions, now)
+            
+            momentum = {}
+            for symbol in {mention[0].upper() for mention in mentions}:
+                momentum[symbol] = self.trend_state.stats(symbol, now)["momentum"]
+            
+            self.results["rising_coins"] = self.trend_state.rising(
+                top=trend_config.get("top", 10),
+                min_mentions=trend_config.get("min_mentions", 3),
+                min_momentum=trend_config.get("rising_threshold", 2.0),
+                now=now
+            )
+            return momentum
         
         except Exception as e:
-            logger.error(f"Error scanning Twitter: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
-                "source": "twitter",
-                "message": f"Failed to scan Twitter: {str(e)}"
-            })
+            logger.error(f"Error updating trend state: {str(e)}", exc_info=True)
+            return {}
     
-    def _scan_news(self):
-        """Scan news sources for major announcements"""
-        logger.info("Scanning news sources")
-        
-        # This is a placeholder - in a real implementation, we would use a news API
-        # or scrape news sources for major announcements
-        
+    def _tag_mentions(self, items):
+        """Fill in trending_coins for feed items from their text, using the scanned coin universe"""
         try:
-            # Simulate news data for now
-            self.results["news"] = [
-                {
-                    "title": "SEC Approves Spot Ethereum ETF",
-                    "summary": "The SEC has approved the first spot Ethereum ETF, opening the door for institutional investment.",
-                    "sentiment": "positive",
-                    "trending_coins": ["ETH"],
-                    "url": "https://example.com/news/eth-etf",
-                    "source": "bloomberg"
-                },
-                {
-                    "title": "Major Bank Adds Bitcoin to Balance Sheet",
-                    "summary": "A major US bank has added Bitcoin to its balance sheet, following the trend of institutional adoption.",
-                    "sentiment": "positive",
-                    "trending_coins": ["BTC"],
-                    "url": "https://example.com/news/bank-btc",
-                    "source": "cnbc"
-                },
-                {
-                    "title": "New Regulations Coming for Crypto Exchanges",
-                    "summary": "Regulators are planning new rules for crypto exchanges, focusing on consumer protection.",
-                    "sentiment": "neutral",
-                    "trending_coins": ["BNB", "CRO"],
-                    "url": "https://example.com/news/regulations",
-                    "source": "coindesk"
-                }
-            ]
+            # Ranked coins first so they win symbols shared with smaller tokens
+            self.ticker_extractor.update(self.results.get("top_coins", []) + self.results.get("trending_coins", []))
+            tagged = self.ticker_extractor.tag_items(items)
+            if tagged:
+                logger.info(f"Tagged {tagged} items with coin mentions")
         
         except Exception as e:
-            logger.error(f"Error scanning news: {str(e)}", exc_info=True)
-            self.results["warnings"].append({
-                "source": "news",
-                "message": f"Failed to scan news: {str(e)}"
-            })
+            logger.error(f"Error tagging coin mentions: {str(e)}", exc_info=True)
     
     def _process_results(self):
         """Process results to find opportunities and warnings"""
         logger.info("Processing market scan results")
         
+        items = [item for feed in self.results.get("feeds", DEFAULT_FEEDS) for item in self.results.get(feed, [])]
+        
+        # Collapse near-duplicates so a story carried by several feeds is counted once
+        items = self._dedup_items(items)
+        
+        # Tag items that arrived as raw text with the coins they mention
+        self._tag_mentions(items)
+        
+        # Score social and news text and aggregate sentiment per coin
+        sentiment_config = self.config.get("sentiment", {})
+        coin_sentiment = self.sentiment_scorer.aggregate(items)
+        self.results["coin_sentiment"] = coin_sentiment
+        
+        # Carry mention counts across scans and rank coins by momentum
+        momentum = self._update_trend_state(items)
+        
         # Find opportunities based on trending coins and positive sentiment
+        min_sources = self.config.get("min_sources", 2)
         for coin in self.results.get("trending_coins", []):
             # Check if coin is trending across multiple sources
-            sources = []
-            if coin.get("source") == "coingecko":
-                sources.append("coingecko")
-            
-            # Check Reddit trends
-            for reddit_trend in self.results.get("reddit_trends", []):
-                if coin.get("symbol", "").upper() in reddit_trend.get("trending_coins", []):
-                    sources.append("reddit")
-            
-            # Check Twitter trends
-            for twitter_trend in self.results.get("twitter_trends", []):
-                if coin.get("symbol", "").upper() in twitter_trend.get("trending_coins", []):
-                    sources.append("twitter")
-            
-            # Check news
-            for news_item in self.results.get("news", []):
-                if coin.get("symbol", "").upper() in news_item.get("trending_coins", []):
-                    sources.append(news_item.get("source"))
+            sources = trending_sources(self.results, coin)
             
             # If coin is trending across multiple sources, add it as an opportunity
-            if len(sources) >= 2:
+            if len(sources) >= min_sources:
                 self.results["opportunities"].append({
                     "type": "trending_coin",
                     "coin": coin.get("name"),
                     "symbol": coin.get("symbol"),
                     "sources": sources,
+                    "sentiment": coin_sentiment.get(coin.get("symbol", "").upper(), {}).get("score"),
+                    "momentum": momentum.get(coin.get("symbol", "").upper()),
                     "confidence": len(sources) / 4.0  # Normalize to 0-1 range (4 possible sources)
                 })
         
-        # Find warnings based on negative sentiment
-        # (This is a placeholder - in a real implementation, we would use more sophisticated analysis)
-        for twitter_trend in self.results.get("twitter_trends", []):
-            if twitter_trend.get("sentiment") == "negative":
-                for coin in twitter_trend.get("trending_coins", []):
-                    self.results["warnings"].append({
-                        "type": "negative_sentiment",
-                        "coin": coin,
-                        "source": "twitter",
-                        "message": twitter_trend.get("tweet")
-                    })
+        # Find opportunities based on mentions growing faster than their baseline
+        for trend in self.results.get("rising_coins", []):
+            self.results["opportunities"].append({
+                "type": "rising_momentum",
+                "coin": trend["symbol"],
+                "symbol": trend["symbol"],
+                "sources": sorted(trend["sources"]),
+                "momentum": trend["momentum"],
+                "sentiment": trend["sentiment"],
+                "confidence": round(min(1.0, 1.0 - 1.0 / trend["momentum"]), 2)
+            })
+        
+        # Find opportunities and warnings based on aggregate sentiment per coin
+        positive_threshold = sentiment_config.get("positive_threshold", 0.3)
+        negative_threshold = sentiment_config.get("negative_threshold", -0.05)
+        min_mentions = sentiment_config.get("min_mentions", 2)
+        for coin, sentiment in coin_sentiment.items():
+            if sentiment["score"] >= positive_threshold and sentiment["mentions"] >= min_mentions:
+                self.results["opportunities"].append({
+                    "type": "positive_sentiment",
+                    "coin": coin,
+                    "symbol": coin,
+                    "sources": sentiment["sources"],
+                    "sentiment": sentiment["score"],
+                    "confidence": round(0.5 * sentiment["score"] + 0.5 * min(1.0, sentiment["mentions"] / 4.0), 2)
+                })
+            elif sentiment["score"] <= negative_threshold:
+                self.results["warnings"].append({
+                    "type": "negative_sentiment",
+                    "coin": coin,
+                    "source": ", ".join(sentiment["sources"]),
+                    "sentiment": sentiment["score"],
+                    "message": sentiment["most_negative"]
+                })
+        
+        # Price and volume signals from the technical indicators
+        self._add_indicator_signals()
         
         logger.info(f"Found {len(self.results['opportunities'])} opportunities and {len(self.results['warnings'])} warnings")
 
@@ -667,7 +492,7 @@ if __name__ == "__main__":
     config = {
         "top_coins": 10,
         "trending_threshold": 5,
-        "sources": ["coingecko", "reddit", "twitter"]
+        "sources": ["coingecko", "reddit", "twitter", "news"]
     }
     
     api_keys = {
@@ -680,4 +505,4 @@ if __name__ == "__main__":
     results = scanner.scan()
     
     # Print results
-    print(json.dumps(results, indent=4))
\ No newline at end of file
+    print(json.dumps(results, indent=4))
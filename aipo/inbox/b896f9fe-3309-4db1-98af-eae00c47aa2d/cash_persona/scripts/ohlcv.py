@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+OHLCV Bar Aggregator for Cash Daily Workflow
+
+This module turns price ticks and scan snapshots into candles:
+1. Folds ticks (PriceStream, BinanceClient) and MarketScanner snapshots into 1-minute bars
+2. Rolls closed bars up incrementally into hourly and daily bars
+3. Stores every timeframe in preallocated NumPy ring buffers, so memory per symbol is
+   fixed no matter how long the process runs
+4. Returns the last N bars as read-only views (no copies), per symbol or as a coin x time matrix
+
+Ring buffers are mirrored (each bar is written twice, at slot i and i + capacity), so the
+last N bars are always one contiguous slice of the buffer.
+
+Usage:
+    from ohlcv import BarAggregator
+    aggregator = BarAggregator()
+    aggregator.add_tick("BTCUSDT", 85000.0, volume=0.5)
+    bars = aggregator.last("BTCUSDT", "1h", 24)        # (24, 5) view: open, high, low, close, volume
+    closes = aggregator.matrix("1m", 60, "close")      # (symbols, 60) view
+"""
+
+import time
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger("Cash.OHLCV")
+
+# Bar fields, in storage order
+FIELDS = ("open", "high", "low", "close", "volume")
+OPEN, HIGH, LOW, CLOSE, VOLUME = range(len(FIELDS))
+
+# Timeframe name -> (bar length in seconds, bars kept)
+DEFAULT_TIMEFRAMES = {
+    "1m": (60, 120),
+    "1h": (3600, 72),
+    "1d": (86400, 60)
+}
+
+
+class BarRing:
+    """Mirrored ring buffer of bars for one timeframe, shared by all symbols"""
+
+    def __init__(self, seconds, capacity, max_symbols):
+        """
+        Initialize the ring
+
+        Args:
+            seconds (int): Bar length in seconds
+            capacity (int): Closed bars kept per symbol
+            max_symbols (int): Symbol rows to preallocate
+        """
+        self.seconds = seconds
+        self.capacity = capacity
+        self.data = np.full((len(FIELDS), max_symbols, 2 * capacity), np.nan)
+        self.times = np.full(2 * capacity, np.nan)
+        self.current = np.full((len(FIELDS), max_symbols), np.nan)
+        self.last_close = np.full(max_symbols, np.nan)
+        self.bucket = None
+        self.head = 0
+        self.count = 0
+
+    @property
+    def max_symbols(self):
+        return self.data.shape[1]
+
+    def grow(self, max_symbols):
+        """Reallocate for more symbol rows (existing bars are kept)"""
+        extra = max_symbols - self.max_symbols
+        if extra <= 0:
+            return
+        self.data = np.concatenate([self.data, np.full((len(FIELDS), extra, 2 * self.capacity), np.nan)], axis=1)
+        self.current = np.concatenate([self.current, np.full((len(FIELDS), extra), np.nan)], axis=1)
+        self.last_close = np.concatenate([self.last_close, np.full(extra, np.nan)])
+
+    def advance(self, bucket):
+        """
+        Move the ring to the bar starting at `bucket`, closing the current bar if needed
+
+        Args:
+            bucket (float): Bar start time (epoch seconds, aligned to the timeframe)
+
+        Returns:
+            tuple: (start time, closed bar column) or None if nothing closed
+        """
+        if self.bucket is None:
+            self.bucket = bucket
+            return None
+        if bucket <= self.bucket:
+            return None
+
+        closed_time = self.bucket
+        column = self._fill_flat(self.current)
+        self._write(closed_time, column)
+
+        # Symbols with no ticks during skipped periods get flat bars at their last close
+        missing = int(round((bucket - self.bucket) / self.seconds)) - 1
+        for i in range(min(missing, self.capacity)):
+            flat = self._fill_flat(np.full_like(self.current, np.nan))
+            self._write(closed_time + (i + 1) * self.seconds, flat)
+
+        self.bucket = bucket
+        self.current = np.full_like(self.current, np.nan)
+        return closed_time, column
+
+    def add_ticks(self, rows, prices, volumes):
+        """
+        Fold ticks for the current bar into the given symbol rows
+
+        Args:
+            rows (np.ndarray): Symbol row indices (unique)
+            prices (np.ndarray): Prices
+            volumes (np.ndarray): Traded volume per tick
+        """
+        current = self.current
+        empty = np.isnan(current[OPEN, rows])
+        current[OPEN, rows] = np.where(empty, prices, current[OPEN, rows])
+        current[HIGH, rows] = np.fmax(current[HIGH, rows], prices)
+        current[LOW, rows] = np.fmin(current[LOW, rows], prices)
+        current[CLOSE, rows] = prices
+        current[VOLUME, rows] = np.where(empty, volumes, current[VOLUME, rows] + volumes)
+
+    def merge_column(self, column):
+        """
+        Fold a closed lower-timeframe bar column (all symbols) into the current bar
+
+        Args:
+            column (np.ndarray): (fields, symbols) bar column
+        """
+        _merge(self.current, column[:, :self.max_symbols])
+
+    def last(self, count):
+        """
+        Get the last `count` closed bars for all symbols
+
+        Returns:
+            np.ndarray: Read-only (fields, symbols, count) view
+        """
+        count = min(count, self.count, self.capacity)
+        end = self.head + self.capacity
+        view = self.data[:, :, end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def last_times(self, count):
+        """Get the start times of the last `count` closed bars (read-only view)"""
+        count = min(count, self.count, self.capacity)
+        end = self.head + self.capacity
+        view = self.times[end - count:end]
+        view.flags.writeable = False
+        return view
+
+    def _fill_flat(self, column):
+        """Give symbols without ticks a flat bar at their last close"""
+        column = column.copy()
+        empty = np.isnan(column[OPEN])
+        for field in (OPEN, HIGH, LOW, CLOSE):
+            column[field] = np.where(empty, self.last_close, column[field])
+        column[VOLUME] = np.where(empty & ~np.isnan(self.last_close), 0.0, column[VOLUME])
+        self.last_close = np.where(np.isnan(column[CLOSE]), self.last_close, column[CLOSE])
+        return column
+
+    def set_bar(self, start, row, values):
+        """
+        Overwrite one symbol's closed bar in the slot of its start time (and its mirror slot)
+
+        Args:
+            start (float): Bar start time (aligned to the timeframe)
+            row (int): Symbol row
+            values (list): open, high, low, close, volume
+
+        Returns:
+            bool: Whether the bar is still held by the ring (older bars are dropped)
+        """
+        if self.bucket is None:
+            return False
+        offset = int(round((self.bucket - start) / self.seconds))
+        if offset < 1 or offset > min(self.count, self.capacity):
+            return False
+        slot = (self.head - offset) % self.capacity
+        self.data[:, row, slot] = values
+        self.data[:, row, slot + self.capacity] = values
+        if offset == 1:
+            # The newest closed bar: later gaps get flat bars at this close
+            self.last_close[row] = values[CLOSE]
+        return True
+
+    def _write(self, start, column):
+        """Write a closed bar column at the head (and its mirror slot)"""
+        self.data[:, :, self.head] = column
+        self.data[:, :, self.head + self.capacity] = column
+        self.times[self.head] = start
+        self.times[self.head + self.capacity] = start
+        self.head = (self.head + 1) % self.capacity
+        self.count += 1
+
+
+class BarAggregator:
+    """Builds rolling OHLCV bars per symbol across several timeframes"""
+
+    def __init__(self, timeframes=None, max_symbols=256):
+        """
+        Initialize the aggregator
+
+        Args:
+            timeframes (dict): Timeframe name -> (bar seconds, bars kept); DEFAULT_TIMEFRAMES if None
+            max_symbols (int): Symbol rows to preallocate (grows by doubling)
+        """
+        timeframes = timeframes or DEFAULT_TIMEFRAMES
+        self.timeframes = sorted(timeframes, key=lambda name: timeframes[name][0])
+        self.rings = [BarRing(timeframes[name][0], timeframes[name][1], max_symbols) for name in self.timeframes]
+        self.symbols = {}
+        self.last_volume_seen = {}
+        self.lock = threading.RLock()
+        self.late_ticks = 0
+
+        for lower, higher in zip(self.rings, self.rings[1:]):
+            if higher.seconds % lower.seconds:
+                raise ValueError("Each timeframe must be a multiple of the one below it")
+
+    def symbol_index(self, symbol):
+        """
+        Get the row of a symbol, adding it if needed
+
+        Args:
+            symbol (str): Symbol (e.g. BTCUSDT)
+
+        Returns:
+            int: Row index
+        """
+        index = self.symbols.get(symbol)
+        if index is None:
+            index = len(self.symbols)
+            if index >= self.rings[0].max_symbols:
+                for ring in self.rings:
+                    ring.grow(ring.max_symbols * 2)
+            self.symbols[symbol] = index
+        return index
+
+    def add_tick(self, symbol, price, volume=0.0, timestamp=None):
+        """
+        Add a single price tick
+
+        Args:
+            symbol (str): Symbol
+            price (float): Trade or last price
+            volume (float): Volume traded since the previous tick
+            timestamp (float): Tick time in epoch seconds (now if None)
+        """
+        self.add_ticks([symbol], [price], [volume], timestamp)
+
+    def add_ticks(self, symbols, prices, volumes=None, timestamp=None):
+        """
+        Add ticks for many symbols sharing one timestamp (vectorized)
+
+        Args:
+            symbols (list): Symbols (unique)
+            prices (list): Prices
+            volumes (list): Volume traded since the previous tick (0 if None)
+            timestamp (float): Tick time in epoch seconds (now if None)
+        """
+        timestamp = timestamp or time.time()
+        prices = np.asarray(prices, dtype=float)
+        volumes = np.zeros_like(prices) if volumes is None else np.asarray(volumes, dtype=float)
+        valid = np.isfinite(prices)
+
+        with self.lock:
+            rows = np.fromiter((self.symbol_index(symbol) for symbol in symbols), dtype=np.intp, count=len(symbols))
+            base = self.rings[0]
+            bucket = timestamp - (timestamp % base.seconds)
+            if base.bucket is not None and bucket < base.bucket:
+                self.late_ticks += len(rows)
+                return
+
+            self._advance(0, bucket)
+            base.add_ticks(rows[valid], prices[valid], np.nan_to_num(volumes[valid]))
+
+    def add_scan(self, scan_results, timestamp=None):
+        """
+        Add a MarketScanner snapshot (one tick per top coin)
+
+        CoinGecko only reports 24h volume, so the volume of each tick is estimated as the
+        24h volume pro-rated over the time since the coin's previous snapshot.
+
+        Args:
+            scan_results (dict): MarketScanner results
+            timestamp (float): Snapshot time in epoch seconds (now if None)
+        """
+        timestamp = timestamp or time.time()
+        symbols, prices, volumes = [], [], []
+        for coin in scan_results.get("top_coins", []):
+            symbol = f"{(coin.get('symbol') or '').upper()}USDT"
+            price = coin.get("live_price") or coin.get("current_price")
+            if price is None or symbol in symbols:
+                continue
+            previous = self.last_volume_seen.get(symbol)
+            elapsed = timestamp - previous if previous else 0.0
+            self.last_volume_seen[symbol] = timestamp
+            symbols.append(symbol)
+            prices.append(price)
+            volumes.append((coin.get("total_volume") or 0.0) * min(elapsed, 86400.0) / 86400.0)
+
+        if symbols:
+            self.add_ticks(symbols, prices, volumes, timestamp)
+
+    def load_klines(self, symbol, timeframe, klines):
+        """
+        Backfill closed bars from Binance klines ([open time ms, open, high, low, close, volume, ...])
+
+        Each kline is written as a closed bar into the slot of its start time, so symbols can
+        be backfilled one after another over the shared time axis. Klines newer than the ring
+        move it forward (other symbols get flat bars); klines older than the bars it holds are
+        dropped. Bars are written straight into the given timeframe (no roll-up), so backfill
+        before streaming live ticks.
+
+        Args:
+            symbol (str): Symbol
+            timeframe (str): Timeframe name the klines belong to
+            klines (list): Kline rows, oldest first
+
+        Returns:
+            int: Number of klines stored
+        """
+        stored = 0
+        with self.lock:
+            row = self.symbol_index(symbol)
+            ring = self.rings[self.timeframes.index(timeframe)]
+            for kline in klines:
+                start = kline[0] / 1000.0
+                start -= start % ring.seconds
+                if ring.bucket is None:
+                    ring.advance(start)
+                if start >= ring.bucket:
+                    # Close the kline's bar: the open bar becomes the one after it
+                    ring.advance(start + ring.seconds)
+                stored += ring.set_bar(start, row, [float(value) for value in kline[1:6]])
+        return stored
+
+    def last(self, symbol, timeframe, count):
+        """
+        Get the last `count` closed bars of a symbol
+
+        Args:
+            symbol (str): Symbol
+            timeframe (str): Timeframe name
+            count (int): Number of bars
+
+        Returns:
+            np.ndarray: Read-only (count, 5) view with columns open, high, low, close, volume
+        """
+        ring = self.rings[self.timeframes.index(timeframe)]
+        return ring.last(count)[:, self.symbols[symbol], :].T
+
+    def matrix(self, timeframe, count, field="close"):
+        """
+        Get one field of the last `count` closed bars for every symbol
+
+        Args:
+            timeframe (str): Timeframe name
+            count (int): Number of bars
+            field (str): Bar field
+
+        Returns:
+            np.ndarray: Read-only (symbols, count) view; rows follow `symbol_list()`
+        """
+        ring = self.rings[self.timeframes.index(timeframe)]
+        return ring.last(count)[FIELDS.index(field), :len(self.symbols), :]
+
+    def times(self, timeframe, count):
+        """Get the start times of the last `count` closed bars of a timeframe"""
+        return self.rings[self.timeframes.index(timeframe)].last_times(count)
+
+    def current(self, symbol, timeframe):
+        """
+        Get the still-open bar of a symbol, including ticks not yet rolled up
+
+        Returns:
+            np.ndarray: (5,) bar (NaN if no ticks yet)
+        """
+        with self.lock:
+            row = self.symbols[symbol]
+            level = self.timeframes.index(timeframe)
+            bar = self.rings[level].current[:, row:row + 1].copy()
+            for lower in reversed(self.rings[:level]):
+                _merge(bar, lower.current[:, row:row + 1])
+            return bar[:, 0]
+
+    def symbol_list(self):
+        """Get symbols in row order"""
+        return list(self.symbols)
+
+    def memory_bytes(self):
+        """Get the bytes held by all ring buffers"""
+        return sum(ring.data.nbytes + ring.current.nbytes + ring.times.nbytes for ring in self.rings)
+
+    def save(self, path):
+        """Save all buffers to an .npz file"""
+        with self.lock:
+            arrays = {"symbols": np.array(self.symbol_list())}
+            for name, ring in zip(self.timeframes, self.rings):
+                arrays[f"{name}_data"] = ring.data
+                arrays[f"{name}_times"] = ring.times
+                arrays[f"{name}_current"] = ring.current
+                arrays[f"{name}_last_close"] = ring.last_close
+                arrays[f"{name}_state"] = np.array([
+                    np.nan if ring.bucket is None else ring.bucket, ring.head, ring.count, ring.capacity, ring.seconds
+                ])
+            np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an aggregator saved with `save`
+
+        Args:
+            path (str or Path): .npz file
+
+        Returns:
+            BarAggregator: Restored aggregator
+        """
+        with np.load(path, allow_pickle=False) as saved:
+            names = [key[:-len("_state")] for key in saved.files if key.endswith("_state")]
+            timeframes = {name: (int(saved[f"{name}_state"][4]), int(saved[f"{name}_state"][3])) for name in names}
+            aggregator = cls(timeframes, max_symbols=max(1, len(saved["symbols"])))
+            aggregator.symbols = {str(symbol): i for i, symbol in enumerate(saved["symbols"])}
+            for name, ring in zip(aggregator.timeframes, aggregator.rings):
+                ring.data = saved[f"{name}_data"].copy()
+                ring.times = saved[f"{name}_times"].copy()
+                ring.current = saved[f"{name}_current"].copy()
+                ring.last_close = saved[f"{name}_last_close"].copy()
+                bucket, head, count = saved[f"{name}_state"][:3]
+                ring.bucket = None if np.isnan(bucket) else float(bucket)
+                ring.head = int(head)
+                ring.count = int(count)
+        return aggregator
+
+    def _advance(self, level, bucket):
+        """Advance a timeframe to `bucket`, rolling any closed bar up into the next timeframe"""
+        closed = self.rings[level].advance(bucket)
+        if closed is None or level + 1 >= len(self.rings):
+            return
+
+        start, column = closed
+        higher = self.rings[level + 1]
+        bucket = start - (start % higher.seconds)
+        if higher.bucket is not None and bucket < higher.bucket:
+            return
+        self._advance(level + 1, bucket)
+        higher.merge_column(column)
+
+
+def _merge(bar, newer):
+    """Merge a newer bar column into an older one in place (NaN means no data)"""
+    empty = np.isnan(bar[OPEN])
+    bar[OPEN] = np.where(empty, newer[OPEN], bar[OPEN])
+    bar[HIGH] = np.fmax(bar[HIGH], newer[HIGH])
+    bar[LOW] = np.fmin(bar[LOW], newer[LOW])
+    bar[CLOSE] = np.where(np.isnan(newer[CLOSE]), bar[CLOSE], newer[CLOSE])
+    bar[VOLUME] = np.where(
+        np.isnan(bar[VOLUME]), newer[VOLUME],
+        np.where(np.isnan(newer[VOLUME]), bar[VOLUME], bar[VOLUME] + newer[VOLUME])
+    )
+
+
+if __name__ == "__main__":
+    # If run directly, stream two simulated days of minute ticks for 500 symbols
+    import json
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = np.random.default_rng(7)
+    symbols = [f"C{i}USDT" for i in range(500)]
+    prices = 10.0 + rng.random(len(symbols)) * 100.0
+    aggregator = BarAggregator()
+
+    start = 1_700_000_000 - (1_700_000_000 % 86400)
+    memory_before = None
+    started = time.perf_counter()
+    for minute in range(2 * 24 * 60):
+        prices *= 1.0 + rng.normal(0, 0.001, len(symbols))
+        aggregator.add_ticks(symbols, prices, rng.random(len(symbols)), start + minute * 60 + 30)
+        if minute == 60:
+            memory_before = aggregator.memory_bytes()
+    elapsed = time.perf_counter() - started
+
+    last_hours = aggregator.last(symbols[0], "1h", 24)
+    print(json.dumps({
+        "ticks": 2 * 24 * 60 * len(symbols),
+        "seconds": round(elapsed, 3),
+        "memory_after_1h_bytes": memory_before,
+        "memory_after_2d_bytes": aggregator.memory_bytes(),
+        "hourly_bars": last_hours.shape,
+        "hourly_is_view": not last_hours.flags.owndata,
+        "daily_closes": aggregator.matrix("1d", 5)[:3].round(4).tolist()
+    }, indent=4, default=list))
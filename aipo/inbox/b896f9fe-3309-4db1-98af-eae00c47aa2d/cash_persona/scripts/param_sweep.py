@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Parameter Sweep for Cash Daily Workflow
+
+This module tunes strategy and risk thresholds against history on every core:
+1. Builds parameter sets from a grid (every combination) or random samples
+2. Evaluates each set with the backtester in a process pool
+3. Shares the price history with workers through shared memory instead of copying it
+4. Ranks the results by a chosen metric (return, Sharpe, drawdown, ...)
+
+The thresholds come from the workflow's config: playbook.confidence_threshold,
+portfolio.concentration_limit, and market_scan.min_sources (bot_hunt.min_stars has no price
+history to test against, so sweep it with a custom `evaluate` function).
+
+Usage:
+    python param_sweep.py --history prices.npz --scans results \\
+        --grid '{"confidence_threshold": [0.5, 0.6, 0.7], "concentration_limit": [15, 20, 30]}'
+    python param_sweep.py --space '{"position_size": [2.0, 20.0]}' --samples 50 --metric sharpe
+
+    from param_sweep import ParamSweep
+    report = ParamSweep(history, events).run(ParamSweep.grid({"min_sources": [1, 2, 3]}))
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import itertools
+import concurrent.futures
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import numpy as np
+
+from backtester import Backtester, PriceHistory, load_scan_events, synthetic_history
+
+logger = logging.getLogger("Cash.ParamSweep")
+
+# Metrics where a smaller value ranks higher
+LOWER_IS_BETTER = {"fees_paid", "trades"}
+
+# Per-worker state, set once by _init_worker
+_WORKER = {}
+
+
+def backtest_metrics(params, history, events, base_strategy):
+    """
+    Default evaluation: run the event-driven backtest with `params` over the base strategy
+
+    Returns:
+        dict: Backtest report without the trade log
+    """
+    report = Backtester(dict(base_strategy, **params)).run(history, events)
+    report.pop("trade_log", None)
+    return report
+
+
+class ParamSweep:
+    """Evaluates many parameter sets against shared historical data in a process pool"""
+
+    def __init__(self, history, events, base_strategy=None, metric="total_return_pct",
+                 workers=None, evaluate=backtest_metrics):
+        """
+        Initialize the sweep
+
+        Args:
+            history (PriceHistory): Price history (copied once into shared memory)
+            events (list): Scan events from `load_scan_events`
+            base_strategy (dict): Strategy values the swept parameters override
+            metric (str): Report key to rank by
+            workers (int): Worker processes (CPU count if None)
+            evaluate (callable): Module-level function (params, history, events, base_strategy) -> dict
+        """
+        self.history = history
+        self.events = events
+        self.base_strategy = base_strategy or {}
+        self.metric = metric
+        self.workers = workers or os.cpu_count() or 1
+        self.evaluate = evaluate
+
+    @staticmethod
+    def grid(space):
+        """
+        Every combination of the listed values
+
+        Args:
+            space (dict): Parameter name -> list of values
+
+        Returns:
+            list: Parameter dicts
+        """
+        names = sorted(space)
+        return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+    @staticmethod
+    def sample(space, samples, seed=0):
+        """
+        Random parameter sets
+
+        Args:
+            space (dict): Parameter name -> [low, high] range (ints if both bounds are ints)
+                or a list of more than two choices
+            samples (int): Number of sets
+            seed (int): Random seed
+
+        Returns:
+            list: Parameter dicts
+        """
+        rng = random.Random(seed)
+        param_sets = []
+        for _ in range(samples):
+            params = {}
+            for name, values in sorted(space.items()):
+                if len(values) == 2 and all(isinstance(value, (int, float)) for value in values):
+                    low, high = values
+                    if isinstance(low, int) and isinstance(high, int):
+                        params[name] = rng.randint(low, high)
+                    else:
+                        params[name] = round(rng.uniform(low, high), 4)
+                else:
+                    params[name] = rng.choice(values)
+            param_sets.append(params)
+        return param_sets
+
+    def run(self, param_sets, top=10):
+        """
+        Evaluate parameter sets and rank them
+
+        Args:
+            param_sets (list): Parameter dicts
+            top (int): Number of ranked results to return
+
+        Returns:
+            dict: Sweep summary with the top results
+        """
+        close = np.ascontiguousarray(self.history.close)
+        start_time = time.time()
+
+        # One copy of the prices in shared memory; workers map it instead of unpickling it
+        shm = shared_memory.SharedMemory(create=True, size=max(1, close.nbytes))
+        try:
+            np.ndarray(close.shape, dtype=close.dtype, buffer=shm.buf)[:] = close
+            history_spec = (
+                shm.name, close.shape, close.dtype.str,
+                self.history.symbols, self.history.times, self.history.bar_seconds
+            )
+
+            results = []
+            with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(history_spec, self.events, self.base_strategy, self.evaluate)
+            ) as executor:
+                chunksize = max(1, len(param_sets) // (self.workers * 4))
+                for params, report in zip(param_sets, executor.map(_run_one, param_sets, chunksize=chunksize)):
+                    results.append(dict(report, params=params))
+        finally:
+            shm.close()
+            shm.unlink()
+
+        ranked = sorted(results, key=self._rank_key)
+        return {
+            "metric": self.metric,
+            "evaluated": len(results),
+            "failed": sum(1 for result in results if "error" in result),
+            "workers": self.workers,
+            "seconds": round(time.time() - start_time, 2),
+            "top": ranked[:top]
+        }
+
+    def _rank_key(self, result):
+        """Sort key putting the best results first (missing metrics last)"""
+        value = result.get(self.metric)
+        if value is None:
+            return (1, 0)
+        return (0, value if self.metric in LOWER_IS_BETTER else -value)
+
+
+def _init_worker(history_spec, events, base_strategy, evaluate):
+    """Attach to the shared price history once per worker"""
+    name, shape, dtype, symbols, times, bar_seconds = history_spec
+    shm = shared_memory.SharedMemory(name=name)
+    close = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+    close.flags.writeable = False
+    _WORKER.update({
+        "shm": shm,
+        "history": PriceHistory(symbols, times, close, bar_seconds),
+        "events": events,
+        "base_strategy": base_strategy,
+        "evaluate": evaluate
+    })
+
+
+def _run_one(params):
+    """Evaluate one parameter set in a worker"""
+    try:
+        return _WORKER["evaluate"](params, _WORKER["history"], _WORKER["events"], _WORKER["base_strategy"])
+    except Exception as e:
+        logger.error(f"Error evaluating {params}: {str(e)}", exc_info=True)
+        return {"error": str(e)}
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Cash Parameter Sweep")
+    parser.add_argument("--history", help="Price history (.npz or directory from PriceHistory.save)")
+    parser.add_argument("--scans", default=str(Path(__file__).parent / "results"), help="Directory of stored market scans")
+    parser.add_argument("--grid", help="JSON object of parameter -> list of values (every combination)")
+    parser.add_argument("--space", help="JSON object of parameter -> [low, high] or choices (random samples)")
+    parser.add_argument("--samples", type=int, default=50, help="Random samples drawn from --space")
+    parser.add_argument("--metric", default="total_return_pct", help="Report key to rank by")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--top", type=int, default=10, help="Number of ranked results to show")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.history:
+        history = PriceHistory.load(args.history)
+        events = load_scan_events(args.scans)
+    else:
+        # Synthetic demo: a month of minute bars and a scan every six hours
+        history = synthetic_history()
+        rng = np.random.default_rng(9)
+        events = [
+            {
+                "timestamp": float(history.times[bar]),
+                "kind": "opportunity" if rng.random() < 0.7 else "warning",
+                "symbol": history.symbols[int(rng.integers(len(history.symbols)))],
+                "confidence": float(rng.random())
+            }
+            for bar in range(0, len(history.times), 360)
+            for _ in range(3)
+        ]
+
+    if args.space:
+        param_sets = ParamSweep.sample(json.loads(args.space), args.samples)
+    else:
+        param_sets = ParamSweep.grid(json.loads(args.grid) if args.grid else {
+            "confidence_threshold": [0.5, 0.6, 0.7, 0.8],
+            "concentration_limit": [15, 20, 30],
+            "holding_bars": [360, 1440, 4320]
+        })
+
+    sweep = ParamSweep(history, events, metric=args.metric, workers=args.workers)
+    print(json.dumps(sweep.run(param_sets, top=args.top), indent=4))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+Price Stream for Cash Daily Workflow
+
+This module ingests live prices from exchange WebSocket streams:
+1. Subscribes to Binance-style mini-ticker streams (all-market or per-symbol)
+2. Keeps an in-memory latest-price book and feeds every tick into rolling OHLCV bars
+3. Reconnects with exponential backoff when a connection drops
+4. Ships a local WebSocket replay server so the stream can be exercised offline
+
+PortfolioTracker and MarketScanner read prices from the book, so a lookup is a
+dictionary read instead of an API call.
+
+Usage:
+    from price_stream import PriceBook, PriceStream
+    book = PriceBook()
+    stream = PriceStream(book, symbols=["BTCUSDT", "ETHUSDT"])
+    stream.start()
+    price = book.get_price("BTCUSDT")
+"""
+
+import os
+import ssl
+import json
+import time
+import base64
+import random
+import socket
+import struct
+import hashlib
+import logging
+import threading
+import socketserver
+from urllib.parse import urlparse
+
+from ohlcv import BarAggregator
+
+logger = logging.getLogger("Cash.PriceStream")
+
+# Binance market data stream endpoint
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443"
+
+# Magic value from RFC 6455 used to derive Sec-WebSocket-Accept
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# WebSocket opcodes
+OPCODE_CONTINUATION = 0x0
+OPCODE_TEXT = 0x1
+OPCODE_BINARY = 0x2
+OPCODE_CLOSE = 0x8
+OPCODE_PING = 0x9
+OPCODE_PONG = 0xA
+
+
+class ConnectionClosed(Exception):
+    """Raised when the WebSocket peer closes the connection"""
+
+
+class WebSocketConnection:
+    """Minimal RFC 6455 WebSocket client for reading market data streams"""
+
+    def __init__(self, url, timeout=60):
+        """
+        Initialize the connection
+
+        Args:
+            url (str): ws:// or wss:// URL
+            timeout (float): Seconds without data before the connection is considered dead
+        """
+        self.url = url
+        self.timeout = timeout
+        self.sock = None
+        self.buffer = b""
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """Open the socket and perform the WebSocket handshake"""
+        parsed = urlparse(self.url)
+        secure = parsed.scheme == "wss"
+        host = parsed.hostname
+        port = parsed.port or (443 if secure else 80)
+        path = parsed.path or "/"
+        if parsed.query:
+            path += f"?{parsed.query}"
+
+        sock = socket.create_connection((host, port), timeout=self.timeout)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        sock.sendall(request.encode("ascii"))
+        self.sock = sock
+        self.buffer = b""
+
+        # Read the handshake response; anything after the headers is frame data
+        while b"\r\n\r\n" not in self.buffer:
+            chunk = sock.recv(4096)
+            if not chunk:
+                raise ConnectionClosed("Connection closed during handshake")
+            self.buffer += chunk
+        header_block, self.buffer = self.buffer.split(b"\r\n\r\n", 1)
+        lines = header_block.decode("latin-1").split("\r\n")
+
+        if " 101 " not in f"{lines[0]} ":
+            raise ConnectionError(f"WebSocket handshake failed: {lines[0]}")
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("sec-websocket-accept") != _accept_key(key):
+            raise ConnectionError("WebSocket handshake failed: bad Sec-WebSocket-Accept")
+
+    def close(self):
+        """Close the connection"""
+        if self.sock is None:
+            return
+        try:
+            self.send(OPCODE_CLOSE, struct.pack(">H", 1000))
+        except OSError:
+            pass
+        try:
+            self.sock.close()
+        finally:
+            self.sock = None
+
+    def send(self, opcode, payload=b""):
+        """
+        Send a single masked frame (clients must mask every frame)
+
+        Args:
+            opcode (int): Frame opcode
+            payload (bytes): Frame payload
+        """
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        with self.lock:
+            self.sock.sendall(_frame_header(opcode, len(payload), masked=True) + mask + masked)
+
+    def send_text(self, text):
+        """Send a text message"""
+        self.send(OPCODE_TEXT, text)
+
+    def recv(self):
+        """
+        Read the next data message, answering pings along the way
+
+        Returns:
+            str: Message text
+        """
+        fragments = []
+        while True:
+            fin, opcode, payload = self._read_frame()
+
+            if opcode == OPCODE_PING:
+                self.send(OPCODE_PONG, payload)
+            elif opcode == OPCODE_PONG:
+                continue
+            elif opcode == OPCODE_CLOSE:
+                self.close()
+                raise ConnectionClosed("Server closed the connection")
+            else:
+                fragments.append(payload)
+                if fin:
+                    return b"".join(fragments).decode("utf-8")
+
+    def _read_frame(self):
+        """Read one frame and return (fin, opcode, payload)"""
+        first, second = self._read_exact(2)
+        fin = bool(first & 0x80)
+        opcode = first & 0x0F
+        masked = bool(second & 0x80)
+        length = second & 0x7F
+        if length == 126:
+            length = struct.unpack(">H", self._read_exact(2))[0]
+        elif length == 127:
+            length = struct.unpack(">Q", self._read_exact(8))[0]
+
+        mask = self._read_exact(4) if masked else None
+        payload = self._read_exact(length)
+        if mask:
+            payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+        return fin, opcode, payload
+
+    def _read_exact(self, size):
+        """Read exactly `size` bytes from the socket"""
+        while len(self.buffer) < size:
+            chunk = self.sock.recv(max(65536, size - len(self.buffer)))
+            if not chunk:
+                raise ConnectionClosed("Connection closed by peer")
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+class PriceBook:
+    """In-memory latest prices per symbol, with rolling OHLCV bars kept in a BarAggregator"""
+
+    def __init__(self, bars=None):
+        """
+        Initialize the price book
+
+        Args:
+            bars (BarAggregator): Bar aggregator fed with every tick (a default one if None)
+        """
+        self.bars = bars or BarAggregator()
+        self.prices = {}
+        self.lock = threading.Lock()
+        self.updates = 0
+
+    def update(self, symbol, price, timestamp=None):
+        """
+        Record a price tick
+
+        Args:
+            symbol (str): Exchange symbol (e.g. BTCUSDT)
+            price (float): Last price
+            timestamp (float): Tick time in epoch seconds (now if None)
+        """
+        self.update_many([(symbol, price, timestamp)])
+
+    def update_many(self, ticks):
+        """
+        Record a batch of price ticks under a single lock
+
+        Args:
+            ticks (list): (symbol, price, timestamp) tuples
+        """
+        now = time.time()
+        by_time = {}
+        with self.lock:
+            for symbol, price, timestamp in ticks:
+                timestamp = timestamp or now
+                self.prices[symbol] = (price, timestamp)
+                by_time.setdefault(timestamp, {})[symbol] = price
+            self.updates += len(ticks)
+
+        # Ticks sharing a timestamp are folded into the bars in one vectorized call
+        for timestamp in sorted(by_time):
+            prices = by_time[timestamp]
+            self.bars.add_ticks(list(prices), list(prices.values()), timestamp=timestamp)
+
+    def get_price(self, symbol, max_age=None):
+        """
+        Get the latest price for a symbol
+
+        Args:
+            symbol (str): Exchange symbol (e.g. BTCUSDT)
+            max_age (float): Ignore prices older than this many seconds
+
+        Returns:
+            float: Latest price (None if unknown or stale)
+        """
+        entry = self.prices.get(symbol)
+        if entry is None:
+            return None
+        if max_age is not None and time.time() - entry[1] > max_age:
+            return None
+        return entry[0]
+
+    def get_bars(self, symbol, timeframe="1m", count=60):
+        """
+        Get the most recent closed OHLCV bars for a symbol, oldest first
+
+        Args:
+            symbol (str): Exchange symbol
+            timeframe (str): Bar timeframe (1m, 1h, 1d)
+            count (int): Number of bars
+
+        Returns:
+            np.ndarray: Read-only (count, 5) view of open, high, low, close, volume
+        """
+        return self.bars.last(symbol, timeframe, count)
+
+    def symbols(self):
+        """Get all symbols with a known price"""
+        return list(self.prices)
+
+
+class PriceStream:
+    """Feeds a PriceBook from Binance-style mini-ticker WebSocket streams"""
+
+    def __init__(self, book, symbols=None, url=BINANCE_STREAM_URL, streams_per_connection=200,
+                 backoff_initial=1.0, backoff_max=60.0, timeout=60):
+        """
+        Initialize the price stream
+
+        Args:
+            book (PriceBook): Book to update
+            symbols (list): Symbols to follow (all-market stream if None)
+            url (str): Stream server base URL
+            streams_per_connection (int): Symbols per WebSocket connection
+            backoff_initial (float): First reconnect delay in seconds
+            backoff_max (float): Maximum reconnect delay in seconds
+            timeout (float): Seconds without data before reconnecting
+        """
+        self.book = book
+        self.symbols = [symbol.upper() for symbol in symbols] if symbols else None
+        self.url = url.rstrip("/")
+        self.streams_per_connection = streams_per_connection
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.stop_event = threading.Event()
+        self.threads = []
+        self.connections = {}
+        self.stats = {"messages": 0, "ticks": 0, "reconnects": 0, "errors": 0}
+
+    def stream_urls(self):
+        """
+        Build one stream URL per connection
+
+        Returns:
+            list: Stream URLs (symbols are sharded across connections)
+        """
+        if not self.symbols:
+            return [f"{self.url}/ws/!miniTicker@arr"]
+
+        urls = []
+        for i in range(0, len(self.symbols), self.streams_per_connection):
+            shard = self.symbols[i:i + self.streams_per_connection]
+            streams = "/".join(f"{symbol.lower()}@miniTicker" for symbol in shard)
+            urls.append(f"{self.url}/stream?streams={streams}")
+        return urls
+
+    def start(self):
+        """Start one reader thread per connection"""
+        self.stop_event.clear()
+        for index, url in enumerate(self.stream_urls()):
+            thread = threading.Thread(target=self._run, args=(index, url), name=f"PriceStream-{index}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        logger.info(f"Price stream started with {len(self.threads)} connection(s)")
+        return self
+
+    def stop(self, timeout=5):
+        """Stop all reader threads"""
+        self.stop_event.set()
+        for connection in list(self.connections.values()):
+            try:
+                connection.sock.shutdown(socket.SHUT_RDWR)
+            except (OSError, AttributeError):
+                pass
+        for thread in self.threads:
+            thread.join(timeout)
+        self.threads = []
+        logger.info("Price stream stopped")
+
+    def wait_for_prices(self, count=1, timeout=10):
+        """
+        Block until the book holds prices for at least `count` symbols
+
+        Returns:
+            bool: Whether the book filled up in time
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if len(self.book.prices) >= count:
+                return True
+            time.sleep(0.05)
+        return len(self.book.prices) >= count
+
+    def _run(self, index, url):
+        """Read one connection, reconnecting with exponential backoff and jitter"""
+        backoff = self.backoff_initial
+
+        while not self.stop_event.is_set():
+            connection = WebSocketConnection(url, timeout=self.timeout)
+            try:
+                connection.connect()
+                self.connections[index] = connection
+                logger.info(f"Connected to {url[:80]}")
+
+                while not self.stop_event.is_set():
+                    message = connection.recv()
+                    self._handle_message(message)
+                    backoff = self.backoff_initial
+
+            except Exception as e:
+                if self.stop_event.is_set():
+                    break
+                self.stats["errors"] += 1
+                logger.warning(f"Price stream connection {index} dropped: {str(e)}. Reconnecting in {backoff:.1f}s")
+            finally:
+                self.connections.pop(index, None)
+                connection.close()
+
+            if self.stop_event.wait(backoff * random.uniform(0.8, 1.2)):
+                break
+            self.stats["reconnects"] += 1
+            backoff = min(self.backoff_max, backoff * 2)
+
+    def _handle_message(self, message):
+        """Parse a mini-ticker message (single, combined-stream, or array) into the book"""
+        data = json.loads(message)
+        if isinstance(data, dict) and "data" in data:
+            data = data["data"]
+        tickers = data if isinstance(data, list) else [data]
+
+        ticks = []
+        for ticker in tickers:
+            if ticker.get("e") != "24hrMiniTicker":
+                continue
+            ticks.append((ticker["s"], float(ticker["c"]), ticker.get("E", 0) / 1000.0 or None))
+
+        if ticks:
+            self.book.update_many(ticks)
+        self.stats["messages"] += 1
+        self.stats["ticks"] += len(ticks)
+
+
+class ReplayServer:
+    """Local WebSocket server that replays mini-ticker messages to every client"""
+
+    def __init__(self, messages, interval=0.0, drop_after=None, loop=False):
+        """
+        Initialize the replay server
+
+        Args:
+            messages (list): Messages (dicts or lists) to send, in order
+            interval (float): Seconds between messages
+            drop_after (int): Close each connection after this many messages (exercises reconnects)
+            loop (bool): Replay the messages forever
+        """
+        self.messages = [json.dumps(message) for message in messages]
+        self.interval = interval
+        self.drop_after = drop_after
+        self.loop = loop
+        self.server = None
+        self.thread = None
+        self.url = None
+        self.connections = 0
+
+    def start(self):
+        """Start serving on a free local port"""
+        replay = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                replay._serve(self.request)
+
+        self.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"ws://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Replay server listening on {self.url}")
+        return self
+
+    def stop(self):
+        """Stop the server"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _serve(self, sock):
+        """Handshake with a client and replay the messages"""
+        request = b""
+        while b"\r\n\r\n" not in request:
+            chunk = sock.recv(4096)
+            if not chunk:
+                return
+            request += chunk
+
+        key = None
+        for line in request.decode("latin-1").split("\r\n")[1:]:
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "sec-websocket-key":
+                key = value.strip()
+        if key is None:
+            sock.sendall(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+            return
+
+        sock.sendall((
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {_accept_key(key)}\r\n\r\n"
+        ).encode("ascii"))
+        self.connections += 1
+
+        sent = 0
+        try:
+            while True:
+                for message in self.messages:
+                    if self.drop_after is not None and sent >= self.drop_after:
+                        sock.sendall(_frame_header(OPCODE_CLOSE, 2) + struct.pack(">H", 1001))
+                        return
+                    payload = message.encode("utf-8")
+                    sock.sendall(_frame_header(OPCODE_TEXT, len(payload)) + payload)
+                    sent += 1
+                    if self.interval:
+                        time.sleep(self.interval)
+                if not self.loop:
+                    break
+            sock.sendall(_frame_header(OPCODE_CLOSE, 2) + struct.pack(">H", 1000))
+        except OSError:
+            pass
+
+
+def synthetic_tickers(symbols, count, start_time=None, step=1.0, seed=7):
+    """
+    Generate all-market mini-ticker arrays with random-walk prices
+
+    Args:
+        symbols (list): Symbols to include in every message
+        count (int): Number of messages
+        start_time (float): Epoch seconds of the first message (now if None)
+        step (float): Seconds between messages
+        seed (int): Random seed
+
+    Returns:
+        list: Messages shaped like Binance's !miniTicker@arr payloads
+    """
+    rng = random.Random(seed)
+    start_time = start_time or time.time()
+    prices = {symbol: 10.0 + rng.random() * 100.0 for symbol in symbols}
+
+    messages = []
+    for i in range(count):
+        event_time = int((start_time + i * step) * 1000)
+        batch = []
+        for symbol in symbols:
+            prices[symbol] *= 1.0 + rng.gauss(0, 0.001)
+            batch.append({"e": "24hrMiniTicker", "E": event_time, "s": symbol, "c": f"{prices[symbol]:.8f}"})
+        messages.append(batch)
+    return messages
+
+
+def _accept_key(key):
+    """Compute Sec-WebSocket-Accept for a Sec-WebSocket-Key"""
+    digest = hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def _frame_header(opcode, length, masked=False):
+    """Build a final-fragment frame header"""
+    mask_bit = 0x80 if masked else 0
+    if length < 126:
+        return struct.pack(">BB", 0x80 | opcode, mask_bit | length)
+    if length < 65536:
+        return struct.pack(">BBH", 0x80 | opcode, mask_bit | 126, length)
+    return struct.pack(">BBQ", 0x80 | opcode, mask_bit | 127, length)
+
+
+if __name__ == "__main__":
+    # If run directly, replay synthetic tickers for thousands of symbols and drop connections
+    logging.basicConfig(level=logging.INFO)
+
+    symbols = [f"C{i}USDT" for i in range(3000)]
+    messages = synthetic_tickers(symbols, 50, start_time=time.time() - 300, step=6.0)
+
+    with ReplayServer(messages, interval=0.01, drop_after=20, loop=True) as server:
+        book = PriceBook()
+        stream = PriceStream(book, url=server.url, backoff_initial=0.1, backoff_max=1.0)
+        stream.start()
+        stream.wait_for_prices(len(symbols))
+        time.sleep(2)
+        stream.stop()
+
+        lookups = 100000
+        start_time = time.perf_counter()
+        for i in range(lookups):
+            book.get_price(symbols[i % len(symbols)])
+        lookup_seconds = time.perf_counter() - start_time
+
+        print(json.dumps({
+            "symbols": len(book.symbols()),
+            "stream": stream.stats,
+            "server_connections": server.connections,
+            "lookup_microseconds": round(lookup_seconds / lookups * 1e6, 3),
+            "sample_bars": book.get_bars(symbols[0], "1m", 3).tolist()
+        }, indent=4))
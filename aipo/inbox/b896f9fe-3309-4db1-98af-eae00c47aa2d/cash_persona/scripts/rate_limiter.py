@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter for Cash Daily Workflow
+
+This module paces outgoing API requests so Cash stays inside each provider's quota:
+1. Keeps a token bucket per API (CoinGecko, Binance, GitHub)
+2. Syncs buckets with quota headers (X-MBX-USED-WEIGHT-1M, X-RateLimit-Remaining)
+3. Queues waiting requests by priority so portfolio pricing runs before bot hunting
+4. Backs off and retries when a provider still answers with a rate limit error
+
+Usage:
+    from rate_limiter import get_scheduler, PRIORITY_PORTFOLIO
+    scheduler = get_scheduler()
+    response = scheduler.get("binance", url, params=params, priority=PRIORITY_PORTFOLIO, weight=2)
+"""
+
+import json
+import time
+import heapq
+import logging
+import itertools
+import threading
+import requests
+
+logger = logging.getLogger("Cash.RateLimiter")
+
+# Request priorities (lower values are served first)
+PRIORITY_PORTFOLIO = 0
+PRIORITY_MARKET = 1
+PRIORITY_BOTS = 2
+
+# Default quotas: `capacity` tokens (request weight) per `period` seconds.
+# `free_not_modified` marks APIs that do not charge for 304 answers.
+DEFAULT_LIMITS = {
+    "coingecko": {"capacity": 30, "period": 60},
+    "binance": {"capacity": 6000, "period": 60},
+    "github": {"capacity": 5000, "period": 3600, "free_not_modified": True},
+    "github_search": {"capacity": 30, "period": 60, "free_not_modified": True},
+    "default": {"capacity": 60, "period": 60}
+}
+
+# Status codes providers use to signal throttling
+RATE_LIMIT_STATUS_CODES = (418, 429)
+
+
+class TokenBucket:
+    """Token bucket tracking the remaining quota of a single API"""
+
+    def __init__(self, capacity, period):
+        """
+        Initialize the token bucket
+
+        Args:
+            capacity (int): Maximum tokens (request weight) per period
+            period (float): Length of the quota window in seconds
+        """
+        self.capacity = float(capacity)
+        self.period = float(period)
+        self.rate = self.capacity / self.period
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.window_reset = None
+        self.blocked_until = 0.0
+
+    def _refill(self, now):
+        """Refill tokens for the time elapsed since the last update"""
+        if self.window_reset is not None:
+            # The provider told us its window; hold tokens until it resets
+            if now < self.window_reset:
+                self.updated = now
+                return
+            self.tokens = self.capacity
+            self.window_reset = None
+        elif now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay_for(self, cost, now):
+        """
+        Get the time to wait until `cost` tokens are available
+
+        Args:
+            cost (float): Tokens needed
+            now (float): Current monotonic time
+
+        Returns:
+            float: Seconds to wait (0 if the tokens are available now)
+        """
+        self._refill(now)
+        cost = min(cost, self.capacity)
+        delay = max(0.0, self.blocked_until - now)
+        if self.tokens < cost:
+            if self.window_reset is not None:
+                delay = max(delay, self.window_reset - now)
+            else:
+                delay = max(delay, (cost - self.tokens) / self.rate)
+        return delay
+
+    def consume(self, cost, now):
+        """Take `cost` tokens from the bucket"""
+        self._refill(now)
+        self.tokens -= min(cost, self.capacity)
+
+    def sync(self, remaining, reset_in, now):
+        """
+        Align the bucket with the quota reported by the provider
+
+        Args:
+            remaining (float): Quota left in the provider's current window
+            reset_in (float): Seconds until the provider's window resets (None if unknown)
+            now (float): Current monotonic time
+        """
+        self._refill(now)
+        self.tokens = min(self.tokens, max(0.0, remaining))
+        if reset_in is not None and reset_in > 0:
+            self.window_reset = now + reset_in
+
+    def refund(self, cost, now):
+        """Give back tokens for a request the provider did not count"""
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + min(cost, self.capacity))
+
+    def block_for(self, seconds, now):
+        """Stop handing out tokens for the given number of seconds"""
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class RequestScheduler:
+    """Central scheduler that paces requests to every API through its token bucket"""
+
+    def __init__(self, limits=None, session=None, max_retries=3, cache=None):
+        """
+        Initialize the request scheduler
+
+        Args:
+            limits (dict): Per-API overrides of DEFAULT_LIMITS
+            session (requests.Session): Session to send requests with
+            max_retries (int): Retries after a rate limit response
+            cache (ResponseCache): Cache for requests sent with use_cache=True
+        """
+        self.limits = dict(DEFAULT_LIMITS)
+        for api, limit in (limits or {}).items():
+            self.limits[api] = {**DEFAULT_LIMITS.get(api, {}), **limit}
+        self.session = session or self._create_session()
+        self.max_retries = max_retries
+        self.cache = cache
+        self.buckets = {}
+        self.waiting = {}
+        self.stats = {}
+        self.condition = threading.Condition()
+        self.counter = itertools.count()
+
+    def register_limit(self, api, limit):
+        """
+        Set the default quota for an API that has no configured limit yet
+
+        Args:
+            api (str): API name
+            limit (dict): {"capacity", "period"} quota (ignored if the API already has one)
+        """
+        with self.condition:
+            if api not in self.limits:
+                self.limits[api] = dict(limit)
+
+    def _create_session(self):
+        """Create a session with a connection pool large enough for parallel scans"""
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=32)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _bucket(self, api):
+        """Get (or create) the token bucket for an API"""
+        if api not in self.buckets:
+            limit = self.limits.get(api, self.limits["default"])
+            self.buckets[api] = TokenBucket(limit["capacity"], limit["period"])
+            self.waiting[api] = []
+            self.stats[api] = {"requests": 0, "rate_limited": 0, "waited_seconds": 0.0}
+        return self.buckets[api]
+
+    def acquire(self, api, weight=1, priority=PRIORITY_MARKET):
+        """
+        Block until the API has quota for a request, serving higher priorities first
+
+        Args:
+            api (str): API name (key in the limits table)
+            weight (float): Quota cost of the request
+            priority (int): Request priority (lower is served first)
+        """
+        ticket = (priority, next(self.counter))
+        started = time.monotonic()
+
+        with self.condition:
+            bucket = self._bucket(api)
+            queue = self.waiting[api]
+            heapq.heappush(queue, ticket)
+            self.condition.notify_all()
+
+            try:
+                while True:
+                    if queue[0] != ticket:
+                        self.condition.wait()
+                        continue
+
+                    now = time.monotonic()
+                    delay = bucket.delay_for(weight, now)
+                    if delay <= 0:
+                        bucket.consume(weight, now)
+                        heapq.heappop(queue)
+                        self.stats[api]["requests"] += 1
+                        self.stats[api]["waited_seconds"] += now - started
+                        return
+                    self.condition.wait(delay)
+            except BaseException:
+                if ticket in queue:
+                    queue.remove(ticket)
+                    heapq.heapify(queue)
+                raise
+            finally:
+                self.condition.notify_all()
+
+    def request(self, api, method, url, priority=PRIORITY_MARKET, weight=1, use_cache=False, **kwargs):
+        """
+        Send a request once the API's quota allows it
+
+        Args:
+            api (str): API name (key in the limits table)
+            method (str): HTTP method
+            url (str): Request URL
+            priority (int): Request priority (lower is served first)
+            weight (float): Quota cost of the request
+            use_cache (bool): Revalidate against / serve from the response cache
+            **kwargs: Extra arguments for requests.Session.request
+
+        Returns:
+            requests.Response: The last response received (`from_cache` is set on cached responses)
+        """
+        kwargs.setdefault("timeout", 30)
+
+        # Serve fresh entries directly and revalidate stale ones with a conditional request
+        cache_key = None
+        entry = None
+        if use_cache and self.cache is not None and method.upper() == "GET":
+            cache_key = self.cache.key(method, url, kwargs.get("params"))
+            entry = self.cache.lookup(cache_key)
+            if entry is not None:
+                if self.cache.is_fresh(entry):
+                    cached = self.cache.build_response(cache_key, entry)
+                    if cached is not None:
+                        self.cache.record("hits")
+                        return cached
+                headers = dict(kwargs.get("headers") or {})
+                headers.update(self.cache.conditional_headers(entry))
+                kwargs["headers"] = headers
+
+        for attempt in range(self.max_retries + 1):
+            self.acquire(api, weight, priority)
+            response = self.session.request(method, url, **kwargs)
+
+            if response.status_code == 304 and self.limits.get(api, {}).get("free_not_modified"):
+                # Providers like GitHub do not count 304 answers against the quota
+                with self.condition:
+                    self._bucket(api).refund(weight, time.monotonic())
+            self._update_from_headers(api, response)
+
+            if not self._is_rate_limited(response):
+                break
+
+            backoff = self._retry_after(response, attempt)
+            logger.warning(f"{api} rate limited (HTTP {response.status_code}). Backing off for {backoff:.1f}s")
+            with self.condition:
+                self.stats[api]["rate_limited"] += 1
+                self._bucket(api).block_for(backoff, time.monotonic())
+                self.condition.notify_all()
+
+        if cache_key is not None:
+            if response.status_code == 304 and entry is not None:
+                cached = self.cache.build_response(cache_key, entry)
+                if cached is not None:
+                    self.cache.refresh(cache_key, response)
+                    self.cache.record("revalidated")
+                    return cached
+            elif response.status_code == 200:
+                self.cache.record("misses")
+                self.cache.store(cache_key, response)
+
+        return response
+
+    def get(self, api, url, **kwargs):
+        """Send a GET request through the scheduler (see `request`)"""
+        return self.request(api, "GET", url, **kwargs)
+
+    def _is_rate_limited(self, response):
+        """Check whether a response signals that the quota was exceeded"""
+        if response.status_code in RATE_LIMIT_STATUS_CODES:
+            return True
+        # GitHub answers 403 with an exhausted quota instead of 429
+        return response.status_code == 403 and response.headers.get("X-RateLimit-Remaining") == "0"
+
+    def _retry_after(self, response, attempt):
+        """Get the backoff before retrying a rate limited request"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+
+        reset = response.headers.get("X-RateLimit-Reset")
+        if reset:
+            try:
+                return max(0.0, float(reset) - time.time())
+            except ValueError:
+                pass
+
+        return float(2 ** attempt)
+
+    def _update_from_headers(self, api, response):
+        """Sync the API's bucket with the quota headers of a response"""
+        headers = response.headers
+        remaining = None
+        reset_in = None
+
+        with self.condition:
+            bucket = self._bucket(api)
+
+            # Binance reports the weight used in the current (fixed) window
+            used_weight = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get("X-MBX-USED-WEIGHT")
+            if used_weight is not None:
+                try:
+                    remaining = bucket.capacity - float(used_weight)
+                    reset_in = bucket.period - (time.time() % bucket.period)
+                except ValueError:
+                    remaining = None
+
+            # GitHub reports the requests left and when its window resets
+            elif headers.get("X-RateLimit-Remaining") is not None:
+                try:
+                    remaining = float(headers["X-RateLimit-Remaining"])
+                    if headers.get("X-RateLimit-Reset"):
+                        reset_in = float(headers["X-RateLimit-Reset"]) - time.time()
+                except ValueError:
+                    remaining = None
+
+            if remaining is not None:
+                bucket.sync(remaining, reset_in, time.monotonic())
+                self.condition.notify_all()
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    """
+    Get the shared request scheduler
+
+    Returns:
+        RequestScheduler: Scheduler shared by all Cash modules
+    """
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler()
+        return _scheduler
+
+
+def configure_scheduler(limits=None, **kwargs):
+    """
+    Replace the shared request scheduler
+
+    Args:
+        limits (dict): Per-API overrides of DEFAULT_LIMITS
+        **kwargs: Extra arguments for RequestScheduler
+
+    Returns:
+        RequestScheduler: The new shared scheduler
+    """
+    global _scheduler
+    with _scheduler_lock:
+        _scheduler = RequestScheduler(limits, **kwargs)
+        return _scheduler
+
+
+if __name__ == "__main__":
+    # If run directly, hammer the rate-limited local stub and report 429s
+    import concurrent.futures
+    from api_stubs import LocalAPIStub
+
+    logging.basicConfig(level=logging.INFO)
+
+    with LocalAPIStub(binance_limit=(40, 2), github_limit=(20, 2)) as stub:
+        scheduler = RequestScheduler({
+            "binance": {"capacity": 40, "period": 2},
+            "github_search": {"capacity": 20, "period": 2}
+        })
+
+        jobs = [("binance", f"{stub.url}/api/v3/ticker/price", PRIORITY_PORTFOLIO)] * 100
+        jobs += [("github_search", f"{stub.url}/search/repositories", PRIORITY_BOTS)] * 40
+
+        started = time.monotonic()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            futures = [executor.submit(scheduler.get, api, url, priority=priority) for api, url, priority in jobs]
+            statuses = [future.result().status_code for future in futures]
+
+        print(json.dumps({
+            "elapsed_seconds": round(time.monotonic() - started, 2),
+            "responses": {str(code): statuses.count(code) for code in sorted(set(statuses))},
+            "stub_rejections": stub.rejections,
+            "scheduler": scheduler.stats
+        }, indent=4))
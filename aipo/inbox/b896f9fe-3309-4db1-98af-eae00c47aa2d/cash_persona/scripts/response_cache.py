@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+HTTP Response Cache for Cash Daily Workflow
+
+This module keeps slow-changing API responses on disk between runs:
+1. Stores response bodies keyed by method, URL, and parameters
+2. Remembers ETag and Last-Modified validators for conditional requests
+3. Serves 304 Not Modified answers (and still-fresh entries) from disk
+4. Evicts least recently used entries once the cache exceeds its size budget
+
+Usage:
+    from response_cache import ResponseCache
+    from rate_limiter import configure_scheduler
+    scheduler = configure_scheduler(cache=ResponseCache("cache/http"))
+    response = scheduler.get("coingecko", url, use_cache=True)
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger("Cash.ResponseCache")
+
+# Response headers kept alongside the cached body
+STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache of HTTP responses with conditional request support"""
+
+    def __init__(self, cache_dir, max_bytes=50 * 1024 * 1024):
+        """
+        Initialize the response cache
+
+        Args:
+            cache_dir (str or Path): Directory for cached responses
+            max_bytes (int): Total size budget for cached bodies
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "revalidated": 0, "misses": 0, "evictions": 0}
+
+        # Index of key -> [body size, last used], rebuilt from disk
+        self.index = {}
+        self.total_bytes = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Rebuild the in-memory index from the cache directory"""
+        for meta_path in self.cache_dir.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            if not body_path.exists():
+                meta_path.unlink(missing_ok=True)
+                continue
+            stat = body_path.stat()
+            self.index[meta_path.stem] = [stat.st_size, stat.st_mtime]
+            self.total_bytes += stat.st_size
+
+    def key(self, method, url, params=None):
+        """
+        Build the cache key for a request
+
+        Args:
+            method (str): HTTP method
+            url (str): Request URL
+            params (dict): Query parameters
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        canonical = json.dumps([method.upper(), url, sorted((params or {}).items())], default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def lookup(self, key):
+        """
+        Get the cached entry for a key
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            dict: Entry metadata (None if not cached)
+        """
+        if key not in self.index:
+            return None
+        try:
+            with open(self.cache_dir / f"{key}.json", 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self._remove(key)
+            return None
+
+    def record(self, outcome):
+        """
+        Count a lookup outcome in the stats (under the cache lock, like evictions)
+
+        Args:
+            outcome (str): "hits", "revalidated", or "misses"
+        """
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def is_fresh(self, entry):
+        """Check whether an entry is still within its Cache-Control max-age"""
+        max_age = entry.get("max_age")
+        return max_age is not None and time.time() - entry.get("stored_at", 0) < max_age
+
+    def conditional_headers(self, entry):
+        """
+        Get the validator headers for revalidating an entry
+
+        Args:
+            entry (dict): Entry metadata
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers
+        """
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, key, response):
+        """
+        Store a successful response if it can be revalidated later
+
+        Args:
+            key (str): Cache key
+            response (requests.Response): Response to store
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        max_age = _max_age(response.headers.get("Cache-Control", ""))
+        if response.status_code != 200 or not (etag or last_modified or max_age):
+            return
+
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+
+        entry = {
+            "url": response.url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "max_age": max_age,
+            "stored_at": time.time(),
+            "headers": {name: response.headers[name] for name in STORED_HEADERS if name in response.headers}
+        }
+
+        with self.lock:
+            self._write(self.cache_dir / f"{key}.body", body)
+            self._write(self.cache_dir / f"{key}.json", json.dumps(entry).encode("utf-8"))
+            previous = self.index.get(key)
+            if previous:
+                self.total_bytes -= previous[0]
+            self.index[key] = [len(body), time.time()]
+            self.total_bytes += len(body)
+            self._evict()
+
+    def refresh(self, key, response):
+        """
+        Record a 304 revalidation for an entry
+
+        Args:
+            key (str): Cache key
+            response (requests.Response): The 304 response
+        """
+        entry = self.lookup(key)
+        if entry is None:
+            return
+        entry["stored_at"] = time.time()
+        max_age = _max_age(response.headers.get("Cache-Control", ""))
+        if max_age is not None:
+            entry["max_age"] = max_age
+        with self.lock:
+            self._write(self.cache_dir / f"{key}.json", json.dumps(entry).encode("utf-8"))
+
+    def build_response(self, key, entry):
+        """
+        Rebuild a requests.Response from a cached entry
+
+        Args:
+            key (str): Cache key
+            entry (dict): Entry metadata
+
+        Returns:
+            requests.Response: Response with `from_cache` set (None if the body is gone)
+        """
+        body_path = self.cache_dir / f"{key}.body"
+        try:
+            body = body_path.read_bytes()
+        except OSError:
+            self._remove(key)
+            return None
+
+        with self.lock:
+            if key in self.index:
+                self.index[key][1] = time.time()
+        os.utime(body_path)
+
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.url = entry.get("url")
+        response.encoding = "utf-8"
+        response.from_cache = True
+        return response
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its budget"""
+        if self.total_bytes <= self.max_bytes:
+            return
+        for key, _ in sorted(self.index.items(), key=lambda item: item[1][1]):
+            if self.total_bytes <= self.max_bytes:
+                break
+            self._remove(key, locked=True)
+            self.stats["evictions"] += 1
+
+    def _remove(self, key, locked=False):
+        """Delete an entry from disk and the index"""
+        if not locked:
+            with self.lock:
+                return self._remove(key, locked=True)
+        size = self.index.pop(key, [0])[0]
+        self.total_bytes -= size
+        for suffix in (".json", ".body"):
+            (self.cache_dir / f"{key}{suffix}").unlink(missing_ok=True)
+
+    def _write(self, path, data):
+        """Write a file atomically"""
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def _max_age(cache_control):
+    """Get max-age (seconds) from a Cache-Control header, None if absent or no-cache"""
+    directives = [part.strip().lower() for part in cache_control.split(",")]
+    if "no-cache" in directives or "no-store" in directives:
+        return None
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return int(directive.split("=", 1)[1])
+            except ValueError:
+                return None
+    return None
+
+
+if __name__ == "__main__":
+    # If run directly, fetch the same endpoints twice through the local stub
+    import tempfile
+    from api_stubs import LocalAPIStub
+    from rate_limiter import RequestScheduler
+
+    logging.basicConfig(level=logging.INFO)
+
+    with tempfile.TemporaryDirectory() as cache_dir, LocalAPIStub(github_limit=(30, 60)) as stub:
+        cache = ResponseCache(cache_dir, max_bytes=1024 * 1024)
+        scheduler = RequestScheduler(cache=cache)
+
+        urls = [
+            ("coingecko", f"{stub.url}/global"),
+            ("coingecko", f"{stub.url}/search/trending"),
+            ("github", f"{stub.url}/repos/freqtrade/freqtrade")
+        ]
+        for run in range(2):
+            for api, url in urls:
+                response = scheduler.get(api, url, use_cache=True)
+                print(f"run {run + 1}: {url} -> {response.status_code}, from cache: {getattr(response, 'from_cache', False)}")
+
+        print(json.dumps({"cache": cache.stats, "stub_requests": stub.request_count, "scheduler": scheduler.stats}, indent=4))
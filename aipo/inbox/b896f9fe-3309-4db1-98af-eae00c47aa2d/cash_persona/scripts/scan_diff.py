@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+Scan Diff for Cash Daily Workflow
+
+This module surfaces what changed between market scans and stores scans compactly:
+1. Compares a scan with the previous one by key: trending coins in and out, top-coin rank and
+   price moves, new and resolved warnings and opportunities, newly rising coins
+2. Emits the result as a compact change set for the playbook, alerts, and other consumers
+3. Computes structural deltas between scans (lists of records are matched by id/symbol/url),
+   which reproduce the newer scan exactly when applied
+4. Stores a full keyframe every `keyframe_every` scans and, in between, only the delta against
+   the latest keyframe (market_diff_*.json next to the market_scan_*.json keyframes)
+
+Usage:
+    from scan_diff import ScanStore, scan_changes
+    store = ScanStore("results", keyframe_every=24)
+    path, changes = store.save(results)
+    for scan in store.iter_scans():
+        ...
+"""
+
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger("Cash.ScanDiff")
+
+# Record fields tried, in order, to match list entries between scans
+IDENTITY_KEYS = ("id", "symbol", "url", "full_name", "name", "title")
+
+# Results keys left out of deltas (the change set is stored separately)
+UNSTORED_KEYS = ("changes",)
+
+KEYFRAME_PREFIX = "market_scan_"
+DELTA_PREFIX = "market_diff_"
+
+
+def diff(old, new):
+    """
+    Structural delta turning `old` into `new`
+
+    Dicts are diffed key by key. Lists of records with a unique identity field are diffed
+    record by record (plus the new order if it changed); anything else is replaced whole.
+
+    Args:
+        old: Previous value (JSON-compatible)
+        new: New value (JSON-compatible)
+
+    Returns:
+        dict: Delta (None if the values are equal)
+    """
+    if old == new:
+        return None
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        node = {}
+        added = {key: value for key, value in new.items() if key not in old}
+        changed = {}
+        for key, value in new.items():
+            if key in old:
+                delta = diff(old[key], value)
+                if delta is not None:
+                    changed[key] = delta
+        removed = [key for key in old if key not in new]
+        if added:
+            node["set"] = added
+        if changed:
+            node["sub"] = changed
+        if removed:
+            node["del"] = removed
+        return {"dict": node}
+
+    if isinstance(old, list) and isinstance(new, list):
+        key = _identity_key(old, new)
+        if key is not None:
+            old_by_key = {item[key]: item for item in old}
+            items = []
+            for item in new:
+                previous = old_by_key.get(item[key])
+                if previous is None:
+                    items.append([item[key], {"=": item}])
+                else:
+                    delta = diff(previous, item)
+                    if delta is not None:
+                        items.append([item[key], delta])
+            node = {"key": key, "items": items}
+            order = [item[key] for item in new]
+            if order != [item[key] for item in old]:
+                node["order"] = order
+            return {"list": node}
+
+    return {"=": new}
+
+
+def patch(old, delta):
+    """
+    Apply a delta from `diff`
+
+    Args:
+        old: Value the delta was computed against
+        delta (dict): Delta (None means unchanged)
+
+    Returns:
+        New value (unchanged parts are shared with `old`)
+    """
+    if delta is None:
+        return old
+    if "=" in delta:
+        return delta["="]
+
+    if "dict" in delta:
+        node = delta["dict"]
+        result = dict(old)
+        for key in node.get("del", []):
+            result.pop(key, None)
+        for key, child in node.get("sub", {}).items():
+            result[key] = patch(old[key], child)
+        result.update(node.get("set", {}))
+        return result
+
+    node = delta["list"]
+    key = node["key"]
+    old_by_key = {item[key]: item for item in old}
+    changed = {item_key: child for item_key, child in node["items"]}
+    order = node.get("order") or [item[key] for item in old]
+    return [patch(old_by_key.get(item_key), changed.get(item_key)) for item_key in order]
+
+
+def _identity_key(old, new):
+    """First identity field that is present and unique in both lists of records"""
+    if not old or not new or not all(isinstance(item, dict) for item in old + new):
+        return None
+    for key in IDENTITY_KEYS:
+        for items in (old, new):
+            values = [item.get(key) for item in items]
+            if not all(isinstance(value, (str, int)) for value in values) or len(set(values)) != len(values):
+                break
+        else:
+            return key
+    return None
+
+
+def _symbol(entry):
+    """Uppercase symbol of a coin, opportunity, or warning entry"""
+    return (entry.get("symbol") or entry.get("coin") or "").upper()
+
+
+def _signal_key(entry):
+    """Key matching the same opportunity or warning across scans"""
+    return (entry.get("type"), _symbol(entry), entry.get("source"), entry.get("message") if not _symbol(entry) else None)
+
+
+def scan_changes(previous, current, price_move_pct=5.0, rank_move=10):
+    """
+    Compact change set between two scans
+
+    Args:
+        previous (dict): Previous scan results (None for the first scan)
+        current (dict): New scan results
+        price_move_pct (float): Smallest price change (percent) reported for a top coin
+        rank_move (int): Smallest market-cap rank change reported for a top coin
+
+    Returns:
+        dict: Changes by category, with "empty" True when nothing changed
+    """
+    previous = previous or {}
+    changes = {"since": previous.get("timestamp"), "timestamp": current.get("timestamp")}
+
+    # Trending coins in and out
+    old_trending = {_symbol(coin) for coin in previous.get("trending_coins", [])}
+    new_trending = {_symbol(coin) for coin in current.get("trending_coins", [])}
+    changes["trending_added"] = sorted(new_trending - old_trending)
+    changes["trending_removed"] = sorted(old_trending - new_trending)
+
+    # Top coins: entries, exits, rank moves, and price moves
+    old_top = {_symbol(coin): coin for coin in previous.get("top_coins", [])}
+    new_top = {_symbol(coin): coin for coin in current.get("top_coins", [])}
+    changes["top_added"] = sorted(set(new_top) - set(old_top)) if old_top else []
+    changes["top_removed"] = sorted(set(old_top) - set(new_top)) if new_top else []
+    rank_moves = []
+    price_moves = []
+    for symbol, coin in new_top.items():
+        old_coin = old_top.get(symbol)
+        if old_coin is None:
+            continue
+        old_rank, new_rank = old_coin.get("market_cap_rank"), coin.get("market_cap_rank")
+        if old_rank and new_rank and abs(new_rank - old_rank) >= rank_move:
+            rank_moves.append({"symbol": symbol, "from": old_rank, "to": new_rank})
+        old_price = old_coin.get("live_price") or old_coin.get("current_price")
+        new_price = coin.get("live_price") or coin.get("current_price")
+        if old_price and new_price:
+            change_pct = (new_price - old_price) / old_price * 100
+            if abs(change_pct) >= price_move_pct:
+                price_moves.append({"symbol": symbol, "from": old_price, "to": new_price, "change_pct": round(change_pct, 2)})
+    changes["rank_moves"] = sorted(rank_moves, key=lambda move: move["to"] - move["from"])
+    changes["price_moves"] = sorted(price_moves, key=lambda move: -abs(move["change_pct"]))
+
+    # Opportunities and warnings that appeared or went away
+    for key in ("opportunities", "warnings"):
+        old_signals = {_signal_key(entry) for entry in previous.get(key, [])}
+        new_signals = {_signal_key(entry) for entry in current.get(key, [])}
+        changes[f"new_{key}"] = [entry for entry in current.get(key, []) if _signal_key(entry) not in old_signals]
+        changes[f"resolved_{key}"] = [entry for entry in previous.get(key, []) if _signal_key(entry) not in new_signals]
+
+    # Coins that started rising
+    old_rising = {_symbol(coin) for coin in previous.get("rising_coins", [])}
+    changes["rising_added"] = [coin for coin in current.get("rising_coins", []) if _symbol(coin) not in old_rising]
+
+    changes["empty"] = not any(
+        value for key, value in changes.items() if key not in ("since", "timestamp")
+    )
+    return changes
+
+
+class ScanStore:
+    """Keyframe plus delta storage of market scans"""
+
+    def __init__(self, results_dir, keyframe_every=24, deltas=True):
+        """
+        Initialize the store
+
+        Args:
+            results_dir (str): Directory holding the scans
+            keyframe_every (int): Scans per keyframe (1 stores every scan in full)
+            deltas (bool): Store deltas between keyframes (False stores every scan in full)
+        """
+        self.results_dir = Path(results_dir)
+        self.keyframe_every = max(1, keyframe_every)
+        self.deltas = deltas
+        self._keyframe = None   # (name, results) of the latest keyframe
+        self._previous = None   # latest scan results
+
+    def paths(self):
+        """Stored scan files (keyframes and deltas), oldest first"""
+        paths = list(self.results_dir.glob(f"{KEYFRAME_PREFIX}*.json")) + list(self.results_dir.glob(f"{DELTA_PREFIX}*.json"))
+        return sorted(paths, key=lambda path: (path.stem.split("_", 2)[-1], path.name.startswith(DELTA_PREFIX)))
+
+    def load(self, path):
+        """
+        Load one stored scan, applying its delta to its keyframe if needed
+
+        Args:
+            path (str): market_scan_*.json or market_diff_*.json file
+
+        Returns:
+            dict: Scan results
+        """
+        path = Path(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if not path.name.startswith(DELTA_PREFIX):
+            return data
+        with open(path.parent / data["keyframe"], 'r') as f:
+            keyframe = json.load(f)
+        return self._expand(keyframe, data)
+
+    def _expand(self, keyframe, data):
+        """Rebuild a scan from its keyframe and stored delta"""
+        for key in UNSTORED_KEYS:
+            keyframe.pop(key, None)
+        results = patch(keyframe, data["delta"])
+        if data.get("changes") is not None:
+            results["changes"] = data["changes"]
+        return results
+
+    def iter_scans(self):
+        """
+        Yield every stored scan in order (each keyframe is read once)
+
+        Yields:
+            tuple: (path, results)
+        """
+        keyframe_name, keyframe_text = None, None
+        for path in self.paths():
+            try:
+                if not path.name.startswith(DELTA_PREFIX):
+                    keyframe_name, keyframe_text = path.name, path.read_text()
+                    yield path, json.loads(keyframe_text)
+                    continue
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                if data["keyframe"] != keyframe_name:
+                    keyframe_name, keyframe_text = data["keyframe"], (path.parent / data["keyframe"]).read_text()
+                yield path, self._expand(json.loads(keyframe_text), data)
+            except Exception as e:
+                logger.warning(f"Skipping unreadable scan {path}: {str(e)}")
+
+    def latest(self):
+        """The most recent stored scan (None if there is none)"""
+        if self._previous is None:
+            for path in reversed(self.paths()):
+                try:
+                    self._previous = self.load(path)
+                    break
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable scan {path}: {str(e)}")
+        return self._previous
+
+    def _latest_keyframe(self):
+        """(path, number of deltas stored after it) for the newest keyframe"""
+        deltas_since = 0
+        for path in reversed(self.paths()):
+            if not path.name.startswith(DELTA_PREFIX):
+                return path, deltas_since
+            deltas_since += 1
+        return None, deltas_since
+
+    def save(self, results, stamp=None, price_move_pct=5.0, rank_move=10):
+        """
+        Store a scan as a keyframe or as a delta against the latest keyframe
+
+        Args:
+            results (dict): Scan results
+            stamp (str): File timestamp (YYYYmmdd_HHMMSS, now if None)
+            price_move_pct (float): Price move threshold for the change set
+            rank_move (int): Rank move threshold for the change set
+
+        Returns:
+            tuple: (path written, change set against the previous scan)
+        """
+        self.results_dir.mkdir(exist_ok=True, parents=True)
+        stamp = stamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        # Normalize through JSON so the delta matches what a reload produces
+        current = json.loads(json.dumps({key: value for key, value in results.items() if key not in UNSTORED_KEYS}))
+        changes = scan_changes(self.latest(), current, price_move_pct, rank_move)
+
+        keyframe_path, deltas_since = self._latest_keyframe()
+        if not self.deltas or keyframe_path is None or deltas_since + 1 >= self.keyframe_every:
+            path = self.results_dir / f"{KEYFRAME_PREFIX}{stamp}.json"
+            with open(path, 'w') as f:
+                json.dump(dict(current, changes=changes), f, indent=4)
+            self._keyframe = (path.name, current)
+        else:
+            if self._keyframe is None or self._keyframe[0] != keyframe_path.name:
+                with open(keyframe_path, 'r') as f:
+                    keyframe = json.load(f)
+                for key in UNSTORED_KEYS:
+                    keyframe.pop(key, None)
+                self._keyframe = (keyframe_path.name, keyframe)
+            path = self.results_dir / f"{DELTA_PREFIX}{stamp}.json"
+            with open(path, 'w') as f:
+                json.dump({
+                    "timestamp": current.get("timestamp"),
+                    "keyframe": keyframe_path.name,
+                    "delta": diff(self._keyframe[1], current),
+                    "changes": changes
+                }, f, separators=(",", ":"))
+
+        self._previous = current
+        return path, changes
+
+
+if __name__ == "__main__":
+    # If run directly, store a day of synthetic hourly scans and compare sizes with full files
+    import random
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = random.Random(1)
+    coins = [{"id": f"coin-{i}", "symbol": f"c{i}", "name": f"Coin {i}", "current_price": rng.uniform(0.01, 1000),
+              "market_cap_rank": i + 1, "total_volume": rng.uniform(1e5, 1e9)} for i in range(2500)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ScanStore(tmp, keyframe_every=24)
+        full_bytes = 0
+        scans = []
+        for hour in range(24):
+            for coin in rng.sample(coins, 300):
+                coin["current_price"] = round(coin["current_price"] * rng.uniform(0.9, 1.12), 6)
+            scan = {
+                "timestamp": datetime(2025, 5, 11, hour).isoformat(),
+                "top_coins": [dict(coin) for coin in coins],
+                "trending_coins": [{"symbol": coin["symbol"], "name": coin["name"]} for coin in rng.sample(coins[:200], 7)],
+                "opportunities": [],
+                "warnings": [{"type": "negative_sentiment", "coin": rng.choice(["BTC", "ETH"]), "message": "bear"}]
+            }
+            full_bytes += len(json.dumps(scan, indent=4))
+            path, changes = store.save(scan, stamp=f"20250511_{hour:02d}0000")
+            scans.append(scan)
+
+        stored_bytes = sum(path.stat().st_size for path in store.paths())
+        restored = [results for _, results in ScanStore(tmp).iter_scans()]
+        exact = all({k: v for k, v in a.items() if k != "changes"} == json.loads(json.dumps(b)) for a, b in zip(restored, scans))
+
+        print(json.dumps({
+            "scans": len(scans),
+            "full_bytes": full_bytes,
+            "stored_bytes": stored_bytes,
+            "ratio": round(stored_bytes / full_bytes, 3),
+            "restored_exactly": exact and len(restored) == len(scans),
+            "last_changes": {key: (len(value) if isinstance(value, list) else value) for key, value in changes.items()}
+        }, indent=4))
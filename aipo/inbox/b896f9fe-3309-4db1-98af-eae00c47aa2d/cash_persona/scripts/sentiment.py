@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Sentiment Scoring for Cash Daily Workflow
+
+This module scores social and news text locally, with no external services:
+1. Lexicon of general sentiment words plus crypto slang (moon, rekt, rug, fud, hodl, ...)
+2. Negation ("not bullish") and intensifier ("very bearish") handling
+3. Tokenization through precompiled translation tables, so a post is one translate + split
+4. Batch scoring across a process pool for large feeds
+5. Per-coin aggregates (mentions, mean score, positive/negative counts) for MarketScanner
+
+Scores are in [-1, 1]; labels are positive (>= 0.05), negative (<= -0.05), or neutral.
+
+Usage:
+    from sentiment import SentimentScorer
+    scorer = SentimentScorer()
+    scorer.score("ETH is not going to zero, very bullish")
+    scores = scorer.score_many(posts)
+    per_coin = scorer.aggregate(items)
+"""
+
+import os
+import math
+import string
+import logging
+import concurrent.futures
+
+logger = logging.getLogger("Cash.Sentiment")
+
+# Word -> valence (roughly -4 to 4)
+LEXICON = {
+    # General
+    "good": 1.9, "great": 3.1, "excellent": 3.2, "amazing": 2.8, "awesome": 3.1, "love": 3.2,
+    "like": 1.5, "happy": 2.7, "excited": 2.4, "exciting": 2.2, "win": 2.8, "winning": 2.4,
+    "wins": 2.7, "gain": 2.0, "gains": 2.0, "profit": 2.0, "profits": 2.0, "strong": 2.1,
+    "growth": 1.9, "grow": 1.6, "growing": 1.6, "success": 2.7, "successful": 2.8, "approve": 2.0,
+    "approved": 2.0, "approves": 2.0, "approval": 2.0, "adoption": 1.8, "adopt": 1.5, "upgrade": 1.6,
+    "breakthrough": 2.5, "record": 1.2, "opportunity": 1.8, "positive": 2.3, "optimistic": 2.4,
+    "confident": 2.2, "safe": 1.9, "secure": 1.4, "support": 1.7, "partnership": 1.8, "launch": 1.2,
+    "bad": -2.5, "terrible": -3.1, "awful": -3.1, "hate": -2.7, "fear": -2.2, "scared": -2.2,
+    "worried": -1.9, "worry": -1.9, "panic": -2.7, "loss": -2.0, "losses": -2.0, "lose": -2.1,
+    "losing": -2.1, "lost": -2.1, "weak": -1.9, "fail": -2.5, "failed": -2.5, "fails": -2.4,
+    "failure": -2.6, "risk": -1.1, "risky": -1.5, "danger": -2.4, "dangerous": -2.4, "crisis": -3.1,
+    "collapse": -3.0, "collapsed": -3.0, "crash": -2.9, "crashed": -2.9, "crashing": -2.9,
+    "ban": -2.6, "banned": -2.6, "bans": -2.6, "lawsuit": -2.2, "sued": -2.2, "fraud": -3.2,
+    "negative": -2.7, "warning": -1.5, "concern": -1.4, "concerns": -1.4, "problem": -1.7,
+    "problems": -1.7, "down": -1.0, "decline": -1.6, "declining": -1.6, "drop": -1.4, "drops": -1.4,
+    "dropped": -1.4, "fall": -1.4, "falls": -1.4, "falling": -1.6, "plunge": -2.5, "plunges": -2.5,
+    "protect": 0.3, "incoming": -0.3, "delay": -1.2, "delayed": -1.3, "regulation": -0.6,
+    "regulations": -0.6, "investigation": -1.9, "exploit": -2.6, "exploited": -2.8, "stolen": -3.0,
+    "up": 0.8, "rise": 1.4, "rises": 1.4, "rising": 1.5, "surge": 2.2, "surges": 2.2, "soar": 2.5,
+    "soars": 2.5, "rally": 2.1, "rallies": 2.1, "breakout": 1.9, "breaks": 0.5, "recover": 1.6,
+    "recovery": 1.6, "rebound": 1.6, "institutional": 0.6, "etf": 0.8,
+    # Crypto slang
+    "bullish": 2.9, "bull": 1.9, "bulls": 1.7, "moon": 2.8, "mooning": 3.0, "moonshot": 2.4,
+    "lambo": 2.2, "hodl": 1.4, "hodling": 1.4, "ath": 2.3, "pump": 1.5, "pumping": 1.7,
+    "wagmi": 2.4, "gm": 0.6, "lfg": 2.5, "undervalued": 2.0, "gem": 2.3, "alpha": 1.4,
+    "accumulate": 1.5, "accumulating": 1.5, "staking": 0.8, "airdrop": 1.2, "listing": 1.4,
+    "listed": 1.3, "halving": 1.0, "mainnet": 1.4, "bearish": -2.9, "bear": -1.9, "bears": -1.7,
+    "dump": -2.3, "dumping": -2.5, "dumped": -2.4, "rekt": -3.0, "rug": -3.3, "rugged": -3.4,
+    "rugpull": -3.4, "scam": -3.4, "scammer": -3.3, "ponzi": -3.3, "fud": -1.8, "ngmi": -2.6,
+    "capitulation": -2.6, "liquidated": -2.9, "liquidation": -2.4, "liquidations": -2.4,
+    "hack": -3.0, "hacked": -3.2, "overvalued": -1.8, "bagholder": -2.0, "bagholders": -2.0,
+    "delisted": -2.8, "delisting": -2.6, "depeg": -3.0, "depegged": -3.1, "insolvent": -3.2,
+    "bankrupt": -3.3, "bankruptcy": -3.3, "shitcoin": -2.4, "honeypot": -3.2
+}
+
+# Emoji -> valence
+EMOJI = {
+    "🚀": 2.6, "📈": 2.0, "🔥": 1.6, "💎": 1.5, "🌕": 2.2, "🐂": 1.8, "💰": 1.8, "✅": 1.2,
+    "📉": -2.0, "💀": -2.2, "🐻": -1.8, "😱": -2.0, "🩸": -2.2, "⚠️": -1.5, "⚠": -1.5, "❌": -1.4
+}
+
+# Words that flip the valence of the next few tokens
+NEGATIONS = frozenset([
+    "not", "no", "never", "none", "nobody", "nothing", "neither", "nor", "without", "cannot",
+    "cant", "dont", "doesnt", "didnt", "isnt", "arent", "wasnt", "werent", "wont", "wouldnt",
+    "shouldnt", "couldnt", "aint", "hardly"
+])
+
+# Intensifiers and dampeners -> scale applied to the next sentiment word
+BOOSTERS = {
+    "very": 1.3, "extremely": 1.5, "super": 1.4, "really": 1.2, "so": 1.15, "hugely": 1.4,
+    "massively": 1.5, "incredibly": 1.4, "absolutely": 1.3, "totally": 1.2, "mega": 1.4,
+    "slightly": 0.6, "somewhat": 0.7, "barely": 0.5, "kinda": 0.7, "little": 0.8
+}
+
+NEGATION_SCOPE = 3
+NEGATION_SCALE = -0.74
+NORMALIZATION_ALPHA = 15.0
+POSITIVE_LABEL = 0.05
+NEGATIVE_LABEL = -0.05
+
+# Precompiled tokenization: punctuation becomes a space (apostrophes vanish so "isn't" -> "isnt"),
+# emoji are padded with spaces so they split into their own tokens
+_TRANSLATION = str.maketrans({
+    **{char: " " for char in string.punctuation if char not in "'$"},
+    "'": "", "’": "", "$": " $",
+    **{emoji: f" {emoji} " for emoji in EMOJI if len(emoji) == 1}
+})
+_VALENCE = dict(LEXICON, **EMOJI)
+
+
+def tokenize(text):
+    """Lowercase and split text into word, cashtag, and emoji tokens"""
+    return text.lower().translate(_TRANSLATION).split()
+
+
+def score_text(text):
+    """
+    Score one text
+
+    Args:
+        text (str): Post, tweet, headline, ...
+
+    Returns:
+        float: Compound score in [-1, 1]
+    """
+    total = 0.0
+    negate_for = 0
+    boost = 1.0
+    valence = _VALENCE
+    for token in tokenize(text):
+        value = valence.get(token)
+        if value is not None:
+            value *= boost
+            if negate_for:
+                value *= NEGATION_SCALE
+            total += value
+            boost = 1.0
+        elif token in NEGATIONS:
+            negate_for = NEGATION_SCOPE + 1
+        elif token in BOOSTERS:
+            boost = BOOSTERS[token]
+        if negate_for:
+            negate_for -= 1
+    if total == 0.0:
+        return 0.0
+    return total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+
+
+def label_for(score):
+    """Map a compound score to positive, negative, or neutral"""
+    if score >= POSITIVE_LABEL:
+        return "positive"
+    if score <= NEGATIVE_LABEL:
+        return "negative"
+    return "neutral"
+
+
+def _score_chunk(texts):
+    """Score a chunk of texts in a worker process"""
+    return [score_text(text) for text in texts]
+
+
+class SentimentScorer:
+    """Scores batches of text and aggregates sentiment per coin"""
+
+    def __init__(self, workers=None, chunk_size=5000, parallel_threshold=20000):
+        """
+        Initialize the scorer
+
+        Args:
+            workers (int): Worker processes for large batches (CPU count if None)
+            chunk_size (int): Texts per worker task
+            parallel_threshold (int): Batches smaller than this are scored in-process
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+
+    def score(self, text):
+        """Score one text (see score_text)"""
+        return score_text(text or "")
+
+    def score_many(self, texts):
+        """
+        Score a batch of texts, fanning out across processes for large batches
+
+        Args:
+            texts (list): Texts
+
+        Returns:
+            list: Compound scores, in input order
+        """
+        texts = [text or "" for text in texts]
+        if self.workers <= 1 or len(texts) < self.parallel_threshold:
+            return _score_chunk(texts)
+
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        scores = []
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for chunk_scores in executor.map(_score_chunk, chunks):
+                scores.extend(chunk_scores)
+        return scores
+
+    def aggregate(self, items, text_keys=("title", "tweet", "summary", "text", "body")):
+        """
+        Score feed items and aggregate sentiment per mentioned coin
+
+        Each item gets "sentiment_score" and "sentiment" (label) set from its text.
+
+        Args:
+            items (list): Feed items with text fields and a "trending_coins" list
+            text_keys (tuple): Item keys whose values are joined into the scored text
+
+        Returns:
+            dict: Coin symbol -> {"mentions", "score", "positive", "negative", "label", "sources", "most_negative"}
+        """
+        texts = [" ".join(str(item[key]) for key in text_keys if item.get(key)) for item in items]
+        scores = self.score_many(texts)
+
+        per_coin = {}
+        for item, text, score in zip(items, texts, scores):
+            item["sentiment_score"] = round(score, 4)
+            item["sentiment"] = label_for(score)
+            for coin in item.get("trending_coins", []):
+                entry = per_coin.setdefault(coin, {
+                    "mentions": 0, "total": 0.0, "positive": 0, "negative": 0,
+                    "sources": [], "most_negative": None, "lowest": 0.0
+                })
+                entry["mentions"] += 1
+                entry["total"] += score
+                entry["positive"] += score >= POSITIVE_LABEL
+                entry["negative"] += score <= NEGATIVE_LABEL
+                if item.get("source") and item["source"] not in entry["sources"]:
+                    entry["sources"].append(item["source"])
+                if score < entry["lowest"]:
+                    entry["lowest"] = score
+                    entry["most_negative"] = text
+
+        for entry in per_coin.values():
+            entry["score"] = round(entry.pop("total") / entry["mentions"], 4)
+            entry["label"] = label_for(entry["score"])
+            entry.pop("lowest")
+        return per_coin
+
+
+if __name__ == "__main__":
+    # If run directly, score sample posts and time a large synthetic batch
+    import json
+    import time
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+
+    scorer = SentimentScorer()
+    samples = [
+        "Dogecoin to the moon! 🚀",
+        "Bear market incoming. Protect your assets.",
+        "ETH is not bearish at all, very bullish long term",
+        "Another rug pull... this project was a scam",
+        "SOL isn't going to crash",
+        "New Regulations Coming for Crypto Exchanges"
+    ]
+    for text in samples:
+        score = scorer.score(text)
+        print(f"{score:+.3f} {label_for(score):8} {text}")
+
+    rng = random.Random(3)
+    vocabulary = list(LEXICON) + ["the", "a", "is", "to", "and", "btc", "eth", "$sol", "today", "market"] * 20
+    posts = [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(8, 40))) for _ in range(100000)]
+
+    start_time = time.perf_counter()
+    SentimentScorer(workers=1).score_many(posts)
+    single = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    scorer.score_many(posts)
+    pooled = time.perf_counter() - start_time
+
+    print(json.dumps({
+        "posts": len(posts),
+        "single_process_seconds": round(single, 3),
+        "pooled_seconds": round(pooled, 3),
+        "workers": scorer.workers,
+        "posts_per_minute": int(len(posts) / min(single, pooled) * 60)
+    }, indent=4))
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Market Data Sources for Cash Daily Workflow
+
+This module is the plugin registry the market scanner pulls its data from:
+1. Each source declares a fetch function, a parse function, the results key it fills,
+   and the API quota its requests are paced under
+2. Sources are enabled by name through the `market_scan.sources` config list
+3. All enabled sources run under one concurrency policy (a thread per source up to
+   `source_workers`, and a shared `source_timeout`), so a scan takes as long as its
+   slowest source rather than the sum of them
+4. File-backed sources replay JSON or JSONL files, for tests and offline runs
+
+Usage:
+    from sources import register_source, register_file_source
+    register_source("telegram", fetch=fetch_telegram, result_key="telegram_trends",
+                    api="telegram", rate_limit={"capacity": 30, "period": 1})
+    register_file_source("fake_reddit", "fixtures/reddit.jsonl", result_key="reddit_trends")
+"""
+
+import json
+import time
+import logging
+import threading
+import concurrent.futures
+from pathlib import Path
+
+logger = logging.getLogger("Cash.Sources")
+
+# Sources enabled when the config does not list any
+DEFAULT_SOURCES = ["coingecko", "reddit", "twitter", "news"]
+
+# Results keys holding social and news items, for scans stored without a "feeds" list
+DEFAULT_FEEDS = ["reddit_trends", "twitter_trends", "news"]
+
+# Concurrency policy defaults
+DEFAULT_SOURCE_WORKERS = 32
+DEFAULT_SOURCE_TIMEOUT = 60
+
+
+class Source:
+    """A market data source: how to fetch it, how to parse it, and where the items go"""
+
+    def __init__(self, name, fetch, parse=None, result_key=None, api=None, rate_limit=None,
+                 label=None, feed=True):
+        """
+        Initialize the source
+
+        Args:
+            name (str): Name used in `market_scan.sources`
+            fetch (callable): fetch(scanner) -> raw data; requests go through scanner.scheduler
+            parse (callable): parse(raw, scanner) -> list of items (raw data is used as-is if None)
+            result_key (str): Results key for the items (None if fetch returns a dict of results
+                to merge into the scanner's results)
+            api (str): Rate limiter API the source's requests are charged to
+            rate_limit (dict): Default quota for `api` ({"capacity", "period"}); config overrides win
+            label (str): Display name for logs and warnings
+            feed (bool): Whether the items are social/news posts for sentiment and trending checks
+        """
+        self.name = name
+        self.fetch = fetch
+        self.parse = parse
+        self.result_key = result_key
+        self.api = api
+        self.rate_limit = rate_limit
+        self.label = label or name.replace("_", " ").title()
+        self.feed = feed and result_key is not None
+
+    def collect(self, scanner):
+        """
+        Fetch and parse the source's items
+
+        Args:
+            scanner (MarketScanner): Scanner the source runs for
+
+        Returns:
+            list: Parsed items (a dict of results to merge if the source has no result_key)
+        """
+        raw = self.fetch(scanner)
+        if self.result_key is None:
+            return raw or {}
+        items = self.parse(raw, scanner) if self.parse else raw
+        items = list(items or [])
+        for item in items:
+            item.setdefault("source", self.name)
+        return items
+
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def register_source(name, fetch, replace=True, **kwargs):
+    """
+    Add a source to the registry
+
+    Args:
+        name (str): Source name
+        fetch (callable): fetch(scanner) -> raw data
+        replace (bool): Replace an existing source with the same name
+        **kwargs: Other Source arguments (parse, result_key, api, rate_limit, label, feed)
+
+    Returns:
+        Source: The registered source
+    """
+    source = Source(name, fetch, **kwargs)
+    with _registry_lock:
+        if name in _registry and not replace:
+            raise ValueError(f"Source already registered: {name}")
+        _registry[name] = source
+    return source
+
+
+def register_file_source(name, path, result_key=None, delay=0.0, **kwargs):
+    """
+    Add a source that replays items from a local JSON list or JSONL file
+
+    Args:
+        name (str): Source name
+        path (str): File of items
+        result_key (str): Results key for the items (`<name>_trends` if None)
+        delay (float): Seconds to sleep per fetch, to simulate a slow API
+        **kwargs: Other Source arguments
+
+    Returns:
+        Source: The registered source
+    """
+    path = Path(path)
+
+    def fetch(scanner):
+        if delay:
+            time.sleep(delay)
+        text = path.read_text(encoding="utf-8")
+        if path.suffix == ".jsonl":
+            return [json.loads(line) for line in text.splitlines() if line.strip()]
+        return json.loads(text)
+
+    return register_source(name, fetch, result_key=result_key or f"{name}_trends", **kwargs)
+
+
+def unregister_source(name):
+    """Remove a source from the registry (no error if it is missing)"""
+    with _registry_lock:
+        _registry.pop(name, None)
+
+
+def get_source(name):
+    """Get a registered source by name (None if unknown)"""
+    with _registry_lock:
+        return _registry.get(name)
+
+
+def registered_sources():
+    """Names of all registered sources"""
+    with _registry_lock:
+        return sorted(_registry)
+
+
+def enabled_sources(names):
+    """
+    Resolve configured source names, skipping unknown ones
+
+    Args:
+        names (list): Names from `market_scan.sources`
+
+    Returns:
+        list: Registered sources in config order
+    """
+    sources = []
+    for name in names:
+        source = get_source(name)
+        if source is None:
+            logger.warning(f"Unknown market data source: {name}")
+            continue
+        sources.append(source)
+    return sources
+
+
+def run_sources(sources, scanner, workers=None, timeout=None):
+    """
+    Run sources concurrently and store their items in the scanner's results
+
+    Args:
+        sources (list): Sources to run
+        scanner (MarketScanner): Scanner whose results receive the items
+        workers (int): Maximum sources running at once (one thread per source up to
+            DEFAULT_SOURCE_WORKERS if None)
+        timeout (float): Seconds to wait for all sources before giving up on the stragglers
+
+    Returns:
+        dict: Per-source status, seconds, and item count
+    """
+    if not sources:
+        return {}
+
+    for source in sources:
+        if source.api and source.rate_limit:
+            scanner.scheduler.register_limit(source.api, source.rate_limit)
+
+    workers = workers or min(len(sources), DEFAULT_SOURCE_WORKERS)
+    timeout = timeout or DEFAULT_SOURCE_TIMEOUT
+    status = {}
+    started = time.monotonic()
+
+    def timed_collect(source):
+        logger.debug(f"Scanning {source.label}")
+        start_time = time.monotonic()
+        items = source.collect(scanner)
+        return items, time.monotonic() - start_time
+
+    # Not a with-block: leaving it would wait for sources that already timed out
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="source")
+    try:
+        futures = {executor.submit(timed_collect, source): source for source in sources}
+        done, pending = concurrent.futures.wait(futures, timeout=timeout)
+
+        # Only finished sources reach the results: a timed-out source's thread keeps running,
+        # and what it returns later is thrown away
+        for future in done:
+            source = futures[future]
+            try:
+                items, seconds = future.result()
+                if source.result_key is None:
+                    _merge_results(scanner.results, items)
+                else:
+                    scanner.results[source.result_key] = items
+                status[source.name] = {
+                    "status": "ok",
+                    "seconds": round(seconds, 3),
+                    "items": len(items) if source.result_key is not None else None
+                }
+            except Exception as e:
+                logger.error(f"Error scanning {source.label}: {str(e)}", exc_info=True)
+                scanner.results["warnings"].append({
+                    "source": source.name,
+                    "message": f"Failed to scan {source.label}: {str(e)}"
+                })
+                status[source.name] = {"status": "error", "error": str(e)}
+
+        for future in pending:
+            source = futures[future]
+            future.cancel()
+            logger.error(f"Timed out scanning {source.label} after {timeout}s")
+            scanner.results["warnings"].append({
+                "source": source.name,
+                "message": f"Timed out scanning {source.label} after {timeout}s"
+            })
+            status[source.name] = {"status": "timeout"}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Scanned {len(sources)} sources in {time.monotonic() - started:.2f}s")
+    return status
+
+
+def _merge_results(results, partial):
+    """Merge a source's own results into the scan results (lists extend, dicts update)"""
+    for key, value in partial.items():
+        if isinstance(value, list) and isinstance(results.get(key), list):
+            results[key].extend(value)
+        elif isinstance(value, dict) and isinstance(results.get(key), dict):
+            results[key].update(value)
+        else:
+            results[key] = value
+
+
+def _fetch_coingecko(scanner):
+    """CoinGecko trending coins, global data, and top coins, as results to merge"""
+    return scanner._scan_coingecko()
+
+
+def _fetch_reddit(scanner):
+    """Reddit trending discussions"""
+    # This is a placeholder - in a real implementation, we would use PRAW (Python Reddit API Wrapper)
+    # or scrape Reddit for trending discussions
+    return [
+        {
+            "subreddit": "r/CryptoCurrency",
+            "title": "Daily Discussion - May 11, 2025",
+            "sentiment": "neutral",
+            "trending_coins": ["BTC", "ETH", "SOL"],
+            "url": "https://reddit.com/r/CryptoCurrency/comments/daily",
+            "source": "reddit"
+        },
+        {
+            "subreddit": "r/Bitcoin",
+            "title": "Bitcoin breaks $100k!",
+            "sentiment": "positive",
+            "trending_coins": ["BTC"],
+            "url": "https://reddit.com/r/Bitcoin/comments/btc100k",
+            "source": "reddit"
+        },
+        {
+            "subreddit": "r/SatoshiStreetBets",
+            "title": "What's your moonshot for this week?",
+            "sentiment": "bullish",
+            "trending_coins": ["PEPE", "DOGE", "SHIB"],
+            "url": "https://reddit.com/r/SatoshiStreetBets/comments/moonshot",
+            "source": "reddit"
+        }
+    ]
+
+
+def _fetch_twitter(scanner):
+    """Twitter trending tweets"""
+    # This is a placeholder - in a real implementation, we would use the Twitter API
+    # or scrape Twitter for trending tweets
+    return [
+        {
+            "username": "elonmusk",
+            "tweet": "Dogecoin to the moon! 🚀",
+            "sentiment": "positive",
+            "trending_coins": ["DOGE"],
+            "url": "https://twitter.com/elonmusk/status/doge",
+            "source": "twitter"
+        },
+        {
+            "username": "VitalikButerin",
+            "tweet": "Excited about the latest Ethereum upgrade. Scaling solutions are coming.",
+            "sentiment": "positive",
+            "trending_coins": ["ETH"],
+            "url": "https://twitter.com/VitalikButerin/status/eth",
+            "source": "twitter"
+        },
+        {
+            "username": "CryptoWhale",
+            "tweet": "Bear market incoming. Protect your assets.",
+            "sentiment": "negative",
+            "trending_coins": ["BTC", "ETH"],
+            "url": "https://twitter.com/CryptoWhale/status/bear",
+            "source": "twitter"
+        }
+    ]
+
+
+def _fetch_news(scanner):
+    """Major announcements from news sites"""
+    # This is a placeholder - in a real implementation, we would use a news API
+    # or scrape news sources for major announcements
+    return [
+        {
+            "title": "SEC Approves Spot Ethereum ETF",
+            "summary": "The SEC has approved the first spot Ethereum ETF, opening the door for institutional investment.",
+            "sentiment": "positive",
+            "trending_coins": ["ETH"],
+            "url": "https://example.com/news/eth-etf",
+            "source": "bloomberg"
+        },
+        {
+            "title": "Major Bank Adds Bitcoin to Balance Sheet",
+            "summary": "A major US bank has added Bitcoin to its balance sheet, following the trend of institutional adoption.",
+            "sentiment": "positive",
+            "trending_coins": ["BTC"],
+            "url": "https://example.com/news/bank-btc",
+            "source": "cnbc"
+        },
+        {
+            "title": "New Regulations Coming for Crypto Exchanges",
+            "summary": "Regulators are planning new rules for crypto exchanges, focusing on consumer protection.",
+            "sentiment": "neutral",
+            "trending_coins": ["BNB", "CRO"],
+            "url": "https://example.com/news/regulations",
+            "source": "coindesk"
+        }
+    ]
+
+
+# Built-in sources. The Reddit, Twitter, and news fetches are placeholders that send no
+# requests, so they declare no API quota; a real fetch declares `api` and `rate_limit` and
+# sends its requests through scanner.scheduler.get(api, ...)
+register_source("coingecko", _fetch_coingecko, api="coingecko", label="CoinGecko", feed=False)
+register_source("reddit", _fetch_reddit, result_key="reddit_trends", label="Reddit")
+register_source("twitter", _fetch_twitter, result_key="twitter_trends", label="Twitter")
+register_source("news", _fetch_news, result_key="news", label="news sources")
+
+
+if __name__ == "__main__":
+    # If run directly, scan twenty slow file-backed sources and show the scan takes about as long as one
+    import tempfile
+    import sources as registry   # the scanner's registry, not this __main__ copy
+    from market_scanner import MarketScanner
+
+    logging.basicConfig(level=logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        names = []
+        for i in range(20):
+            path = Path(tmp) / f"feed_{i}.jsonl"
+            path.write_text("\n".join(json.dumps({"title": f"$BTC post {j} from feed {i}"}) for j in range(50)))
+            registry.register_file_source(f"feed_{i}", path, delay=0.25)
+            names.append(f"feed_{i}")
+
+        scanner = MarketScanner({"sources": names}, {})
+        start_time = time.perf_counter()
+        results = scanner.scan()
+        elapsed = time.perf_counter() - start_time
+
+    print(json.dumps({
+        "sources": len(names),
+        "delay_per_source": 0.25,
+        "scan_seconds": round(elapsed, 3),
+        "items": sum(len(results.get(f"{name}_trends", [])) for name in names),
+        "feeds": len(results["feeds"])
+    }, indent=4))
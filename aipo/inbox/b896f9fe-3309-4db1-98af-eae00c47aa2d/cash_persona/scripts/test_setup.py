@@ -8,6 +8,7 @@ This script tests the Cash setup by running a simple test of each component:
 3. Bot hunter
 4. Playbook generator
 5. Money logger
+6. Startup time of cash_daily, against a budget
 
 Usage:
     python test_setup.py
@@ -27,6 +28,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger("Cash.TestSetup")
 
+# Most `import cash_daily` may take, and modules it must not import until a stage runs
+STARTUP_BUDGET_MS = 50
+LAZY_MODULES = ["requests", "numpy", "market_scanner", "portfolio_tracker", "bot_hunter"]
+
 def test_imports():
     """Test imports of all required modules"""
     logger.info("Testing imports...")
@@ -170,6 +175,61 @@ def test_bot_hunter():
         logger.error(f"❌ Bot hunter test failed: {str(e)}")
         return False
 
+def test_startup():
+    """Test that cash_daily starts within its import-time budget"""
+    logger.info("Testing startup time...")
+    
+    try:
+        from benchmarks import import_times
+        
+        times = import_times("import cash_daily")
+        eager = [name for name in LAZY_MODULES if name in times]
+        if eager:
+            logger.error(f"❌ cash_daily imports {', '.join(eager)} at startup")
+            return False
+        
+        elapsed = times.get("cash_daily", 0)
+        if elapsed > STARTUP_BUDGET_MS:
+            logger.error(f"❌ cash_daily import took {elapsed:.1f} ms (budget {STARTUP_BUDGET_MS} ms)")
+            return False
+        
+        logger.info(f"✅ cash_daily import took {elapsed:.1f} ms (budget {STARTUP_BUDGET_MS} ms)")
+        return True
+    
+    except Exception as e:
+        logger.error(f"❌ Startup test failed: {str(e)}")
+        return False
+
+def test_ohlcv_backfill():
+    """Test that klines backfilled one symbol after another land in their own bars"""
+    logger.info("Testing OHLCV backfill...")
+    
+    try:
+        from ohlcv import BarAggregator
+        
+        aggregator = BarAggregator({"1m": (60, 10)})
+        start = 1_700_000_040 * 1000
+        for offset, symbol in ((0, "BTCUSDT"), (100, "ETHUSDT")):
+            klines = [[start + i * 60000, offset + 10 + i, offset + 10.5 + i, offset + 9.5 + i, offset + 10 + i, 1]
+                      for i in range(5)]
+            aggregator.load_klines(symbol, "1m", klines)
+        
+        for offset, symbol in ((0, "BTCUSDT"), (100, "ETHUSDT")):
+            closes = aggregator.last(symbol, "1m", 5)[:, 3].tolist()
+            if closes != [offset + 10.0 + i for i in range(5)]:
+                logger.error(f"❌ {symbol} backfilled closes are {closes}")
+                return False
+        if not all(value != value for value in aggregator.current("ETHUSDT", "1m")):
+            logger.error("❌ Backfill left a kline in the open bar")
+            return False
+        
+        logger.info("✅ Klines for two symbols backfilled into their own closed bars")
+        return True
+    
+    except Exception as e:
+        logger.error(f"❌ OHLCV backfill test failed: {str(e)}")
+        return False
+
 def main():
     """Main function"""
     logger.info("Starting Cash setup test")
@@ -181,7 +241,9 @@ def main():
         ("Directories", test_directories),
         ("Market Scanner", test_market_scanner),
         ("Portfolio Tracker", test_portfolio_tracker),
-        ("Bot Hunter", test_bot_hunter)
+        ("Bot Hunter", test_bot_hunter),
+        ("Startup", test_startup),
+        ("OHLCV Backfill", test_ohlcv_backfill)
     ]
     
     # Track results
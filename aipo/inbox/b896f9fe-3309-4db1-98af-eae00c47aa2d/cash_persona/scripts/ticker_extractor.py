@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+"""
+Ticker Extractor for Cash Daily Workflow
+
+This module finds coin mentions in raw social and news text:
+1. Compiles the coin universe (symbols and names from top_coins) into one multi-pattern matcher
+2. Matches in a single pass over the text: a trie of all patterns is serialized into one
+   regular expression, so the scan runs in the regex engine rather than per character in Python
+3. Recognizes $TICKER cashtags and whole-word symbols and names (case-insensitive)
+4. Treats ambiguous short symbols (AI, ONE, GAS, ...) as mentions only when cashtagged or
+   written in capitals
+5. Rebuilds incrementally: the pattern trie is patched with the coins that were added or
+   removed, and the expression is recompiled only when the pattern set actually changed
+
+Usage:
+    from ticker_extractor import TickerExtractor
+    extractor = TickerExtractor(results["top_coins"])
+    extractor.extract("$SOL and Bitcoin are pumping")   # ["SOL", "BTC"]
+"""
+
+import re
+import logging
+import threading
+
+logger = logging.getLogger("Cash.TickerExtractor")
+
+# Symbols and names that are ordinary words (or too short) to trust without a cashtag or capitals
+AMBIGUOUS_WORDS = frozenset([
+    "a", "ai", "all", "am", "an", "and", "any", "are", "as", "at", "be", "best", "big", "bit",
+    "by", "can", "cat", "chain", "coin", "cool", "cube", "data", "day", "dog", "dot", "eat",
+    "edge", "end", "ever", "fast", "fire", "for", "free", "fun", "game", "gas", "get", "go",
+    "gold", "good", "got", "great", "has", "have", "he", "hot", "how", "i", "if", "in", "is",
+    "it", "just", "key", "kind", "link", "live", "love", "low", "made", "make", "max", "me",
+    "meme", "mine", "more", "my", "near", "new", "next", "no", "not", "now", "of", "ok", "on",
+    "one", "open", "or", "our", "out", "pay", "people", "play", "pro", "real", "rain", "ray",
+    "red", "ride", "safe", "same", "see", "sun", "super", "so", "star", "sui", "that", "the",
+    "this", "time", "to", "token", "top", "true", "trust", "up", "us", "via", "we", "win",
+    "wow", "yes", "you", "zero"
+])
+
+# Symbols at or below this length are treated as ambiguous
+AMBIGUOUS_MAX_LENGTH = 2
+
+
+class TickerExtractor:
+    """Single-pass multi-pattern matcher mapping text mentions to coin symbols"""
+
+    def __init__(self, coins=None, ambiguous_words=AMBIGUOUS_WORDS):
+        """
+        Initialize the extractor
+
+        Args:
+            coins (list): Coins with "symbol" and optional "name" (top_coins order = priority)
+            ambiguous_words (set): Lowercase words treated as ambiguous
+        """
+        self.ambiguous_words = ambiguous_words
+        self.patterns = {}   # lowercase pattern -> (coin symbol, ambiguous)
+        self.trie = {}
+        self.regex = None
+        self.dirty = False
+        self.lock = threading.Lock()
+        self.stats = {"builds": 0, "compiles": 0, "patterns": 0}
+        if coins:
+            self.update(coins)
+
+    def update(self, coins):
+        """
+        Bring the pattern set in line with a new coin universe
+
+        Only patterns that were added, removed, or remapped touch the trie, and the expression
+        is recompiled lazily on the next extraction if the set of patterns changed.
+
+        Args:
+            coins (list): Coins with "symbol" and optional "name"; earlier coins win shared patterns
+
+        Returns:
+            dict: {"added", "removed", "remapped"} pattern counts
+        """
+        wanted = {}
+        for coin in coins:
+            symbol = (coin.get("symbol") or "").strip()
+            if not symbol:
+                continue
+            symbol_upper = symbol.upper()
+            for pattern, is_name in ((symbol.lower(), False), ((coin.get("name") or "").strip().lower(), True)):
+                if not pattern or pattern in wanted:
+                    continue
+                ambiguous = pattern in self.ambiguous_words or (not is_name and len(pattern) <= AMBIGUOUS_MAX_LENGTH)
+                if is_name and ambiguous:
+                    # A common word as a name is never a reliable mention (the symbol still is)
+                    continue
+                wanted[pattern] = (symbol_upper, ambiguous)
+
+        with self.lock:
+            added = [pattern for pattern in wanted if pattern not in self.patterns]
+            removed = [pattern for pattern in self.patterns if pattern not in wanted]
+            remapped = sum(1 for pattern in wanted if pattern in self.patterns and self.patterns[pattern] != wanted[pattern])
+
+            for pattern in removed:
+                _trie_remove(self.trie, pattern)
+            for pattern in added:
+                _trie_insert(self.trie, pattern)
+
+            self.patterns = wanted
+            self.dirty = self.dirty or bool(added or removed)
+            self.stats["builds"] += 1
+            self.stats["patterns"] = len(wanted)
+
+        return {"added": len(added), "removed": len(removed), "remapped": remapped}
+
+    def mentions(self, text):
+        """
+        Find every coin mention in a text
+
+        Args:
+            text (str): Raw text
+
+        Returns:
+            list: (coin symbol, start, end, cashtag) tuples in text order
+        """
+        regex = self._compiled()
+        if regex is None or not text:
+            return []
+
+        found = []
+        patterns = self.patterns
+        for match in regex.finditer(text):
+            word = match.group(2)
+            entry = patterns.get(word.lower())
+            if entry is None:
+                continue
+            cashtag = match.group(1) is not None
+            if entry[1] and not (cashtag or word.isupper()):
+                continue
+            found.append((entry[0], match.start(), match.end(), cashtag))
+        return found
+
+    def extract(self, text):
+        """
+        Get the distinct coin symbols mentioned in a text
+
+        Args:
+            text (str): Raw text
+
+        Returns:
+            list: Uppercase symbols in order of first mention
+        """
+        return list(dict.fromkeys(symbol for symbol, _, _, _ in self.mentions(text)))
+
+    def extract_many(self, texts):
+        """Extract symbols from many texts (one list per text)"""
+        return [self.extract(text) for text in texts]
+
+    def tag_items(self, items, text_keys=("title", "tweet", "summary", "text", "body")):
+        """
+        Fill in "trending_coins" for feed items that arrive with raw text only
+
+        Args:
+            items (list): Feed items (items that already have trending_coins are left alone)
+            text_keys (tuple): Item keys whose values are searched
+
+        Returns:
+            int: Number of items tagged
+        """
+        tagged = 0
+        for item in items:
+            if item.get("trending_coins"):
+                continue
+            text = " ".join(str(item[key]) for key in text_keys if item.get(key))
+            item["trending_coins"] = self.extract(text)
+            tagged += 1
+        return tagged
+
+    def _compiled(self):
+        """Get the compiled expression, recompiling if the pattern set changed"""
+        if not self.dirty:
+            return self.regex
+        with self.lock:
+            if self.dirty:
+                body = _trie_to_regex(self.trie)
+                self.regex = re.compile(r"(?<![\w$])(\$)?(" + body + r")(?!\w)", re.IGNORECASE) if body else None
+                self.dirty = False
+                self.stats["compiles"] += 1
+            return self.regex
+
+
+def _trie_insert(trie, word):
+    """Add a word to a character trie ("" marks the end of a word)"""
+    node = trie
+    for char in word:
+        node = node.setdefault(char, {})
+    node[""] = True
+
+
+def _trie_remove(trie, word):
+    """Remove a word from a character trie, pruning empty branches"""
+    path = [trie]
+    for char in word:
+        node = path[-1].get(char)
+        if node is None:
+            return
+        path.append(node)
+    path[-1].pop("", None)
+    for char, parent in zip(reversed(word), reversed(path[:-1])):
+        if parent[char]:
+            break
+        del parent[char]
+
+
+def _trie_to_regex(node):
+    """Serialize a trie into an expression with no redundant alternation"""
+    terminal = "" in node
+    branches = []
+    single_chars = []
+    for char in sorted(key for key in node if key):
+        child = node[char]
+        if set(child) == {""}:
+            single_chars.append(char)
+        else:
+            branches.append(re.escape(char) + _trie_to_regex(child))
+
+    if single_chars:
+        branches.append(re.escape(single_chars[0]) if len(single_chars) == 1 else "[" + "".join(re.escape(char) for char in single_chars) + "]")
+
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if terminal:
+        body = "(?:" + body + ")?" if len(branches) > 1 or len(body) > 1 else body + "?"
+    return body
+
+
+if __name__ == "__main__":
+    # If run directly, tag sample posts and time extraction over a large synthetic corpus
+    import json
+    import time
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+
+    coins = [
+        {"symbol": "btc", "name": "Bitcoin"}, {"symbol": "eth", "name": "Ethereum"},
+        {"symbol": "sol", "name": "Solana"}, {"symbol": "doge", "name": "Dogecoin"},
+        {"symbol": "shib", "name": "Shiba Inu"}, {"symbol": "one", "name": "Harmony"},
+        {"symbol": "ai", "name": "Sleepless AI"}, {"symbol": "op", "name": "Optimism"},
+        {"symbol": "link", "name": "Chainlink"}, {"symbol": "gas", "name": "Gas"}
+    ]
+    coins += [{"symbol": f"tk{i}", "name": f"Token Number {i}"} for i in range(5000)]
+    extractor = TickerExtractor(coins)
+
+    samples = [
+        "Bitcoin breaks $100k! ETH and $SOL following",
+        "This is the one coin I'd buy, AI hype is everywhere",
+        "$ONE and $AI are pumping, gas fees on ethereum are low",
+        "Shiba Inu holders vs dogecoin holders; OP airdrop live",
+        "Chainlink oracle upgrade, bitcoiner meetup (no match for bitcoiner)"
+    ]
+    for text in samples:
+        print(f"{extractor.extract(text)} <- {text}")
+
+    rng = random.Random(5)
+    words = ["the", "market", "is", "pumping", "today", "and", "we", "are", "bullish", "on",
+             "bitcoin", "$sol", "eth", "tk42", "one", "gas", "fees", "Token", "Number", "7", "news"]
+    corpus = [" ".join(rng.choice(words) for _ in range(40)) for _ in range(20000)]
+    characters = sum(len(text) for text in corpus)
+
+    start_time = time.perf_counter()
+    extractor.extract_many(corpus)
+    elapsed = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    change = extractor.update(coins[:-100] + [{"symbol": "new1", "name": "New Coin"}])
+    extractor.extract("warm")
+    rebuild = time.perf_counter() - start_time
+
+    print(json.dumps({
+        "patterns": extractor.stats["patterns"],
+        "characters": characters,
+        "chars_per_second": int(characters / elapsed),
+        "incremental_update": change,
+        "rebuild_ms": round(rebuild * 1000, 2)
+    }, indent=4))
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Streaming Top-K Selection for Cash Daily Workflow
+
+This module picks the best few items out of many without sorting them all:
+1. Keeps the best `k` items seen so far in a bounded heap, so selecting from n items costs
+   O(n log k) time and O(k) memory
+2. Consumes any iterable (generators included) without building a list of every item
+3. Is tie-stable: items with equal keys keep their input order, exactly like
+   `sorted(items, key=key, reverse=True)[:k]`
+4. Ranks by several keys in a single pass over the data
+
+Usage:
+    from topk import top_k, rank_many
+    picks = top_k(repositories, 3, key=lambda repo: repo["scores"]["overall"])
+    rankings = rank_many(coins, {"gainers": (5, lambda c: c["change"]), "volume": (10, lambda c: c["volume"])})
+"""
+
+import heapq
+import logging
+from itertools import count
+
+logger = logging.getLogger("Cash.TopK")
+
+# Marks the end of an iterator in TopK.extend (None can be a real item)
+_DONE = object()
+
+
+class _Reversed:
+    """Wraps a key so the heap treats smaller keys as better"""
+
+    __slots__ = ("key",)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+
+class TopK:
+    """Bounded heap holding the best `k` items pushed so far"""
+
+    def __init__(self, k, key=None, reverse=True):
+        """
+        Initialize the selector
+
+        Args:
+            k (int): Number of items to keep
+            key (callable): Ranking key (the item itself if None)
+            reverse (bool): Keep the largest keys (True) or the smallest (False), as in sorted()
+        """
+        self.k = max(0, int(k))
+        self.key = key if key is not None else (lambda item: item)
+        self.reverse = reverse
+        # Min-heap of (key, -arrival, item): the root is the worst item kept. Among equal keys
+        # the latest arrival is worst, which keeps ties in input order. Arrivals are unique,
+        # so items themselves are never compared.
+        self.heap = []
+        self._arrivals = count()
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, item):
+        """
+        Offer one item
+
+        Args:
+            item: Item to rank
+
+        Returns:
+            bool: Whether the item is among the best so far
+        """
+        if not self.k:
+            return False
+        key = self.key(item)
+        heap = self.heap
+        if len(heap) < self.k:
+            heapq.heappush(heap, (key if self.reverse else _Reversed(key), -next(self._arrivals), item))
+            return True
+        # Later arrivals lose ties, so only a strictly better key gets in. Most items fail
+        # this check and are dropped without building an entry.
+        if self.reverse:
+            if not heap[0][0] < key:
+                return False
+            heapq.heapreplace(heap, (key, -next(self._arrivals), item))
+        else:
+            if not key < heap[0][0].key:
+                return False
+            heapq.heapreplace(heap, (_Reversed(key), -next(self._arrivals), item))
+        return True
+
+    def extend(self, items):
+        """Offer every item of an iterable"""
+        items = iter(items)
+        heap = self.heap
+        while len(heap) < self.k:
+            item = next(items, _DONE)
+            if item is _DONE:
+                return
+            self.push(item)
+        if not self.k:
+            return
+
+        # Same as push(), with the current worst key kept in a local
+        key, arrivals, replace = self.key, self._arrivals, heapq.heapreplace
+        if self.reverse:
+            worst = heap[0][0]
+            for item in items:
+                item_key = key(item)
+                if worst < item_key:
+                    replace(heap, (item_key, -next(arrivals), item))
+                    worst = heap[0][0]
+        else:
+            worst = heap[0][0].key
+            for item in items:
+                item_key = key(item)
+                if item_key < worst:
+                    replace(heap, (_Reversed(item_key), -next(arrivals), item))
+                    worst = heap[0][0].key
+
+    def result(self):
+        """
+        Items kept, best first
+
+        Returns:
+            list: Up to `k` items
+        """
+        return [entry[2] for entry in sorted(self.heap, reverse=True)]
+
+
+def top_k(items, k, key=None, reverse=True):
+    """
+    Best `k` items of an iterable, best first
+
+    Same result as `sorted(items, key=key, reverse=reverse)[:k]`, in O(n log k).
+
+    Args:
+        items (iterable): Items to rank (consumed once)
+        k (int): Number of items to return
+        key (callable): Ranking key (the item itself if None)
+        reverse (bool): Largest keys first (True) or smallest first (False)
+
+    Returns:
+        list: Up to `k` items
+    """
+    selector = TopK(k, key=key, reverse=reverse)
+    selector.extend(items)
+    return selector.result()
+
+
+def rank_many(items, rankings):
+    """
+    Several top-k rankings of the same items, in one pass
+
+    Args:
+        items (iterable): Items to rank (consumed once)
+        rankings (dict): Ranking name -> (k, key) or (k, key, reverse)
+
+    Returns:
+        dict: Ranking name -> list of up to k items, best first
+    """
+    selectors = {name: TopK(*spec) for name, spec in rankings.items()}
+    active = [selector for selector in selectors.values() if selector.k]
+    items = iter(items)
+
+    # Fill every heap first, then only compare each item's keys with the current worst keys
+    for item in items:
+        for selector in active:
+            selector.push(item)
+        if all(len(selector.heap) >= selector.k for selector in active):
+            break
+    else:
+        return {name: selector.result() for name, selector in selectors.items()}
+
+    states = [
+        [selector.key, selector.heap, selector.reverse, selector._arrivals,
+         selector.heap[0][0] if selector.reverse else selector.heap[0][0].key]
+        for selector in active
+    ]
+    replace = heapq.heapreplace
+    for item in items:
+        for state in states:
+            item_key = state[0](item)
+            if state[2]:
+                if state[4] < item_key:
+                    heap = state[1]
+                    replace(heap, (item_key, -next(state[3]), item))
+                    state[4] = heap[0][0]
+            elif item_key < state[4]:
+                heap = state[1]
+                replace(heap, (_Reversed(item_key), -next(state[3]), item))
+                state[4] = heap[0][0].key
+    return {name: selector.result() for name, selector in selectors.items()}
+
+
+if __name__ == "__main__":
+    # If run directly, check top_k against a full sort on random data with many ties
+    import json
+    import random
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = random.Random(7)
+    repos = [{"name": f"repo-{i}", "stars": rng.randint(0, 500), "forks": rng.randint(0, 50)} for i in range(100000)]
+
+    start_time = time.perf_counter()
+    expected = {
+        "stars": sorted(repos, key=lambda repo: repo["stars"], reverse=True)[:10],
+        "forks": sorted(repos, key=lambda repo: repo["forks"], reverse=True)[:10],
+        "least_stars": sorted(repos, key=lambda repo: repo["stars"])[:10]
+    }
+    sort_seconds = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    ranked = rank_many(iter(repos), {
+        "stars": (10, lambda repo: repo["stars"]),
+        "forks": (10, lambda repo: repo["forks"]),
+        "least_stars": (10, lambda repo: repo["stars"], False)
+    })
+    rank_seconds = time.perf_counter() - start_time
+
+    print(json.dumps({
+        "items": len(repos),
+        "matches_sorted": ranked == expected,
+        "sort_seconds": round(sort_seconds, 3),
+        "rank_many_seconds": round(rank_seconds, 3),
+        "top_stars": [(repo["name"], repo["stars"]) for repo in ranked["stars"][:5]]
+    }, indent=4))
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Trend State for Cash Daily Workflow
+
+This module remembers coin mentions across market scans:
+1. Keeps exponentially decayed mention counts per symbol per source, at a fast and a slow
+   half-life, plus a decayed sentiment sum
+2. Decays lazily: an update only touches the symbols it mentions, so a scan costs
+   O(new mentions) however many symbols are tracked
+3. Scores momentum as the fast mention rate over the slow one, so coins rank by how quickly
+   attention is growing rather than by a single scan's count
+4. Persists to JSON between runs and prunes symbols whose counts have decayed away
+
+Usage:
+    from trend_state import TrendState
+    state = TrendState.load("cache/trend_state.json")
+    state.update([("BTC", "reddit", 1.0, 0.4), ("SOL", "twitter", 1.0, None)])
+    state.rising(top=10)
+    state.save("cache/trend_state.json")
+"""
+
+import os
+import json
+import math
+import time
+import logging
+from pathlib import Path
+
+from topk import top_k
+
+logger = logging.getLogger("Cash.TrendState")
+
+# Entry layout: [fast count, slow count, decayed sentiment sum, decayed sentiment weight, updated at]
+FAST, SLOW, SENTIMENT, SENTIMENT_WEIGHT, UPDATED = range(5)
+
+# Smallest window rates are computed over, so a fresh state does not report huge rates
+MIN_WINDOW_HOURS = 1.0
+
+# Mentions per hour added to both rates so rare coins don't swing on one mention
+RATE_PRIOR = 0.05
+
+
+class TrendState:
+    """Decayed per-symbol, per-source mention counts with momentum scoring"""
+
+    def __init__(self, fast_half_life_hours=6, slow_half_life_hours=72, prune_below=0.01):
+        """
+        Initialize the trend state
+
+        Args:
+            fast_half_life_hours (float): Half-life of the recent-attention counts
+            slow_half_life_hours (float): Half-life of the baseline counts
+            prune_below (float): Slow count under which a symbol/source is dropped
+        """
+        self.fast_half_life = fast_half_life_hours * 3600.0
+        self.slow_half_life = slow_half_life_hours * 3600.0
+        self.prune_below = prune_below
+        self.symbols = {}   # symbol -> {source: entry}
+        self.started = None
+        self.updated = None
+
+    def _decay(self, entry, now):
+        """Bring an entry's counts forward to `now`"""
+        elapsed = now - entry[UPDATED]
+        if elapsed > 0:
+            fast_factor = 0.5 ** (elapsed / self.fast_half_life)
+            entry[FAST] *= fast_factor
+            entry[SLOW] *= 0.5 ** (elapsed / self.slow_half_life)
+            entry[SENTIMENT] *= fast_factor
+            entry[SENTIMENT_WEIGHT] *= fast_factor
+            entry[UPDATED] = now
+        return entry
+
+    def update(self, mentions, timestamp=None):
+        """
+        Add one scan's mentions
+
+        Args:
+            mentions (iterable): (symbol, source, weight, sentiment) tuples; sentiment may be None
+            timestamp (float): Scan time (now if None)
+
+        Returns:
+            int: Number of mentions added
+        """
+        now = time.time() if timestamp is None else timestamp
+        if self.started is None:
+            self.started = now
+        self.updated = now
+
+        added = 0
+        for symbol, source, weight, sentiment in mentions:
+            sources = self.symbols.setdefault(symbol.upper(), {})
+            entry = sources.get(source)
+            if entry is None:
+                entry = sources[source] = [0.0, 0.0, 0.0, 0.0, now]
+            self._decay(entry, now)
+            entry[FAST] += weight
+            entry[SLOW] += weight
+            if sentiment is not None:
+                entry[SENTIMENT] += weight * sentiment
+                entry[SENTIMENT_WEIGHT] += weight
+            added += 1
+        return added
+
+    def _window(self, half_life, now):
+        """Effective length (hours) of a decayed count that started accumulating at self.started"""
+        age = max(now - (self.started or now), MIN_WINDOW_HOURS * 3600.0)
+        return half_life / math.log(2) * (1.0 - 0.5 ** (age / half_life)) / 3600.0
+
+    def stats(self, symbol, now=None):
+        """
+        Current decayed counts and momentum for a symbol
+
+        Args:
+            symbol (str): Coin symbol
+            now (float): Time to decay to (now if None)
+
+        Returns:
+            dict: mentions (fast count), baseline (slow count), momentum, sentiment, and
+                per-source fast counts (None if the symbol is not tracked)
+        """
+        sources = self.symbols.get(symbol.upper())
+        if not sources:
+            return None
+        now = time.time() if now is None else now
+
+        # Decay copies so reading does not move UPDATED past newer mentions
+        fast = slow = sentiment_sum = sentiment_weight = 0.0
+        by_source = {}
+        for source, entry in sources.items():
+            entry = self._decay(list(entry), now)
+            fast += entry[FAST]
+            slow += entry[SLOW]
+            sentiment_sum += entry[SENTIMENT]
+            sentiment_weight += entry[SENTIMENT_WEIGHT]
+            by_source[source] = round(entry[FAST], 3)
+
+        fast_rate = fast / self._window(self.fast_half_life, now)
+        slow_rate = slow / self._window(self.slow_half_life, now)
+        return {
+            "symbol": symbol.upper(),
+            "mentions": round(fast, 3),
+            "baseline": round(slow, 3),
+            "momentum": round((fast_rate + RATE_PRIOR) / (slow_rate + RATE_PRIOR), 3),
+            "sentiment": round(sentiment_sum / sentiment_weight, 4) if sentiment_weight > 1e-9 else None,
+            "sources": by_source
+        }
+
+    def rising(self, top=20, min_mentions=2.0, min_momentum=0.0, now=None):
+        """
+        Rank symbols by momentum
+
+        Args:
+            top (int): Number of symbols to return
+            min_mentions (float): Minimum decayed recent mentions
+            min_momentum (float): Minimum momentum
+            now (float): Time to decay to (now if None)
+
+        Returns:
+            list: Symbol stats, highest momentum first
+        """
+        now = time.time() if now is None else now
+        candidates = (
+            stats for stats in (self.stats(symbol, now) for symbol in self.symbols)
+            if stats and stats["mentions"] >= min_mentions and stats["momentum"] >= min_momentum
+        )
+        return top_k(candidates, top, key=lambda stats: (stats["momentum"], stats["mentions"]))
+
+    def prune(self, now=None):
+        """
+        Drop symbol/source counts that have decayed below `prune_below`
+
+        Returns:
+            int: Number of entries dropped
+        """
+        now = time.time() if now is None else now
+        dropped = 0
+        for symbol in list(self.symbols):
+            sources = self.symbols[symbol]
+            for source in list(sources):
+                if self._decay(sources[source], now)[SLOW] < self.prune_below:
+                    del sources[source]
+                    dropped += 1
+            if not sources:
+                del self.symbols[symbol]
+        return dropped
+
+    def to_dict(self):
+        """Serializable state"""
+        return {
+            "fast_half_life_hours": self.fast_half_life / 3600.0,
+            "slow_half_life_hours": self.slow_half_life / 3600.0,
+            "started": self.started,
+            "updated": self.updated,
+            "symbols": self.symbols
+        }
+
+    def save(self, path):
+        """
+        Prune and write the state to a JSON file (atomically)
+
+        Args:
+            path (str): Output path
+        """
+        path = Path(path)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        self.prune(self.updated)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        """
+        Load a saved state (an empty one if the file is missing or unreadable)
+
+        Args:
+            path (str): State file
+            **kwargs: Constructor arguments; half-lives given here override the saved ones
+
+        Returns:
+            TrendState: Loaded state
+        """
+        path = Path(path)
+        if not path.exists():
+            return cls(**kwargs)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load trend state from {path}: {str(e)}")
+            return cls(**kwargs)
+
+        kwargs.setdefault("fast_half_life_hours", data.get("fast_half_life_hours", 6))
+        kwargs.setdefault("slow_half_life_hours", data.get("slow_half_life_hours", 72))
+        state = cls(**kwargs)
+        state.started = data.get("started")
+        state.updated = data.get("updated")
+        state.symbols = data.get("symbols", {})
+        return state
+
+
+def scan_mentions(results, items):
+    """
+    Mentions to add to the trend state from one scan
+
+    Items already counted by an earlier scan (`seen_before`) or collapsed as duplicates are skipped.
+
+    Args:
+        results (dict): Market scan results (for CoinGecko's trending list)
+        items (list): Deduplicated social and news items
+
+    Returns:
+        list: (symbol, source, weight, sentiment) tuples
+    """
+    mentions = []
+    for coin in results.get("trending_coins", []):
+        if coin.get("symbol"):
+            mentions.append((coin["symbol"], coin.get("source") or "coingecko", 1.0, None))
+    for item in items:
+        if item.get("seen_before") or "duplicate_of" in item:
+            continue
+        for symbol in item.get("trending_coins", []):
+            mentions.append((symbol, item.get("source") or "unknown", 1.0, item.get("sentiment_score")))
+    return mentions
+
+
+if __name__ == "__main__":
+    # If run directly, simulate three days of scans where one coin's chatter takes off
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = random.Random(3)
+    state = TrendState()
+    now = 1_700_000_000.0
+    for scan in range(72):
+        now += 3600
+        mentions = [(rng.choice(["BTC", "ETH", "SOL", "DOGE"]), rng.choice(["reddit", "twitter", "news"]), 1.0, rng.uniform(-0.3, 0.6))
+                    for _ in range(20)]
+        if scan >= 60:
+            mentions += [("PEPE", "twitter", 1.0, 0.7)] * (scan - 55)
+        state.update(mentions, now)
+
+    print(json.dumps(state.rising(top=5, now=now), indent=4))
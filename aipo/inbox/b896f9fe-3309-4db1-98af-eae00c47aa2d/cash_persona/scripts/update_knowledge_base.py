@@ -18,6 +18,9 @@ from datetime import datetime
 from pathlib import Path
 import glob
 
+from scan_diff import ScanStore
+from topk import top_k
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,12 +36,10 @@ def get_latest_results():
     """Get the latest results from each category"""
     latest_results = {}
     
-    # Find latest market scan
-    market_scan_files = glob.glob(str(RESULTS_DIR / "market_scan_*.json"))
-    if market_scan_files:
-        latest_market_scan = max(market_scan_files, key=os.path.getctime)
-        with open(latest_market_scan, 'r') as f:
-            latest_results["market_scan"] = json.load(f)
+    # Find latest market scan (stored as a keyframe or a delta against one)
+    latest_market_scan = ScanStore(RESULTS_DIR).latest()
+    if latest_market_scan:
+        latest_results["market_scan"] = latest_market_scan
     
     # Find latest portfolio check
     portfolio_files = glob.glob(str(RESULTS_DIR / "portfolio_*.json"))
@@ -63,11 +64,8 @@ def extract_top_bots(bot_hunt_data):
     # Extract repositories
     repositories = bot_hunt_data.get("repositories", [])
     
-    # Sort by stars
-    sorted_repos = sorted(repositories, key=lambda x: x.get("stars", 0), reverse=True)
-    
-    # Take top 10
-    for repo in sorted_repos[:10]:
+    # Take the top 10 by stars
+    for repo in top_k(repositories, 10, key=lambda x: x.get("stars", 0)):
         top_bots.append({
             "name": repo.get("name", "Unknown"),
             "url": repo.get("url", "#"),
@@ -85,11 +83,8 @@ def extract_trending_coins(market_data):
     # Extract trending coins
     coins = market_data.get("trending_coins", [])
     
-    # Sort by score
-    sorted_coins = sorted(coins, key=lambda x: x.get("score", 0), reverse=True)
-    
-    # Take top 5
-    for coin in sorted_coins[:5]:
+    # Take the top 5 by score
+    for coin in top_k(coins, 5, key=lambda x: x.get("score", 0)):
         trending_coins.append({
             "name": coin.get("name", "Unknown"),
             "symbol": coin.get("symbol", "Unknown"),
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""
+Dependency Vulnerability Matcher for Cash Daily Workflow
+
+This module checks bot repositories' declared dependencies against known advisories:
+1. Parses dependency manifests (requirements*.txt, pyproject.toml, package.json) into
+   (ecosystem, package, version range) entries
+2. Loads a locally stored advisory database (advisories.json) into an index keyed by
+   ecosystem and package name, with each package's affected ranges sorted for bisection
+3. Reports a dependency only when every version its declaration allows is affected (a pinned
+   vulnerable version, or a range that cannot reach the fix)
+4. Turns the matches into a security penalty and readable findings
+
+Usage:
+    from vuln_matcher import AdvisoryIndex, parse_manifests
+    index = AdvisoryIndex.load("advisories.json")
+    findings = index.match_dependencies(parse_manifests("path/to/repo"))
+"""
+
+import re
+import json
+import bisect
+import logging
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11 has no TOML parser; pyproject.toml dependencies are skipped there
+    tomllib = None
+
+logger = logging.getLogger("Cash.VulnMatcher")
+
+# Security score penalty per matched advisory, by severity
+SEVERITY_PENALTIES = {"critical": 40, "high": 25, "moderate": 10, "low": 5}
+
+# Sorts above every real version; used as an open upper bound
+_INFINITY = ((float("inf"),), 1)
+
+_VERSION_PART = re.compile(r"\d+")
+_PRERELEASE = re.compile(r"(?i)(?:a|b|c|rc|alpha|beta|pre|preview|dev)\d*$|-")
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)\s*(?:\[[^\]]*\])?\s*(.*?)\s*(?:;.*)?$")
+
+
+def normalize_name(ecosystem, name):
+    """Canonical package name (PyPI names are case-, dash-, and dot-insensitive)"""
+    name = name.strip().lower()
+    if ecosystem == "PyPI":
+        return re.sub(r"[-_.]+", "-", name)
+    return name
+
+
+def version_key(version):
+    """
+    Sort key for a version string
+
+    The release numbers are compared numerically, with trailing zeros ignored
+    (1.0 == 1.0.0), and pre-releases sort before their release.
+
+    Args:
+        version (str): Version such as "2.31.0", "v1.2", or "1.0.0-beta.1"
+
+    Returns:
+        tuple: Comparable key (None if the string has no version number)
+    """
+    version = version.strip().lstrip("vV=")
+    release_text = re.split(r"[^0-9.]", version, maxsplit=1)[0]
+    release = [int(part) for part in _VERSION_PART.findall(release_text)]
+    if not release:
+        return None
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    prerelease = bool(_PRERELEASE.search(version[len(release_text):]))
+    return (tuple(release), 0 if prerelease else 1)
+
+
+def _bump(version, position):
+    """Version key of the next release at `position` (0 = major) after `version`"""
+    release = [int(part) for part in _VERSION_PART.findall(version)] or [0]
+    release = (release + [0] * (position + 1))[:position + 1]
+    release[position] += 1
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+    return (tuple(release), 0)   # x.y.z pre-releases are still below the bump
+
+
+def _npm_interval(term):
+    """Allowed [low, high) version keys for one npm range term (None if unsupported)"""
+    term = term.strip()
+    if term in ("", "*", "x", "latest"):
+        return (None, _INFINITY)
+    if term.startswith(("git", "http", "file:", "link:", "npm:", "workspace:")) or "/" in term:
+        return None
+
+    if " - " in term:
+        # Hyphen range: both ends inclusive
+        first, last = (part.strip() for part in term.split(" - ", 1))
+        low = version_key(first)
+        return (low, _bump(last, len(_VERSION_PART.findall(last)) - 1)) if low is not None else None
+
+    low, high = None, _INFINITY
+    for comparator in re.findall(r"(\^|~|>=|<=|>|<|=)?\s*(v?[\dxX*][\w.*-]*)", term):
+        op, version = comparator
+        wildcard = re.search(r"\.[xX*]|^[xX*]", version)
+        base = re.split(r"\.[xX*]", version)[0]
+        key = version_key(base)
+        if key is None:
+            continue
+        parts = len(_VERSION_PART.findall(base))
+        if op == "^":
+            release = [int(part) for part in _VERSION_PART.findall(base)]
+            position = next((i for i, part in enumerate(release) if part != 0), len(release) - 1)
+            low, high = key, _bump(base, min(position, parts - 1))
+        elif op == "~":
+            low, high = key, _bump(base, 1 if parts > 1 else 0)
+        elif op in (">=", ">"):
+            low = key
+        elif op in ("<", "<="):
+            high = key if op == "<" else _bump(base, parts - 1)
+        elif wildcard or parts < 3:
+            low, high = key, _bump(base, parts - 1)
+        else:
+            low, high = key, key
+    return (low, high)
+
+
+def _python_interval(spec):
+    """Allowed [low, high) version keys for a PEP 440 specifier (None if unsupported)"""
+    spec = spec.strip()
+    if not spec:
+        return (None, _INFINITY)
+    if spec.startswith(("@", "git+", "http")):
+        return None
+
+    low, high = None, _INFINITY
+    for clause in spec.split(","):
+        match = re.match(r"\s*(===|==|~=|!=|>=|<=|>|<)\s*([\w.*+!-]+)", clause)
+        if not match:
+            continue
+        op, version = match.groups()
+        base = version.rstrip(".*")
+        key = version_key(base)
+        if key is None:
+            continue
+        parts = len(_VERSION_PART.findall(base))
+        if op in ("==", "===") and version.endswith(".*"):
+            low, high = key, _bump(base, parts - 1)
+        elif op in ("==", "==="):
+            low, high = key, key
+        elif op == "~=":
+            low, high = key, _bump(base, max(0, parts - 2))
+        elif op in (">=", ">"):
+            low = key if low is None else max(low, key)
+        elif op in ("<", "<="):
+            bound = key if op == "<" else _bump(base, parts - 1)
+            high = min(high, bound)
+    return (low, high)
+
+
+def _requirements(text, source):
+    """Dependencies declared in a requirements.txt"""
+    dependencies = []
+    for line in text.splitlines():
+        line = line.split(" #")[0].strip()
+        if not line or line.startswith(("#", "-")):
+            continue
+        match = _REQUIREMENT.match(line)
+        if match:
+            dependencies.append({"ecosystem": "PyPI", "name": match.group(1), "spec": match.group(2), "source": source})
+    return dependencies
+
+
+def parse_manifests(root):
+    """
+    Dependencies declared in a repository's top-level manifests
+
+    Args:
+        root (str): Repository directory
+
+    Returns:
+        list: {"ecosystem", "name", "spec", "source"} entries
+    """
+    root = Path(root)
+    dependencies = []
+    for path in sorted(root.glob("requirements*.txt")):
+        dependencies.extend(_requirements(path.read_text(errors="ignore"), path.name))
+
+    pyproject = root / "pyproject.toml"
+    if pyproject.is_file() and tomllib is not None:
+        try:
+            data = tomllib.loads(pyproject.read_text(errors="ignore"))
+            for requirement in data.get("project", {}).get("dependencies", []):
+                dependencies.extend(_requirements(requirement, "pyproject.toml"))
+            poetry = data.get("tool", {}).get("poetry", {}).get("dependencies", {})
+            for name, spec in poetry.items():
+                if name.lower() == "python":
+                    continue
+                spec = spec.get("version", "") if isinstance(spec, dict) else str(spec)
+                # Poetry uses npm-style ^ and ~ constraints
+                dependencies.append({"ecosystem": "PyPI", "name": name, "spec": spec, "source": "pyproject.toml", "style": "npm"})
+        except Exception as e:
+            logger.debug(f"Could not parse {pyproject}: {str(e)}")
+
+    package_json = root / "package.json"
+    if package_json.is_file():
+        try:
+            data = json.loads(package_json.read_text(errors="ignore"))
+            for section in ("dependencies", "devDependencies"):
+                for name, spec in (data.get(section) or {}).items():
+                    dependencies.append({"ecosystem": "npm", "name": name, "spec": str(spec), "source": "package.json"})
+        except Exception as e:
+            logger.debug(f"Could not parse {package_json}: {str(e)}")
+    return dependencies
+
+
+def allowed_interval(dependency):
+    """
+    Version interval a dependency declaration allows
+
+    Args:
+        dependency (dict): Entry from parse_manifests
+
+    Returns:
+        tuple: (low key or None, high key), equal keys for a pinned version; None if the
+            declaration cannot be interpreted (URLs, git references)
+    """
+    if dependency["ecosystem"] == "npm" or dependency.get("style") == "npm":
+        alternatives = [_npm_interval(term) for term in dependency["spec"].split("||")]
+        if len(alternatives) != 1:
+            # An alternative with a fix available means the dependency is not stuck
+            return None
+        return alternatives[0]
+    return _python_interval(dependency["spec"])
+
+
+class AdvisoryIndex:
+    """Advisories indexed by ecosystem and package name, with ranges sorted for bisection"""
+
+    def __init__(self, advisories=()):
+        """
+        Build the index
+
+        Args:
+            advisories (list): Advisory dicts: id, ecosystem, package, severity, summary,
+                and `ranges` ([{"introduced", "fixed"}]) or `versions` (affected list)
+        """
+        self.packages = {}   # (ecosystem, name) -> ([introduced keys], [(introduced, fixed, advisory)])
+        self.count = 0
+        for advisory in advisories:
+            self.add(advisory)
+
+    def add(self, advisory):
+        """Index one advisory"""
+        key = (advisory["ecosystem"], normalize_name(advisory["ecosystem"], advisory["package"]))
+        starts, ranges = self.packages.setdefault(key, ([], []))
+        intervals = []
+        for affected in advisory.get("ranges", []):
+            introduced = version_key(affected.get("introduced") or "0") or ((0,), 1)
+            fixed = version_key(affected["fixed"]) if affected.get("fixed") else _INFINITY
+            intervals.append((introduced, fixed))
+        for version in advisory.get("versions", []):
+            exact = version_key(version)
+            if exact is not None:
+                intervals.append((exact, exact))
+
+        for introduced, fixed in intervals:
+            position = bisect.bisect_right(starts, introduced)
+            starts.insert(position, introduced)
+            ranges.insert(position, (introduced, fixed, advisory))
+        self.count += 1
+
+    def match(self, ecosystem, name, interval):
+        """
+        Advisories affecting every version in an interval
+
+        Args:
+            ecosystem (str): "PyPI" or "npm"
+            name (str): Package name
+            interval (tuple): (low, high) from allowed_interval
+
+        Returns:
+            list: Matching advisories
+        """
+        entry = self.packages.get((ecosystem, normalize_name(ecosystem, name)))
+        if entry is None or interval is None:
+            return []
+        low, high = interval
+        if low is None:
+            return []   # No lower bound: the newest release can be installed
+        pinned = low == high
+
+        starts, ranges = entry
+        matches = []
+        # Only ranges introduced at or below the lowest allowed version can cover it
+        for introduced, fixed, advisory in ranges[:bisect.bisect_right(starts, low)]:
+            if introduced == fixed:
+                covered = pinned and low == introduced
+            else:
+                covered = low < fixed and (high <= fixed if not pinned else True)
+            if covered and not any(match is advisory for match in matches):
+                matches.append(advisory)
+        return matches
+
+    def match_dependencies(self, dependencies):
+        """
+        Match a repository's dependencies
+
+        Args:
+            dependencies (list): Entries from parse_manifests
+
+        Returns:
+            list: Findings with id, package, spec, source, severity, summary, malicious
+        """
+        findings = []
+        for dependency in dependencies:
+            if (dependency["ecosystem"], normalize_name(dependency["ecosystem"], dependency["name"])) not in self.packages:
+                continue
+            for advisory in self.match(dependency["ecosystem"], dependency["name"], allowed_interval(dependency)):
+                findings.append({
+                    "id": advisory["id"],
+                    "package": dependency["name"],
+                    "spec": dependency["spec"],
+                    "source": dependency["source"],
+                    "severity": advisory.get("severity", "moderate"),
+                    "malicious": advisory.get("malicious", False),
+                    "summary": advisory.get("summary", "")
+                })
+        return findings
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an advisory database (an empty index if the file is missing or unreadable)
+
+        Args:
+            path (str): JSON file with an "advisories" list
+
+        Returns:
+            AdvisoryIndex: Loaded index
+        """
+        path = Path(path)
+        if not path.exists():
+            logger.warning(f"Advisory database not found at {path}")
+            return cls()
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load advisory database from {path}: {str(e)}")
+            return cls()
+        return cls(data.get("advisories", []))
+
+
+def security_penalty(findings):
+    """
+    Security score penalty for advisory findings
+
+    Malicious packages cost the whole score; otherwise each advisory costs its severity's
+    penalty, up to 80.
+
+    Args:
+        findings (list): Findings from match_dependencies
+
+    Returns:
+        int: Points to subtract from the security score
+    """
+    if any(finding.get("malicious") for finding in findings):
+        return 100
+    return min(80, sum(SEVERITY_PENALTIES.get(finding["severity"], 10) for finding in findings))
+
+
+if __name__ == "__main__":
+    # If run directly, match a few declarations against the bundled advisory database
+    logging.basicConfig(level=logging.INFO)
+
+    index = AdvisoryIndex.load(Path(__file__).parent / "advisories.json")
+    dependencies = [
+        {"ecosystem": "npm", "name": "axios", "spec": "0.21.0", "source": "package.json"},
+        {"ecosystem": "npm", "name": "axios", "spec": "^0.21.0", "source": "package.json"},
+        {"ecosystem": "npm", "name": "event-stream", "spec": "3.3.6", "source": "package.json"},
+        {"ecosystem": "npm", "name": "lodash", "spec": "~4.17.15", "source": "package.json"},
+        {"ecosystem": "PyPI", "name": "requests", "spec": "==2.28.1", "source": "requirements.txt"},
+        {"ecosystem": "PyPI", "name": "PyYAML", "spec": ">=5.1,<5.4", "source": "requirements.txt"},
+        {"ecosystem": "PyPI", "name": "requests", "spec": ">=2.20", "source": "requirements.txt"}
+    ]
+    findings = index.match_dependencies(dependencies)
+    print(json.dumps({"advisories": index.count, "findings": findings, "penalty": security_penalty(findings)}, indent=4))